@@ -1,17 +1,29 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import logging
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Query, Request, Header
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 from ...db import one
-from ...execution import execute_action
+from ...execution import execute_action, execute_actions_batch, load_cases, normalize_uuid, remember_cases
 from ...policy_store import load_policy
 from ...auth import get_actor, get_channel
 from ...audit import with_audit
 from ...rbac import can_execute
-from ...idempotency import request_hash as _request_hash, check_or_replay as _check_or_replay, store as _idem_store
+from ...idempotency import (
+    complete as _idem_complete,
+    complete_many as _idem_complete_many,
+    release as _idem_release,
+    release_many as _idem_release_many,
+    request_hash as _request_hash,
+    reserve as _idem_reserve,
+    reserve_many as _idem_reserve_many,
+)
+
+log = logging.getLogger("api.actions")
 
 router = APIRouter()
 
@@ -23,6 +35,44 @@ class ExecuteActionRequest(BaseModel):
     payload: Dict[str, Any] = Field(default_factory=dict)
 
 
+class ExecuteBatchItem(BaseModel):
+    case_id: str = Field(..., description="Case UUID")
+    action_type: str = Field(..., description="Typed action name")
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    idempotency_key: Optional[str] = Field(None, description="Per-item key (same semantics as the Idempotency-Key header)")
+
+
+class ExecuteBatchRequest(BaseModel):
+    channel: str = Field("api", description="ui|api|slack|agent|supervisor|system (applies to every item)")
+    items: List[ExecuteBatchItem] = Field(..., min_length=1, max_length=1000)
+
+
+def _respond(resp: Any) -> Any:
+    """Queued connector actions answer 202 (poll GET /actions/{action_id});
+    a card status update that lost a concurrent race answers 409."""
+    code = _item_status(resp)
+    if code != 200:
+        return JSONResponse(status_code=code, content=resp)
+    return resp
+
+
+def _item_status(resp: Any) -> int:
+    if not isinstance(resp, dict):
+        return 200
+    if resp.get("queued"):
+        return 202
+    return 409 if resp.get("conflict") else 200
+
+
+def _case_risk(case: Dict[str, Any] | None) -> float | None:
+    if not case or case.get("risk_score") is None:
+        return None
+    try:
+        return float(case.get("risk_score"))
+    except Exception:
+        return None
+
+
 @router.post("/execute")
 def execute(
     request: Request,
@@ -33,25 +83,19 @@ def execute(
     ex = one("SELECT case_id, risk_score FROM agent_cases WHERE case_id=:cid", cid=req.case_id)
     if not ex:
         raise HTTPException(status_code=404, detail=f"Case not found: {req.case_id}")
+    remember_cases([ex])  # guardrails reuse this row instead of querying again
 
     policy = load_policy()
     channel = (req.channel or "").strip() or get_channel(request, default="api")
     actor = get_actor(request, channel=channel)
 
-    case_risk = None
-    if ex.get("risk_score") is not None:
-        try:
-            case_risk = float(ex.get("risk_score"))
-        except Exception:
-            case_risk = None
-
     ok, reason = can_execute(
         policy,
         channel=channel,
         action_type=req.action_type,
         role=actor.get("role"),
         payload=req.payload or {},
-        case_risk_score=case_risk,
+        case_risk_score=_case_risk(ex),
     )
     if not ok:
         raise HTTPException(status_code=403, detail=reason)
@@ -61,7 +105,10 @@ def execute(
     idem_enabled = bool(idem_cfg.get("enabled", False))
     header_name = str(idem_cfg.get("header_name") or "Idempotency-Key")
     idem_key = (request.headers.get(header_name) or idempotency_key or "").strip() if idem_enabled else ""
+    ttl_seconds = int(((policy or {}).get("idempotency_policy") or {}).get("ttl_hours") or 24) * 3600
 
+    rh = ""
+    reserved = False
     if idem_key and (not dry_run):
         rh = _request_hash(
             {
@@ -72,11 +119,14 @@ def execute(
                 "dry_run": False,
             }
         )
-        replayed, prior_resp, conflict = _check_or_replay(key=idem_key, req_hash=rh)
-        if conflict:
-            raise HTTPException(status_code=409, detail=conflict)
-        if replayed:
-            return prior_resp
+        outcome, prior_resp = _idem_reserve(key=idem_key, req_hash=rh, ttl_seconds=ttl_seconds)
+        if outcome == "conflict":
+            raise HTTPException(status_code=409, detail="Idempotency-Key reuse with different request payload")
+        if outcome == "in_flight":
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+        if outcome == "replay":
+            return _respond(prior_resp)
+        reserved = True
 
     payload = with_audit(
         {**(req.payload or {}), "_actor": actor},
@@ -85,28 +135,165 @@ def execute(
         materialization_id=str((req.payload or {}).get("materialization_id") or ""),
     )
 
-    resp = execute_action(
-        case_id=req.case_id,
-        channel=channel,
-        action_type=req.action_type,
-        payload=payload,
-        dry_run=bool(dry_run),
+    try:
+        resp = execute_action(
+            case_id=req.case_id,
+            channel=channel,
+            action_type=req.action_type,
+            payload=payload,
+            dry_run=bool(dry_run),
+        )
+    except Exception:
+        if reserved:
+            try:
+                _idem_release(idem_key, rh)
+            except Exception:
+                log.warning("idempotency release failed key=%s", idem_key)
+        raise
+
+    if reserved:
+        # If this fails the reservation lease expires and a retry re-executes.
+        try:
+            _idem_complete(idem_key, rh, resp, ttl_seconds=ttl_seconds)
+        except Exception:
+            log.warning("idempotency complete failed key=%s", idem_key)
+
+    return _respond(resp)
+
+
+@router.get("/{action_id}")
+def get_action(action_id: str):
+    """Poll an action (e.g. one that /execute answered with 202 queued)."""
+    aid = normalize_uuid(action_id)
+    if not aid:
+        raise HTTPException(status_code=400, detail="action_id must be a UUID")
+    row = one(
+        """
+        SELECT a.action_id, a.case_id, a.channel, a.action_type, a.result, a.created_at,
+               j.job_id, j.status AS job_status, j.attempts, j.result AS job_result, j.error,
+               j.updated_at AS job_updated_at
+        FROM agent_actions a
+        LEFT JOIN action_jobs j ON j.action_id = a.action_id
+        WHERE a.action_id = CAST(:aid AS UUID)
+        """,
+        aid=aid,
     )
+    if not row:
+        raise HTTPException(status_code=404, detail=f"Action not found: {action_id}")
+    # Actions that never went through the queue are complete once written.
+    status = str(row.get("job_status") or "completed")
+    return {"ok": True, "status": status, "done": status not in ("queued", "running"), **row}
 
-    if idem_key and (not dry_run):
-        rh = _request_hash(
-            {
-                "case_id": req.case_id,
-                "channel": channel,
-                "action_type": req.action_type,
-                "payload": req.payload or {},
-                "dry_run": False,
-            }
+
+@router.post("/execute_batch")
+def execute_batch(
+    request: Request,
+    req: ExecuteBatchRequest,
+    dry_run: bool = Query(False, description="If true, validate guardrails only and do not write audit / mutate systems"),
+):
+    """Execute many actions in one request with per-item results.
+
+    Case lookups, RBAC and guardrails are evaluated for the whole batch up
+    front; audit rows are written in one statement. A failing item never
+    fails the request: each result carries the `status_code` that
+    /actions/execute would have returned for it (202 when queued).
+    """
+    policy = load_policy()
+    channel = (req.channel or "").strip() or get_channel(request, default="api")
+    actor = get_actor(request, channel=channel)
+    cases = load_cases([it.case_id for it in req.items])
+
+    idem_cfg = (policy or {}).get("idempotency") or {}
+    idem_enabled = bool(idem_cfg.get("enabled", False)) and not dry_run
+    ttl_seconds = int(((policy or {}).get("idempotency_policy") or {}).get("ttl_hours") or 24) * 3600
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(req.items)
+    runnable: List[int] = []
+    for i, it in enumerate(req.items):
+        case = cases.get(normalize_uuid(it.case_id) or "")
+        if not case:
+            results[i] = {"status_code": 404, "ok": False, "message": f"Case not found: {it.case_id}"}
+            continue
+        ok, reason = can_execute(
+            policy,
+            channel=channel,
+            action_type=it.action_type,
+            role=actor.get("role"),
+            payload=it.payload or {},
+            case_risk_score=_case_risk(case),
         )
-        # Best-effort store; if a race inserts first, it's OK (replay works next time).
+        if not ok:
+            results[i] = {"status_code": 403, "ok": False, "message": reason}
+            continue
+        runnable.append(i)
+
+    # Per-item idempotency: reserve every keyed item in one round trip.
+    hashes: Dict[int, str] = {}
+    if idem_enabled:
+        keyed = [i for i in runnable if (req.items[i].idempotency_key or "").strip()]
+        for i in keyed:
+            it = req.items[i]
+            hashes[i] = _request_hash(
+                {
+                    "case_id": it.case_id,
+                    "channel": channel,
+                    "action_type": it.action_type,
+                    "payload": it.payload or {},
+                    "dry_run": False,
+                }
+            )
+        outcomes = _idem_reserve_many(
+            [(str(req.items[i].idempotency_key).strip(), hashes[i]) for i in keyed],
+            ttl_seconds=ttl_seconds,
+        )
+        for i, (outcome, prior_resp) in zip(keyed, outcomes):
+            if outcome == "conflict":
+                results[i] = {"status_code": 409, "ok": False, "message": "Idempotency-Key reuse with different request payload"}
+            elif outcome == "in_flight":
+                results[i] = {"status_code": 409, "ok": False, "message": "A request with this Idempotency-Key is still in progress"}
+            elif outcome == "replay":
+                results[i] = {"status_code": _item_status(prior_resp), "replayed": True, **(prior_resp or {})}
+        runnable = [i for i in runnable if results[i] is None]
+
+    reserved = [(str(req.items[i].idempotency_key).strip(), hashes[i]) for i in runnable if i in hashes]
+    batch = []
+    for i in runnable:
+        it = req.items[i]
+        payload = with_audit(
+            {**(it.payload or {}), "_actor": actor},
+            actor=actor,
+            request=request,
+            materialization_id=str((it.payload or {}).get("materialization_id") or ""),
+        )
+        batch.append({"case_id": it.case_id, "action_type": it.action_type, "payload": payload})
+
+    try:
+        executed = execute_actions_batch(batch, channel=channel, cases=cases, dry_run=bool(dry_run)) if batch else []
+    except Exception:
+        if reserved:
+            try:
+                _idem_release_many(reserved)
+            except Exception:
+                log.warning("idempotency release failed for %d keys", len(reserved))
+        raise
+
+    completed = []
+    for i, resp in zip(runnable, executed):
+        results[i] = {"status_code": _item_status(resp), **resp}
+        if i in hashes:
+            completed.append((str(req.items[i].idempotency_key).strip(), hashes[i], resp))
+    if completed:
         try:
-            _idem_store(idem_key, rh, resp)
+            _idem_complete_many(completed, ttl_seconds=ttl_seconds)
         except Exception:
-            pass
+            log.warning("idempotency complete failed for %d keys", len(completed))
 
-    return resp
+    items_out = [{"index": i, **(r or {})} for i, r in enumerate(results)]
+    succeeded = sum(1 for r in items_out if r.get("status_code") in (200, 202) and r.get("ok"))
+    return {
+        "ok": succeeded == len(items_out),
+        "count": len(items_out),
+        "succeeded": succeeded,
+        "failed": len(items_out) - succeeded,
+        "items": items_out,
+    }
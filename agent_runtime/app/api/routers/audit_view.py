@@ -1,24 +1,77 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
+import base64
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from ...db import all
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from ...db import all, stream
 
 router = APIRouter()
 
 
-@router.get("/recent")
-def recent(limit: int = Query(50, ge=1, le=200)):
-    rows = all(
-        """
-        SELECT
+# Hot fields of the '_audit' envelope are projected into indexed columns
+# (seed/00_schema.sql), so list endpoints return those instead of the full blob.
+_AUDIT_COLUMNS = """
           action_id,
           case_id,
           channel,
           action_type,
           result,
           created_at,
-          payload->'_audit' AS audit
+          audit_request_id AS request_id,
+          actor_sub,
+          actor_role,
+          policy_revision,
+          materialization_id
+"""
+
+
+def _select(include_audit: bool) -> str:
+    cols = _AUDIT_COLUMNS.rstrip()
+    if include_audit:
+        cols += ",\n          payload->'_audit' AS audit"
+    return cols
+
+
+def _parse_uuid(value: str, field: str) -> str:
+    try:
+        return str(uuid.UUID(str(value)))
+    except Exception:
+        raise HTTPException(status_code=400, detail=f"{field} must be a UUID")
+
+
+def encode_cursor(created_at: Any, action_id: Any) -> str:
+    """Opaque keyset cursor: (created_at, action_id) of the last row returned."""
+    ts = created_at.isoformat() if isinstance(created_at, datetime) else str(created_at)
+    raw = f"{ts}|{action_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, str]:
+    try:
+        pad = "=" * (-len(token) % 4)
+        ts, aid = base64.urlsafe_b64decode(token + pad).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(ts), str(uuid.UUID(aid))
+    except Exception:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+
+@router.get("/recent")
+def recent(
+    limit: int = Query(50, ge=1, le=200),
+    include_audit: bool = Query(False, description="Also return the full payload->'_audit' envelope"),
+):
+    rows = all(
+        f"""
+        SELECT
+{_select(include_audit)}
         FROM agent_actions
         ORDER BY created_at DESC
         LIMIT :lim
@@ -29,23 +82,190 @@ def recent(limit: int = Query(50, ge=1, le=200)):
 
 
 @router.get("/by_case/{case_id}")
-def by_case(case_id: str, limit: int = Query(200, ge=1, le=500)):
+def by_case(
+    case_id: str,
+    limit: int = Query(200, ge=1, le=500),
+    include_audit: bool = Query(False, description="Also return the full payload->'_audit' envelope"),
+):
+    # Compare as UUID (not case_id::text) so idx_agent_actions_case_created is usable.
+    cid = _parse_uuid(case_id, "case_id")
     rows = all(
-        """
+        f"""
         SELECT
-          action_id,
-          case_id,
-          channel,
-          action_type,
-          result,
-          created_at,
-          payload->'_audit' AS audit
+{_select(include_audit)}
         FROM agent_actions
-        WHERE case_id::text = :cid
+        WHERE case_id = CAST(:cid AS UUID)
         ORDER BY created_at DESC
         LIMIT :lim
         """,
-        cid=case_id,
+        cid=cid,
         lim=limit,
     )
     return {"ok": True, "case_id": case_id, "items": rows}
+
+
+@router.get("/search")
+def search(
+    request_id: Optional[str] = Query(None, description="Audit envelope request_id / correlation id"),
+    actor_sub: Optional[str] = Query(None, description="Actor subject (audit.actor.sub)"),
+    actor_role: Optional[str] = Query(None, description="Actor role (audit.actor.role)"),
+    policy_revision: Optional[int] = Query(None, description="Governance policy revision in effect"),
+    materialization_id: Optional[str] = Query(None),
+    case_id: Optional[str] = Query(None),
+    action_type: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None, description="created_at >= since (ISO 8601)"),
+    until: Optional[datetime] = Query(None, description="created_at < until (ISO 8601)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    include_audit: bool = Query(False, description="Also return the full payload->'_audit' envelope"),
+):
+    """Filter audit rows on projected envelope fields (newest first, keyset-paginated)."""
+    where = []
+    params: Dict[str, Any] = {"lim": limit}
+    if request_id:
+        where.append("audit_request_id = :rid")
+        params["rid"] = request_id
+    if actor_sub:
+        where.append("actor_sub = :sub")
+        params["sub"] = actor_sub
+    if actor_role:
+        where.append("actor_role = :role")
+        params["role"] = actor_role
+    if policy_revision is not None:
+        where.append("policy_revision = :rev")
+        params["rev"] = int(policy_revision)
+    if materialization_id:
+        where.append("materialization_id = :mid")
+        params["mid"] = materialization_id
+    if case_id:
+        where.append("case_id = CAST(:cid AS UUID)")
+        params["cid"] = _parse_uuid(case_id, "case_id")
+    if action_type:
+        where.append("action_type = :at")
+        params["at"] = action_type
+    if since:
+        where.append("created_at >= :since")
+        params["since"] = since
+    if until:
+        where.append("created_at < :until")
+        params["until"] = until
+    if cursor:
+        cts, caid = decode_cursor(cursor)
+        where.append("(created_at, action_id) < (:cts, CAST(:caid AS UUID))")
+        params["cts"] = cts
+        params["caid"] = caid
+
+    w = ("WHERE " + " AND ".join(where)) if where else ""
+    rows = all(
+        f"""
+        SELECT
+{_select(include_audit)}
+        FROM agent_actions
+        {w}
+        ORDER BY created_at DESC, action_id DESC
+        LIMIT :lim
+        """,
+        **params,
+    )
+    next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["action_id"]) if len(rows) == limit else None
+    return {"ok": True, "items": rows, "next_cursor": next_cursor}
+
+
+_EXPORT_FIELDS = [
+    "action_id",
+    "case_id",
+    "channel",
+    "action_type",
+    "result",
+    "created_at",
+    "request_id",
+    "actor_sub",
+    "actor_role",
+    "policy_revision",
+    "materialization_id",
+    "audit",
+    "cursor",
+]
+
+
+def _export_ndjson(rows: Iterator[Dict[str, Any]], rows_per_chunk: int) -> Iterator[bytes]:
+    buf: List[str] = []
+    for r in rows:
+        r["cursor"] = encode_cursor(r["created_at"], r["action_id"])
+        buf.append(json.dumps(r, default=str, separators=(",", ":")))
+        if len(buf) >= rows_per_chunk:
+            yield ("\n".join(buf) + "\n").encode("utf-8")
+            buf = []
+    if buf:
+        yield ("\n".join(buf) + "\n").encode("utf-8")
+
+
+def _export_csv(rows: Iterator[Dict[str, Any]], rows_per_chunk: int) -> Iterator[bytes]:
+    out = io.StringIO()
+    w = csv.DictWriter(out, fieldnames=_EXPORT_FIELDS, extrasaction="ignore")
+    w.writeheader()
+    n = 0
+    for r in rows:
+        r["cursor"] = encode_cursor(r["created_at"], r["action_id"])
+        if r.get("audit") is not None:
+            r["audit"] = json.dumps(r["audit"], default=str, separators=(",", ":"))
+        w.writerow(r)
+        n += 1
+        if n >= rows_per_chunk:
+            yield out.getvalue().encode("utf-8")
+            out.seek(0)
+            out.truncate(0)
+            n = 0
+    if out.tell():
+        yield out.getvalue().encode("utf-8")
+
+
+@router.get("/export")
+def export(
+    since: Optional[datetime] = Query(None, description="created_at >= since (ISO 8601)"),
+    until: Optional[datetime] = Query(None, description="created_at < until (ISO 8601)"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    cursor: Optional[str] = Query(None, description="Resume after the row carrying this cursor"),
+    include_audit: bool = Query(True, description="Include the full payload->'_audit' envelope"),
+    chunk_size: int = Query(1000, ge=100, le=10000, description="Rows per server-side fetch / response chunk"),
+):
+    """Stream agent_actions oldest-first for SIEM ingestion.
+
+    Rows are read through a server-side cursor and written as a chunked
+    response, so memory is bounded by chunk_size. Every row carries a
+    `cursor`; to resume an interrupted export, pass the last received one.
+    """
+    where = []
+    params: Dict[str, Any] = {}
+    if since:
+        where.append("created_at >= :since")
+        params["since"] = since
+    if until:
+        where.append("created_at < :until")
+        params["until"] = until
+    if cursor:
+        cts, caid = decode_cursor(cursor)
+        where.append("(created_at, action_id) > (:cts, CAST(:caid AS UUID))")
+        params["cts"] = cts
+        params["caid"] = caid
+
+    w = ("WHERE " + " AND ".join(where)) if where else ""
+    rows = stream(
+        f"""
+        SELECT
+{_select(include_audit)}
+        FROM agent_actions
+        {w}
+        ORDER BY created_at ASC, action_id ASC
+        """,
+        chunk_size=chunk_size,
+        **params,
+    )
+
+    if format == "csv":
+        return StreamingResponse(
+            _export_csv(rows, chunk_size),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="audit_export.csv"'},
+        )
+    return StreamingResponse(_export_ndjson(rows, chunk_size), media_type="application/x-ndjson")
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Query, Request, Response
+
+from ...config import BOARD_SETTLE_SECONDS
+from ...db import all, one
+
+router = APIRouter()
+
+BOARD_STATUSES = ("todo", "in_progress", "blocked", "resolved")
+
+
+def board_version() -> Tuple[int, int, int]:
+    """(version, head, recent) from the card change counter (index lookups only).
+
+    change_seq is taken inside the writing transaction, so a lower seq can
+    commit after a higher one. `version` is therefore the highest seq taken
+    more than BOARD_SETTLE_SECONDS ago; `head` is MAX(change_seq); `recent`
+    sums the seqs of the younger changes, so it moves when a late one commits.
+    """
+    row = one(
+        """
+        SELECT
+          COALESCE((SELECT MAX(change_seq) FROM kanban_cards), 0) AS head,
+          COALESCE((SELECT change_seq FROM kanban_cards WHERE changed_at < now() - make_interval(secs => :settle)
+                    ORDER BY change_seq DESC LIMIT 1), 0) AS version,
+          COALESCE((SELECT SUM(change_seq) FROM kanban_cards
+                    WHERE changed_at >= now() - make_interval(secs => :settle)), 0) AS recent
+        """,
+        settle=BOARD_SETTLE_SECONDS,
+    ) or {}
+    return int(row.get("version") or 0), int(row.get("head") or 0), int(row.get("recent") or 0)
+
+
+def _etag(version: int, recent: int = 0) -> str:
+    return f'"board-{version}-{recent}"' if recent else f'"board-{version}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    inm = request.headers.get("If-None-Match") or ""
+    return any(t.strip() in (etag, f"W/{etag}", "*") for t in inm.split(","))
+
+
+@router.get("")
+def get_board(
+    request: Request,
+    response: Response,
+    since: Optional[int] = Query(None, ge=0, description="Board version from a previous response: return only cards changed after it"),
+    limit: int = Query(1000, ge=1, le=10000),
+):
+    """Kanban board snapshot grouped by status, versioned by the card change counter.
+
+    A trigger takes the next kanban_cards.change_seq on every card insert/update
+    (and when the linked case's risk/status changes). The board version is the
+    highest change_seq taken more than BOARD_SETTLE_SECONDS ago: a seq is taken
+    before its transaction commits, so a younger one may still be followed by
+    a lower seq committing late, and a cursor past it would skip that card.
+    - `If-None-Match: <ETag>` answers 304 without reading any card while
+      neither the version nor the set of younger changes moved.
+    - `since=<version>` returns cards with change_seq > since, oldest change
+      first. Cards changed within the settle window come back again in the
+      next delta (clients upsert by card_id). With `more=true` the delta was
+      cut at `limit`; call again with the returned `version`.
+
+    Remaining risk: a card write whose transaction commits more than
+    BOARD_SETTLE_SECONDS after taking its change_seq can still be missed by a
+    delta client (a full GET /board or a `reset` re-syncs it). More than
+    `limit` cards changed within the window make a cut delta repeat until they
+    settle.
+    """
+    version, head, recent = board_version()
+    etag = _etag(version, recent)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    if since is not None:
+        if since >= head:
+            return {"ok": True, "delta": True, "since": since, "version": version, "more": False, "cards": []}
+        cards = all(
+            "SELECT * FROM v_kanban_cards WHERE change_seq > :since ORDER BY change_seq ASC LIMIT :lim",
+            since=int(since),
+            lim=limit,
+        )
+        more = len(cards) == limit
+        return {
+            "ok": True,
+            "delta": True,
+            "since": since,
+            # Never past the settled version; a cut delta resumes from its last card.
+            "version": min(int(cards[-1]["change_seq"]), version) if more else version,
+            "more": more,
+            "cards": cards,
+        }
+
+    rows = all("SELECT * FROM v_kanban_cards ORDER BY updated_at DESC LIMIT :lim", lim=limit)
+    columns: Dict[str, List[Dict[str, Any]]] = {st: [] for st in BOARD_STATUSES}
+    for r in rows:
+        columns.setdefault(str(r.get("status") or "todo"), []).append(r)
+    return {
+        "ok": True,
+        "delta": False,
+        "version": version,
+        "truncated": len(rows) == limit,
+        "counts": {st: len(cards) for st, cards in columns.items()},
+        "columns": columns,
+    }
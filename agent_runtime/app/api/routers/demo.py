@@ -5,7 +5,7 @@ import uuid
 
 from pathlib import Path
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from datetime import datetime, timedelta, timezone
 
@@ -13,7 +13,7 @@ from fastapi import APIRouter, HTTPException, Header, Request
 from pydantic import BaseModel, Field
 
 from ...db import one, all, q
-from ...execution import execute_action
+from ...execution import execute_action, load_cards, load_cases, remember_cards, remember_cases
 from ...policy_store import load_policy
 from ...approval import approval_required_for_action
 from ...auth import get_actor, get_channel
@@ -51,12 +51,23 @@ def _load_context(card_id: str) -> Dict[str, Any]:
         rid=resource_id,
     ) if resource_id else []
 
+    # Dry-run guardrails later in this request reuse these rows.
+    remember_cards([card])
+    if case:
+        remember_cases([case])
+
     return {
         "card": card,
         "case": case or {},
         "signals": {"ops": ops, "market": mkt},
     }
 
+
+def _preload_guardrail_rows(items: List[Tuple[Any, Any, Dict[str, Any]]]) -> None:
+    """Load every card/case the (case_id, action_type, payload) validations will check, one query each at most."""
+    load_cards([pl.get("card_id") for _cid, at, pl in items if at == "UpdateCardStatus"])
+    load_cases([cid for cid, _at, _pl in items])
+
 @router.post("/nova/run")
 def demo_nova_run(
     request: Request,
@@ -95,6 +106,7 @@ def demo_nova_run(
     if not case_id:
         raise HTTPException(status_code=400, detail="Card is missing case_id binding (cannot validate actions).")
 
+    _preload_guardrail_rows([(case_id, p["action_type"], p["payload"]) for p in proposals])
     for p in proposals:
         res = execute_action(
             case_id=case_id,
@@ -271,6 +283,7 @@ def demo_nova_run_and_materialize(
 
         # Optionally run validations (dry_run) for UI preview
         validations = []
+        _preload_guardrail_rows([(p["case_id"], p["action_type"], dict(p.get("action_payload") or {})) for p in pas])
         for p in pas:
             res = execute_action(
                 case_id=str(p["case_id"]),
@@ -389,6 +402,7 @@ def demo_nova_run_and_materialize(
         )
 
     # Validate proposals (dry-run) for UI preview
+    _preload_guardrail_rows([(case_id, p["action_type"], p["payload"]) for p in proposals])
     for p in proposals:
         res = execute_action(
             case_id=case_id,
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, FrozenSet, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from ... import change_feed
+from ...config import CHANGE_FEED_BACKEND, CHANGE_FEED_HEARTBEAT_SECONDS
+
+router = APIRouter()
+
+# Max events written per wake-up before yielding to other clients.
+BATCH_EVENTS = 500
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    return f"id: {event['id']}\nevent: {event['kind']}\ndata: {json.dumps(event, default=str, separators=(',', ':'))}\n\n"
+
+
+async def _stream(cursor: int, kinds: Optional[FrozenSet[str]], heartbeat: float) -> AsyncIterator[str]:
+    broker = change_feed.broker
+    broker.clients += 1
+    late_mark = broker.late_mark
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            changed = broker.waiter()
+            late, late_mark = broker.late_since(late_mark)
+            events, gap = broker.read_after(cursor, limit=BATCH_EVENTS)
+            if gap or (late is not None and late <= cursor):
+                # Cursor fell out of the buffer, or an event we already passed
+                # arrived late: the client must re-sync (GET /board).
+                cursor = broker.last_id
+                yield f"id: {cursor}\nevent: reset\ndata: {json.dumps({'id': cursor, 'kind': 'reset'})}\n\n"
+                continue
+            if events:
+                cursor = int(events[-1]["id"])
+                chunk = "".join(_sse(e) for e in events if kinds is None or e["kind"] in kinds)
+                if chunk:
+                    yield chunk
+                continue
+            try:
+                await asyncio.wait_for(changed.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"  # keeps proxies from closing idle streams
+    finally:
+        broker.clients -= 1
+
+
+@router.get("/stream")
+async def stream(
+    kinds: Optional[str] = Query(None, description="Comma-separated: card,case,pending_action,action,news (default: all)"),
+    last_event_id: Optional[int] = Query(None, ge=0, description="Resume after this event id (same as the Last-Event-ID header)"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """Server-sent events for card / case / pending-action / action / news changes.
+
+    Each event is `id: <event id>`, `event: <kind>`, `data: {id, kind, op, object_id, data, ts}`.
+    Reconnecting browsers send Last-Event-ID automatically and resume after it;
+    if those events have already left the server buffer, a `reset` event is
+    sent instead and the client should reload (GET /board).
+    """
+    wanted: Optional[FrozenSet[str]] = None
+    if kinds:
+        wanted = frozenset(k.strip() for k in kinds.split(",") if k.strip())
+        unknown = wanted - set(change_feed.EVENT_KINDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"unknown event kinds: {sorted(unknown)}")
+
+    resume = last_event_id
+    if resume is None and (last_event_id_header or "").strip().isdigit():
+        resume = int(last_event_id_header.strip())
+    cursor = change_feed.broker.last_id if resume is None else resume
+
+    return StreamingResponse(
+        _stream(cursor, wanted, CHANGE_FEED_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/status")
+def status():
+    b = change_feed.broker
+    return {
+        "ok": True,
+        "backend": CHANGE_FEED_BACKEND,
+        "clients": b.clients,
+        "buffered": len(b),
+        "capacity": b.capacity,
+        "last_event_id": b.last_id,
+    }
@@ -5,6 +5,9 @@ from typing import Any, Dict, List, Tuple
 
 from fastapi import APIRouter, Body, Header, HTTPException, Response
 
+from ...jobs.cleanup import ROW_CLEANUP_TABLES
+from ...news_linker import ENTITY_KINDS
+from ...partitions import PARTITIONED_TABLES
 from ...policy_store import load_policy, save_policy, policy_path_str, policy_etag, policy_revision
 
 router = APIRouter()
@@ -49,6 +52,77 @@ def _validate_policy_strict(p: Dict[str, Any]) -> Tuple[List[str], List[str]]:
             if hn is not None and not isinstance(hn, str):
                 errors.append("idempotency.header_name must be a string")
 
+    # time partitioning / retention (optional)
+    pp = p.get("partition_policy")
+    if pp is not None:
+        if not isinstance(pp, dict):
+            errors.append("partition_policy must be an object")
+        else:
+            if "premake" in pp and not isinstance(pp.get("premake"), int):
+                errors.append("partition_policy.premake must be an integer")
+            tables = pp.get("tables") or {}
+            if not isinstance(tables, dict):
+                errors.append("partition_policy.tables must be an object mapping table->settings")
+            else:
+                for t, cfg in tables.items():
+                    if t not in PARTITIONED_TABLES:
+                        warnings.append(f"partition_policy.tables has unknown table: {t}")
+                    if not isinstance(cfg, dict):
+                        errors.append(f"partition_policy.tables.{t} must be an object")
+                        continue
+                    for k in ("premake", "retain_days"):
+                        if k in cfg and cfg.get(k) is not None and not isinstance(cfg.get(k), int):
+                            errors.append(f"partition_policy.tables.{t}.{k} must be an integer")
+
+    # batched row-level cleanup (optional)
+    cp = p.get("cleanup_policy")
+    if cp is not None:
+        if not isinstance(cp, dict):
+            errors.append("cleanup_policy must be an object")
+        else:
+            for k in ("batch_size", "pause_ms", "max_batches", "interval_seconds"):
+                if k in cp and not isinstance(cp.get(k), int):
+                    errors.append(f"cleanup_policy.{k} must be an integer")
+            if isinstance(cp.get("batch_size"), int) and cp["batch_size"] <= 0:
+                errors.append("cleanup_policy.batch_size must be > 0")
+            tables = cp.get("tables") or {}
+            if not isinstance(tables, dict):
+                errors.append("cleanup_policy.tables must be an object mapping table->settings")
+            else:
+                for t, cfg in tables.items():
+                    if t not in ROW_CLEANUP_TABLES:
+                        warnings.append(f"cleanup_policy.tables has unknown table: {t} (partitioned tables use partition_policy)")
+                    if not isinstance(cfg, dict):
+                        errors.append(f"cleanup_policy.tables.{t} must be an object")
+                    elif "retain_days" in cfg and cfg.get("retain_days") is not None and not isinstance(cfg.get("retain_days"), int):
+                        errors.append(f"cleanup_policy.tables.{t}.retain_days must be an integer")
+
+    # news -> resource/case linking (optional)
+    nl = p.get("news_link_policy")
+    if nl is not None:
+        if not isinstance(nl, dict):
+            errors.append("news_link_policy must be an object")
+        else:
+            for k in ("batch_size", "max_batches", "lag_seconds", "alert_min_severity"):
+                if k in nl and not isinstance(nl.get(k), int):
+                    errors.append(f"news_link_policy.{k} must be an integer")
+            tms = nl.get("topic_alert_min_severity") or {}
+            if not isinstance(tms, dict) or not all(isinstance(v, int) for v in tms.values()):
+                errors.append("news_link_policy.topic_alert_min_severity must map topic->integer")
+            ents = nl.get("entities") or {}
+            if not isinstance(ents, dict):
+                errors.append("news_link_policy.entities must be an object mapping resource_id->names")
+            else:
+                for rid, kinds in ents.items():
+                    if not isinstance(kinds, dict):
+                        errors.append(f"news_link_policy.entities.{rid} must be an object")
+                        continue
+                    for kind, names in kinds.items():
+                        if kind not in ENTITY_KINDS:
+                            warnings.append(f"news_link_policy.entities.{rid} has unknown kind: {kind}")
+                        elif not isinstance(names, list):
+                            errors.append(f"news_link_policy.entities.{rid}.{kind} must be a list")
+
     # rbac-lite (optional)
     rbac = p.get("rbac")
     if rbac is not None:
@@ -3,7 +3,8 @@ from __future__ import annotations
 import os
 from fastapi import APIRouter, HTTPException, Query, Request
 
-from ...jobs.cleanup import cleanup_idempotency
+from ...connectors.registry import connector_status
+from ...jobs.cleanup import cleanup_partitions, cleanup_tables
 from ...policy_store import load_policy
 
 router = APIRouter()
@@ -18,7 +19,15 @@ def _is_dev() -> bool:
 def cleanup(request: Request, ttl_hours: int | None = Query(default=None, description="Override TTL hours for this run (dev only).")):
     if not _is_dev():
         raise HTTPException(status_code=403, detail="maintenance endpoints only enabled in dev mode")
-    return cleanup_idempotency(ttl_hours=ttl_hours)
+    return cleanup_tables(ttl_hours=ttl_hours)
+
+
+@router.post("/partitions")
+def partitions(request: Request):
+    """Premake future time partitions and drop expired ones (dev only)."""
+    if not _is_dev():
+        raise HTTPException(status_code=403, detail="maintenance endpoints only enabled in dev mode")
+    return cleanup_partitions()
 
 
 @router.get("/status")
@@ -27,4 +36,7 @@ def status():
     return {
         "ok": True,
         "idempotency_policy": (policy.get("idempotency_policy") or {}),
+        "partition_policy": (policy.get("partition_policy") or {}),
+        "cleanup_policy": (policy.get("cleanup_policy") or {}),
+        "connectors": connector_status(),
     }
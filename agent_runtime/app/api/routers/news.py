@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 import json
+import logging
+import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel, Field
 
-from ...config import DEV_MODE
+from ...change_feed import publish_many
+from ...config import DEV_MODE, NEWS_SEARCH_MAX_SCAN
 from ...db import all, one, q
+from ...news_dedupe import cluster_items
 
 router = APIRouter()
+log = logging.getLogger("news")
 
 class NewsItemIn(BaseModel):
     topic: str = Field("memory", description="Topic namespace, e.g. memory | logistics | energy")
@@ -26,31 +31,144 @@ class NewsItemIn(BaseModel):
 class NewsIngestRequest(BaseModel):
     items: List[NewsItemIn] = Field(default_factory=list)
 
+_ITEM_COLS = "item_id, fetched_at, published_at, topic, source, title, url, summary, severity, signals, case_id, cluster_id"
+
+
 @router.get("/items")
 def list_news_items(
     topic: str | None = None,
     limit: int = 50,
+    collapse: bool = False,
+    case_id: str | None = None,
 ):
+    """Latest news items.
+
+    collapse=true returns one item per near-duplicate cluster (the most severe,
+    then newest) with `cluster_size`, counted over the most recent items.
+    case_id returns the evidence the news linker attached to that case.
+    """
     limit = max(1, min(int(limit), 200))
+    conds = []
+    params: Dict[str, Any] = {"lim": limit}
     if topic:
+        conds.append("topic=:topic")
+        params["topic"] = str(topic)
+    if case_id:
+        try:
+            params["case_id"] = str(uuid.UUID(case_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="case_id must be a UUID")
+        conds.append("case_id=CAST(:case_id AS UUID)")
+    where = f"WHERE {' AND '.join(conds)}" if conds else ""
+    if not collapse:
         rows = all(
-            """SELECT item_id, fetched_at, published_at, topic, source, title, url, summary, severity, signals, case_id
+            f"""SELECT {_ITEM_COLS}
                  FROM news_items
-                 WHERE topic=:topic
+                 {where}
                  ORDER BY fetched_at DESC
                  LIMIT :lim""",
-            topic=str(topic),
-            lim=limit,
+            **params,
         )
-    else:
-        rows = all(
-            """SELECT item_id, fetched_at, published_at, topic, source, title, url, summary, severity, signals, case_id
+        return {"ok": True, "items": rows}
+
+    rows = all(
+        f"""SELECT {_ITEM_COLS}, cluster_size
+             FROM (
+               SELECT r.*,
+                      count(*) OVER w AS cluster_size,
+                      row_number() OVER (w ORDER BY r.severity DESC, r.fetched_at DESC) AS rn
+               FROM (
+                 SELECT {_ITEM_COLS}, COALESCE(cluster_id, item_id) AS cluster_key
                  FROM news_items
+                 {where}
                  ORDER BY fetched_at DESC
-                 LIMIT :lim""",
-            lim=limit,
+                 LIMIT :scan
+               ) r
+               WINDOW w AS (PARTITION BY r.cluster_key)
+             ) c
+             WHERE rn = 1
+             ORDER BY fetched_at DESC
+             LIMIT :lim""",
+        scan=min(limit * 10, 2000),
+        **params,
+    )
+    return {"ok": True, "collapsed": True, "items": rows}
+
+
+# all: websearch syntax ("quoted phrase", or, -exclude); any: items matching at least one word.
+_TSQUERY = {
+    "all": "websearch_to_tsquery('english', :q)",
+    "any": "CAST(replace(CAST(plainto_tsquery('english', :q) AS TEXT), ' & ', ' | ') AS tsquery)",
+}
+
+
+@router.get("/search")
+def search_news(
+    q: str = Query(..., min_length=1, max_length=500, description="Search text (websearch syntax for match=all)"),
+    topic: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Only items fetched at or after this time"),
+    min_severity: int = Query(0, ge=0, le=100),
+    match: str = Query("all", pattern="^(all|any)$", description="all: every term must match; any: at least one"),
+    fuzzy: bool = Query(True, description="Fall back to trigram title similarity when nothing matches"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """Ranked full-text search over news titles (weight A) and summaries (weight B).
+
+    The GIN index on news_items.search_tsv finds matches; the newest
+    NEWS_SEARCH_MAX_SCAN of them are ranked with ts_rank_cd (so a very common
+    term costs a bounded amount of work) and paged with limit/offset.
+    When the first page is empty and pg_trgm is installed, titles similar to
+    `q` are returned instead (`fuzzy: true`), which catches typos.
+    """
+    filters = ""
+    params: Dict[str, Any] = {"q": q, "lim": limit, "off": offset, "scan": NEWS_SEARCH_MAX_SCAN}
+    if topic:
+        filters += " AND topic = :topic"
+        params["topic"] = str(topic)
+    if since is not None:
+        filters += " AND fetched_at >= :since"
+        params["since"] = since
+    if min_severity:
+        filters += " AND severity >= :min_sev"
+        params["min_sev"] = int(min_severity)
+
+    tsq = _TSQUERY[match]
+    rows = all(
+        f"""
+        WITH hits AS (
+          SELECT {_ITEM_COLS}, search_tsv
+          FROM news_items
+          WHERE search_tsv @@ {tsq}{filters}
+          ORDER BY fetched_at DESC
+          LIMIT :scan
         )
-    return {"ok": True, "items": rows}
+        SELECT {_ITEM_COLS}, ts_rank_cd(search_tsv, {tsq}) AS rank
+        FROM hits
+        ORDER BY rank DESC, fetched_at DESC, item_id
+        LIMIT :lim OFFSET :off
+        """,
+        **params,
+    )
+    next_offset = offset + limit if len(rows) == limit and offset + limit < NEWS_SEARCH_MAX_SCAN else None
+    if rows or offset or not fuzzy:
+        return {"ok": True, "query": q, "items": rows, "next_offset": next_offset, "fuzzy": False}
+
+    try:
+        rows = all(
+            f"""
+            SELECT {_ITEM_COLS}, word_similarity(:q, title) AS rank
+            FROM news_items
+            WHERE :q <% title{filters}
+            ORDER BY rank DESC, fetched_at DESC
+            LIMIT :lim
+            """,
+            **{k: v for k, v in params.items() if k not in ("off", "scan")},
+        )
+    except Exception as e:
+        log.warning("fuzzy news search unavailable: %s", e)
+        rows = []
+    return {"ok": True, "query": q, "items": rows, "next_offset": None, "fuzzy": True}
 
 @router.get("/alerts")
 def list_news_alerts(topic: str | None = None, limit: int = 50):
@@ -75,38 +193,81 @@ def list_news_alerts(topic: str | None = None, limit: int = 50):
         )
     return {"ok": True, "alerts": rows}
 
+def _insert_items(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Insert news rows with one statement; returns only the rows that were new (url dedupe)."""
+    if not rows:
+        return []
+    return all(
+        """
+        INSERT INTO news_items(topic, source, title, url, published_at, summary, severity, signals, raw)
+        SELECT r.topic, r.source, r.title, r.url, r.published_at, r.summary, r.severity, r.signals, r.raw
+        FROM jsonb_to_recordset(CAST(:rows AS JSONB))
+          AS r(topic TEXT, source TEXT, title TEXT, url TEXT, published_at TIMESTAMPTZ,
+               summary TEXT, severity INT, signals JSONB, raw JSONB)
+        ON CONFLICT(url) DO NOTHING
+        RETURNING item_id, topic, title, url, severity
+        """,
+        rows=json.dumps(rows, default=str),
+    )
+
+
+def _cluster_inserted(inserted: List[Dict[str, Any]], rows: List[Dict[str, Any]]) -> Dict[str, str]:
+    text = {r["url"]: f"{r['title']} {r.get('summary') or ''}" for r in rows}
+    clusters = cluster_items([(str(r["item_id"]), text.get(r["url"], r["title"])) for r in inserted])
+    for r in inserted:
+        r["cluster_id"] = clusters.get(str(r["item_id"]))
+    return clusters
+
+
+def _publish_inserted(rows: List[Dict[str, Any]]) -> None:
+    publish_many(
+        (
+            "news",
+            r["item_id"],
+            "created",
+            {"topic": r["topic"], "title": r["title"], "severity": int(r["severity"] or 0), "cluster_id": r.get("cluster_id")},
+        )
+        for r in rows
+    )
+
+
 @router.post("/ingest")
 def ingest_news(request: Request, req: NewsIngestRequest):
-    """Ingest deduped news items from news_monitor.
+    """Ingest news items from news_monitor in one set-based INSERT.
 
-    Dedupe policy: url is UNIQUE.
+    Dedupe policy: url is UNIQUE. `inserted` counts new rows, `deduped` counts
+    items whose url was already stored (or repeated within the batch).
     """
-
-    inserted = 0
-    skipped = 0
-
+    rows: List[Dict[str, Any]] = []
+    seen = set()
     for it in req.items:
-        try:
-            q(
-                """INSERT INTO news_items(topic, source, title, url, published_at, summary, severity, signals, raw)
-                     VALUES(:topic, :source, :title, :url, :published_at, :summary, :severity, :signals::jsonb, :raw::jsonb)
-                     ON CONFLICT(url) DO NOTHING""",
-                topic=str(it.topic or "general"),
-                source=it.source,
-                title=str(it.title),
-                url=str(it.url),
-                published_at=it.published_at,
-                summary=it.summary,
-                severity=int(it.severity or 0),
-                signals=json.dumps(it.signals or {}, default=str),
-                raw=json.dumps(it.raw or {}, default=str),
-            )
-            inserted += 1
-        except Exception:
-            # In demo mode, keep ingestion resilient.
-            skipped += 1
-
-    return {"ok": True, "inserted": inserted, "skipped": skipped}
+        url = str(it.url)
+        if url in seen:
+            continue
+        seen.add(url)
+        rows.append(
+            {
+                "topic": str(it.topic or "general"),
+                "source": it.source,
+                "title": str(it.title),
+                "url": url,
+                "published_at": it.published_at,
+                "summary": it.summary,
+                "severity": int(it.severity or 0),
+                "signals": it.signals or {},
+                "raw": it.raw or {},
+            }
+        )
+
+    inserted = _insert_items(rows)
+    clusters = _cluster_inserted(inserted, rows)
+    _publish_inserted(inserted)
+    return {
+        "ok": True,
+        "inserted": len(inserted),
+        "deduped": len(req.items) - len(inserted),
+        "near_duplicates": sum(1 for iid, cid in clusters.items() if iid != cid),
+    }
 
 @router.post("/check-now")
 def check_now(request: Request, topic: str = "memory"):
@@ -149,23 +310,24 @@ def check_now(request: Request, topic: str = "memory"):
         },
     ]
 
-    inserted = 0
-    for s in samples:
-        q(
-            """INSERT INTO news_items(topic, source, title, url, published_at, summary, severity, signals, raw)
-                 VALUES(:topic, :source, :title, :url, :published_at, :summary, :severity, :signals::jsonb, :raw::jsonb)
-                 ON CONFLICT(url) DO NOTHING""",
-            topic=str(s["topic"]),
-            source=s["source"],
-            title=s["title"],
-            url=s["url"],
-            published_at=s["published_at"],
-            summary=s["summary"],
-            severity=int(s["severity"]),
-            signals=json.dumps(s.get("signals") or {}, default=str),
-            raw=json.dumps({"demo": True}, default=str),
-        )
-        inserted += 1
+    inserted = _insert_items(
+        [
+            {
+                "topic": str(s["topic"]),
+                "source": s["source"],
+                "title": s["title"],
+                "url": s["url"],
+                "published_at": s["published_at"],
+                "summary": s["summary"],
+                "severity": int(s["severity"]),
+                "signals": s.get("signals") or {},
+                "raw": {"demo": True},
+            }
+            for s in samples
+        ]
+    )
+
+    _cluster_inserted(inserted, samples)
 
     # Create a lightweight alert row for the top item
     top = one(
@@ -182,4 +344,5 @@ def check_now(request: Request, topic: str = "memory"):
             note="demo burst inserted via /news/check-now",
         )
 
-    return {"ok": True, "inserted": inserted}
+    _publish_inserted(inserted)
+    return {"ok": True, "inserted": len(inserted)}
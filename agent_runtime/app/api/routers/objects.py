@@ -1,4 +1,5 @@
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Query
 
@@ -6,6 +7,9 @@ from ...db import one, all
 
 router = APIRouter()
 
+# Card statuses an SLA can still be breached in.
+OPEN_STATUSES = ("todo", "in_progress", "blocked")
+
 
 def _not_found(obj_type: str, obj_id: str):
     raise HTTPException(status_code=404, detail=f"{obj_type} not found: {obj_id}")
@@ -135,12 +139,39 @@ def get_card(card_id: str, limit: int = Query(50, ge=1, le=500)):
 @router.get("/list/cards")
 def list_cards(
     status: Optional[str] = Query(None, description="todo|in_progress|blocked|resolved"),
+    breached: Optional[bool] = Query(None, description="true: open cards past their SLA due date; false: the rest"),
+    due_before: Optional[datetime] = Query(None, description="Open cards whose SLA is due before this time"),
     limit: int = Query(100, ge=1, le=500),
 ):
-    if status:
-        return all(
-            "SELECT * FROM v_kanban_cards WHERE status=:st ORDER BY updated_at DESC LIMIT :lim",
-            st=status,
-            lim=limit,
+    """List Kanban cards, newest activity first.
+
+    `breached=true` / `due_before` are range scans on (status, sla_due_at) and
+    return the most overdue cards first; they only match open cards, so an
+    explicit non-open `status` is rejected.
+    """
+    open_only = breached is True or due_before is not None
+    if open_only and status and status not in OPEN_STATUSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"breached=true and due_before only apply to open cards ({', '.join(OPEN_STATUSES)})",
         )
-    return all("SELECT * FROM v_kanban_cards ORDER BY updated_at DESC LIMIT :lim", lim=limit)
+    where: List[str] = []
+    params: Dict[str, Any] = {"lim": limit}
+    if status:
+        where.append("status = :st")
+        params["st"] = status
+    elif open_only:
+        where.append(f"status IN ({', '.join(repr(st) for st in OPEN_STATUSES)})")
+    if breached is True:
+        where.append("sla_due_at < now()")
+    elif breached is False:
+        where.append("(status = 'resolved' OR sla_due_at IS NULL OR sla_due_at >= now())")
+    if due_before is not None:
+        where.append("sla_due_at < :due")
+        params["due"] = due_before
+
+    order = "sla_due_at ASC" if breached or due_before is not None else "updated_at DESC"
+    sql = "SELECT * FROM v_kanban_cards"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return all(f"{sql} ORDER BY {order} LIMIT :lim", **params)
@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import hashlib
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, HTTPException, Query, Header, Request
 from pydantic import BaseModel, Field
 
+from ...change_feed import publish, publish_many
 from ...db import one, all, q
-from ...execution import execute_action
+from ...execution import execute_action, execute_actions_batch, normalize_uuid, remember_cases
 from ...policy_store import load_policy
 from ...auth import get_actor, get_channel
 from ...rbac import can_approve, can_execute
@@ -53,7 +54,42 @@ def _audit_action(
         pass
 
 
-def _audit_violation(
+def _audit_actions(rows: List[Dict[str, Any]]) -> None:
+    """Write many audit rows with one INSERT (same best-effort contract as _audit_action)."""
+    if not rows:
+        return
+    vals, params = _values(
+        [{**r, "payload": json.dumps(r["payload"], default=str)} for r in rows],
+        [("case_id", "UUID"), ("channel", "TEXT"), ("action_type", "TEXT"), ("payload", "JSONB"), ("result", "TEXT")],
+    )
+    try:
+        q(
+            f"""
+            INSERT INTO agent_actions (case_id, channel, action_type, payload, result)
+            VALUES {vals}
+            """,
+            **params,
+        )
+    except Exception:
+        # Best-effort audit: never throw.
+        pass
+
+
+def _values(rows: List[Dict[str, Any]], cols: List[Tuple[str, str]]) -> Tuple[str, Dict[str, Any]]:
+    """Render rows as a typed multi-row VALUES list with numbered bind params."""
+    params: Dict[str, Any] = {}
+    tuples = []
+    for i, r in enumerate(rows):
+        parts = []
+        for name, typ in cols:
+            k = f"{name}_{i}"
+            params[k] = r.get(name)
+            parts.append(f"CAST(:{k} AS {typ})")
+        tuples.append("(" + ", ".join(parts) + ")")
+    return ",\n".join(tuples), params
+
+
+def _violation_row(
     *,
     request: Request,
     actor: Dict[str, Any],
@@ -64,7 +100,7 @@ def _audit_violation(
     to: str,
     reason: str,
     materialization_id: str | None = None,
-) -> None:
+) -> Dict[str, Any]:
     pl = with_audit(
         {
             "pending_id": pending_id,
@@ -76,13 +112,98 @@ def _audit_violation(
         request=request,
         materialization_id=materialization_id,
     )
-    _audit_action(
-        case_id=case_id,
-        channel=channel,
-        action_type="PendingActionTransitionViolation",
-        payload=pl,
-        result=f"blocked: {reason}",
+    return {
+        "case_id": case_id,
+        "channel": channel,
+        "action_type": "PendingActionTransitionViolation",
+        "payload": pl,
+        "result": f"blocked: {reason}",
+    }
+
+
+def _audit_violation(**kwargs: Any) -> None:
+    _audit_action(**_violation_row(**kwargs))
+
+
+def _idem_conflict_row(
+    *,
+    request: Request,
+    actor: Dict[str, Any],
+    endpoint: str,
+    subject: str,
+    pa: Dict[str, Any],
+    pending_id: str,
+    idempotency_key: str | None,
+    expected: str,
+    received: str,
+    materialization_id: str | None = None,
+) -> Dict[str, Any]:
+    pl = with_audit(
+        {
+            "endpoint": endpoint,
+            "subject": subject,
+            "card_id": str(pa.get("card_id") or ""),
+            "pending_id": pending_id,
+            "idempotency_key": idempotency_key,
+            "expected_request_hash": expected,
+            "received_request_hash": received,
+        },
+        actor=actor,
+        request=request,
+        materialization_id=materialization_id,
     )
+    return {
+        "case_id": str(pa.get("case_id") or ""),
+        "channel": "system",
+        "action_type": "IdempotencyConflict",
+        "payload": pl,
+        "result": "blocked: Idempotency-Key reuse with different payload",
+    }
+
+
+def _to_status(res: Dict[str, Any]) -> str:
+    # Queued connector actions are moved to executed/blocked by app/jobs/executor.py.
+    if res.get("queued"):
+        return "queued"
+    return "executed" if res.get("ok") else "blocked"
+
+
+def _case_risk(value: Any) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except Exception:
+        return None
+
+
+def _load_pending(pending_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """pending_id -> pending_actions row (+ case_risk_score) in one query."""
+    ids = sorted({u for u in (normalize_uuid(p) for p in pending_ids) if u})
+    if not ids:
+        return {}
+    rows = all(
+        """
+        SELECT p.*, c.risk_score AS case_risk_score
+        FROM pending_actions p
+        LEFT JOIN agent_cases c ON c.case_id = p.case_id
+        WHERE p.pending_id = ANY(CAST(:ids AS UUID[]))
+        """,
+        ids=ids,
+    )
+    return {str(r["pending_id"]): r for r in rows}
+
+
+def _batch_response(pending_ids: List[str], results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    items = [{"index": i, "pending_id": pid, **r} for i, (pid, r) in enumerate(zip(pending_ids, results))]
+    succeeded = sum(1 for r in items if r.get("status_code") == 200 and r.get("ok"))
+    return {
+        "ok": succeeded == len(items),
+        "count": len(items),
+        "succeeded": succeeded,
+        "failed": len(items) - succeeded,
+        "items": items,
+    }
 
 
 class DecisionRequest(BaseModel):
@@ -90,11 +211,31 @@ class DecisionRequest(BaseModel):
     note: str = Field("", description="Optional note")
 
 
+class DecisionBatchItem(BaseModel):
+    pending_id: str
+    decision: str = Field("approve", description="approve | reject")
+    note: str = Field("", description="Optional note")
+    idempotency_key: Optional[str] = Field(None, description="Per-item Idempotency-Key (scoped like the header)")
+
+
+class DecisionBatchRequest(BaseModel):
+    items: List[DecisionBatchItem] = Field(..., min_length=1, max_length=500)
+
+
+class ExecuteBatchItem(BaseModel):
+    pending_id: str
+    idempotency_key: Optional[str] = Field(None, description="Per-item Idempotency-Key (scoped like the header)")
+
+
+class ExecuteBatchRequest(BaseModel):
+    items: List[ExecuteBatchItem] = Field(..., min_length=1, max_length=500)
+
+
 @router.get("/")
 def list_pending_actions(
     case_id: Optional[str] = Query(None),
     card_id: Optional[str] = Query(None),
-    status: Optional[str] = Query(None, description="pending|approved|rejected|executed|blocked|canceled"),
+    status: Optional[str] = Query(None, description="pending|approved|rejected|queued|executed|blocked|canceled"),
     limit: int = Query(200, ge=1, le=500),
 ):
     where = []
@@ -164,26 +305,19 @@ def decide_pending_action(
     # Idempotency replay/conflict (scoped)
     if scoped_idem and str(pa.get("decision_idempotency_key") or "") == scoped_idem:
         if str(pa.get("decision_request_hash") or "") and str(pa.get("decision_request_hash") or "") != req_hash:
-            pl = with_audit(
-                {
-                    "endpoint": "/pending_actions/decision",
-                    "subject": subject,
-                    "card_id": str(pa.get("card_id") or ""),
-                    "pending_id": pending_id,
-                    "idempotency_key": idempotency_key,
-                    "expected_request_hash": str(pa.get("decision_request_hash") or ""),
-                    "received_request_hash": req_hash,
-                },
-                actor=actor,
-                request=request,
-                materialization_id=mid,
-            )
             _audit_action(
-                case_id=case_id,
-                channel="system",
-                action_type="IdempotencyConflict",
-                payload=pl,
-                result="blocked: Idempotency-Key reuse with different payload",
+                **_idem_conflict_row(
+                    request=request,
+                    actor=actor,
+                    endpoint="/pending_actions/decision",
+                    subject=subject,
+                    pa=pa,
+                    pending_id=pending_id,
+                    idempotency_key=idempotency_key,
+                    expected=str(pa.get("decision_request_hash") or ""),
+                    received=req_hash,
+                    materialization_id=mid,
+                )
             )
             raise HTTPException(status_code=409, detail="Idempotency-Key reuse with different payload (request_hash mismatch).")
 
@@ -274,6 +408,7 @@ def decide_pending_action(
         payload=pl,
         result=f"ok: {new_status}",
     )
+    publish("pending_action", pending_id, case_id=case_id, status=new_status)
 
     return one("SELECT * FROM v_pending_actions WHERE pending_id=:pid", pid=pending_id)
 
@@ -306,26 +441,19 @@ def execute_pending_action(
     # Idempotency replay/conflict (scoped)
     if scoped_idem and str(pa.get("execution_idempotency_key") or "") == scoped_idem:
         if str(pa.get("execution_request_hash") or "") and str(pa.get("execution_request_hash") or "") != exec_req_hash:
-            pl = with_audit(
-                {
-                    "endpoint": "/pending_actions/execute",
-                    "subject": subject,
-                    "card_id": str(pa.get("card_id") or ""),
-                    "pending_id": pending_id,
-                    "idempotency_key": idempotency_key,
-                    "expected_request_hash": str(pa.get("execution_request_hash") or ""),
-                    "received_request_hash": exec_req_hash,
-                },
-                actor=actor,
-                request=request,
-                materialization_id=mid,
-            )
             _audit_action(
-                case_id=case_id,
-                channel="system",
-                action_type="IdempotencyConflict",
-                payload=pl,
-                result="blocked: Idempotency-Key reuse with different payload",
+                **_idem_conflict_row(
+                    request=request,
+                    actor=actor,
+                    endpoint="/pending_actions/execute",
+                    subject=subject,
+                    pa=pa,
+                    pending_id=pending_id,
+                    idempotency_key=idempotency_key,
+                    expected=str(pa.get("execution_request_hash") or ""),
+                    received=exec_req_hash,
+                    materialization_id=mid,
+                )
             )
             raise HTTPException(status_code=409, detail="Idempotency-Key reuse with different payload (request_hash mismatch).")
 
@@ -341,6 +469,8 @@ def execute_pending_action(
 
     # RBAC + payload rule enforcement for execution
     risk_row = one("SELECT risk_score FROM agent_cases WHERE case_id=:cid", cid=case_id)
+    if risk_row:
+        remember_cases([{"case_id": case_id, "risk_score": risk_row.get("risk_score")}])
     case_risk = None
     if risk_row and risk_row.get("risk_score") is not None:
         try:
@@ -398,9 +528,10 @@ def execute_pending_action(
         action_type=action_type,
         payload=payload,
         dry_run=bool(dry_run),
+        pending_id=pending_id,
     )
 
-    to_status = "executed" if res.get("ok") else "blocked"
+    to_status = _to_status(res)
 
     if dry_run:
         if not _pa_transition_allowed(policy, frm, to_status):
@@ -426,7 +557,7 @@ def execute_pending_action(
         q(
             """
             UPDATE pending_actions
-            SET status='executed',
+            SET status=:st,
                 executed_action_id=:aid,
                 execution_idempotency_key=COALESCE(:eik, execution_idempotency_key),
                 execution_request_hash=COALESCE(:erh, execution_request_hash),
@@ -434,6 +565,7 @@ def execute_pending_action(
                 updated_at=now()
             WHERE pending_id=:pid
             """,
+            st=to_status,
             aid=action_id,
             er=str(res.get("result") or "ok"),
             eik=scoped_idem,
@@ -456,5 +588,317 @@ def execute_pending_action(
             erh=exec_req_hash,
             pid=pending_id,
         )
+    publish("pending_action", pending_id, case_id=case_id, status=to_status if res.get("ok") else "blocked")
 
     return {"pending_id": pending_id, "dry_run": False, "transition": f"{frm}->{to_status}", "execution": res}
+
+
+@router.post("/decide_batch")
+def decide_pending_actions_batch(
+    request: Request,
+    req: DecisionBatchRequest,
+    channel: str = Query("supervisor", description="Decision channel (ui|supervisor|system)"),
+):
+    """Approve/reject many pending actions with per-item results.
+
+    Same rules as PATCH /{pending_id}/decision, but targets are loaded in one
+    query, RBAC and transitions are checked in memory, status changes are
+    applied with one UPDATE and audit rows are written with one INSERT.
+    """
+    policy = load_policy()
+    if not channel:
+        channel = get_channel(request, default="ui")
+    actor = get_actor(request, channel=channel)
+    subject = str(actor.get("sub") or actor.get("email") or "anonymous")
+
+    rows = _load_pending([it.pending_id for it in req.items])
+    results: List[Dict[str, Any]] = []
+    audit_rows: List[Dict[str, Any]] = []
+    updates: Dict[str, Dict[str, Any]] = {}
+
+    for it in req.items:
+        pid = normalize_uuid(it.pending_id) or ""
+        pa = rows.get(pid)
+        if not pa:
+            results.append({"status_code": 404, "ok": False, "detail": f"Pending action not found: {it.pending_id}"})
+            continue
+
+        decision = (it.decision or "").lower().strip()
+        if decision not in {"approve", "reject"}:
+            results.append({"status_code": 400, "ok": False, "detail": "decision must be approve or reject"})
+            continue
+        new_status = "approved" if decision == "approve" else "rejected"
+
+        decision_body = {"decision": decision, "note": it.note or "", "channel": channel}
+        req_hash = hashlib.sha256(json.dumps(decision_body, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        scoped_idem = _scoped_idem_key("/pending_actions/decision", subject, str(pa.get("card_id") or ""), it.idempotency_key) if it.idempotency_key else None
+
+        mid = str(pa.get("materialization_id") or "") or None
+        case_id = str(pa.get("case_id") or "")
+        frm = str(pa.get("status") or "")
+
+        if scoped_idem and str(pa.get("decision_idempotency_key") or "") == scoped_idem:
+            if str(pa.get("decision_request_hash") or "") and str(pa.get("decision_request_hash") or "") != req_hash:
+                audit_rows.append(
+                    _idem_conflict_row(
+                        request=request,
+                        actor=actor,
+                        endpoint="/pending_actions/decision",
+                        subject=subject,
+                        pa=pa,
+                        pending_id=pid,
+                        idempotency_key=it.idempotency_key,
+                        expected=str(pa.get("decision_request_hash") or ""),
+                        received=req_hash,
+                        materialization_id=mid,
+                    )
+                )
+                results.append({"status_code": 409, "ok": False, "detail": "Idempotency-Key reuse with different payload (request_hash mismatch)."})
+                continue
+            if frm in ("approved", "rejected"):
+                results.append({"status_code": 200, "ok": True, "replayed": True, "status": frm})
+                continue
+
+        ok, reason = can_approve(
+            policy,
+            channel=channel,
+            action_type=str(pa.get("action_type") or ""),
+            role=actor.get("role"),
+            payload=dict(pa.get("action_payload") or {}),
+            case_risk_score=_case_risk(pa.get("case_risk_score")),
+        )
+        violation = dict(request=request, actor=actor, case_id=case_id, channel=channel, pending_id=pid, frm=frm, materialization_id=mid)
+        if not ok:
+            audit_rows.append(_violation_row(**violation, to="(decision)", reason=f"rbac: {reason}"))
+            results.append({"status_code": 403, "ok": False, "detail": reason})
+            continue
+        if not _pa_transition_allowed(policy, frm, new_status):
+            audit_rows.append(_violation_row(**violation, to=new_status, reason=f"illegal transition {frm} -> {new_status}"))
+            results.append({"status_code": 409, "ok": False, "detail": f"Illegal pending_action transition: {frm} -> {new_status}"})
+            continue
+
+        updates[pid] = {"pending_id": pid, "st": new_status, "ab": subject, "note": it.note or "", "dik": scoped_idem, "drh": req_hash}
+        # A later item for the same pending_id must see this decision.
+        pa["status"] = new_status
+        pa["decision_idempotency_key"] = scoped_idem or pa.get("decision_idempotency_key")
+        pa["decision_request_hash"] = req_hash
+        audit_rows.append(
+            {
+                "case_id": case_id,
+                "channel": channel,
+                "action_type": "DecidePendingAction",
+                "payload": with_audit(
+                    {"pending_id": pid, "decision": decision, "note": it.note or "", "idempotency_key_scoped": scoped_idem},
+                    actor=actor,
+                    request=request,
+                    materialization_id=mid,
+                ),
+                "result": f"ok: {new_status}",
+            }
+        )
+        results.append({"status_code": 200, "ok": True, "status": new_status})
+
+    if updates:
+        vals, params = _values(
+            list(updates.values()),
+            [("pending_id", "UUID"), ("st", "TEXT"), ("ab", "TEXT"), ("note", "TEXT"), ("dik", "TEXT"), ("drh", "TEXT")],
+        )
+        q(
+            f"""
+            UPDATE pending_actions p
+            SET status=v.st,
+                approved_by=v.ab,
+                approved_at=CASE WHEN v.st = 'approved' THEN now() ELSE NULL END,
+                decision_idempotency_key=COALESCE(v.dik, p.decision_idempotency_key),
+                decision_request_hash=COALESCE(v.drh, p.decision_request_hash),
+                updated_at=now(),
+                execution_result=CASE WHEN v.note <> '' THEN v.note ELSE p.execution_result END
+            FROM (VALUES {vals}) AS v(pending_id, st, ab, note, dik, drh)
+            WHERE p.pending_id = v.pending_id
+            """,
+            **params,
+        )
+        publish_many(("pending_action", u["pending_id"], "updated", {"status": u["st"]}) for u in updates.values())
+    _audit_actions(audit_rows)
+
+    return _batch_response([it.pending_id for it in req.items], results)
+
+
+@router.post("/execute_batch")
+def execute_pending_actions_batch(
+    request: Request,
+    req: ExecuteBatchRequest,
+    dry_run: bool = Query(True, description="If true, validate only; do not write audit/DB."),
+    channel: str = Query("ui", description="Execution channel (ui|supervisor|system)"),
+):
+    """Execute many pending actions with per-item results.
+
+    Same rules as POST /{pending_id}/execute. Targets are loaded in one query
+    and run through execution.execute_actions_batch(); resulting status
+    changes are applied with one UPDATE and violations audited in one INSERT.
+    """
+    policy = load_policy()
+    if not channel:
+        channel = get_channel(request, default="ui")
+    actor = get_actor(request, channel=channel)
+    subject = str(actor.get("sub") or actor.get("email") or "anonymous")
+
+    rows = _load_pending([it.pending_id for it in req.items])
+    results: List[Optional[Dict[str, Any]]] = [None] * len(req.items)
+    audit_rows: List[Dict[str, Any]] = []
+    runnable: List[Tuple[int, Dict[str, Any], Optional[str], str]] = []
+    batch: List[Dict[str, Any]] = []
+    seen: set[str] = set()
+
+    for i, it in enumerate(req.items):
+        pid = normalize_uuid(it.pending_id) or ""
+        pa = rows.get(pid)
+        if not pa:
+            results[i] = {"status_code": 404, "ok": False, "detail": f"Pending action not found: {it.pending_id}"}
+            continue
+        if pid in seen:
+            results[i] = {"status_code": 409, "ok": False, "detail": "pending_id appears more than once in this batch"}
+            continue
+        seen.add(pid)
+
+        case_id = str(pa.get("case_id") or "")
+        frm = str(pa.get("status") or "")
+        mid = str(pa.get("materialization_id") or "") or None
+
+        exec_body = {"pending_id": pid, "dry_run": bool(dry_run), "channel": channel}
+        exec_req_hash = hashlib.sha256(json.dumps(exec_body, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        scoped_idem = _scoped_idem_key("/pending_actions/execute", subject, str(pa.get("card_id") or ""), it.idempotency_key) if it.idempotency_key else None
+
+        if scoped_idem and str(pa.get("execution_idempotency_key") or "") == scoped_idem:
+            if str(pa.get("execution_request_hash") or "") and str(pa.get("execution_request_hash") or "") != exec_req_hash:
+                audit_rows.append(
+                    _idem_conflict_row(
+                        request=request,
+                        actor=actor,
+                        endpoint="/pending_actions/execute",
+                        subject=subject,
+                        pa=pa,
+                        pending_id=pid,
+                        idempotency_key=it.idempotency_key,
+                        expected=str(pa.get("execution_request_hash") or ""),
+                        received=exec_req_hash,
+                        materialization_id=mid,
+                    )
+                )
+                results[i] = {"status_code": 409, "ok": False, "detail": "Idempotency-Key reuse with different payload (request_hash mismatch)."}
+                continue
+            if frm in ("executed", "blocked"):
+                results[i] = {
+                    "status_code": 200,
+                    "ok": frm == "executed",
+                    "dry_run": False,
+                    "idempotent": True,
+                    "status": frm,
+                    "executed_action_id": str(pa.get("executed_action_id") or ""),
+                    "execution_result": str(pa.get("execution_result") or ""),
+                }
+                continue
+
+        ok, reason = can_execute(
+            policy,
+            channel=channel,
+            action_type=str(pa.get("action_type") or ""),
+            role=actor.get("role"),
+            payload=dict(pa.get("action_payload") or {}),
+            case_risk_score=_case_risk(pa.get("case_risk_score")),
+        )
+        violation = dict(request=request, actor=actor, case_id=case_id, channel=channel, pending_id=pid, frm=frm, materialization_id=mid)
+        if not ok:
+            if not dry_run:
+                audit_rows.append(_violation_row(**violation, to="(execute)", reason=f"rbac: {reason}"))
+            results[i] = {"status_code": 403, "ok": False, "detail": reason}
+            continue
+        if pa.get("approval_required") and frm != "approved":
+            if not dry_run:
+                audit_rows.append(_violation_row(**violation, to="executed", reason="execution attempted without approval"))
+            results[i] = {"status_code": 409, "ok": False, "detail": "Pending action requires approval before execution."}
+            continue
+
+        base_payload = dict(pa.get("action_payload") or {})
+        base_payload["_actor"] = actor
+        base_payload["materialization_id"] = mid or ""
+        batch.append(
+            {
+                "case_id": case_id,
+                "pending_id": pid,
+                "action_type": str(pa.get("action_type") or ""),
+                "payload": with_audit(base_payload, actor=actor, request=request, materialization_id=mid),
+            }
+        )
+        runnable.append((i, pa, scoped_idem, exec_req_hash))
+
+    cases = {
+        str(pa.get("case_id")): {"case_id": str(pa.get("case_id")), "risk_score": pa.get("case_risk_score")}
+        for _i, pa, _k, _h in runnable
+        if pa.get("case_risk_score") is not None
+    }
+    executed = execute_actions_batch(batch, channel=channel, cases=cases, dry_run=bool(dry_run)) if batch else []
+
+    updates: List[Dict[str, Any]] = []
+    for (i, pa, scoped_idem, exec_req_hash), res in zip(runnable, executed):
+        pid = str(pa["pending_id"])
+        frm = str(pa.get("status") or "")
+        to_status = _to_status(res)
+        allowed = _pa_transition_allowed(policy, frm, to_status)
+        if dry_run:
+            if not allowed:
+                results[i] = {"status_code": 409, "ok": False, "detail": f"Illegal pending_action transition: {frm} -> {to_status}"}
+            else:
+                results[i] = {"status_code": 200, "ok": bool(res.get("ok")), "dry_run": True, "would_transition": f"{frm}->{to_status}", "execution": res}
+            continue
+        if not allowed:
+            audit_rows.append(
+                _violation_row(
+                    request=request,
+                    actor=actor,
+                    case_id=str(pa.get("case_id") or ""),
+                    channel=channel,
+                    pending_id=pid,
+                    frm=frm,
+                    to=to_status,
+                    reason=f"illegal transition {frm} -> {to_status}",
+                    materialization_id=str(pa.get("materialization_id") or "") or None,
+                )
+            )
+            results[i] = {"status_code": 409, "ok": False, "detail": f"Illegal pending_action transition: {frm} -> {to_status}"}
+            continue
+        updates.append(
+            {
+                "pending_id": pid,
+                "st": to_status,
+                "aid": res.get("action_id") if res.get("ok") else None,
+                "er": str(res.get("result") or "ok") if res.get("ok") else str(res.get("result") or res.get("error") or "blocked"),
+                "eik": scoped_idem,
+                "erh": exec_req_hash,
+            }
+        )
+        results[i] = {"status_code": 200, "ok": bool(res.get("ok")), "dry_run": False, "transition": f"{frm}->{to_status}", "execution": res}
+
+    if updates:
+        vals, params = _values(
+            updates,
+            [("pending_id", "UUID"), ("st", "TEXT"), ("aid", "UUID"), ("er", "TEXT"), ("eik", "TEXT"), ("erh", "TEXT")],
+        )
+        q(
+            f"""
+            UPDATE pending_actions p
+            SET status=v.st,
+                executed_action_id=CASE WHEN v.st IN ('executed', 'queued') THEN v.aid ELSE p.executed_action_id END,
+                execution_idempotency_key=COALESCE(v.eik, p.execution_idempotency_key),
+                execution_request_hash=COALESCE(v.erh, p.execution_request_hash),
+                execution_result=v.er,
+                updated_at=now()
+            FROM (VALUES {vals}) AS v(pending_id, st, aid, er, eik, erh)
+            WHERE p.pending_id = v.pending_id
+            """,
+            **params,
+        )
+        publish_many(("pending_action", u["pending_id"], "updated", {"status": u["st"]}) for u in updates)
+    _audit_actions(audit_rows)
+
+    return _batch_response([it.pending_id for it in req.items], [r or {} for r in results])
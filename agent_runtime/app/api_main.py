@@ -18,19 +18,26 @@ from __future__ import annotations
 import logging
 import time
 import uuid
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
+from . import change_feed
+from .config import GZIP_REQUEST_MAX_BYTES
+from .gzip_request import GzipRequestMiddleware
 from .logging_utils import setup_logging
+from .object_cache import request_cache
 from .request_context import get_request_id, reset_request_id, set_request_id
 
 from .api.routers import (
     actions,
     audit_view,
+    board,
     cases,
     demo,
+    events,
     governance,
     graph,
     health,
@@ -42,6 +49,16 @@ from .api.routers import (
 )
 
 
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    # postgres change-feed backend: LISTEN thread feeding GET /events/stream.
+    change_feed.start_listener()
+    try:
+        yield
+    finally:
+        change_feed.stop_listener()
+
+
 def create_app() -> FastAPI:
     setup_logging()
 
@@ -52,6 +69,7 @@ def create_app() -> FastAPI:
             "A minimal Foundry-style API surface: ontology + object graph + kinetic actions. "
             "This is a demo scaffold (not production hardened)."
         ),
+        lifespan=_lifespan,
     )
 
     def _error_response(
@@ -97,6 +115,9 @@ def create_app() -> FastAPI:
             details=exc.errors(),
         )
 
+    # Registered before the request-id middleware so it runs inside it (errors get the X-Request-Id).
+    app.add_middleware(GzipRequestMiddleware, max_size=GZIP_REQUEST_MAX_BYTES)
+
     @app.middleware("http")
     async def _request_id_middleware(request: Request, call_next):
         rid = (request.headers.get("X-Request-Id") or "").strip() or str(uuid.uuid4())
@@ -107,7 +128,9 @@ def create_app() -> FastAPI:
         rethrow = None
 
         try:
-            response = await call_next(request)
+            # One object cache per request (see object_cache.py).
+            with request_cache():
+                response = await call_next(request)
         except (HTTPException, RequestValidationError) as e:
             # Let exception handlers format the response, but keep correlation.
             rethrow = e
@@ -152,6 +175,7 @@ def create_app() -> FastAPI:
     app.include_router(health.router)
     app.include_router(ontology.router, prefix="/ontology", tags=["ontology"])
     app.include_router(objects.router, prefix="/objects", tags=["objects"])
+    app.include_router(board.router, prefix="/board", tags=["board"])
     app.include_router(cases.router, prefix="/cases", tags=["cases"])
     app.include_router(graph.router, prefix="/graph", tags=["graph"])
     app.include_router(actions.router, prefix="/actions", tags=["actions"])
@@ -160,6 +184,7 @@ def create_app() -> FastAPI:
     app.include_router(governance.router, prefix="/governance", tags=["governance"])
     app.include_router(maintenance.router, prefix="/maintenance", tags=["maintenance"])
     app.include_router(news.router, prefix="/news", tags=["news"])
+    app.include_router(events.router, prefix="/events", tags=["events"])
     app.include_router(demo.router, prefix="/demo", tags=["demo"])
 
     return app
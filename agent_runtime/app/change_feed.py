@@ -0,0 +1,231 @@
+"""Change feed: card / case / pending-action / action / news change events.
+
+Writers call publish()/publish_many() after their change is committed. Events
+reach the API's Broker, which GET /events/stream fans out to SSE clients.
+
+Backends (CHANGE_FEED_BACKEND):
+- inprocess: publish() appends straight to this process's broker. Only
+  writers inside the API process (routers, execute_action) are seen.
+- postgres: publish() sends NOTIFY change_feed (ids from change_feed_seq,
+  so they are global). Every API replica runs a LISTEN thread that feeds its
+  broker, so writers in other processes (runner, executor) reach clients too.
+
+The broker keeps the last CHANGE_FEED_BUFFER events in a ring buffer and
+holds no per-client queues. Each client keeps a cursor (last event id) and
+reads forward from it, so a slow client only delays itself. A client whose
+cursor has fallen out of the buffer (or that resumes from a Last-Event-ID
+that old, or from before an API restart) gets a `reset` event and must
+re-sync, e.g. via GET /board.
+NOTIFYs arrive in commit order, not id order, so an event can show up after
+a newer one. The broker files it in id order (clients behind it still read it
+in sequence); clients whose cursor is already past it get a `reset` too.
+Publishing never raises: the feed is a notification channel, not a source
+of truth.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import select
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from . import config
+from .db import listen_connection, q
+
+log = logging.getLogger("change_feed")
+
+CHANNEL = "change_feed"
+EVENT_KINDS = ("card", "case", "pending_action", "action", "news")
+
+
+class Broker:
+    """Ring buffer of recent events plus a wake-up signal for async readers."""
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = max(1, int(capacity))
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=self.capacity)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changed: Optional[asyncio.Event] = None
+        # (mark, id) of events that arrived after a newer one; see late_since().
+        self._late: Deque[Tuple[int, int]] = deque(maxlen=1000)
+        self._late_mark = 0
+        self.clients = 0
+
+    def append(self, event: Dict[str, Any]) -> None:
+        eid = int(event["id"])
+        with self._lock:
+            if not self._events or eid > int(self._events[-1]["id"]):
+                self._events.append(event)
+            elif not self._insert_late(event, eid):
+                return  # duplicate delivery
+            loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._wake)
+            except RuntimeError:
+                pass  # loop shut down
+
+    def _insert_late(self, event: Dict[str, Any], eid: int) -> bool:
+        """File an event older than the newest one in id order; False for a duplicate."""
+        i = len(self._events)
+        while i and int(self._events[i - 1]["id"]) > eid:
+            i -= 1
+        if i and int(self._events[i - 1]["id"]) == eid:
+            return False
+        if len(self._events) < self.capacity:
+            self._events.insert(i, event)
+        elif i:  # full: make room at the old end, unless it is older than all of it
+            self._events.popleft()
+            self._events.insert(i - 1, event)
+        self._late_mark += 1
+        self._late.append((self._late_mark, eid))
+        return True
+
+    @property
+    def late_mark(self) -> int:
+        with self._lock:
+            return self._late_mark
+
+    def late_since(self, mark: int) -> Tuple[Optional[int], int]:
+        """Lowest id that arrived late after `mark` (None if none) and the current mark.
+
+        A reader whose cursor is at or past that id has skipped the event."""
+        with self._lock:
+            if mark == self._late_mark:
+                return None, mark
+            if not self._late or self._late[0][0] > mark + 1:
+                return 0, self._late_mark  # records dropped: assume the worst
+            return min(eid for m, eid in self._late if m > mark), self._late_mark
+
+    def _wake(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @property
+    def last_id(self) -> int:
+        with self._lock:
+            return int(self._events[-1]["id"]) if self._events else 0
+
+    def read_after(self, last_id: int, limit: int = 500) -> Tuple[List[Dict[str, Any]], bool]:
+        """Events with id > last_id (oldest first) and whether the cursor is unusable:
+        some events were already evicted, or the cursor is ahead of everything
+        buffered (it came from before a restart of this process)."""
+        with self._lock:
+            if not self._events:
+                return [], last_id > 0
+            first = int(self._events[0]["id"])
+            gap = last_id < first - 1 or last_id > int(self._events[-1]["id"])
+            out = []
+            # Ids are increasing; walk from the newest end to the cursor.
+            for ev in reversed(self._events):
+                if int(ev["id"]) <= last_id:
+                    break
+                out.append(ev)
+            out.reverse()
+            return out[:limit], gap
+
+    def waiter(self) -> asyncio.Event:
+        """Event set by the next append. Take it *before* read_after() so no append is missed.
+
+        Must be called on the API event loop.
+        """
+        if self._changed is None or self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._changed = asyncio.Event()
+        return self._changed
+
+
+broker = Broker(config.CHANGE_FEED_BUFFER)
+# In-process ids start at the epoch-ms, so they keep growing across API restarts
+# and a browser's Last-Event-ID from the previous run is older than any new one.
+_local_ids = itertools.count(int(time.time() * 1000))
+
+
+def _event(kind: str, obj_id: Any, op: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    # The "id" (event id) is assigned by the backend.
+    return {"kind": kind, "op": op, "object_id": str(obj_id), "data": data, "ts": time.time()}
+
+
+def publish_many(events: Iterable[Tuple[str, Any, str, Dict[str, Any]]]) -> None:
+    """Publish (kind, object_id, op, data) events; one NOTIFY statement in postgres mode."""
+    evs = [_event(kind, obj_id, op, dict(data or {})) for kind, obj_id, op, data in events]
+    if not evs:
+        return
+    try:
+        if config.CHANGE_FEED_BACKEND == "postgres":
+            q(
+                """
+                SELECT pg_notify(:ch, (e || jsonb_build_object('id', nextval('change_feed_seq')))::text)
+                FROM jsonb_array_elements(CAST(:evs AS JSONB)) AS e
+                """,
+                ch=CHANNEL,
+                evs=json.dumps(evs, default=str),
+            )
+            return
+        for ev in evs:
+            ev["id"] = next(_local_ids)
+            broker.append(ev)
+    except Exception as e:
+        log.warning("change feed publish failed: %s", e)
+
+
+def publish(kind: str, obj_id: Any, op: str = "updated", **data: Any) -> None:
+    publish_many([(kind, obj_id, op, data)])
+
+
+def listen_forever(stop: threading.Event, poll_seconds: float = 5.0) -> None:
+    """LISTEN change_feed and feed the broker (postgres backend). Reconnects on errors."""
+    while not stop.is_set():
+        conn = None
+        try:
+            conn = listen_connection()
+            cur = conn.cursor()
+            cur.execute(f"LISTEN {CHANNEL}")
+            log.info("change feed listening on %s", CHANNEL)
+            while not stop.is_set():
+                if select.select([conn], [], [], poll_seconds) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    n = conn.notifies.pop(0)
+                    try:
+                        broker.append(json.loads(n.payload))
+                    except Exception as e:
+                        log.warning("bad change feed payload: %s", e)
+        except Exception as e:
+            log.warning("change feed listener error: %s", e)
+            stop.wait(poll_seconds)
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+
+_listener: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def start_listener() -> None:
+    global _listener
+    if config.CHANGE_FEED_BACKEND != "postgres" or (_listener is not None and _listener.is_alive()):
+        return
+    _stop.clear()
+    _listener = threading.Thread(target=listen_forever, args=(_stop,), name="change-feed-listen", daemon=True)
+    _listener.start()
+
+
+def stop_listener() -> None:
+    _stop.set()
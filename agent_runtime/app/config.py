@@ -11,6 +11,40 @@ ERP_CONNECTOR = os.getenv("ERP_CONNECTOR", "mock")  # mock | sap | oracle | ...
 ERP_BASE_URL = os.getenv("ERP_BASE_URL", "")
 ERP_API_KEY = os.getenv("ERP_API_KEY", "")
 
+# External connector calls: sync (inside the request) | async (action_jobs queue + executor workers).
+# local_db actions (UpdateCardStatus) always run synchronously.
+ACTION_EXECUTION_MODE = os.getenv("ACTION_EXECUTION_MODE", "sync").strip().lower()
+EXECUTOR_WORKERS = int(os.getenv("EXECUTOR_WORKERS", "4"))
+EXECUTOR_POLL_SECONDS = float(os.getenv("EXECUTOR_POLL_SECONDS", "1.0"))
+EXECUTOR_MAX_ATTEMPTS = int(os.getenv("EXECUTOR_MAX_ATTEMPTS", "3"))
+EXECUTOR_LEASE_SECONDS = int(os.getenv("EXECUTOR_LEASE_SECONDS", "300"))
+
+# SLA sweeper (app/jobs/sla_sweeper.py): marks overdue open cards breached and emits card events.
+SLA_SWEEP_SECONDS = float(os.getenv("SLA_SWEEP_SECONDS", "30"))
+SLA_SWEEP_BATCH = int(os.getenv("SLA_SWEEP_BATCH", "500"))
+
+# GET /board: card changes younger than this are not trusted as committed in order yet;
+# delta versions stay behind them (longest expected card-writing transaction).
+BOARD_SETTLE_SECONDS = float(os.getenv("BOARD_SETTLE_SECONDS", "30"))
+
+# Change feed (GET /events/stream): inprocess | postgres (LISTEN/NOTIFY, needed when
+# the runner/executor run in other processes or there are several API replicas).
+# docker-compose sets postgres for api, agent, executor and sla_sweeper; inprocess
+# only sees writes made inside the API process (tests, single-process dev runs).
+CHANGE_FEED_BACKEND = os.getenv("CHANGE_FEED_BACKEND", "inprocess").strip().lower()
+CHANGE_FEED_BUFFER = int(os.getenv("CHANGE_FEED_BUFFER", "10000"))
+CHANGE_FEED_HEARTBEAT_SECONDS = float(os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", "15"))
+
+# News near-duplicate clustering (app/news_dedupe.py).
+NEWS_SIMHASH_MAX_DISTANCE = int(os.getenv("NEWS_SIMHASH_MAX_DISTANCE", "6"))
+NEWS_DEDUPE_WARM_DAYS = int(os.getenv("NEWS_DEDUPE_WARM_DAYS", "30"))
+
+# News full-text search (GET /news/search): most recent matches ranked per query.
+NEWS_SEARCH_MAX_SCAN = int(os.getenv("NEWS_SEARCH_MAX_SCAN", "5000"))
+
+# Gzip request bodies (Content-Encoding: gzip, e.g. news_monitor ingest batches): max decompressed size.
+GZIP_REQUEST_MAX_BYTES = int(os.getenv("GZIP_REQUEST_MAX_BYTES", str(16 * 1024 * 1024)))
+
 # API
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", "8000"))
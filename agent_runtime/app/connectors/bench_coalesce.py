@@ -0,0 +1,93 @@
+"""Benchmark: backend calls saved by connector request coalescing.
+
+Fires concurrent TriggerPurchase / ExpediteShipment actions at a handful of
+supplier/SKU targets through a ManagedConnector wrapping a counting mock
+connector, once without and once with a coalescing window:
+
+    python -m app.connectors.bench_coalesce --actions 500 --targets 10 --window-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from .erp import ExecutionResult, MockERPConnector
+from .registry import DEFAULT_SETTINGS, ManagedConnector
+
+
+class CountingMockConnector(MockERPConnector):
+    """Mock connector that counts backend round trips and simulates their latency."""
+
+    def __init__(self, latency_ms: float = 5.0):
+        self.latency = latency_ms / 1000.0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _round_trip(self) -> None:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+
+    def execute(self, action_type: str, payload: Dict[str, Any]) -> ExecutionResult:
+        self._round_trip()
+        return super().execute(action_type, payload)
+
+    def execute_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[ExecutionResult]:
+        self._round_trip()
+        return super().execute_batch(items)
+
+
+def run(actions: int, targets: int, window_ms: float, threads: int, latency_ms: float) -> Dict[str, Any]:
+    backend = CountingMockConnector(latency_ms)
+    settings = {
+        **DEFAULT_SETTINGS,
+        "rate_per_sec": 1e9,
+        "burst": 1_000_000,
+        "max_concurrency": threads,
+        "coalesce_window_ms": window_ms,
+    }
+    conn = ManagedConnector(backend, settings)
+    kinds = ("TriggerPurchase", "ExpediteShipment")
+
+    def one(i: int) -> bool:
+        t = i % targets
+        payload = {"supplier_id": f"SUP-{t:03d}", "sku": f"SKU-{t:04d}", "qty": 10}
+        return conn.execute(kinds[i % 2], payload).ok
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        ok = sum(pool.map(one, range(actions)))
+    elapsed = time.perf_counter() - t0
+    return {
+        "window_ms": window_ms,
+        "actions": actions,
+        "ok": ok,
+        "backend_calls": backend.calls,
+        "calls_saved": actions - backend.calls,
+        "elapsed_s": round(elapsed, 3),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Measure ERP calls saved by request coalescing")
+    ap.add_argument("--actions", type=int, default=500)
+    ap.add_argument("--targets", type=int, default=10, help="distinct supplier/SKU targets")
+    ap.add_argument("--window-ms", type=float, default=20.0)
+    ap.add_argument("--threads", type=int, default=32)
+    ap.add_argument("--latency-ms", type=float, default=5.0, help="simulated backend latency per call")
+    args = ap.parse_args()
+
+    for window in (0.0, args.window_ms):
+        r = run(args.actions, args.targets, window, args.threads, args.latency_ms)
+        print(
+            f"[bench_coalesce] window_ms={r['window_ms']:g} actions={r['actions']} ok={r['ok']} "
+            f"backend_calls={r['backend_calls']} calls_saved={r['calls_saved']} elapsed_s={r['elapsed_s']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
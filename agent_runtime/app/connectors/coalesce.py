@@ -0,0 +1,125 @@
+"""Request coalescing for connector write-backs.
+
+Many cases tend to recommend the same TriggerPurchase / ExpediteShipment for
+the same supplier or SKU at about the same time. Instead of one ERP call per
+action, calls for the same (action_type, target key) are held for up to
+`window_ms` and sent as one execute_batch() call; each caller still gets its
+own ExecutionResult (and so its own agent_actions row).
+
+The first caller of a group is the leader: it waits for the window (or until
+`max_batch` items joined), flushes, and wakes the others. If the bulk call
+raises, every caller in the group sees that exception.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .erp import ExecutionResult
+
+# Payload fields that identify the ERP object an action targets.
+DEFAULT_KEY_FIELDS: Tuple[str, ...] = ("supplier_id", "sku", "resource_id", "shipment_id")
+
+Item = Tuple[str, Dict[str, Any]]
+
+
+class _Group:
+    def __init__(self) -> None:
+        self.items: List[Item] = []
+        self.results: List[ExecutionResult] = []
+        self.error: Optional[BaseException] = None
+        self.full = threading.Event()
+        self.done = threading.Event()
+
+
+class Coalescer:
+    def __init__(
+        self,
+        flush: Callable[[List[Item]], List[ExecutionResult]],
+        *,
+        window_ms: float,
+        max_batch: int = 50,
+        action_types: Iterable[str] = (),
+        key_fields: Iterable[str] = DEFAULT_KEY_FIELDS,
+    ):
+        self._flush = flush
+        self.window = max(0.0, float(window_ms)) / 1000.0
+        self.max_batch = max(1, int(max_batch))
+        self.action_types = {a.strip() for a in action_types if a and a.strip()}
+        self.key_fields = tuple(key_fields)
+        self._open: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], _Group] = {}
+        self._lock = threading.Lock()
+        self.stats = {"items": 0, "calls": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0 and self.max_batch > 1 and bool(self.action_types)
+
+    def target_key(self, action_type: str, payload: Dict[str, Any]) -> Optional[Tuple[Tuple[str, str], ...]]:
+        """(field, value) pairs of the target fields present, or None if not coalescable."""
+        if not self.enabled or action_type not in self.action_types:
+            return None
+        key = tuple((f, str(payload[f])) for f in self.key_fields if payload.get(f) not in (None, ""))
+        return key or None
+
+    def submit(self, action_type: str, payload: Dict[str, Any]) -> ExecutionResult:
+        """Execute one action as part of the open group for its target (callers check target_key first)."""
+        key = (action_type, self.target_key(action_type, payload) or ())
+        with self._lock:
+            group = self._open.get(key)
+            leader = group is None
+            if leader:
+                group = _Group()
+                self._open[key] = group
+            idx = len(group.items)
+            group.items.append((action_type, payload))
+            if len(group.items) >= self.max_batch:
+                # Full: later callers start a new group.
+                self._open.pop(key, None)
+                group.full.set()
+
+        if leader:
+            group.full.wait(self.window)
+            with self._lock:
+                if self._open.get(key) is group:
+                    del self._open[key]
+            self._run(group)
+        else:
+            group.done.wait()
+
+        if group.error is not None:
+            raise group.error
+        return group.results[idx]
+
+    def _run(self, group: _Group) -> None:
+        n = len(group.items)
+        try:
+            results = self._flush(list(group.items))
+            if len(results) != n:
+                raise RuntimeError(f"connector returned {len(results)} results for {n} items")
+            if n > 1:
+                results = [
+                    ExecutionResult(ok=r.ok, message=r.message, data={**(r.data or {}), "coalesced": n})
+                    for r in results
+                ]
+            group.results = results
+        except Exception as e:
+            group.error = e
+        finally:
+            with self._lock:
+                self.stats["items"] += n
+                self.stats["calls"] += 1
+            group.done.set()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            items, calls = self.stats["items"], self.stats["calls"]
+        return {
+            "window_ms": round(self.window * 1000, 1),
+            "max_batch": self.max_batch,
+            "action_types": sorted(self.action_types),
+            "items": items,
+            "calls": calls,
+            "calls_saved": items - calls,
+        }
@@ -15,7 +15,7 @@ In production you would implement:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 from ..config import ERP_CONNECTOR, ERP_BASE_URL
 
@@ -33,29 +33,36 @@ class ERPConnector:
     def execute(self, action_type: str, payload: Dict[str, Any]) -> ExecutionResult:
         raise NotImplementedError
 
+    def execute_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[ExecutionResult]:
+        """Execute (action_type, payload) items; results are aligned with items.
+
+        Connectors backed by a bulk API should override this to make one call.
+        """
+        return [self.execute(action_type, payload) for action_type, payload in items]
+
 
 class MockERPConnector(ERPConnector):
     name = "mock"
 
-    def execute(self, action_type: str, payload: Dict[str, Any]) -> ExecutionResult:
-        # Simulate a write-back without external dependencies.
-        # This is where you'd call SAP/Oracle/etc.
+    @staticmethod
+    def _result(action_type: str, payload: Dict[str, Any]) -> ExecutionResult:
         return ExecutionResult(
             ok=True,
             message=f"mock-executed {action_type}",
             data={"action_type": action_type, "payload": payload},
         )
 
+    def execute(self, action_type: str, payload: Dict[str, Any]) -> ExecutionResult:
+        # Simulate a write-back without external dependencies.
+        # This is where you'd call SAP/Oracle/etc.
+        return self._result(action_type, payload)
 
-def get_erp_connector() -> ERPConnector:
-    # Simple registry: extend as real connectors are added.
-    if ERP_CONNECTOR.lower() == "mock":
-        return MockERPConnector()
-    # Unknown connector -> fail closed
-    return _FailClosedConnector(ERP_CONNECTOR)
+    def execute_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[ExecutionResult]:
+        # Stands in for a bulk write-back endpoint: one "call" for all items.
+        return [self._result(action_type, payload) for action_type, payload in items]
 
 
-class _FailClosedConnector(ERPConnector):
+class FailClosedConnector(ERPConnector):
     def __init__(self, name: str):
         self.name = name
 
@@ -64,7 +71,15 @@ class _FailClosedConnector(ERPConnector):
             ok=False,
             message=(
                 f"ERP_CONNECTOR='{self.name}' not implemented. "
-                "Set ERP_CONNECTOR=mock or implement a real connector."
+                "Set ERP_CONNECTOR=mock, ERP_CONNECTOR=http (with ERP_BASE_URL) or implement a real connector."
             ),
             data={"action_type": action_type, "payload": payload, "base_url": ERP_BASE_URL},
         )
+
+
+def get_erp_connector() -> ERPConnector:
+    # Singleton per connector name, wrapped with rate limit / circuit breaker /
+    # bounded concurrency (see registry.py). Unknown names fail closed.
+    from .registry import get_connector
+
+    return get_connector(ERP_CONNECTOR)
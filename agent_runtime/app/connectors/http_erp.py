@@ -0,0 +1,74 @@
+"""Generic HTTP/JSON ERP connector over a pooled keep-alive session.
+
+Wire contract (implemented by stub_erp.py for local runs and tests):
+
+  POST {ERP_BASE_URL}/actions/{action_type}   body: payload
+    -> {"ok": bool, "message": str, "data": {...}}
+  POST {ERP_BASE_URL}/actions/_bulk           body: {"items": [{"action_type", "payload"}, ...]}
+    -> {"results": [{"ok", "message", "data"}, ...]}   (aligned with items)
+
+5xx responses and transport errors raise (they count against the circuit
+breaker and are retried by the executor); 4xx responses are business
+rejections and come back as ok=False results.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .erp import ERPConnector, ExecutionResult
+
+
+class HttpERPConnector(ERPConnector):
+    name = "http"
+
+    def __init__(self, base_url: str, *, api_key: str = "", timeout: float = 10.0, pool_size: int = 16):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = float(timeout)
+        self.session = requests.Session()
+        # One keep-alive pool shared by every thread using this connector.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, int(pool_size)), max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Content-Type"] = "application/json"
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+    def _post(self, path: str, body: Any) -> Tuple[int, Dict[str, Any]]:
+        r = self.session.post(f"{self.base_url}{path}", json=body, timeout=self.timeout)
+        if r.status_code >= 500:
+            r.raise_for_status()
+        try:
+            data = r.json() if r.content else {}
+        except ValueError:
+            data = {"raw": r.text[:500]}
+        return r.status_code, data if isinstance(data, dict) else {"data": data}
+
+    @staticmethod
+    def _result(status: int, body: Dict[str, Any], action_type: str) -> ExecutionResult:
+        if status >= 400:
+            return ExecutionResult(ok=False, message=str(body.get("message") or f"rejected: HTTP {status}"), data=body)
+        return ExecutionResult(
+            ok=bool(body.get("ok", True)),
+            message=str(body.get("message") or f"http-executed {action_type}"),
+            data=body.get("data") if isinstance(body.get("data"), dict) else body,
+        )
+
+    def execute(self, action_type: str, payload: Dict[str, Any]) -> ExecutionResult:
+        status, body = self._post(f"/actions/{action_type}", payload)
+        return self._result(status, body, action_type)
+
+    def execute_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[ExecutionResult]:
+        status, body = self._post(
+            "/actions/_bulk",
+            {"items": [{"action_type": at, "payload": p} for at, p in items]},
+        )
+        if status >= 400:
+            return [self._result(status, body, at) for at, _p in items]
+        results = body.get("results") or []
+        if len(results) != len(items):
+            raise RuntimeError(f"bulk response has {len(results)} results for {len(items)} items")
+        return [self._result(200, r if isinstance(r, dict) else {}, at) for (at, _p), r in zip(items, results)]
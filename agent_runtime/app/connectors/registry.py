@@ -0,0 +1,189 @@
+"""Connector registry: one long-lived, protected instance per connector name.
+
+get_connector(name) builds the backend connector once (so HTTP connectors keep
+their keep-alive pool) and wraps it in ManagedConnector, which applies a token
+bucket rate limit, bounded concurrency and a circuit breaker, and (when
+CONNECTOR_COALESCE_WINDOW_MS > 0 and the backend has a bulk call) coalesces
+same-target actions into one execute_batch() call (see coalesce.py).
+
+Settings come from the environment, per connector first and then global:
+CONNECTOR_<NAME>_<KEY> (e.g. CONNECTOR_HTTP_RATE_PER_SEC), then CONNECTOR_<KEY>.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from ..config import ERP_API_KEY, ERP_BASE_URL
+from .coalesce import Coalescer
+from .erp import ERPConnector, ExecutionResult, FailClosedConnector, MockERPConnector
+from .resilience import CircuitBreaker, ConnectorUnavailable, TokenBucket
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    "rate_per_sec": 50.0,
+    "burst": 100,
+    "max_concurrency": 16,
+    "acquire_timeout": 2.0,
+    "timeout_seconds": 10.0,
+    "cb_window": 50,
+    "cb_min_calls": 10,
+    "cb_failure_rate": 0.5,
+    "cb_slow_call_ms": 5000.0,
+    "cb_slow_call_rate": 0.8,
+    "cb_open_seconds": 30.0,
+    "coalesce_window_ms": 0.0,
+    "coalesce_max_batch": 50,
+    "coalesce_action_types": "TriggerPurchase,ExpediteShipment",
+}
+
+
+def connector_settings(name: str) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    prefix = "CONNECTOR_" + "".join(c if c.isalnum() else "_" for c in name.upper())
+    for key, default in DEFAULT_SETTINGS.items():
+        raw = os.getenv(f"{prefix}_{key.upper()}") or os.getenv(f"CONNECTOR_{key.upper()}")
+        out[key] = type(default)(raw) if raw not in (None, "") else default
+    return out
+
+
+class ManagedConnector(ERPConnector):
+    """Wraps a backend connector with rate limit, concurrency bound and circuit breaker.
+
+    Calls that are refused raise ConnectorUnavailable; backend exceptions are
+    re-raised after being recorded. Both count as retryable for the executor.
+    """
+
+    def __init__(self, inner: ERPConnector, settings: Dict[str, Any]):
+        self.inner = inner
+        self.name = inner.name
+        self.settings = dict(settings)
+        self.limiter = TokenBucket(settings["rate_per_sec"], int(settings["burst"]))
+        self.breaker = CircuitBreaker(
+            window=int(settings["cb_window"]),
+            min_calls=int(settings["cb_min_calls"]),
+            failure_rate=settings["cb_failure_rate"],
+            slow_call_ms=settings["cb_slow_call_ms"],
+            slow_call_rate=settings["cb_slow_call_rate"],
+            open_seconds=settings["cb_open_seconds"],
+        )
+        self.max_concurrency = max(1, int(settings["max_concurrency"]))
+        self._sem = threading.BoundedSemaphore(self.max_concurrency)
+        self._in_flight = 0
+        self._count_lock = threading.Lock()
+        self.coalescer = Coalescer(
+            self.execute_batch,
+            window_ms=settings["coalesce_window_ms"] if self.has_bulk else 0,
+            max_batch=int(settings["coalesce_max_batch"]),
+            action_types=str(settings["coalesce_action_types"]).split(","),
+        )
+
+    @property
+    def has_bulk(self) -> bool:
+        return type(self.inner).execute_batch is not ERPConnector.execute_batch
+
+    def _call(self, fn: Callable[[], Any]) -> Any:
+        timeout = float(self.settings["acquire_timeout"])
+        if not self.limiter.acquire(timeout):
+            raise ConnectorUnavailable(f"rate limit exceeded for connector '{self.name}'")
+        if not self._sem.acquire(timeout=timeout):
+            raise ConnectorUnavailable(f"too many concurrent calls to connector '{self.name}'")
+        try:
+            if not self.breaker.allow():
+                raise ConnectorUnavailable(f"circuit open for connector '{self.name}'")
+            with self._count_lock:
+                self._in_flight += 1
+            t0 = time.monotonic()
+            try:
+                res = fn()
+            except Exception:
+                self.breaker.record(False, (time.monotonic() - t0) * 1000)
+                raise
+            finally:
+                with self._count_lock:
+                    self._in_flight -= 1
+            self.breaker.record(True, (time.monotonic() - t0) * 1000)
+            return res
+        finally:
+            self._sem.release()
+
+    def execute(self, action_type: str, payload: Dict[str, Any]) -> ExecutionResult:
+        if self.coalescer.target_key(action_type, payload) is not None:
+            return self.coalescer.submit(action_type, payload)
+        return self._call(lambda: self.inner.execute(action_type, payload))
+
+    def execute_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[ExecutionResult]:
+        if self.has_bulk:
+            # Real bulk endpoint: one backend call for the whole batch.
+            return self._call(lambda: self.inner.execute_batch(items))
+        out: List[ExecutionResult] = []
+        for action_type, payload in items:
+            try:
+                out.append(self.execute(action_type, payload))
+            except Exception as e:
+                out.append(ExecutionResult(ok=False, message=f"connector error: {e}"))
+        return out
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "connector": self.name,
+            "breaker": self.breaker.snapshot(),
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            "rate_per_sec": self.limiter.rate,
+            "coalescing": self.coalescer.snapshot() if self.coalescer.enabled else None,
+        }
+
+
+_instances: Dict[str, ManagedConnector] = {}
+_lock = threading.Lock()
+
+
+def build_connector(name: str, settings: Dict[str, Any]) -> ERPConnector:
+    key = (name or "").strip().lower()
+    if key == "mock":
+        return MockERPConnector()
+    if key == "http" and ERP_BASE_URL:
+        from .http_erp import HttpERPConnector
+
+        return HttpERPConnector(
+            ERP_BASE_URL,
+            api_key=ERP_API_KEY,
+            timeout=settings["timeout_seconds"],
+            pool_size=int(settings["max_concurrency"]),
+        )
+    # Unknown connector (or http without a base URL) -> fail closed
+    return FailClosedConnector(name)
+
+
+def get_connector(name: str) -> ManagedConnector:
+    key = (name or "").strip().lower()
+    inst = _instances.get(key)
+    if inst is not None:
+        return inst
+    with _lock:
+        inst = _instances.get(key)
+        if inst is None:
+            settings = connector_settings(key)
+            inst = ManagedConnector(build_connector(name, settings), settings)
+            _instances[key] = inst
+        return inst
+
+
+def register_connector(connector: ERPConnector, settings: Dict[str, Any] | None = None) -> ManagedConnector:
+    """Install a connector instance under its name (tests, custom backends)."""
+    inst = ManagedConnector(connector, settings or connector_settings(connector.name))
+    with _lock:
+        _instances[connector.name.lower()] = inst
+    return inst
+
+
+def connector_status() -> Dict[str, Dict[str, Any]]:
+    return {name: inst.status() for name, inst in list(_instances.items())}
+
+
+def reset_connectors() -> None:
+    with _lock:
+        _instances.clear()
@@ -0,0 +1,142 @@
+"""Protection primitives wrapped around every connector (see registry.py).
+
+- TokenBucket: per-connector request rate limit (rate/s with a burst)
+- CircuitBreaker: opens when the recent error rate or slow-call rate crosses a
+  threshold, fails fast while open, and lets a single probe through after
+  `open_seconds` (half-open) to decide whether to close again
+- bounded concurrency: a semaphore in ManagedConnector
+
+All are thread-safe; API workers and executor threads share one instance per
+connector.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+
+class ConnectorUnavailable(RuntimeError):
+    """Raised instead of calling the backend (breaker open, rate/concurrency limit)."""
+
+
+class TokenBucket:
+    def __init__(self, rate_per_sec: float, burst: int):
+        self.rate = max(0.0, float(rate_per_sec))
+        self.capacity = max(1, int(burst))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token. Returns 0.0 on success, else seconds until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            if self.rate <= 0:
+                return float("inf")
+            return (1.0 - self._tokens) / self.rate
+
+    def acquire(self, timeout: float) -> bool:
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            wait = self.try_acquire()
+            if wait == 0.0:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        *,
+        window: int = 50,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        slow_call_ms: float = 5000.0,
+        slow_call_rate: float = 0.8,
+        open_seconds: float = 30.0,
+    ):
+        self.window = max(1, int(window))
+        self.min_calls = max(1, int(min_calls))
+        self.failure_rate = float(failure_rate)
+        self.slow_call_ms = float(slow_call_ms)
+        self.slow_call_rate = float(slow_call_rate)
+        self.open_seconds = float(open_seconds)
+
+        self._calls: Deque[Tuple[bool, bool]] = deque(maxlen=self.window)  # (failed, slow)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record(self, ok: bool, latency_ms: float) -> None:
+        slow = latency_ms >= self.slow_call_ms
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                if ok and not slow:
+                    self._state = self.CLOSED
+                    self._calls.clear()
+                else:
+                    self._trip()
+                return
+            self._calls.append((not ok, slow))
+            if len(self._calls) < self.min_calls:
+                return
+            n = len(self._calls)
+            failures = sum(1 for f, _ in self._calls if f)
+            slows = sum(1 for _, s in self._calls if s)
+            if failures / n >= self.failure_rate or slows / n >= self.slow_call_rate:
+                self._trip()
+
+    def _trip(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            n = len(self._calls)
+            failures = sum(1 for f, _ in self._calls if f)
+            slows = sum(1 for _, s in self._calls if s)
+        return {
+            "state": self.state,
+            "calls": n,
+            "failure_rate": round(failures / n, 3) if n else 0.0,
+            "slow_call_rate": round(slows / n, 3) if n else 0.0,
+        }
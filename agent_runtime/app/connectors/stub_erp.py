@@ -0,0 +1,115 @@
+"""Local stub ERP server speaking the HttpERPConnector wire contract.
+
+For tests and local runs without a real ERP:
+
+    python -m app.connectors.stub_erp --port 8089 [--delay-ms 200] [--fail-status 503]
+    ERP_CONNECTOR=http ERP_BASE_URL=http://localhost:8089 ...
+
+Behaviour can be changed at runtime through the server object (tests) via
+`delay_ms`, `fail_status` and `reject_action_types`; `calls` counts requests.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Set, Tuple
+
+
+class StubERPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr: Tuple[str, int]):
+        super().__init__(addr, _Handler)
+        self.delay_ms = 0
+        self.fail_status = 0
+        self.reject_action_types: Set[str] = set()
+        self.calls = 0
+        self.items = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def result_for(self, action_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if action_type in self.reject_action_types:
+            return {"ok": False, "message": f"stub-rejected {action_type}", "data": {}}
+        return {
+            "ok": True,
+            "message": f"stub-executed {action_type}",
+            "data": {"erp_ref": uuid.uuid4().hex[:12], "action_type": action_type},
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StubERPServer
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_POST(self) -> None:
+        n = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(n) or b"{}")
+        srv = self.server
+        with srv._lock:
+            srv.calls += 1
+        if srv.delay_ms:
+            time.sleep(srv.delay_ms / 1000.0)
+        if srv.fail_status:
+            self._send(srv.fail_status, {"ok": False, "message": f"stub failure {srv.fail_status}"})
+            return
+
+        path = self.path.rstrip("/")
+        if path == "/actions/_bulk":
+            items = body.get("items") or []
+            with srv._lock:
+                srv.items += len(items)
+            self._send(200, {"results": [srv.result_for(str(i.get("action_type")), i.get("payload") or {}) for i in items]})
+            return
+        if path.startswith("/actions/"):
+            with srv._lock:
+                srv.items += 1
+            self._send(200, srv.result_for(path[len("/actions/"):], body))
+            return
+        self._send(404, {"ok": False, "message": f"unknown path {self.path}"})
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0) -> StubERPServer:
+    """Start a stub server on a background thread (port 0 = pick a free port)."""
+    srv = StubERPServer((host, port))
+    threading.Thread(target=srv.serve_forever, name="stub-erp", daemon=True).start()
+    return srv
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Stub ERP server for HttpERPConnector")
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--delay-ms", type=int, default=0)
+    ap.add_argument("--fail-status", type=int, default=0)
+    args = ap.parse_args()
+
+    srv = StubERPServer((args.host, args.port))
+    srv.delay_ms = args.delay_ms
+    srv.fail_status = args.fail_status
+    print(f"[stub_erp] listening on {srv.base_url}")
+    srv.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -32,6 +32,35 @@ def one(sql: str, **params):
 def all(sql: str, **params):
     return [dict(x._mapping) for x in q(sql, **params).fetchall()]
 
+def stream(sql: str, chunk_size: int = 1000, **params):
+    """Yield rows (as dicts) via a server-side cursor, chunk_size rows per fetch.
+
+    Memory stays bounded by chunk_size regardless of result size. The
+    connection is held until the generator is exhausted or closed.
+    """
+    _ensure_engine()
+    assert _engine is not None and _text is not None
+    with _engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(_text(sql), params)
+        try:
+            for part in result.partitions(chunk_size):
+                for x in part:
+                    yield dict(x._mapping)
+        finally:
+            result.close()
+
+
+def listen_connection():
+    """Dedicated autocommit DBAPI connection for LISTEN (not returned to the pool)."""
+    _ensure_engine()
+    assert _engine is not None
+    fairy = _engine.raw_connection()
+    fairy.detach()
+    conn = fairy.dbapi_connection
+    conn.autocommit = True  # notifications are only delivered outside a transaction
+    return conn
+
+
 def wait_for_db(max_seconds: int = 60, sleep_seconds: float = 2.0) -> None:
     """Block until DB is reachable, or raise after max_seconds."""
     deadline = time.time() + max_seconds
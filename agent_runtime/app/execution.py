@@ -4,7 +4,8 @@ This module is the single place where the system "changes the world".
 It:
 1) validates guardrails (demo version)
 2) records an auditable action row
-3) calls the connector
+3) calls the connector (or, with ACTION_EXECUTION_MODE=async, queues an
+   action_jobs row for app/jobs/executor.py)
 4) writes back the result
 
 In a Foundry-like system, this is the boundary between ontology & operational systems.
@@ -13,12 +14,16 @@ In a Foundry-like system, this is the boundary between ontology & operational sy
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, Tuple
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
-from .db import q, one
-from .connectors.erp import get_erp_connector
+from . import config
+from .change_feed import publish_many
+from .db import all, q
+from .connectors.erp import ExecutionResult, get_erp_connector
 from .policy_store import load_policy
 from .audit import with_audit
+from .object_cache import MISS, cache_get, cache_pop, cache_put
 
 
 # --- Card status policy ---
@@ -41,11 +46,27 @@ def _resolve_gate() -> dict:
 
 
 
-def _guardrails(case_id: str, channel: str, action_type: str, payload: Dict[str, Any]) -> Tuple[bool, str]:
+# Sentinel for _guardrails(card=..., case=...): "not preloaded, query it".
+_NOT_LOADED: Any = object()
+
+
+def _guardrails(
+    case_id: str,
+    channel: str,
+    action_type: str,
+    payload: Dict[str, Any],
+    *,
+    card: Any = _NOT_LOADED,
+    case: Any = _NOT_LOADED,
+) -> Tuple[bool, str]:
     """Return (passed, message).
 
     Guardrails are intentionally explicit and conservative. They should be
     *business* rules, not just type checks.
+
+    Callers pass the kanban_cards / agent_cases rows they already loaded
+    (None = not found) to skip the lookups; otherwise get_card()/get_case()
+    use the request cache.
     """
     # Generic demo guardrails
     qty = payload.get("qty")
@@ -66,10 +87,8 @@ def _guardrails(case_id: str, channel: str, action_type: str, payload: Dict[str,
         if new_status not in ("todo", "in_progress", "blocked", "resolved"):
             return False, "blocked: payload.new_status must be one of todo|in_progress|blocked|resolved"
 
-        card = one(
-            "SELECT card_id, case_id, status FROM kanban_cards WHERE card_id=:id",
-            id=str(card_id),
-        )
+        if card is _NOT_LOADED:
+            card = get_card(card_id)
         if not card:
             return False, f"blocked: card not found: {card_id}"
 
@@ -102,10 +121,8 @@ def _guardrails(case_id: str, channel: str, action_type: str, payload: Dict[str,
 
             if bool(gate.get("require_high_risk_case", False)):
                 threshold = int(gate.get("high_risk_threshold", 0) or 0)
-                case = one(
-                    "SELECT risk_score FROM agent_cases WHERE case_id=:cid",
-                    cid=str(case_id),
-                )
+                if case is _NOT_LOADED:
+                    case = get_case(case_id)
                 if not case:
                     return False, "blocked: case not found"
                 if int(case.get("risk_score") or 0) < threshold:
@@ -114,16 +131,7 @@ def _guardrails(case_id: str, channel: str, action_type: str, payload: Dict[str,
     return True, "ok"
 
 
-def execute_action(
-    *,
-    case_id: str,
-    channel: str,
-    action_type: str,
-    payload: Dict[str, Any],
-    dry_run: bool = False,
-) -> dict:
-    """Execute an action and persist an audit record."""
-
+def _with_internal_audit(payload: Dict[str, Any]) -> Dict[str, Any]:
     payload = dict(payload or {})
     # Ensure a normalized audit envelope exists on every audit row.
     if "_audit" not in payload:
@@ -135,25 +143,250 @@ def execute_action(
             request_method="",
             materialization_id=str(payload.get("materialization_id") or payload.get("materialization_id")) if payload.get("materialization_id") is not None else None,
         )
+    return payload
 
-    passed, msg = _guardrails(case_id, channel, action_type, payload)
 
-    if dry_run:
-        if not passed:
-            return {"ok": False, "dry_run": True, "blocked": True, "message": msg}
-        # Do not write audit / do not call connectors / do not mutate DB.
-        preview: dict = {"ok": True, "dry_run": True, "message": "ok (dry_run)"}
-        if action_type == "UpdateCardStatus":
-            preview["would_execute"] = {
-                "connector": "local_db",
-                "update": {"card_id": str(payload.get("card_id")), "new_status": str(payload.get("new_status"))},
-            }
-        else:
-            preview["would_execute"] = {
-                "connector": get_erp_connector().name,
+def _dry_run_preview(action_type: str, payload: Dict[str, Any], passed: bool, msg: str) -> dict:
+    if not passed:
+        return {"ok": False, "dry_run": True, "blocked": True, "message": msg}
+    # Do not write audit / do not call connectors / do not mutate DB.
+    preview: dict = {"ok": True, "dry_run": True, "message": "ok (dry_run)"}
+    if action_type == "UpdateCardStatus":
+        preview["would_execute"] = {
+            "connector": "local_db",
+            "update": {"card_id": str(payload.get("card_id")), "new_status": str(payload.get("new_status"))},
+        }
+    else:
+        connector = get_erp_connector()
+        preview["would_execute"] = {
+            "connector": connector.name,
+            "action_type": action_type,
+        }
+        preview["connector_state"] = connector_state(connector)
+    return preview
+
+
+def _update_card_status(case_id: str, channel: str, payload: Dict[str, Any], *, expected: str) -> dict:
+    """Compare-and-set the card status and write the audit row in one statement.
+
+    The UPDATE only matches while the card is still in `expected` (the status
+    the guardrails validated) and the transition is allowed from it. If another
+    writer moved the card in between, nothing is updated, the audit row records
+    the conflict and the result has conflict=True.
+    """
+    card_id = str(payload.get("card_id"))
+    new_status = str(payload.get("new_status"))
+    blocked_reason = payload.get("blocked_reason")
+    resolved_at = payload.get("resolved_at")
+    ok_msg = f"card status updated -> {new_status}"
+    conflict_msg = f"conflict: card {card_id} is no longer '{expected}' (concurrent update); re-read and retry"
+
+    row = q(
+        """
+        WITH u AS (
+          UPDATE kanban_cards
+          SET status=:st,
+              blocked_reason=CASE WHEN :st='blocked' THEN :br ELSE NULL END,
+              resolved_at=CASE WHEN :st='resolved' THEN CAST(:ra AS TIMESTAMPTZ) ELSE NULL END,
+              last_activity_at=now(),
+              updated_at=now()
+          WHERE card_id=:id
+            AND status=:expected
+            AND (:st = :expected OR :st = ANY(CAST(:allowed AS TEXT[])))
+          RETURNING card_id, status, blocked_reason, resolved_at
+        ),
+        a AS (
+          INSERT INTO agent_actions(case_id, channel, action_type, payload, result)
+          VALUES(
+            :cid, :ch, 'UpdateCardStatus', CAST(:pl AS JSONB),
+            CASE WHEN EXISTS (SELECT 1 FROM u) THEN :ok_res ELSE :conflict_res END
+          )
+          RETURNING action_id
+        )
+        SELECT a.action_id, u.card_id, u.status, u.blocked_reason, u.resolved_at
+        FROM a LEFT JOIN u ON true
+        """,
+        st=new_status,
+        br=blocked_reason,
+        ra=resolved_at,
+        id=card_id,
+        expected=expected,
+        allowed=list(_allowed_transitions().get(expected, []) or []),
+        cid=case_id,
+        ch=channel,
+        pl=json.dumps(payload),
+        ok_res=f"ok: {ok_msg}",
+        conflict_res=conflict_msg,
+    ).fetchone()
+
+    if row[1] is None:
+        _forget_card(card_id)  # the next read must see the new status
+        return {
+            "ok": False,
+            "conflict": True,
+            "message": conflict_msg,
+            "action_id": str(row[0]),
+            "connector": "local_db",
+            "data": {"card_id": card_id, "expected_status": expected},
+        }
+
+    _remember_card_status(card_id, str(row[2]))
+    return {
+        "ok": True,
+        "message": ok_msg,
+        "action_id": str(row[0]),
+        "connector": "local_db",
+        "data": {
+            "card_id": str(row[1]),
+            "status": str(row[2]),
+            "blocked_reason": row[3],
+            "resolved_at": str(row[4]) if row[4] else None,
+        },
+    }
+
+
+def connector_state(connector: Any) -> Optional[Dict[str, Any]]:
+    """Breaker / limiter snapshot for registry-managed connectors (None otherwise)."""
+    status = getattr(connector, "status", None)
+    return status() if callable(status) else None
+
+
+def is_async_mode() -> bool:
+    return config.ACTION_EXECUTION_MODE == "async"
+
+
+def _insert_actions(
+    audit_rows: List[Dict[str, Any]],
+    jobs: List[Dict[str, Any]],
+    cards: Sequence[Dict[str, Any]] = (),
+) -> Set[str]:
+    """Write audit rows, their queued connector jobs and card status changes in one statement.
+
+    action_jobs.action_created_at is taken from the inserted agent_actions row
+    so workers can address the (partitioned) row for write-back.
+
+    `cards` are compare-and-set updates ({card_id, expected, st, br, ra}); an
+    audit row carrying `card_id` records its `conflict` result instead of
+    `result` when that card was no longer in `expected`. Returns the ids of
+    the cards that were updated.
+    """
+    res = q(
+        """
+        WITH u AS (
+          UPDATE kanban_cards k
+          SET status=v.st,
+              blocked_reason=CASE WHEN v.st='blocked' THEN v.br ELSE NULL END,
+              resolved_at=CASE WHEN v.st='resolved' THEN v.ra ELSE NULL END,
+              last_activity_at=now(),
+              updated_at=now()
+          FROM jsonb_to_recordset(CAST(:cards AS JSONB))
+            AS v(card_id UUID, expected TEXT, st TEXT, br TEXT, ra TIMESTAMPTZ)
+          WHERE k.card_id = v.card_id AND k.status = v.expected
+          RETURNING k.card_id
+        ),
+        a AS (
+          INSERT INTO agent_actions(action_id, case_id, channel, action_type, payload, result)
+          SELECT r.action_id, r.case_id, r.channel, r.action_type, r.payload,
+                 CASE WHEN r.card_id IS NULL OR r.card_id IN (SELECT card_id FROM u)
+                      THEN r.result ELSE r.conflict END
+          FROM jsonb_to_recordset(CAST(:rows AS JSONB))
+            AS r(action_id UUID, case_id UUID, channel TEXT, action_type TEXT, payload JSONB, result TEXT,
+                 card_id UUID, conflict TEXT)
+          RETURNING action_id, created_at
+        ),
+        j AS (
+          INSERT INTO action_jobs(action_id, action_created_at, case_id, pending_id, channel, action_type, payload, max_attempts)
+          SELECT j.action_id, a.created_at, j.case_id, j.pending_id, j.channel, j.action_type, j.payload, :ma
+          FROM jsonb_to_recordset(CAST(:jobs AS JSONB))
+            AS j(action_id UUID, case_id UUID, pending_id UUID, channel TEXT, action_type TEXT, payload JSONB)
+          JOIN a ON a.action_id = j.action_id
+        )
+        SELECT card_id FROM u
+        """,
+        rows=json.dumps(audit_rows, default=str),
+        jobs=json.dumps(jobs, default=str),
+        cards=json.dumps(list(cards), default=str),
+        ma=int(config.EXECUTOR_MAX_ATTEMPTS),
+    )
+    return {str(r[0]) for r in res.fetchall()} if cards else set()
+
+
+def _queued_result(action_id: str, connector_name: str) -> dict:
+    return {
+        "ok": True,
+        "queued": True,
+        "status": "queued",
+        "message": f"queued for {connector_name}",
+        "action_id": action_id,
+        "connector": connector_name,
+    }
+
+
+def _change_events(case_id: Any, action_type: str, res: dict) -> List[Tuple[str, Any, str, Dict[str, Any]]]:
+    """Change-feed events for one executed (non dry-run) action result."""
+    if not res.get("action_id"):
+        return []
+    if res.get("queued"):
+        status = "queued"
+    elif res.get("blocked"):
+        status = "blocked"
+    elif res.get("conflict"):
+        status = "conflict"
+    else:
+        status = "done" if res.get("ok") else "failed"
+    events: List[Tuple[str, Any, str, Dict[str, Any]]] = [
+        (
+            "action",
+            res["action_id"],
+            "created",
+            {
+                "case_id": str(case_id),
                 "action_type": action_type,
-            }
-        return preview
+                "ok": bool(res.get("ok")),
+                "status": status,
+            },
+        )
+    ]
+    data = res.get("data") or {}
+    if action_type == "UpdateCardStatus" and res.get("ok") and data.get("card_id"):
+        events.append(("card", data["card_id"], "updated", {"case_id": str(case_id), "status": data.get("status")}))
+    return events
+
+
+def _published(case_id: Any, action_type: str, res: dict) -> dict:
+    publish_many(_change_events(case_id, action_type, res))
+    return res
+
+
+def execute_action(
+    *,
+    case_id: str,
+    channel: str,
+    action_type: str,
+    payload: Dict[str, Any],
+    dry_run: bool = False,
+    pending_id: Optional[str] = None,
+    card: Any = _NOT_LOADED,
+    case: Any = _NOT_LOADED,
+) -> dict:
+    """Execute an action and persist an audit record.
+
+    In async mode external connector actions are queued instead of executed;
+    the result has queued=True and the action_id to poll (GET /actions/{id}).
+    `pending_id` lets the executor write the outcome back to pending_actions.
+    `card` / `case` are rows the caller already holds (see _guardrails).
+    """
+
+    payload = _with_internal_audit(payload)
+
+    if action_type == "UpdateCardStatus" and card is _NOT_LOADED and payload.get("card_id"):
+        # Loaded here (not inside _guardrails) so the update can compare-and-set on it.
+        card = get_card(payload.get("card_id"))
+
+    passed, msg = _guardrails(case_id, channel, action_type, payload, card=card, case=case)
+
+    if dry_run:
+        return _dry_run_preview(action_type, payload, passed, msg)
 
     if not passed:
         row = q(
@@ -168,62 +401,30 @@ def execute_action(
             pl=json.dumps(payload),
             res=msg,
         ).fetchone()
-        return {"ok": False, "blocked": True, "message": msg, "action_id": str(row[0])}
+        return _published(case_id, action_type, {"ok": False, "blocked": True, "message": msg, "action_id": str(row[0])})
 
     
     # Local (in-DB) Kinetic actions
     if action_type == "UpdateCardStatus":
-        card_id = str(payload.get("card_id"))
-        new_status = str(payload.get("new_status"))
-        blocked_reason = payload.get("blocked_reason")
-        resolved_at = payload.get("resolved_at")
-
-        # Perform update
-        upd = q(
-            """
-            UPDATE kanban_cards
-            SET status=:st,
-                blocked_reason=CASE WHEN :st='blocked' THEN :br ELSE NULL END,
-                resolved_at=CASE WHEN :st='resolved' THEN CAST(:ra AS TIMESTAMPTZ) ELSE NULL END,
-                last_activity_at=now(),
-                updated_at=now()
-            WHERE card_id=:id
-            RETURNING card_id, status, blocked_reason, resolved_at
-            """,
-            st=new_status,
-            br=blocked_reason,
-            ra=resolved_at,
-            id=card_id,
-        ).fetchone()
-
-        row = q(
-            """
-            INSERT INTO agent_actions(case_id, channel, action_type, payload, result)
-            VALUES(:cid, :ch, :at, CAST(:pl AS JSONB), :res)
-            RETURNING action_id
-            """,
-            cid=case_id,
-            ch=channel,
-            at=action_type,
-            pl=json.dumps(payload),
-            res=f"ok: card status updated -> {new_status}",
-        ).fetchone()
-
-        return {
-            "ok": True,
-            "message": f"card status updated -> {new_status}",
-            "action_id": str(row[0]),
-            "connector": "local_db",
-            "data": {
-                "card_id": str(upd[0]) if upd else card_id,
-                "status": str(upd[1]) if upd else new_status,
-                "blocked_reason": upd[2] if upd else blocked_reason,
-                "resolved_at": str(upd[3]) if upd and upd[3] else resolved_at,
-            },
-        }
+        return _published(case_id, action_type, _update_card_status(case_id, channel, payload, expected=str(card["status"])))
 
     connector = get_erp_connector()
-    res = connector.execute(action_type, payload)
+    if is_async_mode():
+        aid = str(uuid.uuid4())
+        row = {"action_id": aid, "case_id": case_id, "channel": channel, "action_type": action_type, "payload": payload}
+        _insert_actions(
+            [{**row, "result": f"queued: {connector.name}"}],
+            [{**row, "pending_id": pending_id}],
+        )
+        return _published(
+            case_id, action_type, {**_queued_result(aid, connector.name), "connector_state": connector_state(connector)}
+        )
+
+    try:
+        res = connector.execute(action_type, payload)
+    except Exception as e:
+        # Breaker open, rate limited or backend failure: audit it as a failed call.
+        res = ExecutionResult(ok=False, message=f"connector error: {e}")
 
     row = q(
         """
@@ -238,10 +439,264 @@ def execute_action(
         res=res.message,
     ).fetchone()
 
-    return {
-        "ok": bool(res.ok),
-        "message": res.message,
-        "action_id": str(row[0]),
-        "connector": connector.name,
-        "data": res.data or {},
-    }
+    return _published(
+        case_id,
+        action_type,
+        {
+            "ok": bool(res.ok),
+            "message": res.message,
+            "action_id": str(row[0]),
+            "connector": connector.name,
+            "connector_state": connector_state(connector),
+            "data": res.data or {},
+        },
+    )
+
+
+# Max items handed to one ERPConnector.execute_batch() call.
+CONNECTOR_BATCH_SIZE = 100
+
+
+def normalize_uuid(v: Any) -> Optional[str]:
+    try:
+        return str(uuid.UUID(str(v)))
+    except Exception:
+        return None
+
+
+def _load_many(kind: str, sql: str, key_col: str, raw_ids: List[Any]) -> Dict[str, Dict[str, Any]]:
+    """Serve ids from the request cache and fetch the rest in one query.
+
+    Ids that are not found are cached as None, so they are not queried again.
+    """
+    out: Dict[str, Dict[str, Any]] = {}
+    missing: List[str] = []
+    for u in sorted({u for u in (normalize_uuid(c) for c in raw_ids) if u}):
+        hit = cache_get(kind, u)
+        if hit is MISS:
+            missing.append(u)
+        elif hit is not None:
+            out[u] = hit
+    if missing:
+        found = {str(r[key_col]): r for r in all(sql, ids=missing)}
+        for u in missing:
+            cache_put(kind, u, found.get(u))
+        out.update(found)
+    return out
+
+
+def load_cards(card_ids: List[Any]) -> Dict[str, Dict[str, Any]]:
+    """card_id -> {card_id, case_id, status}; at most one query (invalid ids are skipped)."""
+    return _load_many(
+        "card",
+        "SELECT card_id, case_id, status FROM kanban_cards WHERE card_id = ANY(CAST(:ids AS UUID[]))",
+        "card_id",
+        card_ids,
+    )
+
+
+def load_cases(case_ids: List[Any]) -> Dict[str, Dict[str, Any]]:
+    """case_id -> {case_id, risk_score}; at most one query (invalid ids are skipped)."""
+    return _load_many(
+        "case",
+        "SELECT case_id, risk_score FROM agent_cases WHERE case_id = ANY(CAST(:ids AS UUID[]))",
+        "case_id",
+        case_ids,
+    )
+
+
+def get_card(card_id: Any) -> Optional[Dict[str, Any]]:
+    key = normalize_uuid(card_id)
+    if key is None:
+        return None
+    return load_cards([key]).get(key)
+
+
+def get_case(case_id: Any) -> Optional[Dict[str, Any]]:
+    key = normalize_uuid(case_id)
+    if key is None:
+        return None
+    return load_cases([key]).get(key)
+
+
+def remember_cards(rows: List[Dict[str, Any]]) -> None:
+    """Put card rows the caller already loaded (need card_id, case_id, status) in the request cache."""
+    for r in rows:
+        key = normalize_uuid(r.get("card_id"))
+        if key:
+            cache_put("card", key, {"card_id": r.get("card_id"), "case_id": r.get("case_id"), "status": r.get("status")})
+
+
+def remember_cases(rows: List[Dict[str, Any]]) -> None:
+    """Put case rows the caller already loaded (need case_id, risk_score) in the request cache."""
+    for r in rows:
+        key = normalize_uuid(r.get("case_id"))
+        if key:
+            cache_put("case", key, {"case_id": r.get("case_id"), "risk_score": r.get("risk_score")})
+
+
+def _forget_card(card_id: str) -> None:
+    key = normalize_uuid(card_id)
+    if key:
+        cache_pop("card", key)
+
+
+def _remember_card_status(card_id: str, status: str) -> None:
+    key = normalize_uuid(card_id)
+    hit = cache_get("card", key) if key else MISS
+    if hit is not MISS and hit is not None:
+        cache_put("card", key, {**hit, "status": status})
+
+
+def execute_actions_batch(
+    items: List[Dict[str, Any]],
+    *,
+    channel: str,
+    cases: Optional[Dict[str, Dict[str, Any]]] = None,
+    dry_run: bool = False,
+) -> List[dict]:
+    """Batch form of execute_action(); results are aligned with `items`.
+
+    Each item is {case_id, action_type, payload, pending_id?}. Cards and
+    cases are loaded once for the whole batch, connector calls are chunked
+    through ERPConnector.execute_batch() (or queued in async mode), and the
+    card status updates and all audit rows are written with a single statement. Items are evaluated in order, so two
+    status changes on the same card see each other.
+
+    Card updates compare-and-set on the status the batch started from; items
+    on a card another writer moved in the meantime come back with conflict=True.
+    """
+    payloads = [_with_internal_audit(it.get("payload") or {}) for it in items]
+    card_ids = [p.get("card_id") for it, p in zip(items, payloads) if it.get("action_type") == "UpdateCardStatus"]
+    cards = load_cards(card_ids)
+    if cases is None:
+        cases = load_cases([it.get("case_id") for it in items])
+
+    results: List[Optional[dict]] = [None] * len(items)
+    audit_rows: List[Dict[str, Any]] = []
+    card_updates: Dict[str, Dict[str, Any]] = {}
+    card_items: Dict[str, List[int]] = {}
+    erp_idx: List[int] = []
+
+    def _audit(i: int, result: str) -> str:
+        aid = str(uuid.uuid4())
+        audit_rows.append(
+            {
+                "action_id": aid,
+                "case_id": str(items[i]["case_id"]),
+                "channel": channel,
+                "action_type": items[i]["action_type"],
+                "payload": payloads[i],
+                "result": result,
+            }
+        )
+        return aid
+
+    for i, it in enumerate(items):
+        action_type = str(it["action_type"])
+        payload = payloads[i]
+        card = _NOT_LOADED
+        if action_type == "UpdateCardStatus" and payload.get("card_id"):
+            card = cards.get(normalize_uuid(payload.get("card_id")) or "")
+        case = cases.get(normalize_uuid(it["case_id"]) or "")
+        passed, msg = _guardrails(str(it["case_id"]), channel, action_type, payload, card=card, case=case)
+
+        if dry_run:
+            results[i] = _dry_run_preview(action_type, payload, passed, msg)
+            continue
+        if not passed:
+            results[i] = {"ok": False, "blocked": True, "message": msg, "action_id": _audit(i, msg)}
+            continue
+
+        if action_type == "UpdateCardStatus":
+            card_id = str(card["card_id"])
+            new_status = str(payload.get("new_status"))
+            # Later items in this batch must see the new status.
+            cards[card_id] = {**card, "status": new_status}
+            expected = card_updates[card_id]["expected"] if card_id in card_updates else str(card["status"])
+            card_updates[card_id] = {
+                "card_id": card_id,
+                "expected": expected,
+                "st": new_status,
+                "br": payload.get("blocked_reason"),
+                "ra": payload.get("resolved_at"),
+            }
+            card_items.setdefault(card_id, []).append(i)
+            results[i] = {
+                "ok": True,
+                "message": f"card status updated -> {new_status}",
+                "action_id": _audit(i, f"ok: card status updated -> {new_status}"),
+                "connector": "local_db",
+                "data": {
+                    "card_id": card_id,
+                    "status": new_status,
+                    "blocked_reason": payload.get("blocked_reason") if new_status == "blocked" else None,
+                    "resolved_at": payload.get("resolved_at") if new_status == "resolved" else None,
+                },
+            }
+            continue
+
+        erp_idx.append(i)
+
+    if dry_run:
+        return [r or {} for r in results]
+
+    jobs: List[Dict[str, Any]] = []
+    if erp_idx and is_async_mode():
+        connector = get_erp_connector()
+        for i in erp_idx:
+            aid = _audit(i, f"queued: {connector.name}")
+            jobs.append({**audit_rows[-1], "pending_id": items[i].get("pending_id")})
+            results[i] = _queued_result(aid, connector.name)
+    elif erp_idx:
+        connector = get_erp_connector()
+        for start in range(0, len(erp_idx), CONNECTOR_BATCH_SIZE):
+            chunk = erp_idx[start:start + CONNECTOR_BATCH_SIZE]
+            try:
+                res_list = connector.execute_batch([(str(items[i]["action_type"]), payloads[i]) for i in chunk])
+                if len(res_list) != len(chunk):
+                    raise RuntimeError(f"connector returned {len(res_list)} results for {len(chunk)} items")
+            except Exception as e:
+                res_list = [ExecutionResult(ok=False, message=f"connector error: {e}") for _ in chunk]
+            state = connector_state(connector)
+            for i, res in zip(chunk, res_list):
+                results[i] = {
+                    "ok": bool(res.ok),
+                    "message": res.message,
+                    "action_id": _audit(i, res.message),
+                    "connector": connector.name,
+                    "connector_state": state,
+                    "data": res.data or {},
+                }
+
+    if audit_rows:
+        audit_by_id = {r["action_id"]: r for r in audit_rows}
+        conflicts: Dict[str, str] = {}
+        for card_id, u in card_updates.items():
+            conflicts[card_id] = (
+                f"conflict: card {card_id} is no longer '{u['expected']}' (concurrent update); re-read and retry"
+            )
+            for i in card_items[card_id]:
+                audit_by_id[results[i]["action_id"]].update(card_id=card_id, conflict=conflicts[card_id])
+        updated_ids = _insert_actions(audit_rows, jobs, list(card_updates.values()))
+        for card_id, u in card_updates.items():
+            if card_id in updated_ids:
+                _remember_card_status(card_id, u["st"])
+                continue
+            _forget_card(card_id)
+            for i in card_items[card_id]:
+                results[i] = {
+                    "ok": False,
+                    "conflict": True,
+                    "message": conflicts[card_id],
+                    "action_id": results[i]["action_id"],
+                    "connector": "local_db",
+                    "data": {"card_id": card_id, "expected_status": u["expected"]},
+                }
+        publish_many(
+            ev
+            for it, r in zip(items, results)
+            for ev in _change_events(it["case_id"], str(it["action_type"]), r or {})
+        )
+
+    return [r or {} for r in results]
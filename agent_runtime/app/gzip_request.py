@@ -0,0 +1,83 @@
+"""ASGI middleware: accept gzip-compressed request bodies (Content-Encoding: gzip).
+
+news_monitor posts its ingest batches compressed. The body is inflated before
+routing, so endpoints see plain JSON and need no changes. Decompression is
+bounded by `max_size` (413 beyond it) so a small body cannot expand without
+limit; a corrupt or truncated stream is a 400.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from starlette.responses import JSONResponse
+
+from .request_context import get_request_id
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+
+
+class RequestBodyTooLarge(ValueError):
+    pass
+
+
+def gunzip_bounded(data: bytes, max_size: int) -> bytes:
+    d = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    out = d.decompress(data, max_size + 1)
+    if len(out) > max_size:
+        raise RequestBodyTooLarge(f"decompressed body exceeds {max_size} bytes")
+    if not d.eof:
+        raise zlib.error("truncated gzip stream")
+    return out
+
+
+class GzipRequestMiddleware:
+    def __init__(self, app: Callable[..., Awaitable[None]], max_size: int = 16 * 1024 * 1024):
+        self.app = app
+        self.max_size = int(max_size)
+
+    async def __call__(self, scope: Scope, receive: Callable[[], Awaitable[Message]], send: Callable[[Message], Awaitable[None]]) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers: List[Tuple[bytes, bytes]] = list(scope.get("headers") or [])
+        encoding = next((v for k, v in headers if k == b"content-encoding"), b"").strip().lower()
+        if encoding != b"gzip":
+            return await self.app(scope, receive, send)
+
+        chunks: List[bytes] = []
+        while True:
+            msg = await receive()
+            if msg["type"] == "http.disconnect":
+                return
+            chunks.append(msg.get("body", b""))
+            if not msg.get("more_body", False):
+                break
+        try:
+            body = gunzip_bounded(b"".join(chunks), self.max_size)
+        except RequestBodyTooLarge as e:
+            return await self._error(413, str(e))(scope, receive, send)
+        except zlib.error as e:
+            return await self._error(400, f"invalid gzip body: {e}")(scope, receive, send)
+
+        headers = [(k, v) for k, v in headers if k not in (b"content-encoding", b"content-length")]
+        headers.append((b"content-length", str(len(body)).encode("ascii")))
+        sent = False
+
+        async def receive_inflated() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(dict(scope, headers=headers), receive_inflated, send)
+
+    @staticmethod
+    def _error(status_code: int, message: str) -> JSONResponse:
+        # Same envelope as the API's exception handlers.
+        return JSONResponse(
+            status_code=status_code,
+            content={"error": {"code": f"http_{status_code}", "message": message, "details": None}, "request_id": get_request_id()},
+        )
@@ -2,12 +2,17 @@ from __future__ import annotations
 
 import hashlib
 import json
-from typing import Any, Dict, Optional, Callable
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Callable, Tuple
 
 
 # Lazy DB callables so unit tests don't require SQLAlchemy installed.
 _one: Callable[..., Any] | None = None
 _q: Callable[..., Any] | None = None
+_all: Callable[..., Any] | None = None
 
 
 def _get_one() -> Callable[..., Any]:
@@ -26,6 +31,51 @@ def _get_q() -> Callable[..., Any]:
     return _q
 
 
+def _get_all() -> Callable[..., Any]:
+    global _all
+    if _all is None:
+        from .db import all as _all_fn
+        _all = _all_fn
+    return _all
+
+
+# In-process fast path: recently *completed* keys only. In-flight state always
+# lives in the DB so every replica sees the same reservation.
+LRU_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_LRU_SIZE", "10000"))
+_lru: "OrderedDict[str, Tuple[str, Any, float]]" = OrderedDict()
+_lru_lock = threading.Lock()
+
+# How long an in-flight reservation blocks the key before another request may
+# take it over (covers workers that crash between reserve() and complete()).
+DEFAULT_LEASE_SECONDS = 300
+
+
+def _lru_get(key: str) -> Optional[Tuple[str, Any]]:
+    with _lru_lock:
+        hit = _lru.get(key)
+        if hit is None:
+            return None
+        req_hash, response, expires = hit
+        if expires <= time.time():
+            del _lru[key]
+            return None
+        _lru.move_to_end(key)
+        return req_hash, response
+
+
+def _lru_put(key: str, req_hash: str, response: Any, ttl_seconds: int) -> None:
+    with _lru_lock:
+        _lru[key] = (req_hash, response, time.time() + ttl_seconds)
+        _lru.move_to_end(key)
+        while len(_lru) > LRU_MAX_ENTRIES:
+            _lru.popitem(last=False)
+
+
+def clear_cache() -> None:
+    with _lru_lock:
+        _lru.clear()
+
+
 def canonical_json(obj: Any) -> str:
     """Stable JSON for hashing (sort keys, no whitespace)."""
     return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
@@ -39,26 +89,209 @@ def request_hash(obj: Any) -> str:
 
 def get_existing(key: str) -> Optional[Dict[str, Any]]:
     one = _get_one()
-    row = one("SELECT key, request_hash, response FROM idempotency_keys WHERE key=:k", k=key)
+    row = one("SELECT key, request_hash, status, response FROM idempotency_keys WHERE key=:k", k=key)
     return row
 
 
-def store(key: str, req_hash: str, response_obj: Any) -> None:
+def reserve(
+    *,
+    key: str,
+    req_hash: str,
+    ttl_seconds: int,
+    lease_seconds: int = DEFAULT_LEASE_SECONDS,
+) -> tuple[str, Optional[Any]]:
+    """Atomically claim an idempotency key in one round trip.
+
+    Returns (outcome, response) where outcome is one of:
+      - "reserved":  caller owns the key and must complete() or release() it
+      - "replay":    a completed response exists for the same request
+      - "conflict":  key was used with a different request payload
+      - "in_flight": the same request is still executing elsewhere
+
+    Expired rows (completed past TTL, or in-flight past their lease) are taken
+    over in the same statement instead of blocking until cleanup runs.
+    """
+    hit = _lru_get(key)
+    if hit is not None:
+        if str(hit[0]) != str(req_hash):
+            return ("conflict", None)
+        return ("replay", hit[1])
+
+    q = _get_q()
+    r = q(
+        """
+        INSERT INTO idempotency_keys(key, request_hash, status, response, expires_at)
+        VALUES(:k, :h, 'in_flight', NULL, now() + make_interval(secs => :lease))
+        ON CONFLICT (key) DO UPDATE
+          SET request_hash=EXCLUDED.request_hash,
+              status='in_flight',
+              response=NULL,
+              created_at=now(),
+              expires_at=EXCLUDED.expires_at
+          WHERE idempotency_keys.expires_at < now()
+        RETURNING key
+        """,
+        k=key,
+        h=req_hash,
+        lease=int(lease_seconds),
+    )
+    if r is not None and r.fetchone():
+        return ("reserved", None)
+
+    # A missing row means cleanup deleted it between the two statements;
+    # it reports "in_flight" so the caller retries.
+    return _outcome_for_row(key, req_hash, get_existing(key), ttl_seconds)
+
+
+def complete(key: str, req_hash: str, response_obj: Any, *, ttl_seconds: int) -> bool:
+    """Record the response for a reserved key and cache it for fast replays.
+
+    Returns False (and caches nothing) when the reservation is no longer in
+    flight, e.g. it expired and cleanup deleted it or it was already
+    completed: the LRU must not replay a response the database does not back."""
+    q = _get_q()
+    r = q(
+        """
+        UPDATE idempotency_keys
+        SET status='completed',
+            response=CAST(:r AS JSONB),
+            expires_at=now() + make_interval(secs => :ttl)
+        WHERE key=:k AND request_hash=:h AND status='in_flight'
+        """,
+        k=key,
+        h=req_hash,
+        r=canonical_json(response_obj),
+        ttl=int(ttl_seconds),
+    )
+    if getattr(r, "rowcount", 0) != 1:
+        return False
+    _lru_put(key, req_hash, json.loads(canonical_json(response_obj)), ttl_seconds)
+    return True
+
+
+def release(key: str, req_hash: str) -> None:
+    """Drop an in-flight reservation (execution failed before producing a response)."""
     q = _get_q()
-    payload = canonical_json(response_obj)
     q(
-        "INSERT INTO idempotency_keys(key, request_hash, response) VALUES(:k, :h, CAST(:r AS JSONB))",
+        "DELETE FROM idempotency_keys WHERE key=:k AND request_hash=:h AND status='in_flight'",
         k=key,
         h=req_hash,
-        r=payload,
     )
 
 
-def check_or_replay(*, key: str, req_hash: str) -> tuple[bool, Optional[Any], Optional[str]]:
-    """Return (replayed, response, conflict_reason)."""
-    row = get_existing(key)
+def _outcome_for_row(key: str, req_hash: str, row: Optional[Dict[str, Any]], ttl_seconds: int) -> tuple[str, Optional[Any]]:
     if not row:
-        return (False, None, None)
+        return ("in_flight", None)
     if str(row.get("request_hash")) != str(req_hash):
-        return (False, None, "Idempotency-Key reuse with different request payload")
-    return (True, row.get("response"), None)
+        return ("conflict", None)
+    if str(row.get("status") or "completed") == "in_flight":
+        return ("in_flight", None)
+    _lru_put(key, req_hash, row.get("response"), ttl_seconds)
+    return ("replay", row.get("response"))
+
+
+def reserve_many(
+    entries: List[Tuple[str, str]],
+    *,
+    ttl_seconds: int,
+    lease_seconds: int = DEFAULT_LEASE_SECONDS,
+) -> List[tuple[str, Optional[Any]]]:
+    """Batch form of reserve(): one INSERT and at most one SELECT for all keys.
+
+    `entries` is a list of (key, req_hash); the result is aligned with it.
+    A key repeated within the batch only reserves once; later copies report
+    "in_flight" (same request) or "conflict" (different request).
+    """
+    out: List[Optional[tuple[str, Optional[Any]]]] = [None] * len(entries)
+    first: Dict[str, int] = {}
+    pending: List[int] = []
+    for i, (key, req_hash) in enumerate(entries):
+        if key in first:
+            prev_hash = entries[first[key]][1]
+            out[i] = ("in_flight", None) if str(prev_hash) == str(req_hash) else ("conflict", None)
+            continue
+        first[key] = i
+        hit = _lru_get(key)
+        if hit is not None:
+            out[i] = ("conflict", None) if str(hit[0]) != str(req_hash) else ("replay", hit[1])
+            continue
+        pending.append(i)
+
+    if pending:
+        q = _get_q()
+        r = q(
+            """
+            INSERT INTO idempotency_keys(key, request_hash, status, response, expires_at)
+            SELECT e.k, e.h, 'in_flight', NULL, now() + make_interval(secs => :lease)
+            FROM jsonb_to_recordset(CAST(:rows AS JSONB)) AS e(k TEXT, h TEXT)
+            ON CONFLICT (key) DO UPDATE
+              SET request_hash=EXCLUDED.request_hash,
+                  status='in_flight',
+                  response=NULL,
+                  created_at=now(),
+                  expires_at=EXCLUDED.expires_at
+              WHERE idempotency_keys.expires_at < now()
+            RETURNING key
+            """,
+            rows=json.dumps([{"k": entries[i][0], "h": entries[i][1]} for i in pending]),
+            lease=int(lease_seconds),
+        )
+        reserved = {str(x[0]) for x in (r.fetchall() if r is not None else [])}
+        rest = [i for i in pending if entries[i][0] not in reserved]
+        rows: Dict[str, Dict[str, Any]] = {}
+        if rest:
+            all_ = _get_all()
+            for row in all_(
+                "SELECT key, request_hash, status, response FROM idempotency_keys WHERE key = ANY(:ks)",
+                ks=[entries[i][0] for i in rest],
+            ):
+                rows[str(row["key"])] = row
+        for i in pending:
+            key, req_hash = entries[i]
+            if key in reserved:
+                out[i] = ("reserved", None)
+            else:
+                out[i] = _outcome_for_row(key, req_hash, rows.get(key), ttl_seconds)
+
+    return [x if x is not None else ("in_flight", None) for x in out]
+
+
+def complete_many(entries: List[Tuple[str, str, Any]], *, ttl_seconds: int) -> int:
+    """Batch form of complete(): `entries` is a list of (key, req_hash, response).
+    Only rows that were updated are cached; returns how many."""
+    if not entries:
+        return 0
+    q = _get_q()
+    r = q(
+        """
+        UPDATE idempotency_keys k
+        SET status='completed',
+            response=e.r,
+            expires_at=now() + make_interval(secs => :ttl)
+        FROM jsonb_to_recordset(CAST(:rows AS JSONB)) AS e(k TEXT, h TEXT, r JSONB)
+        WHERE k.key=e.k AND k.request_hash=e.h AND k.status='in_flight'
+        RETURNING k.key
+        """,
+        rows=canonical_json([{"k": k, "h": h, "r": resp} for k, h, resp in entries]),
+        ttl=int(ttl_seconds),
+    )
+    done = {row[0] for row in r.fetchall()} if r is not None else set()
+    for k, h, resp in entries:
+        if k in done:
+            _lru_put(k, h, json.loads(canonical_json(resp)), ttl_seconds)
+    return len(done)
+
+
+def release_many(entries: List[Tuple[str, str]]) -> None:
+    """Batch form of release()."""
+    if not entries:
+        return
+    q = _get_q()
+    q(
+        """
+        DELETE FROM idempotency_keys k
+        USING jsonb_to_recordset(CAST(:rows AS JSONB)) AS e(k TEXT, h TEXT)
+        WHERE k.key=e.k AND k.request_hash=e.h AND k.status='in_flight'
+        """,
+        rows=json.dumps([{"k": k, "h": h} for k, h in entries]),
+    )
@@ -1,26 +1,172 @@
 from __future__ import annotations
 
+import os
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 from ..db import q
+from ..partitions import PARTITIONED_TABLES, table_config, drop_expired_partitions, ensure_partitions
 from ..policy_store import load_policy
 
 
-def cleanup_idempotency(ttl_hours: int | None = None) -> Dict[str, Any]:
-    policy = load_policy() or {}
-    if ttl_hours is None:
-        ttl_hours = int(((policy.get("idempotency_policy") or {}).get("ttl_hours") or 24))
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=ttl_hours)
+# Used when governance policy does not specify cleanup_policy.
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_PAUSE_MS = 50
+DEFAULT_MAX_BATCHES = 200
+DEFAULT_SUPERSEDED_RETAIN_DAYS = 30
+DEFAULT_ACTION_JOBS_RETAIN_DAYS = 7
 
-    # Delete expired materializations to allow idempotency key reuse after TTL
-    r = q("DELETE FROM materializations WHERE created_at < :cutoff RETURNING materialization_id", cutoff=cutoff)
-    deleted = [str(x[0]) for x in r.fetchall()] if r else []
+# Non-partitioned tables whose retention is set under cleanup_policy.tables.
+ROW_CLEANUP_TABLES = ("pending_actions", "action_jobs")
+
+
+def cleanup_config(policy: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    p = policy if policy is not None else (load_policy() or {})
+    cp = (p or {}).get("cleanup_policy") or {}
+    ip = (p or {}).get("idempotency_policy") or {}
+    tables = cp.get("tables") or {}
+    superseded = (tables.get("pending_actions") or {}).get("retain_days", DEFAULT_SUPERSEDED_RETAIN_DAYS)
+    jobs = (tables.get("action_jobs") or {}).get("retain_days", DEFAULT_ACTION_JOBS_RETAIN_DAYS)
+    return {
+        "batch_size": max(1, int(cp.get("batch_size") or DEFAULT_BATCH_SIZE)),
+        "pause_ms": max(0, int(cp.get("pause_ms") if cp.get("pause_ms") is not None else DEFAULT_PAUSE_MS)),
+        # Per table per cycle; whatever is left over is picked up next cycle.
+        "max_batches": max(1, int(cp.get("max_batches") or DEFAULT_MAX_BATCHES)),
+        "ttl_hours": int(ip.get("ttl_hours") or os.getenv("IDEMPOTENCY_TTL_HOURS") or 24),
+        "interval_seconds": int(
+            cp.get("interval_seconds")
+            or ip.get("cleanup_interval_seconds")
+            or os.getenv("IDEMPOTENCY_CLEANUP_INTERVAL")
+            or 3600
+        ),
+        "superseded_retain_days": int(superseded) if superseded is not None else 0,
+        "action_jobs_retain_days": int(jobs) if jobs is not None else 0,
+    }
+
+
+def delete_batched(
+    table: str,
+    pk: str,
+    where: str,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    pause_ms: int = 0,
+    max_batches: int | None = None,
+    **params: Any,
+) -> Dict[str, Any]:
+    """DELETE in bounded batches (each its own short transaction) with a pause between.
+
+    `pk` may be a composite key ("dq_id, ts"): partitioned tables have no
+    globally unique ctid, so batches are always selected by primary key.
+    """
+    t0 = time.monotonic()
+    deleted = 0
+    batches = 0
+    done = False
+    while max_batches is None or batches < max_batches:
+        r = q(
+            f"""
+            DELETE FROM {table}
+            WHERE ({pk}) IN (SELECT {pk} FROM {table} WHERE {where} LIMIT :lim)
+            """,
+            lim=int(batch_size),
+            **params,
+        )
+        n = int(getattr(r, "rowcount", 0) or 0)
+        batches += 1
+        deleted += n
+        if n < batch_size:
+            done = True
+            break
+        if pause_ms:
+            time.sleep(pause_ms / 1000.0)
+    return {
+        "deleted": deleted,
+        "batches": batches,
+        "elapsed_ms": int((time.monotonic() - t0) * 1000),
+        # False when max_batches was hit with rows still pending.
+        "complete": done,
+    }
+
+
+def _targets(cfg: Dict[str, Any], policy: Dict[str, Any], now: datetime) -> List[Tuple[str, str, str, Dict[str, Any]]]:
+    """(table, pk, where, params) for every table swept by cleanup_tables()."""
+    ttl_cutoff = now - timedelta(hours=cfg["ttl_hours"])
+    out: List[Tuple[str, str, str, Dict[str, Any]]] = [
+        # idempotency_keys carry their own expires_at (set from the policy TTL on write).
+        ("idempotency_keys", "key", "expires_at < now()", {}),
+        # Delete expired materializations to allow idempotency key reuse after TTL
+        ("materializations", "materialization_id", "created_at < :cutoff", {"cutoff": ttl_cutoff}),
+    ]
+    if cfg["superseded_retain_days"] > 0:
+        out.append((
+            "pending_actions",
+            "pending_id",
+            # Keep rows still referenced through superseded_by (self FK).
+            """status = 'canceled' AND superseded_at < :cutoff
+               AND NOT EXISTS (SELECT 1 FROM pending_actions s WHERE s.superseded_by = pending_actions.pending_id)""",
+            {"cutoff": now - timedelta(days=cfg["superseded_retain_days"])},
+        ))
+    if cfg["action_jobs_retain_days"] > 0:
+        out.append((
+            "action_jobs",
+            "job_id",
+            "status IN ('succeeded','failed') AND updated_at < :cutoff",
+            {"cutoff": now - timedelta(days=cfg["action_jobs_retain_days"])},
+        ))
+    # Whole expired partitions are dropped by cleanup_partitions(); this catches
+    # the remainder in partially expired partitions and the DEFAULT partition.
+    for table, pk in (("dq_results", "dq_id, ts"), ("agent_predictions", "pred_id, ts")):
+        retain = table_config(table, policy)["retain_days"]
+        if retain > 0:
+            col = PARTITIONED_TABLES[table][0]
+            out.append((table, pk, f"{col} < :cutoff", {"cutoff": now - timedelta(days=retain)}))
+    return out
+
+
+def cleanup_tables(policy: Dict[str, Any] | None = None, *, ttl_hours: int | None = None) -> Dict[str, Any]:
+    """Batched row-level retention for every table in _targets(); returns per-table metrics."""
+    policy = policy if policy is not None else (load_policy() or {})
+    cfg = cleanup_config(policy)
+    if ttl_hours is not None:
+        cfg["ttl_hours"] = int(ttl_hours)
+    now = datetime.now(timezone.utc)
+
+    tables: Dict[str, Any] = {}
+    for table, pk, where, params in _targets(cfg, policy, now):
+        tables[table] = delete_batched(
+            table,
+            pk,
+            where,
+            batch_size=cfg["batch_size"],
+            pause_ms=cfg["pause_ms"],
+            max_batches=cfg["max_batches"],
+            **params,
+        )
 
     return {
         "ok": True,
-        "ttl_hours": ttl_hours,
-        "cutoff": cutoff.isoformat(),
-        "deleted_materializations": deleted,
-        "deleted_count": len(deleted),
+        "ttl_hours": cfg["ttl_hours"],
+        "batch_size": cfg["batch_size"],
+        "tables": tables,
+        "deleted_count": sum(t["deleted"] for t in tables.values()),
     }
+
+
+def cleanup_partitions(policy: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """Premake future partitions and drop expired ones (partition_policy)."""
+    policy = policy if policy is not None else (load_policy() or {})
+    created = ensure_partitions(policy)
+
+    tables: Dict[str, Any] = {}
+    for table in PARTITIONED_TABLES:
+        cfg = table_config(table, policy)
+        dropped = drop_expired_partitions(table, retain_days=cfg["retain_days"])
+        tables[table] = {
+            "created": created.get(table, 0),
+            "dropped": dropped,
+            "retain_days": cfg["retain_days"],
+        }
+
+    return {"ok": True, "tables": tables}
@@ -1,24 +1,34 @@
 from __future__ import annotations
 
-import os
 import time
 from datetime import datetime, timezone
 
-from .cleanup import cleanup_idempotency
+from .cleanup import cleanup_config, cleanup_partitions, cleanup_tables
 from ..policy_store import load_policy
 
 
 def main():
-    policy = load_policy() or {}
-    ttl_hours = int(((policy.get("idempotency_policy") or {}).get("ttl_hours") or os.getenv("IDEMPOTENCY_TTL_HOURS") or 24))
-    interval = int(((policy.get("idempotency_policy") or {}).get("cleanup_interval_seconds") or os.getenv("IDEMPOTENCY_CLEANUP_INTERVAL") or 3600))
-
     while True:
+        # Re-read every cycle so policy edits (TTL, batch size, interval) apply without a restart.
+        policy = load_policy() or {}
+        interval = cleanup_config(policy)["interval_seconds"]
         try:
-            res = cleanup_idempotency(ttl_hours=ttl_hours)
-            print(f"[cleanup_loop] {datetime.now(timezone.utc).isoformat()} deleted={res.get('deleted_count')}")
+            res = cleanup_tables(policy)
+            ts = datetime.now(timezone.utc).isoformat()
+            for table, m in (res.get("tables") or {}).items():
+                print(
+                    f"[cleanup_loop] {ts} table={table} deleted={m['deleted']} batches={m['batches']} "
+                    f"elapsed_ms={m['elapsed_ms']} complete={m['complete']}"
+                )
         except Exception as e:
             print(f"[cleanup_loop] error: {e}")
+        try:
+            parts = cleanup_partitions(policy)
+            for table, r in (parts.get("tables") or {}).items():
+                if r.get("created") or r.get("dropped"):
+                    print(f"[cleanup_loop] partitions {table} created={r.get('created')} dropped={r.get('dropped')}")
+        except Exception as e:
+            print(f"[cleanup_loop] partition error: {e}")
         time.sleep(interval)
 
 
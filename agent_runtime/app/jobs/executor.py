@@ -0,0 +1,228 @@
+"""Executor workers for queued connector actions (ACTION_EXECUTION_MODE=async).
+
+execute_action() writes the agent_actions row plus an action_jobs row and
+returns 202 right away. These workers claim jobs with
+SELECT ... FOR UPDATE SKIP LOCKED (so any number of workers/replicas can run
+side by side), call the connector outside of any DB transaction, and write the
+outcome back to action_jobs, agent_actions.result and pending_actions.
+
+Connector exceptions are retried with linear backoff up to max_attempts;
+a connector result (ok or not) is final. Jobs whose worker died mid-call are
+requeued once their lock is older than EXECUTOR_LEASE_SECONDS, or failed if
+that was already their last attempt.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+from ..change_feed import publish_many
+from ..config import EXECUTOR_LEASE_SECONDS, EXECUTOR_POLL_SECONDS, EXECUTOR_WORKERS
+from ..connectors.erp import ExecutionResult, get_erp_connector
+from ..db import all, q
+
+RETRY_BACKOFF_SECONDS = 30
+
+
+def claim_jobs(worker_id: str, limit: int = 1) -> List[Dict[str, Any]]:
+    return all(
+        """
+        UPDATE action_jobs j
+        SET status='running',
+            locked_by=:w,
+            locked_at=now(),
+            attempts=j.attempts + 1,
+            updated_at=now()
+        WHERE j.job_id IN (
+          SELECT job_id FROM action_jobs
+          WHERE status='queued' AND available_at <= now()
+          ORDER BY available_at
+          LIMIT :lim
+          FOR UPDATE SKIP LOCKED
+        )
+        RETURNING j.job_id, j.action_id, j.action_created_at, j.case_id, j.pending_id,
+                  j.channel, j.action_type, j.payload, j.attempts, j.max_attempts
+        """,
+        w=worker_id,
+        lim=int(limit),
+    )
+
+
+def finish_job(job: Dict[str, Any], res: ExecutionResult, connector_name: str, error: str | None = None) -> None:
+    """Record a final connector result on the job, its audit row and its pending action."""
+    q(
+        """
+        WITH j AS (
+          UPDATE action_jobs
+          SET status=:st, result=CAST(:res AS JSONB), error=:err, locked_by=NULL, updated_at=now()
+          WHERE job_id=:jid
+          RETURNING action_id, action_created_at, pending_id
+        ),
+        a AS (
+          UPDATE agent_actions t
+          SET result=:msg
+          FROM j
+          WHERE t.action_id = j.action_id AND t.created_at = j.action_created_at
+          RETURNING t.action_id
+        )
+        UPDATE pending_actions p
+        SET status=:pst,
+            executed_action_id=CASE WHEN :pst = 'executed' THEN j.action_id ELSE p.executed_action_id END,
+            execution_result=:msg,
+            updated_at=now()
+        FROM j
+        WHERE p.pending_id = j.pending_id AND p.status = 'queued'
+        """,
+        jid=str(job["job_id"]),
+        st="succeeded" if res.ok else "failed",
+        pst="executed" if res.ok else "blocked",
+        msg=res.message,
+        err=error,
+        res=json.dumps(
+            {"ok": bool(res.ok), "message": res.message, "connector": connector_name, "data": res.data or {}},
+            default=str,
+        ),
+    )
+    publish_many(_result_events(job, bool(res.ok)))
+
+
+def _result_events(job: Dict[str, Any], ok: bool) -> List[Tuple[str, Any, str, Dict[str, Any]]]:
+    case_id = str(job.get("case_id"))
+    events: List[Tuple[str, Any, str, Dict[str, Any]]] = [
+        (
+            "action",
+            job.get("action_id"),
+            "updated",
+            {"case_id": case_id, "action_type": job.get("action_type"), "ok": ok, "status": "done" if ok else "failed"},
+        )
+    ]
+    if job.get("pending_id"):
+        events.append(("pending_action", job["pending_id"], "updated", {"case_id": case_id, "status": "executed" if ok else "blocked"}))
+    return events
+
+
+def fail_or_retry(job: Dict[str, Any], error: str) -> None:
+    """Connector raised: requeue with backoff, or give up after max_attempts."""
+    if int(job.get("attempts") or 0) < int(job.get("max_attempts") or 1):
+        q(
+            """
+            UPDATE action_jobs
+            SET status='queued',
+                error=:err,
+                locked_by=NULL,
+                available_at=now() + make_interval(secs => :delay),
+                updated_at=now()
+            WHERE job_id=:jid
+            """,
+            jid=str(job["job_id"]),
+            err=error,
+            delay=RETRY_BACKOFF_SECONDS * int(job.get("attempts") or 1),
+        )
+        return
+    finish_job(job, ExecutionResult(ok=False, message=f"error: {error}"), connector_name="", error=error)
+
+
+def requeue_stale(lease_seconds: int = EXECUTOR_LEASE_SECONDS) -> Tuple[int, int]:
+    """Release jobs whose lease expired: requeue them, or fail them (like a final
+    connector error) when they already used max_attempts. Returns (requeued, failed)."""
+    msg = f"error: lease expired after {int(lease_seconds)}s (worker lost)"
+    rows = all(
+        """
+        WITH s AS (
+          UPDATE action_jobs
+          SET status=CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+              error=CASE WHEN attempts >= max_attempts THEN :msg ELSE error END,
+              locked_by=NULL,
+              updated_at=now()
+          WHERE status='running' AND locked_at < now() - make_interval(secs => :lease)
+          RETURNING job_id, action_id, action_created_at, case_id, pending_id, action_type, status
+        ),
+        a AS (
+          UPDATE agent_actions t
+          SET result=:msg
+          FROM s
+          WHERE s.status = 'failed' AND t.action_id = s.action_id AND t.created_at = s.action_created_at
+          RETURNING t.action_id
+        ),
+        p AS (
+          UPDATE pending_actions p
+          SET status='blocked', execution_result=:msg, updated_at=now()
+          FROM s
+          WHERE s.status = 'failed' AND p.pending_id = s.pending_id AND p.status = 'queued'
+          RETURNING p.pending_id
+        )
+        SELECT job_id, action_id, case_id, pending_id, action_type, status FROM s
+        """,
+        lease=int(lease_seconds),
+        msg=msg,
+    )
+    failed = [r for r in rows if r["status"] == "failed"]
+    if failed:
+        publish_many([ev for r in failed for ev in _result_events(r, False)])
+    return len(rows) - len(failed), len(failed)
+
+
+def run_job(job: Dict[str, Any]) -> None:
+    connector = get_erp_connector()
+    payload = job.get("payload") or {}
+    if isinstance(payload, str):
+        payload = json.loads(payload)
+    try:
+        res = connector.execute(str(job["action_type"]), dict(payload))
+    except Exception as e:
+        fail_or_retry(job, f"{type(e).__name__}: {e}")
+        return
+    finish_job(job, res, connector.name)
+
+
+def run_once(worker_id: str, limit: int = 1) -> int:
+    """Claim and run up to `limit` jobs. Returns how many were processed."""
+    jobs = claim_jobs(worker_id, limit=limit)
+    for job in jobs:
+        run_job(job)
+    return len(jobs)
+
+
+def worker_loop(worker_id: str, stop: threading.Event, poll_seconds: float = EXECUTOR_POLL_SECONDS) -> None:
+    while not stop.is_set():
+        try:
+            if run_once(worker_id):
+                continue  # drain without sleeping while there is work
+        except Exception as e:
+            print(f"[executor] {worker_id} error: {e}")
+        stop.wait(poll_seconds)
+
+
+def main():
+    workers = max(1, int(os.getenv("EXECUTOR_WORKERS", str(EXECUTOR_WORKERS))))
+    base = f"{socket.gethostname()}:{os.getpid()}"
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=worker_loop, args=(f"{base}:{n}", stop), name=f"executor-{n}", daemon=True)
+        for n in range(workers)
+    ]
+    for t in threads:
+        t.start()
+    print(f"[executor] {datetime.now(timezone.utc).isoformat()} started workers={workers}")
+
+    try:
+        while True:
+            time.sleep(max(10, EXECUTOR_LEASE_SECONDS // 2))
+            try:
+                requeued, failed = requeue_stale()
+                if requeued or failed:
+                    print(f"[executor] stale jobs requeued={requeued} failed={failed}")
+            except Exception as e:
+                print(f"[executor] requeue error: {e}")
+    except KeyboardInterrupt:
+        stop.set()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""SLA sweeper: mark overdue open Kanban cards as breached.
+
+kanban_cards.sla_due_at is persisted on write (trigger kanban_cards_sla), so
+finding overdue cards is a range scan on idx_kanban_cards_status_sla_due
+instead of a per-row computation. Each sweep flips `breached` on cards that
+crossed their due date since the last sweep and publishes one
+`card` / `sla_breached` change-feed event per card. Resolving a card or
+moving its due date into the future clears the flag again (trigger).
+
+Any number of sweepers can run: rows are claimed with SKIP LOCKED.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from ..change_feed import publish_many
+from ..config import SLA_SWEEP_BATCH, SLA_SWEEP_SECONDS
+from ..db import all
+
+
+def sweep_once(limit: int = SLA_SWEEP_BATCH) -> List[Dict[str, Any]]:
+    """Mark up to `limit` newly overdue cards breached; returns the flipped cards."""
+    rows = all(
+        """
+        WITH due AS (
+          SELECT card_id FROM kanban_cards
+          WHERE status IN ('todo', 'in_progress', 'blocked')
+            AND sla_due_at < now()
+            AND NOT breached
+          ORDER BY sla_due_at
+          LIMIT :lim
+          FOR UPDATE SKIP LOCKED
+        )
+        UPDATE kanban_cards k
+        SET breached = TRUE
+        FROM due
+        WHERE k.card_id = due.card_id
+        RETURNING k.card_id, k.case_id, k.status, k.sla_due_at
+        """,
+        lim=int(limit),
+    )
+    publish_many(
+        (
+            "card",
+            r["card_id"],
+            "sla_breached",
+            {"case_id": str(r["case_id"]) if r.get("case_id") else None, "status": r["status"], "sla_due_at": r["sla_due_at"]},
+        )
+        for r in rows
+    )
+    return rows
+
+
+def sweep(limit: int = SLA_SWEEP_BATCH) -> int:
+    """Sweep in batches until no overdue unflagged card is left. Returns how many were flipped."""
+    total = 0
+    while True:
+        n = len(sweep_once(limit))
+        total += n
+        if n < limit:
+            return total
+
+
+def main():
+    while True:
+        try:
+            n = sweep()
+            if n:
+                print(f"[sla_sweeper] {datetime.now(timezone.utc).isoformat()} breached={n}")
+        except Exception as e:
+            print(f"[sla_sweeper] error: {e}")
+        time.sleep(SLA_SWEEP_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
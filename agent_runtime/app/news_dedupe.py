@@ -0,0 +1,223 @@
+"""Near-duplicate news clustering (SimHash + LSH bands).
+
+The same story is syndicated under many URLs, so url dedupe is not enough.
+Each new item gets a 64-bit SimHash over word 3-shingles of title + summary.
+Items within NEWS_SIMHASH_MAX_DISTANCE differing bits (default 6; rewordings
+of one story land around 2-8, unrelated headlines around 30) join the cluster
+of the item they match; otherwise they start a cluster named after their own
+item_id. news_items.cluster_id holds the result and /news/items?collapse=true
+shows one item per cluster.
+
+Lookups use LSH banding: the signature is cut into 4 bands of 16 bits and only
+items sharing a band are compared (popcount), about 4 * N / 65536 candidates.
+Pairs within 3 bits always share a band; pairs 4-6 bits apart are found when
+they do (most of them). The index keeps signatures in flat arrays (about 30
+bytes per item) and is warmed from the news_signatures table for the last
+NEWS_DEDUPE_WARM_DAYS. Items the local index cannot place are probed once
+more in the table (one statement per batch, nearest match computed in SQL),
+which finds items written by other API replicas.
+
+Clustering never fails an ingest: errors are logged and the items simply stay
+unclustered.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from . import config
+from .db import all, q, stream
+
+log = logging.getLogger("news_dedupe")
+
+BANDS = 4
+BAND_BITS = 16
+_MASK64 = (1 << 64) - 1
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _shingles(text: str, k: int = 3) -> List[str]:
+    words = _TOKEN.findall(text.lower())
+    if len(words) <= k:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + k]) for i in range(len(words) - k + 1)]
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of the word 3-shingles of `text` (unsigned)."""
+    votes = [0] * 64
+    for sh in _shingles(text):
+        h = int.from_bytes(hashlib.blake2b(sh.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            votes[bit] += 1 if (h >> bit) & 1 else -1
+    sig = 0
+    for bit, v in enumerate(votes):
+        if v > 0:
+            sig |= 1 << bit
+    return sig
+
+
+def bands(sig: int) -> List[int]:
+    return [(sig >> (b * BAND_BITS)) & 0xFFFF for b in range(BANDS)]
+
+
+def to_signed(sig: int) -> int:
+    """Unsigned 64-bit -> Postgres BIGINT."""
+    return sig - (1 << 64) if sig >= 1 << 63 else sig
+
+
+def distance(a: int, b: int) -> int:
+    return ((a ^ b) & _MASK64).bit_count()
+
+
+class SimHashIndex:
+    """In-memory LSH index: band value -> positions into flat signature/cluster arrays."""
+
+    def __init__(self, max_distance: int = 6):
+        self.max_distance = int(max_distance)
+        self._sigs = array("Q")
+        self._cluster_idx = array("I")
+        self._clusters: List[str] = []
+        self._cluster_pos: Dict[str, int] = {}
+        self._buckets: List[Dict[int, array]] = [{} for _ in range(BANDS)]
+        self._lock = threading.Lock()
+        self.warmed = False
+
+    def __len__(self) -> int:
+        return len(self._sigs)
+
+    def lookup(self, sig: int) -> Optional[str]:
+        """Cluster of the closest indexed signature within max_distance (None = no match)."""
+        best: Tuple[int, Optional[str]] = (self.max_distance + 1, None)
+        with self._lock:
+            for b, val in enumerate(bands(sig)):
+                for pos in self._buckets[b].get(val, ()):
+                    d = distance(sig, self._sigs[pos])
+                    if d < best[0]:
+                        best = (d, self._clusters[self._cluster_idx[pos]])
+                        if d == 0:
+                            return best[1]
+        return best[1]
+
+    def add(self, sig: int, cluster_id: str) -> None:
+        with self._lock:
+            ci = self._cluster_pos.get(cluster_id)
+            if ci is None:
+                ci = self._cluster_pos[cluster_id] = len(self._clusters)
+                self._clusters.append(cluster_id)
+            pos = len(self._sigs)
+            self._sigs.append(sig & _MASK64)
+            self._cluster_idx.append(ci)
+            for b, val in enumerate(bands(sig)):
+                bucket = self._buckets[b].get(val)
+                if bucket is None:
+                    bucket = self._buckets[b][val] = array("I")
+                bucket.append(pos)
+
+
+def _remote_matches(sigs: Dict[str, int], max_distance: int) -> Dict[str, str]:
+    """Nearest stored signature per probe (band index lookup + popcount in SQL)."""
+    probes = [
+        {"item_id": iid, "simhash": to_signed(sig), **{f"band{b}": v for b, v in enumerate(bands(sig))}}
+        for iid, sig in sigs.items()
+    ]
+    rows = all(
+        """
+        SELECT p.item_id, m.cluster_id
+        FROM jsonb_to_recordset(CAST(:probes AS JSONB))
+          AS p(item_id TEXT, simhash BIGINT, band0 INT, band1 INT, band2 INT, band3 INT)
+        CROSS JOIN LATERAL (
+          SELECT s.cluster_id, bit_count((s.simhash # p.simhash)::bit(64)) AS d
+          FROM news_signatures s
+          WHERE s.band0 = p.band0 OR s.band1 = p.band1 OR s.band2 = p.band2 OR s.band3 = p.band3
+          ORDER BY d
+          LIMIT 1
+        ) m
+        WHERE m.d <= :maxd
+        """,
+        probes=json.dumps(probes),
+        maxd=int(max_distance),
+    )
+    return {str(r["item_id"]): str(r["cluster_id"]) for r in rows}
+
+
+_index: Optional[SimHashIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> SimHashIndex:
+    """Process-wide index, warmed from news_signatures on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SimHashIndex(config.NEWS_SIMHASH_MAX_DISTANCE)
+        if not _index.warmed:
+            for r in stream(
+                """
+                SELECT simhash, cluster_id FROM news_signatures
+                WHERE created_at >= now() - make_interval(days => :d)
+                ORDER BY created_at
+                """,
+                chunk_size=10000,
+                d=int(config.NEWS_DEDUPE_WARM_DAYS),
+            ):
+                _index.add(int(r["simhash"]), str(r["cluster_id"]))
+            _index.warmed = True
+        return _index
+
+
+def assign_clusters(items: List[Tuple[str, str]]) -> Dict[str, str]:
+    """Cluster newly inserted (item_id, text) pairs and persist signatures + cluster_id.
+
+    Returns {item_id: cluster_id}; an item that starts a cluster maps to itself.
+    """
+    if not items:
+        return {}
+    index = get_index()
+    sigs = {str(iid): simhash(text or "") for iid, text in items}
+
+    # Items the local index cannot place may match rows written by other replicas.
+    misses = [iid for iid, sig in sigs.items() if index.lookup(sig) is None]
+    remote = _remote_matches({iid: sigs[iid] for iid in misses}, index.max_distance) if misses else {}
+
+    out: Dict[str, str] = {}
+    rows = []
+    for iid, sig in sigs.items():
+        # In order, so later items of this batch match earlier ones through the index.
+        cluster_id = index.lookup(sig) or remote.get(iid) or iid
+        index.add(sig, cluster_id)
+        out[iid] = cluster_id
+        rows.append(
+            {"item_id": iid, "simhash": to_signed(sig), **{f"band{b}": v for b, v in enumerate(bands(sig))}, "cluster_id": cluster_id}
+        )
+
+    q(
+        """
+        WITH s AS (
+          INSERT INTO news_signatures(item_id, simhash, band0, band1, band2, band3, cluster_id)
+          SELECT r.item_id, r.simhash, r.band0, r.band1, r.band2, r.band3, r.cluster_id
+          FROM jsonb_to_recordset(CAST(:rows AS JSONB))
+            AS r(item_id UUID, simhash BIGINT, band0 INT, band1 INT, band2 INT, band3 INT, cluster_id UUID)
+          ON CONFLICT (item_id) DO NOTHING
+          RETURNING item_id, cluster_id
+        )
+        UPDATE news_items n SET cluster_id = s.cluster_id FROM s WHERE n.item_id = s.item_id
+        """,
+        rows=json.dumps(rows),
+    )
+    return out
+
+
+def cluster_items(items: List[Tuple[str, str]]) -> Dict[str, str]:
+    """assign_clusters() that never raises (ingest must not fail on clustering)."""
+    try:
+        return assign_clusters(items)
+    except Exception as e:
+        log.warning("news clustering failed: %s", e)
+        return {}
@@ -0,0 +1,116 @@
+"""Per-resource news features for the risk model.
+
+news_resource_features keeps one row per resource with exponentially decayed
+sums over the linked news items (time constants 24h and 7d):
+
+- items_24h / items_7d: item counts
+- sev_24h / sev_7d: severity-weighted counts (severity / 100 per item)
+- themes_7d: {theme: decayed count}, themes from signals.theme and the
+  monitor's matched keyword terms (leak* -> leakage, ...)
+
+The news linker adds each batch's contributions in the same statement that
+writes the links (decaying the stored values to now first), so the row is
+always current and the runner reads O(resources) rows instead of raw news.
+A decayed sum behaves like a rolling window without having to subtract the
+items that fall out of it.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .db import all
+
+TAU_24H = 86400.0
+TAU_7D = 7 * 86400.0
+# A theme is flagged while its decayed 7d count is at least this (one fresh item ~ 1.0).
+THEME_FLAG_MIN = 0.5
+MOMENTUM_CAP = 10.0
+
+_THEME_ALIASES = {
+    "leak": "leakage",
+    "leaks": "leakage",
+    "leaking": "leakage",
+    "dump": "dumping",
+    "shortages": "shortage",
+    "discount": "price_cut",
+    "price cut": "price_cut",
+    "price cuts": "price_cut",
+}
+
+
+def item_themes(signals: Dict[str, Any]) -> List[str]:
+    raw: List[str] = []
+    theme = signals.get("theme")
+    raw += theme if isinstance(theme, list) else [theme] if theme else []
+    raw += list(signals.get("matched_terms") or [])
+    out = []
+    for t in raw:
+        name = str(t).strip().lower().rstrip("*").strip().replace("_", " ")
+        name = _THEME_ALIASES.get(name, name).replace(" ", "_")
+        if name and name not in out:
+            out.append(name)
+    return out
+
+
+def contributions(
+    items: Iterable[Tuple[Dict[str, Any], Dict[str, Any], Iterable[str]]],
+    now: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Per-resource feature increments for (item, signals, resource_ids) triples.
+
+    Each item counts with its own age, so linking a backlog does not look
+    like a burst of fresh news.
+    """
+    now = now or datetime.now(timezone.utc)
+    acc: Dict[str, Dict[str, Any]] = {}
+    for it, signals, rids in items:
+        ts = it["fetched_at"]
+        age = max(0.0, (now - ts).total_seconds())
+        d24, d7 = math.exp(-age / TAU_24H), math.exp(-age / TAU_7D)
+        sev = int(it.get("severity") or 0) / 100.0
+        themes = item_themes(signals)
+        for rid in rids:
+            a = acc.setdefault(rid, {"resource_id": rid, "items_24h": 0.0, "items_7d": 0.0, "sev_24h": 0.0, "sev_7d": 0.0, "themes": {}, "last_item_at": ts})
+            a["items_24h"] += d24
+            a["items_7d"] += d7
+            a["sev_24h"] += sev * d24
+            a["sev_7d"] += sev * d7
+            for t in themes:
+                a["themes"][t] = a["themes"].get(t, 0.0) + d7
+            a["last_item_at"] = max(a["last_item_at"], ts)
+    for a in acc.values():
+        a["last_item_at"] = a["last_item_at"].isoformat()
+    return list(acc.values())
+
+
+def features_at(row: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Decay a stored news_resource_features row to `now` and derive momentum / theme flags."""
+    now = now or datetime.now(timezone.utc)
+    age = max(0.0, (now - row["updated_at"]).total_seconds())
+    d24, d7 = math.exp(-age / TAU_24H), math.exp(-age / TAU_7D)
+    sev_24h = float(row["sev_24h"]) * d24
+    sev_7d = float(row["sev_7d"]) * d7
+    # Last day's rate vs. the week's average daily rate (1.0 = steady, >1 = accelerating).
+    momentum = min(MOMENTUM_CAP, sev_24h / (sev_7d / 7.0)) if sev_7d > 1e-9 else 0.0
+    themes = {k: float(v) * d7 for k, v in (row.get("themes_7d") or {}).items()}
+    last = row.get("last_item_at")
+    return {
+        "news_items_24h": round(float(row["items_24h"]) * d24, 3),
+        "news_items_7d": round(float(row["items_7d"]) * d7, 3),
+        "news_severity_24h": round(sev_24h, 3),
+        "news_severity_7d": round(sev_7d, 3),
+        "news_momentum": round(momentum, 3),
+        "news_themes": sorted(t for t, v in themes.items() if v >= THEME_FLAG_MIN),
+        "news_last_item_at": last.isoformat() if isinstance(last, datetime) else last,
+    }
+
+
+def load_news_features(now: Optional[datetime] = None) -> Dict[str, Dict[str, Any]]:
+    rows = all(
+        """SELECT resource_id, items_24h, items_7d, sev_24h, sev_7d, themes_7d, last_item_at, updated_at
+           FROM news_resource_features"""
+    )
+    return {r["resource_id"]: features_at(r, now) for r in rows}
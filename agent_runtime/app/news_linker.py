@@ -0,0 +1,330 @@
+"""Incremental news -> resource / case linker (a runner.tick stage).
+
+Each pass reads only news items past the `news_linker` watermark (keyset on
+(fetched_at, item_id), served by idx_news_items_fetched_item), so the cost
+is proportional to new items, not to the table. Items younger than
+`lag_seconds` are left for the next pass: fetched_at is the inserting
+transaction's start time, and a slow ingest could otherwise commit behind
+the watermark.
+
+Items are matched to resources with the entity dictionary in
+news_link_policy.entities (resource_id -> category / product / vendor names)
+against signals.category / product / vendor, plus resource ids named in
+signals.resource_id(s) or in the title. A vendor alone only links when the
+item names no category or product (Samsung makes DRAM and NAND).
+
+Links are written in bulk to news_links together with the resource's open
+case; news_items.case_id gets the highest-risk linked case and the
+resource's news features (app/news_features.py) are updated. Items at or above
+the policy severity threshold raise a news_alert (once per item). All writes
+of a batch and the watermark advance happen in one statement, guarded by a
+compare-and-set on the watermark, so concurrent runners never double-process.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .change_feed import publish_many
+from .db import all, one, q
+from .news_features import contributions
+from .policy_store import load_policy
+
+JOB = "news_linker"
+DEFAULT_BATCH_SIZE = 2000
+DEFAULT_MAX_BATCHES = 20
+DEFAULT_LAG_SECONDS = 5
+DEFAULT_ALERT_MIN_SEVERITY = 80
+ENTITY_KINDS = ("category", "product", "vendor")
+OPEN_CASE_STATUSES = ("AT_RISK", "MITIGATION")
+
+_SPACE = re.compile(r"[\s_\-]+")
+_TOKEN = re.compile(r"[a-z0-9_]+")
+
+
+def link_config(policy: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    p = policy if policy is not None else (load_policy() or {})
+    lp = (p or {}).get("news_link_policy") or {}
+    return {
+        "batch_size": max(1, int(lp.get("batch_size") or DEFAULT_BATCH_SIZE)),
+        "max_batches": max(1, int(lp.get("max_batches") or DEFAULT_MAX_BATCHES)),
+        "lag_seconds": max(0, int(lp.get("lag_seconds") if lp.get("lag_seconds") is not None else DEFAULT_LAG_SECONDS)),
+        "alert_min_severity": int(lp.get("alert_min_severity") or DEFAULT_ALERT_MIN_SEVERITY),
+        "topic_alert_min_severity": {str(k): int(v) for k, v in (lp.get("topic_alert_min_severity") or {}).items()},
+        "entities": lp.get("entities") or {},
+    }
+
+
+def _norm(value: Any) -> str:
+    return _SPACE.sub(" ", str(value).strip().lower())
+
+
+def _values(v: Any) -> List[str]:
+    if v is None:
+        return []
+    if isinstance(v, (list, tuple, set)):
+        return [_norm(x) for x in v if x is not None and str(x).strip()]
+    return [_norm(v)] if str(v).strip() else []
+
+
+class EntityDictionary:
+    """(kind, normalized name) -> resource ids, plus the set of known resource ids."""
+
+    def __init__(self, entities: Dict[str, Dict[str, Any]], resource_ids: Iterable[str] = ()):
+        self.terms: Dict[Tuple[str, str], Set[str]] = {}
+        self.resource_ids: Set[str] = {str(r) for r in resource_ids} | {str(r) for r in entities}
+        for rid, kinds in entities.items():
+            for kind in ENTITY_KINDS:
+                for name in _values((kinds or {}).get(kind)):
+                    self.terms.setdefault((kind, name), set()).add(str(rid))
+
+    def match(self, title: str, signals: Dict[str, Any]) -> Dict[str, str]:
+        """resource_id -> what matched it (e.g. "category:dram")."""
+        out: Dict[str, str] = {}
+        ids = signals.get("resource_ids") or []
+        named_ids = [signals.get("resource_id")] + ([ids] if isinstance(ids, str) else list(ids))
+        for rid in (str(r).strip() for r in named_ids if r):
+            if rid in self.resource_ids:
+                out.setdefault(rid, f"resource_id:{rid}")
+        for tok in set(_TOKEN.findall((title or "").lower())) & self.resource_ids:
+            out.setdefault(tok, f"title:{tok}")
+
+        named = False
+        for kind in ("category", "product"):
+            for name in _values(signals.get(kind)):
+                named = True
+                for rid in self.terms.get((kind, name), ()):
+                    out.setdefault(rid, f"{kind}:{name}")
+        if not out and not named:
+            for name in _values(signals.get("vendor")):
+                for rid in self.terms.get(("vendor", name), ()):
+                    out.setdefault(rid, f"vendor:{name}")
+        return out
+
+
+def _signals(raw: Any) -> Dict[str, Any]:
+    if isinstance(raw, dict):
+        return raw
+    try:
+        v = json.loads(raw) if raw else {}
+        return v if isinstance(v, dict) else {}
+    except Exception:
+        return {}
+
+
+def _open_cases(resource_ids: Set[str]) -> Dict[str, Dict[str, Any]]:
+    """Latest open case per resource (same choice as actions.upsert_case)."""
+    if not resource_ids:
+        return {}
+    rows = all(
+        """
+        SELECT DISTINCT ON (resource_id) resource_id, case_id, risk_score
+        FROM agent_cases
+        WHERE status = ANY(CAST(:st AS TEXT[])) AND resource_id = ANY(CAST(:rids AS TEXT[]))
+        ORDER BY resource_id, updated_at DESC
+        """,
+        st=list(OPEN_CASE_STATUSES),
+        rids=sorted(resource_ids),
+    )
+    return {str(r["resource_id"]): r for r in rows}
+
+
+def _known_resources() -> Set[str]:
+    rows = all(
+        "SELECT DISTINCT resource_id FROM agent_cases WHERE status = ANY(CAST(:st AS TEXT[]))",
+        st=list(OPEN_CASE_STATUSES),
+    )
+    return {str(r["resource_id"]) for r in rows}
+
+
+def link_batch(cfg: Dict[str, Any], entities: EntityDictionary) -> Dict[str, Any]:
+    """Link one batch past the watermark. Returns counts; `items` < batch_size means caught up."""
+    wm = one("SELECT last_ts, last_id FROM job_watermarks WHERE job = :job", job=JOB)
+    if wm is None:
+        q("INSERT INTO job_watermarks(job) VALUES (:job) ON CONFLICT (job) DO NOTHING", job=JOB)
+        wm = one("SELECT last_ts, last_id FROM job_watermarks WHERE job = :job", job=JOB)
+    items = all(
+        """
+        SELECT item_id, fetched_at, topic, title, severity, signals
+        FROM news_items
+        WHERE (fetched_at, item_id) > (:ts, CAST(:id AS UUID))
+          AND fetched_at < now() - make_interval(secs => :lag)
+        ORDER BY fetched_at, item_id
+        LIMIT :lim
+        """,
+        ts=wm["last_ts"],
+        id=str(wm["last_id"]),
+        lag=cfg["lag_seconds"],
+        lim=cfg["batch_size"],
+    )
+    if not items:
+        return {"items": 0, "links": 0, "cases": 0, "alerts": 0}
+
+    signals = {str(it["item_id"]): _signals(it.get("signals")) for it in items}
+    matches = {iid: entities.match(it["title"], signals[iid]) for iid, it in zip(signals, items)}
+    cases = _open_cases({rid for m in matches.values() for rid in m})
+
+    links: List[Dict[str, Any]] = []
+    item_cases: List[Dict[str, Any]] = []
+    alerts: List[Dict[str, Any]] = []
+    thresholds = cfg["topic_alert_min_severity"]
+    for it in items:
+        iid = str(it["item_id"])
+        best: Optional[Dict[str, Any]] = None
+        for rid, how in matches[iid].items():
+            case = cases.get(rid)
+            links.append({"item_id": iid, "resource_id": rid, "case_id": str(case["case_id"]) if case else None, "matched_by": how})
+            if case and (best is None or int(case["risk_score"]) > int(best["risk_score"])):
+                best = case
+        if best is not None:
+            item_cases.append({"item_id": iid, "case_id": str(best["case_id"])})
+        sev = int(it["severity"] or 0)
+        threshold = thresholds.get(str(it["topic"]), cfg["alert_min_severity"])
+        if sev >= threshold:
+            alerts.append(
+                {
+                    "item_id": iid,
+                    "topic": it["topic"],
+                    "severity": sev,
+                    "case_id": str(best["case_id"]) if best else None,
+                    "note": f"severity {sev} >= {threshold}" + (f"; {', '.join(sorted(matches[iid].values()))}" if matches[iid] else ""),
+                }
+            )
+
+    feats = contributions((it, signals[str(it["item_id"])], matches[str(it["item_id"])]) for it in items if matches[str(it["item_id"])])
+
+    last = items[-1]
+    row = one(
+        """
+        WITH w AS (
+          UPDATE job_watermarks
+          SET last_ts = :new_ts, last_id = CAST(:new_id AS UUID), updated_at = now()
+          WHERE job = :job AND last_ts = :ts AND last_id = CAST(:id AS UUID)
+          RETURNING job
+        ),
+        l AS (
+          INSERT INTO news_links(item_id, resource_id, case_id, matched_by)
+          SELECT r.item_id, r.resource_id, r.case_id, r.matched_by
+          FROM jsonb_to_recordset(CAST(:links AS JSONB))
+            AS r(item_id UUID, resource_id TEXT, case_id UUID, matched_by TEXT)
+          WHERE EXISTS (SELECT 1 FROM w)
+          ON CONFLICT (item_id, resource_id) DO NOTHING
+          RETURNING item_id
+        ),
+        c AS (
+          UPDATE news_items n SET case_id = r.case_id
+          FROM jsonb_to_recordset(CAST(:cases AS JSONB)) AS r(item_id UUID, case_id UUID)
+          WHERE n.item_id = r.item_id AND n.case_id IS DISTINCT FROM r.case_id AND EXISTS (SELECT 1 FROM w)
+          RETURNING n.item_id
+        ),
+        a AS (
+          INSERT INTO news_alerts(topic, severity, item_id, case_id, status, note)
+          SELECT r.topic, r.severity, r.item_id, r.case_id, 'open', r.note
+          FROM jsonb_to_recordset(CAST(:alerts AS JSONB))
+            AS r(item_id UUID, topic TEXT, severity INT, case_id UUID, note TEXT)
+          WHERE EXISTS (SELECT 1 FROM w)
+            AND NOT EXISTS (SELECT 1 FROM news_alerts x WHERE x.item_id = r.item_id)
+          RETURNING alert_id, item_id, topic, severity, case_id
+        ),
+        f AS (
+          -- Decay the stored sums to now, then add this batch (app/news_features.py).
+          INSERT INTO news_resource_features AS x
+            (resource_id, items_24h, items_7d, sev_24h, sev_7d, themes_7d, last_item_at, updated_at)
+          SELECT r.resource_id, r.items_24h, r.items_7d, r.sev_24h, r.sev_7d, r.themes, r.last_item_at, now()
+          FROM jsonb_to_recordset(CAST(:feats AS JSONB))
+            AS r(resource_id TEXT, items_24h FLOAT8, items_7d FLOAT8, sev_24h FLOAT8, sev_7d FLOAT8, themes JSONB, last_item_at TIMESTAMPTZ)
+          WHERE EXISTS (SELECT 1 FROM w)
+          ON CONFLICT (resource_id) DO UPDATE SET
+            items_24h = x.items_24h * exp(-extract(epoch FROM now() - x.updated_at) / 86400.0) + EXCLUDED.items_24h,
+            items_7d = x.items_7d * exp(-extract(epoch FROM now() - x.updated_at) / 604800.0) + EXCLUDED.items_7d,
+            sev_24h = x.sev_24h * exp(-extract(epoch FROM now() - x.updated_at) / 86400.0) + EXCLUDED.sev_24h,
+            sev_7d = x.sev_7d * exp(-extract(epoch FROM now() - x.updated_at) / 604800.0) + EXCLUDED.sev_7d,
+            themes_7d = (
+              SELECT COALESCE(jsonb_object_agg(t.k, t.v), '{}'::jsonb)
+              FROM (
+                SELECT k, sum(v) AS v
+                FROM (
+                  SELECT key AS k, value::float8 * exp(-extract(epoch FROM now() - x.updated_at) / 604800.0) AS v
+                  FROM jsonb_each_text(x.themes_7d)
+                  UNION ALL
+                  SELECT key, value::float8 FROM jsonb_each_text(EXCLUDED.themes_7d)
+                ) u
+                GROUP BY k
+              ) t
+              WHERE t.v >= 0.01
+            ),
+            last_item_at = GREATEST(x.last_item_at, EXCLUDED.last_item_at),
+            updated_at = now()
+          RETURNING resource_id
+        )
+        SELECT (SELECT count(*) FROM w) AS advanced,
+               (SELECT count(*) FROM l) AS links,
+               (SELECT count(*) FROM c) AS cases,
+               (SELECT COALESCE(jsonb_agg(a), '[]'::jsonb) FROM a) AS alerts
+        """,
+        job=JOB,
+        ts=wm["last_ts"],
+        id=str(wm["last_id"]),
+        new_ts=last["fetched_at"],
+        new_id=str(last["item_id"]),
+        links=json.dumps(links),
+        cases=json.dumps(item_cases),
+        alerts=json.dumps(alerts),
+        feats=json.dumps(feats),
+    ) or {}
+    if not row.get("advanced"):
+        # Another linker took this batch; nothing was written.
+        return {"items": len(items), "links": 0, "cases": 0, "alerts": 0, "conflict": True}
+
+    raised = row.get("alerts") or []
+    if isinstance(raised, str):
+        raised = json.loads(raised)
+    publish_many(
+        [("news", ic["item_id"], "linked", {"case_id": ic["case_id"]}) for ic in item_cases]
+        + [("news", a["item_id"], "alert", {"alert_id": a["alert_id"], "topic": a["topic"], "severity": a["severity"], "case_id": a.get("case_id")}) for a in raised]
+    )
+    return {"items": len(items), "links": int(row.get("links") or 0), "cases": int(row.get("cases") or 0), "alerts": len(raised)}
+
+
+def link_new_items(policy: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """Process batches until caught up (or max_batches). Returns summed counts."""
+    cfg = link_config(policy)
+    entities = EntityDictionary(cfg["entities"], _known_resources())
+    total = {"items": 0, "links": 0, "cases": 0, "alerts": 0, "batches": 0}
+    for _ in range(cfg["max_batches"]):
+        r = link_batch(cfg, entities)
+        total["batches"] += 1
+        for k in ("items", "links", "cases", "alerts"):
+            total[k] += r[k]
+        if r.get("conflict") or r["items"] < cfg["batch_size"]:
+            break
+    return total
+
+
+def attach_case(case_id: str, resource_id: str, days: int = 30) -> int:
+    """Point recent links of `resource_id` without a case at a newly opened case.
+
+    Items linked before the case existed would otherwise never reach it; this
+    is an index range on (resource_id, created_at), not a rescan.
+    """
+    row = one(
+        """
+        WITH l AS (
+          UPDATE news_links SET case_id = CAST(:cid AS UUID)
+          WHERE resource_id = :rid AND case_id IS NULL AND created_at >= now() - make_interval(days => :d)
+          RETURNING item_id
+        ),
+        n AS (
+          UPDATE news_items n SET case_id = CAST(:cid AS UUID)
+          FROM l WHERE n.item_id = l.item_id AND n.case_id IS NULL
+          RETURNING n.item_id
+        )
+        SELECT count(*) AS n FROM l
+        """,
+        cid=str(case_id),
+        rid=str(resource_id),
+        d=int(days),
+    )
+    return int((row or {}).get("n") or 0)
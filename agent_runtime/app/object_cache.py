@@ -0,0 +1,52 @@
+"""Request-scoped object cache (cards, cases) for guardrail evaluation.
+
+The API middleware opens one cache per HTTP request; rows loaded by routers
+or by execution.load_cards()/load_cases() are remembered for the rest of that
+request, so repeated guardrail checks on the same card/case cost no extra
+queries. Writes through execution.py update the cached row.
+
+Outside a request (runner loop, executor workers) there is no cache and every
+lookup goes to the database.
+"""
+
+from __future__ import annotations
+
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Returned by cache_get() when the key was never cached (None = cached "not found").
+MISS: Any = object()
+
+_CACHE: contextvars.ContextVar[Optional[Dict[Tuple[str, str], Any]]] = contextvars.ContextVar(
+    "object_cache", default=None
+)
+
+
+@contextmanager
+def request_cache() -> Iterator[Dict[Tuple[str, str], Any]]:
+    store: Dict[Tuple[str, str], Any] = {}
+    token = _CACHE.set(store)
+    try:
+        yield store
+    finally:
+        _CACHE.reset(token)
+
+
+def cache_get(kind: str, key: str) -> Any:
+    store = _CACHE.get()
+    if store is None:
+        return MISS
+    return store.get((kind, key), MISS)
+
+
+def cache_put(kind: str, key: str, value: Any) -> None:
+    store = _CACHE.get()
+    if store is not None:
+        store[(kind, key)] = value
+
+
+def cache_pop(kind: str, key: str) -> None:
+    store = _CACHE.get()
+    if store is not None:
+        store.pop((kind, key), None)
@@ -0,0 +1,141 @@
+"""Native Postgres range partitioning for append-only, time-ordered tables.
+
+The schema (seed/00_schema.sql) declares these tables as PARTITION BY RANGE on
+their timestamp column, plus a DEFAULT partition as a safety net. This module:
+
+- keeps future partitions created ahead of time (ensure_time_partitions())
+- enforces retention by dropping whole expired partitions (no row-by-row DELETE)
+
+Partition granularity is fixed by the schema (changing it would create
+overlapping ranges). Only premake/retention is policy-driven.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+from .db import all, one, q
+from .policy_store import load_policy
+
+log = logging.getLogger("partitions")
+
+# table -> (partition column, granularity)
+PARTITIONED_TABLES: Dict[str, Tuple[str, str]] = {
+    "agent_actions": ("created_at", "month"),
+    "audit_log": ("ts", "month"),
+    "dq_results": ("ts", "day"),
+    "agent_predictions": ("ts", "day"),
+}
+
+# Used when governance policy does not specify partition_policy.
+DEFAULT_PREMAKE = {"day": 14, "month": 3}
+DEFAULT_RETAIN_DAYS = {
+    "agent_actions": 400,
+    "audit_log": 400,
+    "dq_results": 30,
+    "agent_predictions": 90,
+}
+
+_PART_RE = re.compile(r"^(?P<parent>[a-z_]+)_p(?P<ymd>\d{8})$")
+
+
+def _partition_policy(policy: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    p = policy if policy is not None else (load_policy() or {})
+    return (p or {}).get("partition_policy") or {}
+
+
+def table_config(table: str, policy: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    _col, gran = PARTITIONED_TABLES[table]
+    pp = _partition_policy(policy)
+    tcfg = ((pp.get("tables") or {}).get(table) or {})
+    premake = tcfg.get("premake", pp.get("premake", DEFAULT_PREMAKE[gran]))
+    retain = tcfg.get("retain_days", DEFAULT_RETAIN_DAYS[table])
+    return {
+        "granularity": gran,
+        "premake": int(premake),
+        # retain_days <= 0 (or null) disables retention for the table.
+        "retain_days": int(retain) if retain is not None else 0,
+    }
+
+
+def _add_months(d: datetime, n: int) -> datetime:
+    m = d.month - 1 + n
+    return d.replace(year=d.year + m // 12, month=m % 12 + 1, day=1)
+
+
+def partition_upper_bound(name: str, granularity: str) -> datetime | None:
+    """Exclusive upper bound of a partition named <parent>_pYYYYMMDD (UTC)."""
+    m = _PART_RE.match(name)
+    if not m:
+        return None
+    lo = datetime.strptime(m.group("ymd"), "%Y%m%d").replace(tzinfo=timezone.utc)
+    if granularity == "day":
+        return lo + timedelta(days=1)
+    return _add_months(lo, 1)
+
+
+def list_partitions(table: str) -> List[str]:
+    rows = all(
+        """
+        SELECT c.relname AS name
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = :parent
+        ORDER BY c.relname
+        """,
+        parent=table,
+    )
+    return [str(r["name"]) for r in rows]
+
+
+def ensure_partitions(policy: Dict[str, Any] | None = None) -> Dict[str, int]:
+    """Create missing current/future partitions. Returns table -> created count.
+
+    Each table is its own statement: a table that fails is logged and counted
+    as 0 instead of keeping the remaining tables from being premade.
+    """
+    out: Dict[str, int] = {}
+    for table in PARTITIONED_TABLES:
+        cfg = table_config(table, policy)
+        try:
+            r = one(
+                "SELECT ensure_time_partitions(:parent, :gran, :premake) AS created",
+                parent=table,
+                gran=cfg["granularity"],
+                premake=cfg["premake"],
+            )
+        except Exception:
+            log.exception("ensure_time_partitions failed for %s", table)
+            out[table] = 0
+            continue
+        out[table] = int((r or {}).get("created") or 0)
+    return out
+
+
+def drop_expired_partitions(
+    table: str,
+    *,
+    retain_days: int,
+    now: datetime | None = None,
+) -> List[str]:
+    """Drop partitions whose whole range is older than the retention cutoff."""
+    if retain_days <= 0:
+        return []
+    _col, gran = PARTITIONED_TABLES[table]
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=retain_days)
+
+    dropped: List[str] = []
+    for name in list_partitions(table):
+        m = _PART_RE.match(name)
+        if not m or m.group("parent") != table:
+            continue  # DEFAULT partition or foreign naming: never drop
+        upper = partition_upper_bound(name, gran)
+        if upper is not None and upper <= cutoff:
+            # Name is validated by _PART_RE, so quoting is safe.
+            q(f'DROP TABLE IF EXISTS "{name}"')
+            dropped.append(name)
+    return dropped
@@ -1,5 +1,24 @@
+import math
+
+# News pressure can add at most this many points on top of the market/supply score.
+NEWS_MAX_BUMP = 15
+NEWS_ALARM_THEMES = ("shortage", "leakage")
+
 def clamp(x, lo=0, hi=100): return max(lo, min(hi, x))
-def compute_risk(resource_signals: dict, supplier_otif: dict):
+
+def news_bump(news: dict | None) -> int:
+    """Risk points from a resource's news features (app/news_features.py); 0 without news."""
+    if not news:
+        return 0
+    pressure = float(news.get("news_severity_7d") or 0.0)
+    bump = 3.0 * math.log2(1.0 + pressure)
+    if float(news.get("news_momentum") or 0.0) >= 1.5:
+        bump *= 1.25
+    if any(t in (news.get("news_themes") or []) for t in NEWS_ALARM_THEMES):
+        bump += 5
+    return int(round(min(NEWS_MAX_BUMP, bump)))
+
+def compute_risk(resource_signals: dict, supplier_otif: dict, news: dict | None = None):
     price = resource_signals.get("price_index", 1.0)
     market = 90 if price>=1.30 else 70 if price>=1.20 else 50 if price>=1.10 else 30
     if supplier_otif:
@@ -8,7 +27,12 @@ def compute_risk(resource_signals: dict, supplier_otif: dict):
     else:
         worst = None
         supply = 40
-    risk=int(round(0.55*market+0.45*supply))
+    bump=news_bump(news)
+    risk=int(round(0.55*market+0.45*supply))+bump
     conf=0.75 if risk>=70 else 0.6
     ltf=21 if risk>=85 else 45 if risk>=70 else 90
-    return clamp(risk), conf, ltf, {"price_index":price,"worst_supplier_otif":worst}
+    features={"price_index":price,"worst_supplier_otif":worst}
+    if news:
+        features.update(news)
+        features["news_risk_bump"]=bump
+    return clamp(risk), conf, ltf, features
@@ -9,28 +9,41 @@ from .decision import score_decisions
 from .actions import upsert_case, write_recommendations, slack_alert
 from .scenarios import persist_scenarios
 from .db import q, wait_for_db
+from .change_feed import publish
 from .audit import with_audit
+from .partitions import ensure_partitions
+from .news_linker import attach_case, link_new_items
+from .news_features import load_news_features
 
 def tick():
     ing=ingest_all()
     print("Ingested:", ing, flush=True)
 
+    try:
+        print("News linked:", link_new_items(), flush=True)
+    except Exception as e:
+        print("News linking failed:", repr(e), flush=True)
+
     if not run_blocking_gates():
         print("DQ BLOCK: skipping case creation this tick", flush=True)
         return
 
     market=load_latest_market_signals()
     otif=load_supplier_otif_latest()
+    news=load_news_features()
 
     for rid, sigs in market.items():
-        risk, conf, ltf, features = compute_risk(sigs, otif)
+        risk, conf, ltf, features = compute_risk(sigs, otif, news.get(rid))
         q("""INSERT INTO agent_predictions(resource_id,risk_score,confidence,predicted_window_days,features)
              VALUES(:rid,:r,:c,:w,CAST(:f AS JSONB))""", rid=rid, r=risk, c=conf, w=ltf, f=json.dumps(features))
 
         if risk < RISK_CREATE_THRESHOLD:
             continue
 
-        case_id,_=upsert_case(rid, risk, conf, ltf, features)
+        case_id,created=upsert_case(rid, risk, conf, ltf, features)
+        publish("case", case_id, "created" if created else "updated", resource_id=rid, risk_score=risk, confidence=conf)
+        if created:
+            attach_case(case_id, rid)
         persist_scenarios(case_id, risk)
         recs=score_decisions(risk)
         write_recommendations(case_id, recs)
@@ -56,6 +69,10 @@ def tick():
 
 def main():
     wait_for_db(max_seconds=90)
+    try:
+        ensure_partitions()
+    except Exception as e:
+        print("Partition premake failed:", repr(e), flush=True)
     while True:
         try:
             tick()
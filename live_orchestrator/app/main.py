@@ -2,19 +2,22 @@ from __future__ import annotations
 
 import json
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any
 
-import requests
 from fastapi import FastAPI, WebSocket
 from fastapi.websockets import WebSocketDisconnect
 
 from .gemini_live import GeminiLiveBridge, safe_close
 from .tools_backend import (
+    api_get_json_async,
+    api_post_json_async,
     build_grounded_context,
     build_structured_citations,
     classify_tools_for_prompt,
-    run_tools,
+    close_async_client,
+    run_tools_async,
 )
 
 API_BASE = os.getenv("API_BASE", "http://api:8000").rstrip("/")
@@ -22,21 +25,16 @@ ORCHESTRATOR_MODE = os.getenv("ORCHESTRATOR_MODE", "scaffold").strip().lower()
 # scaffold: deterministic websocket bridge (Devpost-friendly)
 # gemini_live: connects to Gemini Live API (keep deterministic commands available)
 
-app = FastAPI(title="Gemini Live Orchestrator", version="0.2")
 
-
-def _api_post(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-    url = f"{API_BASE}{path}"
-    r = requests.post(url, json=payload, timeout=30)
-    r.raise_for_status()
-    return r.json()
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    try:
+        yield
+    finally:
+        await close_async_client()
 
 
-def _api_get(path: str) -> Dict[str, Any]:
-    url = f"{API_BASE}{path}"
-    r = requests.get(url, timeout=30)
-    r.raise_for_status()
-    return r.json()
+app = FastAPI(title="Gemini Live Orchestrator", version="0.2", lifespan=_lifespan)
 
 
 @app.get("/healthz")
@@ -109,7 +107,8 @@ async def ws(websocket: WebSocket):
 
                 # Tool-backed grounding: fetch latest alerts/news/cases when the prompt suggests it.
                 tool_plan = classify_tools_for_prompt(text)
-                tool_results = run_tools(tool_plan) if tool_plan else {"tools": []}
+                # Async on the shared client: a slow API call only waits this session.
+                tool_results = await run_tools_async(tool_plan) if tool_plan else {"tools": []}
 
                 citations = None
                 if tool_results.get("tools"):
@@ -150,7 +149,7 @@ async def ws(websocket: WebSocket):
 
             if cmd == "run_memory_burst":
                 topic = str(data.get("topic") or "memory")
-                res = _api_post(
+                res = await api_post_json_async(
                     "/demo/run_scenario",
                     {
                         "name": "memory_leakage_news_burst",
@@ -168,18 +167,18 @@ async def ws(websocket: WebSocket):
             if cmd == "list_news":
                 topic = data.get("topic")
                 if topic:
-                    res = _api_get(f"/news/items?topic={topic}&limit=50")
+                    res = await api_get_json_async(f"/news/items?topic={topic}&limit=50")
                 else:
-                    res = _api_get("/news/items?limit=50")
+                    res = await api_get_json_async("/news/items?limit=50")
                 await websocket.send_json({"type": "news_items", "topic": topic, "result": res})
                 continue
 
             if cmd == "list_alerts":
                 topic = data.get("topic")
                 if topic:
-                    res = _api_get(f"/news/alerts?topic={topic}&limit=50")
+                    res = await api_get_json_async(f"/news/alerts?topic={topic}&limit=50")
                 else:
-                    res = _api_get("/news/alerts?limit=50")
+                    res = await api_get_json_async("/news/alerts?limit=50")
                 await websocket.send_json({"type": "news_alerts", "topic": topic, "result": res})
                 continue
 
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import os
-from typing import Any, Dict, List, Tuple, Optional
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Optional
+from urllib.parse import urlencode
 
+import httpx
 import requests
 
 API_BASE = os.getenv("API_BASE", "http://api:8000").rstrip("/")
 REQUEST_TIMEOUT = float(os.getenv("TOOL_TIMEOUT_SECONDS", "20"))
+# Tool results are shared across websocket sessions for this long (0 disables the cache).
+TOOL_CACHE_TTL_SECONDS = float(os.getenv("TOOL_CACHE_TTL_SECONDS", "10"))
+TOOL_CACHE_MAX_ENTRIES = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "256"))
+API_MAX_CONNECTIONS = int(os.getenv("API_MAX_CONNECTIONS", "32"))
 
 def api_get_json(path: str) -> Dict[str, Any]:
     url = f"{API_BASE}{path}"
@@ -14,6 +25,35 @@ def api_get_json(path: str) -> Dict[str, Any]:
     r.raise_for_status()
     return r.json()
 
+# One AsyncClient (keep-alive pool) for all websocket sessions; created on first use.
+_client: Optional[httpx.AsyncClient] = None
+
+def get_async_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=API_BASE,
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=API_MAX_CONNECTIONS, max_keepalive_connections=API_MAX_CONNECTIONS),
+        )
+    return _client
+
+async def close_async_client() -> None:
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+
+async def api_get_json_async(path: str) -> Dict[str, Any]:
+    r = await get_async_client().get(path)
+    r.raise_for_status()
+    return r.json()
+
+async def api_post_json_async(path: str, payload: Dict[str, Any], timeout: float = 30.0) -> Dict[str, Any]:
+    r = await get_async_client().post(path, json=payload, timeout=timeout)
+    r.raise_for_status()
+    return r.json()
+
 def _clip(obj: Any, max_chars: int = 6000) -> Any:
     # Avoid flooding Live API turns.
     s = str(obj)
@@ -21,23 +61,72 @@ def _clip(obj: Any, max_chars: int = 6000) -> Any:
         return obj
     return s[:max_chars] + "...(clipped)"
 
+def news_items_path(topic: str = "memory", limit: int = 20) -> str:
+    # One item per near-duplicate cluster, so citations are not the same story N times.
+    return f"/news/items?topic={topic}&limit={limit}&collapse=true"
+
+def news_search_path(q: str, topic: str = "memory", days: Optional[int] = None, limit: int = 10) -> str:
+    # Ranked server-side full-text search; items matching more of the words come first.
+    params: Dict[str, Any] = {"q": q, "topic": topic, "limit": limit, "match": "any"}
+    if days:
+        params["since"] = (datetime.now(timezone.utc) - timedelta(days=int(days))).isoformat()
+    return f"/news/search?{urlencode(params)}"
+
+def news_alerts_path(topic: str = "memory", limit: int = 10) -> str:
+    return f"/news/alerts?topic={topic}&limit={limit}"
+
+def cases_path(limit: int = 10) -> str:
+    # Cases router is mounted at /cases
+    return f"/cases?limit={limit}"
+
+# Tool name -> API path for its args.
+TOOL_PATHS: Dict[str, Callable[..., str]] = {
+    "news_items": news_items_path,
+    "news_search": news_search_path,
+    "news_alerts": news_alerts_path,
+    "cases": cases_path,
+}
+
 def fetch_news_items(topic: str = "memory", limit: int = 20) -> Dict[str, Any]:
-    return api_get_json(f"/news/items?topic={topic}&limit={limit}")
+    return api_get_json(news_items_path(topic, limit))
+
+def search_news(q: str, topic: str = "memory", days: Optional[int] = None, limit: int = 10) -> Dict[str, Any]:
+    return api_get_json(news_search_path(q, topic, days, limit))
 
 def fetch_news_alerts(topic: str = "memory", limit: int = 10) -> Dict[str, Any]:
-    return api_get_json(f"/news/alerts?topic={topic}&limit={limit}")
+    return api_get_json(news_alerts_path(topic, limit))
 
 def fetch_cases(limit: int = 10) -> Dict[str, Any]:
-    # Cases router is mounted at /cases
-    return api_get_json(f"/cases?limit={limit}")
+    return api_get_json(cases_path(limit))
+
+_NEWS_INTENT = ["latest", "recent", "what's new", "update", "signal", "leakage", "oversupply", "price", "inventory"]
+# Words that only express intent; what is left of the prompt becomes the search query.
+_SEARCH_NOISE = set(
+    "latest recent what what's whats new update updates signal signals news any show me tell give the a an "
+    "of in on for about from to is are there any last past days day week weeks".split()
+)
+_LAST_DAYS = re.compile(r"\b(?:last|past)\s+(\d+)\s+days?\b")
+
+def news_search_args(prompt: str) -> Optional[Dict[str, Any]]:
+    """Search query for a prompt ("HBM lead time Korea last 7 days"), or None if nothing is left."""
+    p = prompt.lower()
+    m = _LAST_DAYS.search(p)
+    days = int(m.group(1)) if m else (7 if re.search(r"\b(?:last|past) week\b", p) else None)
+    words = [w for w in re.findall(r"[a-z0-9][a-z0-9'-]*", _LAST_DAYS.sub(" ", p)) if w not in _SEARCH_NOISE and not w.isdigit()]
+    if not words:
+        return None
+    return {"q": " ".join(words), "topic": "memory", "days": days, "limit": 10}
 
 def classify_tools_for_prompt(prompt: str) -> List[Tuple[str, Dict[str, Any]]]:
     p = prompt.lower().strip()
     tools: List[Tuple[str, Dict[str, Any]]] = []
 
     # Very small intent rules to keep demo deterministic and reliable.
-    if any(k in p for k in ["latest", "recent", "what's new", "update", "signal", "leakage", "oversupply", "price", "inventory"]):
+    if any(k in p for k in _NEWS_INTENT) or _LAST_DAYS.search(p):
         tools.append(("news_alerts", {"topic": "memory", "limit": 10}))
+        search = news_search_args(prompt)
+        if search:
+            tools.append(("news_search", search))
         tools.append(("news_items", {"topic": "memory", "limit": 25}))
 
     if any(k in p for k in ["case", "cases", "kanban", "incident", "open case", "status"]):
@@ -53,6 +142,8 @@ def run_tools(tool_plan: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
         try:
             if name == "news_items":
                 data = fetch_news_items(**args)
+            elif name == "news_search":
+                data = search_news(**args)
             elif name == "news_alerts":
                 data = fetch_news_alerts(**args)
             elif name == "cases":
@@ -64,6 +155,75 @@ def run_tools(tool_plan: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
             out["tools"].append({"name": name, "args": args, "ok": False, "error": str(e)})
     return out
 
+class ToolCache:
+    """Short-TTL cache of tool results keyed by (tool, args), shared by all sessions.
+
+    Concurrent misses for the same key share one in-flight request
+    (single-flight), so N sessions asking the same question cost one API call.
+    The request runs as its own task: a session that disconnects while waiting
+    does not cancel it for the others. Failures are not cached.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256, clock: Callable[[], float] = time.monotonic):
+        self.ttl = float(ttl)
+        self.max_entries = max(1, int(max_entries))
+        self.clock = clock
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(name: str, args: Dict[str, Any]) -> str:
+        return f"{name}:{json.dumps(args, sort_keys=True, default=str)}"
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        hit = self._entries.get(key)
+        if hit is not None and hit[0] > self.clock():
+            self.hits += 1
+            return hit[1]
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._done(k, t))
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: "asyncio.Future[Any]") -> None:
+        self._inflight.pop(key, None)
+        if self.ttl <= 0 or task.cancelled() or task.exception() is not None:
+            return
+        now = self.clock()
+        if len(self._entries) >= self.max_entries:
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            while len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))  # oldest insert first
+        self._entries[key] = (now + self.ttl, task.result())
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+tool_cache = ToolCache(TOOL_CACHE_TTL_SECONDS, TOOL_CACHE_MAX_ENTRIES)
+
+async def _run_tool_async(name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+    path_for = TOOL_PATHS.get(name)
+    if path_for is None:
+        return {"name": name, "args": args, "ok": True, "data": {"error": f"unknown tool {name}"}}
+    try:
+        data = await tool_cache.get(ToolCache.key(name, args), lambda: api_get_json_async(path_for(**args)))
+        return {"name": name, "args": args, "ok": True, "data": _clip(data)}
+    except Exception as e:
+        return {"name": name, "args": args, "ok": False, "error": str(e) or type(e).__name__}
+
+async def run_tools_async(tool_plan: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """run_tools() for the websocket handler: all tools at once on the shared client, cached.
+
+    Results keep plan order; a failing tool only fails its own entry.
+    """
+    results = await asyncio.gather(*(_run_tool_async(name, args) for name, args in tool_plan))
+    return {"tools": list(results)}
+
 def build_grounded_context(tool_results: Dict[str, Any]) -> str:
     """System-style instruction block for grounded answers.
 
@@ -157,12 +317,14 @@ def build_structured_citations(tool_results: Dict[str, Any], max_each: int = 5)
                 score = _pick_float(r, ["score", "severity", "risk_score"])
                 url = _pick_str(r, ["url", "source_url", "link"]) or ""
                 alerts.append({"title": title, "ts": ts, "score": score, "url": url})
-        elif name == "news_items":
+        elif name in ("news_search", "news_items"):
             for r in records[:max_each]:
                 title = _pick_str(r, ["title", "headline", "summary"]) or "(untitled news)"
                 ts = _pick_str(r, ["ts", "published_at", "published", "created_at", "time"]) or ""
                 score = _pick_float(r, ["score", "severity"])
                 url = _pick_str(r, ["url", "source_url", "link"]) or ""
+                if url and any(n["url"] == url for n in news):
+                    continue  # already cited from the search results
                 news.append({"title": title, "ts": ts, "score": score, "url": url})
         elif name == "cases":
             for r in records[:max_each]:
@@ -0,0 +1,95 @@
+"""Benchmark: severity scoring throughput on synthetic headlines.
+
+Compares the previous per-keyword substring scan with the scorer's one
+compiled regex per topic. Both produce the same result (severity plus the
+matched terms for the explanation). Headlines mix general news words with the
+memory vocabulary; --keyword-share sets how many words come from the latter
+(0.15 is about one keyword hit per headline, like a feed), --extra-terms grows
+the keyword list to show how each scales:
+
+    python -m app.bench_scoring --items 100000 [--keyword-share 0.15] [--extra-terms 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from .scoring import Score, Scorer, load_scorer
+
+_WORDS = (
+    "dram nand hbm flash prices spot contract inventory leakage shortage oversupply datacenter "
+    "supplier capacity fab output quarter demand guidance earnings outlook shipments wafer memory "
+    "server cloud hyperscaler margin pricing channel checks analysts report said rises falls"
+).split()
+_FILLER = (
+    "the a of to in and for on with as by from at after amid over new its says could will may than more "
+    "year week market shares stock investors company firm chipmaker maker korea taiwan china us japan "
+    "samsung micron hynix tsmc intel nvidia apple production plant plans expects sees second first third "
+    "half sales revenue profit loss record high low strong weak growth decline"
+).split()
+
+
+def headlines(n: int, seed: int = 1, keyword_share: float = 0.15) -> List[Tuple[str, float]]:
+    rnd = random.Random(seed)
+
+    def word() -> str:
+        return rnd.choice(_WORDS if rnd.random() < keyword_share else _FILLER)
+
+    return [(" ".join(word() for _ in range(rnd.randint(8, 30))), rnd.choice((0.8, 1.0))) for _ in range(n)]
+
+
+def substring_score(terms: Dict[str, float], text: str, weight: float) -> Score:
+    """The original news_monitor.score_item() approach (one `in` check per
+    keyword), keeping the matched terms like the scorer does."""
+    s = text.lower()
+    matched = {kw: pts for kw, pts in terms.items() if kw.rstrip("*") in s}
+    source = 50 * weight
+    return Score(max(0, min(100, int(30 + source) + int(sum(matched.values())))), matched, 30.0, source)
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    t = time.perf_counter()
+    fn()
+    return time.perf_counter() - t
+
+
+def run(items: int, extra_terms: int, keyword_share: float = 0.15, repeat: int = 5) -> Dict[str, Any]:
+    base = load_scorer(os.path.join(os.path.dirname(__file__), "keywords.yaml")).rules("memory")
+    terms = dict(base.terms)
+    terms.update({f"term{i}": 1.0 for i in range(extra_terms)})
+    scorer = Scorer({"topics": {"memory": {"base": base.base, "source_weight_scale": base.source_weight_scale, "terms": terms}}})
+    data = headlines(items, keyword_share=keyword_share)
+
+    out: Dict[str, Any] = {"items": items, "terms": len(terms)}
+    runs: Dict[str, Callable[[], Any]] = {
+        "substring": lambda: [substring_score(terms, text, w) for text, w in data],
+        "scorer": lambda: scorer.score_batch("memory", data),
+    }
+    best = {name: float("inf") for name in runs}
+    for _ in range(max(1, repeat)):  # interleaved, best of `repeat` each
+        for name, fn in runs.items():
+            best[name] = min(best[name], _timed(fn))
+    for name, secs in best.items():
+        out[f"{name}_per_sec"] = int(items / secs)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="News severity scoring benchmark")
+    ap.add_argument("--items", type=int, default=100_000)
+    ap.add_argument("--extra-terms", type=int, default=0)
+    ap.add_argument("--keyword-share", type=float, default=0.15)
+    args = ap.parse_args()
+    r = run(args.items, args.extra_terms, args.keyword_share)
+    print(
+        f"[bench_scoring] items={r['items']} terms={r['terms']} "
+        f"substring={r['substring_per_sec']}/s scorer={r['scorer_per_sec']}/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
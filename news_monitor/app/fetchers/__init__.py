@@ -0,0 +1 @@
+"""News source fetchers for news_monitor."""
@@ -0,0 +1,138 @@
+"""Concurrent RSS/Atom fetcher with conditional GET.
+
+Sources are fetched on a bounded thread pool through one requests.Session, so
+connections to the same host (e.g. news.google.com) are kept alive across
+sources and polls. Every source has its own timeout; a slow or dead feed only
+costs its own slot.
+
+The ETag / Last-Modified validators of each feed are persisted in a small JSON
+file and sent back as If-None-Match / If-Modified-Since, so an unchanged feed
+costs one 304 and is not downloaded or parsed again.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Optional dependency for NEWS_MODE=rss
+try:
+    import feedparser  # type: ignore
+except Exception:
+    feedparser = None  # type: ignore
+
+USER_AGENT = "supply-chain-kanban-news-monitor/1.0"
+
+
+@dataclass
+class FetchResult:
+    source: Any
+    status: int = 0
+    entries: List[Any] = field(default_factory=list)
+    not_modified: bool = False
+    error: Optional[str] = None
+    elapsed_ms: int = 0
+
+
+class FeedStateStore:
+    """Per-feed-URL conditional GET validators, persisted as one JSON file."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, str]] = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._state = dict(json.load(f) or {})
+            except Exception:
+                self._state = {}  # corrupt state only costs one full download
+
+    def get(self, url: str) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._state.get(url) or {})
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        entry = {k: v for k, v in (("etag", etag), ("last_modified", last_modified)) if v}
+        with self._lock:
+            if self._state.get(url) != entry:
+                self._state[url] = entry
+                self._dirty = True
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._state, sort_keys=True)
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+
+
+class FeedFetcher:
+    def __init__(self, *, concurrency: int = 16, timeout: float = 10.0, state_path: Optional[str] = None):
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = float(timeout)
+        self.state = FeedStateStore(state_path)
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="feed-fetch")
+
+    def fetch_one(self, source: Any) -> FetchResult:
+        """Fetch one source (needs .url, optional .timeout). Never raises."""
+        url = str(source.url)
+        headers: Dict[str, str] = {}
+        cached = self.state.get(url)
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        start = time.monotonic()
+        res = FetchResult(source=source)
+        try:
+            r = self.session.get(url, headers=headers, timeout=getattr(source, "timeout", None) or self.timeout)
+            res.status = r.status_code
+            if r.status_code == 304:
+                res.not_modified = True
+            elif r.status_code >= 400:
+                res.error = f"http {r.status_code}"
+            else:
+                if feedparser is None:
+                    raise RuntimeError("feedparser not installed (pip install feedparser)")
+                res.entries = list(feedparser.parse(r.content).entries)
+                self.state.put(url, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+        except Exception as e:
+            res.error = f"{type(e).__name__}: {e}"
+        res.elapsed_ms = int((time.monotonic() - start) * 1000)
+        return res
+
+    def fetch_all(self, sources: List[Any]) -> List[FetchResult]:
+        """Fetch all sources concurrently; results are in `sources` order."""
+        results = list(self._pool.map(self.fetch_one, sources))
+        try:
+            self.state.save()
+        except Exception:
+            pass  # validators are an optimisation; next poll downloads in full
+        return results
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+        self.session.close()
@@ -0,0 +1,141 @@
+"""Local stub RSS server for fetcher tests and offline runs.
+
+    python -m app.fetchers.stub_feeds --port 8090 --feeds 150
+    RSS_ALLOWLIST_PATH=... (urls http://localhost:8090/feeds/<name>) NEWS_MODE=rss ...
+
+Each feed under /feeds/<name> answers with an ETag and Last-Modified and
+honours If-None-Match / If-Modified-Since with 304. Tests change feeds at
+runtime with `publish()`, slow them down with `delay_ms` and read the
+`requests` / `full` / `not_modified` counters.
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+
+class StubFeedServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr: Tuple[str, int]):
+        super().__init__(addr, _Handler)
+        self.feeds: Dict[str, List[Dict[str, str]]] = {}
+        self.versions: Dict[str, int] = {}
+        self.modified: Dict[str, float] = {}
+        self.delay_ms: Dict[str, int] = {}
+        self.requests = 0
+        self.full = 0
+        self.not_modified = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, name: str) -> str:
+        return f"{self.base_url}/feeds/{name}"
+
+    def publish(self, name: str, title: str, link: str, summary: str = "") -> None:
+        with self._lock:
+            self.feeds.setdefault(name, []).insert(0, {"title": title, "link": link, "summary": summary})
+            self.versions[name] = self.versions.get(name, 0) + 1
+            # Whole seconds: Last-Modified has 1s resolution.
+            self.modified[name] = float(int(time.time()) + self.versions[name])
+
+    def render(self, name: str) -> bytes:
+        items = "".join(
+            f"<item><title>{escape(e['title'])}</title><link>{escape(e['link'])}</link>"
+            f"<description>{escape(e['summary'])}</description></item>"
+            for e in self.feeds.get(name, [])
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>{escape(name)}</title>{items}</channel></rss>"
+        ).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StubFeedServer
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+
+    def do_GET(self) -> None:
+        srv = self.server
+        name = self.path.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+        with srv._lock:
+            srv.requests += 1
+            known = self.path.startswith("/feeds/") and name in srv.feeds
+            version = srv.versions.get(name, 0)
+            modified = srv.modified.get(name, 0.0)
+            delay = srv.delay_ms.get(name, 0)
+        if delay:
+            time.sleep(delay / 1000.0)
+        if not known:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        etag = f'"{name}-{version}"'
+        last_modified = formatdate(modified, usegmt=True)
+        if self.headers.get("If-None-Match") == etag or (
+            not self.headers.get("If-None-Match") and self.headers.get("If-Modified-Since") == last_modified
+        ):
+            with srv._lock:
+                srv.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = srv.render(name)
+        with srv._lock:
+            srv.full += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_stub_feeds(host: str = "127.0.0.1", port: int = 0) -> StubFeedServer:
+    """Start a stub feed server on a background thread (port 0 = pick a free port)."""
+    srv = StubFeedServer((host, port))
+    threading.Thread(target=srv.serve_forever, name="stub-feeds", daemon=True).start()
+    return srv
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Stub RSS feed server")
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=8090)
+    ap.add_argument("--feeds", type=int, default=10, help="number of demo feeds (feed-0 .. feed-N-1)")
+    args = ap.parse_args()
+
+    srv = StubFeedServer((args.host, args.port))
+    for n in range(args.feeds):
+        srv.publish(f"feed-{n}", f"DRAM spot prices soften (feed {n})", f"https://example.com/feed-{n}/1")
+    print(f"[stub_feeds] listening on {srv.base_url}/feeds/feed-0 .. feed-{args.feeds - 1}")
+    srv.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
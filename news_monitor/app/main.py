@@ -1,19 +1,22 @@
 from __future__ import annotations
 
+import gzip
 import json
 import os
 import time
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional
 
 import requests
+import yaml
 from dotenv import load_dotenv
 
-# Optional dependency for NEWS_MODE=rss
-try:
-    import feedparser  # type: ignore
-except Exception:
-    feedparser = None  # type: ignore
+from .fetchers.rss import FeedFetcher, FetchResult, feedparser
+from .outbox import Outbox
+from .scheduler import SourceScheduler
+from .scoring import load_scorer
+from .seen import SeenFilter
 
 load_dotenv()
 
@@ -24,6 +27,29 @@ POLL_SECONDS = int(os.getenv("POLL_SECONDS", "30"))
 DEV_MODE = os.getenv("DEV_MODE", "1").strip()  # allow /news/check-now in dev
 
 RSS_ALLOWLIST_PATH = os.getenv("RSS_ALLOWLIST_PATH", "/app/app/rss_sources.yaml")
+KEYWORDS_PATH = os.getenv("KEYWORDS_PATH", os.path.join(os.path.dirname(__file__), "keywords.yaml"))
+
+# RSS fetching: bounded concurrency, default per-source timeout, persisted ETag/Last-Modified.
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "16"))
+FETCH_TIMEOUT_SECONDS = float(os.getenv("FETCH_TIMEOUT_SECONDS", "10"))
+FEED_STATE_PATH = os.getenv("FEED_STATE_PATH", "/app/data/feed_state.json")
+
+# Seen-URL bloom filter: items the API already acknowledged are not posted again.
+SEEN_FILTER_PATH = os.getenv("SEEN_FILTER_PATH", "/app/data/seen_urls.bloom")
+SEEN_FILTER_CAPACITY = int(os.getenv("SEEN_FILTER_CAPACITY", "1000000"))
+
+# Per-source scheduling (NEWS_MODE=rss): `interval:` per source, default POLL_SECONDS.
+NEWS_BACKOFF_AFTER = int(os.getenv("NEWS_BACKOFF_AFTER", "3"))
+NEWS_MAX_BACKOFF = float(os.getenv("NEWS_MAX_BACKOFF", "8"))
+NEWS_JITTER = float(os.getenv("NEWS_JITTER", "0.1"))
+SOURCE_METRICS_PATH = os.getenv("SOURCE_METRICS_PATH", "/app/data/source_metrics.json")
+
+# Outbox: fetched items are queued on disk and posted in bounded gzip batches with retry.
+OUTBOX_PATH = os.getenv("OUTBOX_PATH", "/app/data/outbox.sqlite3")
+OUTBOX_BATCH_ITEMS = int(os.getenv("OUTBOX_BATCH_ITEMS", "200"))
+OUTBOX_BATCH_BYTES = int(os.getenv("OUTBOX_BATCH_BYTES", "1000000"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "20"))
+OUTBOX_RETRY_MAX_SECONDS = float(os.getenv("OUTBOX_RETRY_MAX_SECONDS", "300"))
 
 
 @dataclass
@@ -31,10 +57,18 @@ class RssSource:
     name: str
     url: str
     weight: float = 1.0
-
-
-def _api_post(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-    r = requests.post(f"{API_BASE}{path}", json=payload, timeout=30)
+    timeout: Optional[float] = None  # seconds; default FETCH_TIMEOUT_SECONDS
+    interval: Optional[float] = None  # seconds between polls; default POLL_SECONDS
+    kind: str = "rss"  # adapter that fetches it, see register_adapter()
+
+
+def _api_post(path: str, payload: Dict[str, Any], *, compress: bool = False) -> Dict[str, Any]:
+    if compress:
+        body = gzip.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), compresslevel=6)
+        headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+        r = requests.post(f"{API_BASE}{path}", data=body, headers=headers, timeout=30)
+    else:
+        r = requests.post(f"{API_BASE}{path}", json=payload, timeout=30)
     r.raise_for_status()
     return r.json()
 
@@ -45,107 +79,247 @@ def _api_get(path: str) -> Dict[str, Any]:
     return r.json()
 
 
+def _float(v: Any, default: Optional[float]) -> Optional[float]:
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return default
+
+
 def load_rss_sources() -> List[RssSource]:
-    # Tiny YAML-ish parser (keeps deps minimal). Format is fixed in rss_sources.yaml.
-    # If you prefer full YAML: add PyYAML and parse properly.
-    txt = ""
     try:
         with open(RSS_ALLOWLIST_PATH, "r", encoding="utf-8") as f:
-            txt = f.read()
+            doc = yaml.safe_load(f) or {}
     except FileNotFoundError:
         return []
 
+    raw = doc.get("sources") if isinstance(doc, dict) else doc
     sources: List[RssSource] = []
-    cur: Dict[str, Any] = {}
-    for raw in txt.splitlines():
-        line = raw.strip()
-        if not line or line.startswith("#"):
+    for s in raw or []:
+        if not isinstance(s, dict) or not s.get("name") or not s.get("url"):
             continue
-        if line.startswith("- "):
-            if cur:
-                sources.append(RssSource(**cur))  # type: ignore[arg-type]
-            cur = {}
-            line = line[2:].strip()
-            if line.startswith("name:"):
-                cur["name"] = line.split(":", 1)[1].strip().strip('"')
-        elif ":" in line:
-            k, v = line.split(":", 1)
-            k = k.strip()
-            v = v.strip().strip('"')
-            if k == "weight":
-                try:
-                    cur[k] = float(v)
-                except Exception:
-                    cur[k] = 1.0
-            else:
-                cur[k] = v
-    if cur:
-        sources.append(RssSource(**cur))  # type: ignore[arg-type]
+        sources.append(
+            RssSource(
+                name=str(s["name"]),
+                url=str(s["url"]),
+                weight=_float(s.get("weight"), 1.0) or 0.0,
+                timeout=_float(s.get("timeout"), None),
+                interval=_float(s.get("interval"), None),
+                kind=str(s.get("kind") or "rss"),
+            )
+        )
     return sources
 
 
-KEYWORDS = [
-    ("leak", 30),
-    ("leakage", 30),
-    ("dump", 25),
-    ("inventory", 20),
-    ("oversupply", 20),
-    ("shortage", 18),
-    ("price", 15),
-    ("spot", 10),
-    ("contract", 10),
-    ("HBM", 12),
-    ("DRAM", 12),
-    ("NAND", 12),
-    ("flash", 8),
-    ("datacenter", 10),
-    ("data center", 10),
-    ("AI", 6),
-]
-
-
-def score_item(title: str, summary: str, base: float) -> int:
-    s = (title + " " + summary).lower()
-    score = int(30 + 50 * base)
-    for kw, pts in KEYWORDS:
-        if kw.lower() in s:
-            score += pts
-    return max(0, min(100, score))
-
-
-def fetch_rss_items() -> List[Dict[str, Any]]:
-    if feedparser is None:
-        raise RuntimeError("feedparser not installed (pip install feedparser)")
-
-    sources = load_rss_sources()
+_fetcher: Optional[FeedFetcher] = None
+
+
+def get_fetcher() -> FeedFetcher:
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = FeedFetcher(concurrency=FETCH_CONCURRENCY, timeout=FETCH_TIMEOUT_SECONDS, state_path=FEED_STATE_PATH)
+    return _fetcher
+
+
+# Source adapters by `kind:`. An adapter has fetch_all(sources) -> List[FetchResult]
+# (results in `sources` order, never raising); FetchResult.entries need .title/.link/.summary.
+_adapters: Dict[str, Any] = {}
+
+
+def register_adapter(kind: str, adapter: Any) -> None:
+    _adapters[kind] = adapter
+
+
+def get_adapter(kind: str) -> Optional[Any]:
+    if kind not in _adapters and kind == "rss":
+        if feedparser is None:
+            raise RuntimeError("feedparser not installed (pip install feedparser)")
+        return get_fetcher()
+    return _adapters.get(kind)
+
+
+def fetch_sources(sources: List[RssSource]) -> List[FetchResult]:
+    """Fetch sources through their kind's adapter; results are in `sources` order."""
+    by_kind: Dict[str, List[int]] = defaultdict(list)
+    for i, src in enumerate(sources):
+        by_kind[src.kind].append(i)
+    results: List[Optional[FetchResult]] = [None] * len(sources)
+    for kind, idx in by_kind.items():
+        adapter = get_adapter(kind)
+        if adapter is None:
+            for i in idx:
+                results[i] = FetchResult(source=sources[i], error=f"no adapter for kind {kind!r}")
+            continue
+        for i, res in zip(idx, adapter.fetch_all([sources[i] for i in idx])):
+            results[i] = res
+    return results  # type: ignore[return-value]
+
+
+def items_from_result(res: FetchResult) -> List[Dict[str, Any]]:
+    src = res.source
     items: List[Dict[str, Any]] = []
-    for src in sources:
-        feed = feedparser.parse(src.url)  # type: ignore[attr-defined]
-        for e in feed.entries[:20]:
-            title = getattr(e, "title", "") or ""
-            link = getattr(e, "link", "") or ""
-            summary = getattr(e, "summary", "") or ""
-            score = score_item(title, summary, src.weight)
-            if not link or not title:
-                continue
-            items.append(
-                {
-                    "topic": TOPIC,
-                    "title": title,
-                    "url": link,
-                    "source": src.name,
-                    "score": score,
-                    "summary": summary[:4000],
-                }
-            )
+    for e in res.entries[:20]:
+        title = getattr(e, "title", "") or ""
+        link = getattr(e, "link", "") or ""
+        summary = getattr(e, "summary", "") or ""
+        if not link or not title:
+            continue
+        items.append(
+            {
+                "topic": TOPIC,
+                "title": title,
+                "url": link,
+                "source": src.name,
+                "summary": summary[:4000],
+                "_weight": src.weight,
+            }
+        )
     return items
 
 
-def ingest_items(items: List[Dict[str, Any]]) -> Tuple[int, int]:
-    if not items:
-        return (0, 0)
-    res = _api_post("/news/ingest", {"items": items})
-    return int(res.get("inserted", 0)), int(res.get("deduped", 0))
+def score_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Set severity + matched-term signals on items, one batch per topic."""
+    scorer = load_scorer(KEYWORDS_PATH)
+    by_topic: Dict[str, List[Dict[str, Any]]] = {}
+    for it in items:
+        by_topic.setdefault(it["topic"], []).append(it)
+    for topic, group in by_topic.items():
+        scores = scorer.score_batch(topic, [(f"{it['title']} {it['summary']}", it.pop("_weight", 1.0)) for it in group])
+        for it, sc in zip(group, scores):
+            it["severity"] = sc.severity
+            it["signals"] = {**(it.get("signals") or {}), **sc.signals()}
+    return items
+
+
+def _fetch_stats(results: List[FetchResult]) -> Dict[str, Any]:
+    return {
+        "sources": len(results),
+        "not_modified": sum(1 for r in results if r.not_modified),
+        "errors": {r.source.name: r.error for r in results if r.error},
+        "slowest_ms": max((r.elapsed_ms for r in results), default=0),
+    }
+
+
+_seen: Optional[SeenFilter] = None
+
+
+def get_seen() -> SeenFilter:
+    global _seen
+    if _seen is None:
+        _seen = SeenFilter(capacity=SEEN_FILTER_CAPACITY, path=SEEN_FILTER_PATH)
+    return _seen
+
+
+_outbox: Optional[Outbox] = None
+
+
+def get_outbox() -> Outbox:
+    global _outbox
+    if _outbox is None:
+        _outbox = Outbox(
+            OUTBOX_PATH,
+            batch_items=OUTBOX_BATCH_ITEMS,
+            batch_bytes=OUTBOX_BATCH_BYTES,
+            max_attempts=OUTBOX_MAX_ATTEMPTS,
+            retry_max_s=OUTBOX_RETRY_MAX_SECONDS,
+        )
+    return _outbox
+
+
+def _post_ingest(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return _api_post("/news/ingest", {"items": items}, compress=True)
+
+
+def deliver_outbox() -> Dict[str, Any]:
+    """Post pending outbox batches; acknowledged urls go into the seen filter."""
+    outbox = get_outbox()
+    d = outbox.deliver(_post_ingest)
+    if d.delivered_urls:
+        seen = get_seen()
+        seen.add_many(d.delivered_urls)
+        try:
+            seen.save()
+        except Exception:
+            pass
+    outbox.prune()
+    return {
+        "delivered": d.delivered,
+        "inserted": d.inserted,
+        "deduped": d.deduped,
+        "batches": d.batches,
+        "delivery_error": d.error,
+        "retry_in_s": d.retry_in_s,
+        "outbox": outbox.stats(),
+    }
+
+
+def queue_items(items: List[Dict[str, Any]]) -> List[str]:
+    """Queue items not seen (or queued) before in the outbox; returns their urls."""
+    seen = get_seen()
+    return get_outbox().enqueue(it for it in items if it["url"] not in seen)
+
+
+_scheduler: Optional[SourceScheduler] = None
+
+
+def get_scheduler() -> SourceScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = SourceScheduler(
+            [],
+            default_interval=POLL_SECONDS,
+            backoff_after=NEWS_BACKOFF_AFTER,
+            max_backoff=NEWS_MAX_BACKOFF,
+            jitter=NEWS_JITTER,
+        )
+    return _scheduler
+
+
+def _save_metrics(metrics: Dict[str, Any]) -> None:
+    if not SOURCE_METRICS_PATH:
+        return
+    try:
+        os.makedirs(os.path.dirname(SOURCE_METRICS_PATH) or ".", exist_ok=True)
+        tmp = f"{SOURCE_METRICS_PATH}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(metrics, f, sort_keys=True)
+        os.replace(tmp, SOURCE_METRICS_PATH)
+    except Exception:
+        pass  # metrics are best-effort
+
+
+def run_due_sources() -> Dict[str, Any]:
+    """Fetch the sources that are due into the outbox, deliver pending items and
+    reschedule each source by its result.
+
+    A source counts as changed when it returned an item that was not seen or
+    queued before, so feeds without ETag support back off too.
+    """
+    sched = get_scheduler()
+    sched.update_sources(load_rss_sources())
+    due = sched.take_due()
+    results = fetch_sources(due) if due else []
+    per_source = [items_from_result(res) for res in results]
+    items = [it for got in per_source for it in got]
+    score_items(items)
+    queued = set(queue_items(items))
+    for res, got in zip(results, per_source):
+        sched.record(res.source, changed=any(it["url"] in queued for it in got), error=bool(res.error), elapsed_ms=res.elapsed_ms)
+    ingest = {"queued": len(queued), "skipped_seen": len(items) - len(queued), **deliver_outbox()}
+
+    metrics = sched.metrics()
+    _save_metrics(metrics)
+    wake = sched.next_wake()
+    if ingest["outbox"]["pending"]:
+        retry = ingest["retry_in_s"] or 0.0
+        wake = retry if wake is None else min(wake, retry)
+    return {
+        "fetched": len(items),
+        **ingest,
+        **_fetch_stats(results),
+        "due": {src.name: metrics[src.name] for src in due if src.name in metrics},
+        "next_in_s": round(wake, 3) if wake is not None else None,
+    }
 
 
 def run_once() -> Dict[str, Any]:
@@ -154,9 +328,7 @@ def run_once() -> Dict[str, Any]:
         return {"mode": NEWS_MODE, "hint": "Use /demo/run_scenario to simulate a burst."}
 
     if NEWS_MODE == "rss":
-        rss_items = fetch_rss_items()
-        inserted, deduped = ingest_items(rss_items)
-        return {"mode": NEWS_MODE, "fetched": len(rss_items), "inserted": inserted, "deduped": deduped}
+        return {"mode": NEWS_MODE, **run_due_sources()}
 
     if NEWS_MODE == "check_now":
         # Legacy dev-mode hook (kept for convenience).
@@ -170,12 +342,17 @@ def run_once() -> Dict[str, Any]:
 def main() -> None:
     print(json.dumps({"service": "news_monitor", "api_base": API_BASE, "topic": TOPIC, "mode": NEWS_MODE}))
     while True:
+        wait = float(POLL_SECONDS)
         try:
             out = run_once()
-            print(json.dumps(out))
+            if out.get("due") != {} or out.get("delivered") or out.get("delivery_error"):  # quiet when idle
+                print(json.dumps(out))
+            if out.get("next_in_s") is not None:
+                # Sleep until the next source or outbox retry is due; the cap picks up rss_sources.yaml edits.
+                wait = min(wait, max(0.5, out["next_in_s"]))
         except Exception as e:
             print(json.dumps({"error": str(e), "mode": NEWS_MODE}))
-        time.sleep(POLL_SECONDS)
+        time.sleep(wait)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,223 @@
+"""Durable outbox between fetching and POST /news/ingest.
+
+Fetched items are written to a small SQLite file first (one row per url, so
+an item fetched again while it waits is not queued twice). Delivery reads the
+oldest pending rows in bounded batches (item count and uncompressed bytes),
+posts them gzip-compressed and marks them delivered once the API answered.
+
+When the API is slow or down the items stay on disk and delivery backs off
+(exponential with jitter, capped) without blocking fetching; the next pass
+resumes with the same batch instead of re-fetching and re-posting everything.
+A batch the API rejects for its content (400, 413, 422) is split in halves
+until the bad row is alone; that row is parked at once. Any other failure,
+including other 4xx such as a 404 from a misrouted deploy, is treated like an
+outage: the attempt is counted and delivery backs off. Rows that keep failing
+are parked after `max_attempts`, so neither holds up the queue. Delivered
+rows are kept for `retention_s` (the url key keeps suppressing re-queues
+meanwhile) and then pruned; the seen-URL filter covers them from then on.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Statuses that blame the request body; anything else may succeed on retry.
+REJECTED_STATUSES = frozenset({400, 413, 422})
+
+
+def _rejected(e: Exception) -> bool:
+    """The API refused this body (bad, too large or invalid) and will again."""
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    return status in REJECTED_STATUSES
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    item TEXT NOT NULL,
+    enqueued_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    delivered_at REAL,
+    failed_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox (seq) WHERE delivered_at IS NULL AND failed_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_outbox_delivered ON outbox (delivered_at) WHERE delivered_at IS NOT NULL;
+"""
+
+
+@dataclass
+class DeliveryStats:
+    batches: int = 0
+    delivered: int = 0
+    inserted: int = 0
+    deduped: int = 0
+    failed: int = 0
+    error: Optional[str] = None
+    retry_in_s: Optional[float] = None
+    delivered_urls: List[str] = field(default_factory=list)
+
+
+class Outbox:
+    def __init__(
+        self,
+        path: str,
+        *,
+        batch_items: int = 200,
+        batch_bytes: int = 1_000_000,
+        max_attempts: int = 20,
+        retry_base_s: float = 2.0,
+        retry_max_s: float = 300.0,
+        retention_s: float = 86400.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.batch_items = max(1, int(batch_items))
+        self.batch_bytes = max(1, int(batch_bytes))
+        self.max_attempts = max(1, int(max_attempts))
+        self.retry_base_s = float(retry_base_s)
+        self.retry_max_s = float(retry_max_s)
+        self.retention_s = float(retention_s)
+        self.clock = clock
+        self.fail_streak = 0
+        self.retry_at = 0.0
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def enqueue(self, items: Iterable[Dict[str, Any]]) -> List[str]:
+        """Queue items by url; returns the urls that were not queued (or delivered) before."""
+        rows = [(it["url"], json.dumps(it, separators=(",", ":"), default=str)) for it in items]
+        if not rows:
+            return []
+        now = self.clock()
+        added: List[str] = []
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                for url, item in rows:
+                    cur = self._db.execute("INSERT OR IGNORE INTO outbox (url, item, enqueued_at) VALUES (?, ?, ?)", (url, item, now))
+                    if cur.rowcount:
+                        added.append(url)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return added
+
+    def next_batch(self, limit: Optional[int] = None) -> List[Tuple[int, str, str]]:
+        """Oldest pending rows (seq, url, item json), bounded by batch_items and batch_bytes."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, url, item FROM outbox WHERE delivered_at IS NULL AND failed_at IS NULL ORDER BY seq LIMIT ?",
+                (min(self.batch_items, limit or self.batch_items),),
+            ).fetchall()
+        batch: List[Tuple[int, str, str]] = []
+        size = 0
+        for seq, url, item in rows:
+            if batch and size + len(item) > self.batch_bytes:
+                break
+            batch.append((seq, url, item))
+            size += len(item)
+        return batch
+
+    def mark_delivered(self, seqs: List[int]) -> None:
+        now = self.clock()
+        with self._lock:
+            self._db.executemany("UPDATE outbox SET delivered_at = ? WHERE seq = ?", [(now, s) for s in seqs])
+
+    def mark_attempt(self, seqs: List[int], park: bool = False) -> int:
+        """Count a failed attempt; rows out of attempts (or all, with park) are parked.
+        Returns how many were parked."""
+        now = self.clock()
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany("UPDATE outbox SET attempts = attempts + 1 WHERE seq = ?", [(s,) for s in seqs])
+                cur = self._db.execute(
+                    f"UPDATE outbox SET failed_at = ? WHERE seq IN ({','.join('?' * len(seqs))}) AND attempts >= ?",
+                    (now, *seqs, 0 if park else self.max_attempts),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return cur.rowcount
+
+    def prune(self) -> int:
+        with self._lock:
+            cur = self._db.execute("DELETE FROM outbox WHERE delivered_at < ?", (self.clock() - self.retention_s,))
+        return cur.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending, oldest = self._db.execute(
+                "SELECT count(*), min(enqueued_at) FROM outbox WHERE delivered_at IS NULL AND failed_at IS NULL"
+            ).fetchone()
+            (failed,) = self._db.execute("SELECT count(*) FROM outbox WHERE failed_at IS NOT NULL").fetchone()
+        return {
+            "pending": int(pending),
+            "failed": int(failed),
+            "oldest_pending_s": round(self.clock() - oldest, 1) if oldest is not None else None,
+        }
+
+    def _backoff(self) -> float:
+        delay = min(self.retry_max_s, self.retry_base_s * (2 ** (self.fail_streak - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def deliver(self, post: Callable[[List[Dict[str, Any]]], Dict[str, Any]], max_batches: int = 50) -> DeliveryStats:
+        """Send pending batches through `post(items) -> ingest response` until the
+        queue is empty, a post fails (then back off) or max_batches were sent."""
+        out = DeliveryStats()
+        now = self.clock()
+        if now < self.retry_at:
+            out.retry_in_s = round(self.retry_at - now, 3)
+            return out
+        limit: Optional[int] = None
+        for _ in range(max(1, int(max_batches))):
+            batch = self.next_batch(limit)
+            if not batch:
+                break
+            seqs = [s for s, _, _ in batch]
+            try:
+                res = post([json.loads(item) for _, _, item in batch])
+            except Exception as e:
+                if _rejected(e):
+                    if len(batch) > 1:
+                        limit = len(batch) // 2  # bisect towards the rejected row
+                        continue
+                    out.failed += self.mark_attempt(seqs, park=True)
+                    out.error = f"{type(e).__name__}: {e}"
+                    limit = None
+                    continue
+                out.failed += self.mark_attempt(seqs)
+                out.error = f"{type(e).__name__}: {e}"
+                self.fail_streak += 1
+                self.retry_at = self.clock() + self._backoff()
+                out.retry_in_s = round(self.retry_at - self.clock(), 3)
+                break
+            self.mark_delivered(seqs)
+            limit = None
+            self.fail_streak = 0
+            self.retry_at = 0.0
+            out.batches += 1
+            out.delivered += len(batch)
+            out.inserted += int(res.get("inserted", 0))
+            out.deduped += int(res.get("deduped", 0))
+            out.delivered_urls.extend(u for _, u, _ in batch)
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,157 @@
+"""Per-source poll scheduling for news_monitor.
+
+Every source has its own base interval (`interval:` in rss_sources.yaml,
+default POLL_SECONDS). Due times are kept in a heap, so a pass only fetches
+the sources that are due and the loop sleeps until the next one.
+
+- Backoff: after `backoff_after` unchanged polls in a row (304, or a feed with
+  no entries) the interval doubles per further unchanged poll, up to
+  `max_backoff` x the base interval. The first changed poll resets it.
+  Failed fetches count as unchanged, so a dead feed is not hammered either.
+- Jitter: every next due time is spread by +-`jitter` of the interval, so
+  sources with equal intervals do not stay in lockstep on one host.
+
+Per-source metrics: lag (how late a fetch started vs. its due time) and fetch
+duration (last + EWMA), polls, errors, unchanged streak and current interval.
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+EWMA_ALPHA = 0.2
+
+
+@dataclass
+class SourceState:
+    source: Any
+    interval: float
+    due: float
+    unchanged: int = 0
+    current_interval: float = 0.0
+    polls: int = 0
+    errors: int = 0
+    last_lag_ms: int = 0
+    max_lag_ms: int = 0
+    last_fetch_ms: int = 0
+    avg_fetch_ms: float = 0.0
+    started: Optional[float] = None  # set while a fetch is in flight
+
+
+class SourceScheduler:
+    def __init__(
+        self,
+        sources: Iterable[Any],
+        *,
+        default_interval: float = 30.0,
+        backoff_after: int = 3,
+        max_backoff: float = 8.0,
+        jitter: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self.default_interval = float(default_interval)
+        self.backoff_after = max(1, int(backoff_after))
+        self.max_backoff = max(1.0, float(max_backoff))
+        self.jitter = min(0.5, max(0.0, float(jitter)))
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self._states: Dict[str, SourceState] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = 0
+        self.update_sources(sources)
+
+    def _push(self, st: SourceState) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (st.due, self._seq, st.source.name))
+
+    def _base_interval(self, source: Any) -> float:
+        iv = getattr(source, "interval", None)
+        return max(1.0, float(iv)) if iv else self.default_interval
+
+    def update_sources(self, sources: Iterable[Any]) -> None:
+        """Apply a (re)loaded source list. Known sources keep their schedule and stats;
+        new ones are due now; removed ones drop out of the heap lazily."""
+        now = self.clock()
+        fresh: Dict[str, SourceState] = {}
+        for src in sources:
+            st = self._states.get(src.name)
+            interval = self._base_interval(src)
+            if st is None:
+                st = SourceState(source=src, interval=interval, due=now, current_interval=interval)
+                fresh[src.name] = st
+                self._push(st)
+                continue
+            if st.interval != interval:
+                st.current_interval = interval * st.current_interval / st.interval
+            st.source, st.interval = src, interval
+            fresh[src.name] = st
+        self._states = fresh
+
+    def take_due(self, now: Optional[float] = None) -> List[Any]:
+        """Pop every source due at `now`; they are in flight until `record()`."""
+        now = self.clock() if now is None else now
+        out: List[Any] = []
+        while self._heap and self._heap[0][0] <= now:
+            due, _, name = heapq.heappop(self._heap)
+            st = self._states.get(name)
+            if st is None or st.due != due or st.started is not None:
+                continue  # removed source or superseded entry
+            st.started = now
+            lag = int((now - due) * 1000)
+            st.last_lag_ms = lag
+            st.max_lag_ms = max(st.max_lag_ms, lag)
+            out.append(st.source)
+        return out
+
+    def record(self, source: Any, *, changed: bool, error: bool = False, elapsed_ms: Optional[int] = None) -> None:
+        """Account one finished fetch and schedule the source's next poll."""
+        st = self._states.get(source.name)
+        if st is None:
+            return
+        now = self.clock()
+        started, st.started = st.started, None
+        fetch_ms = int(elapsed_ms if elapsed_ms is not None else (now - (started if started is not None else now)) * 1000)
+        st.polls += 1
+        st.errors += int(bool(error))
+        st.last_fetch_ms = fetch_ms
+        st.avg_fetch_ms = fetch_ms if st.polls == 1 else (1 - EWMA_ALPHA) * st.avg_fetch_ms + EWMA_ALPHA * fetch_ms
+
+        if changed and not error:
+            st.unchanged = 0
+            st.current_interval = st.interval
+        else:
+            st.unchanged += 1
+            if st.unchanged >= self.backoff_after:
+                st.current_interval = min(st.interval * self.max_backoff, st.current_interval * 2)
+        spread = st.current_interval * self.jitter
+        st.due = now + st.current_interval + (self.rng.uniform(-spread, spread) if spread else 0.0)
+        self._push(st)
+
+    def next_wake(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the earliest due source (0 if one is due), None if nothing is scheduled."""
+        now = self.clock() if now is None else now
+        dues = [st.due for st in self._states.values() if st.started is None]
+        return max(0.0, min(dues) - now) if dues else None
+
+    def metrics(self, now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        now = self.clock() if now is None else now
+        return {
+            name: {
+                "interval_s": st.interval,
+                "current_interval_s": round(st.current_interval, 3),
+                "unchanged_polls": st.unchanged,
+                "polls": st.polls,
+                "errors": st.errors,
+                "lag_ms": st.last_lag_ms,
+                "max_lag_ms": st.max_lag_ms,
+                "fetch_ms": st.last_fetch_ms,
+                "avg_fetch_ms": round(st.avg_fetch_ms, 1),
+                "next_in_s": round(max(0.0, st.due - now), 3) if st.started is None else 0.0,
+            }
+            for name, st in self._states.items()
+        }
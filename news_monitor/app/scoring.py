@@ -0,0 +1,190 @@
+"""Keyword severity scoring for news items.
+
+Keyword lists and weights come from keywords.yaml (per topic, see the file
+header). Each topic compiles all of its terms into one regular expression, so
+an item is scanned once in the regex engine instead of once per keyword:
+
+- the terms are merged into a prefix tree (`d(?:ram|ump)`), so the engine
+  never retries the same letters for terms that share them;
+- whole-word terms end in a word boundary, `prefix*` terms and phrases
+  (`data center*` -> `data\\W+center`) stop after the prefix, so the matched
+  text is the term itself and maps back to it with one dict lookup;
+- the pattern starts with a non-word character instead of a word boundary
+  (the text gets a leading space), so the engine only tries positions right
+  after a separator;
+- ASCII text (almost every feed item) is lower-cased and has its separators
+  turned into spaces by one `bytes.translate`, and is matched by a bytes
+  variant of the pattern that starts with a literal space, which the engine
+  finds with a plain character scan;
+- the patterns have no capture groups, which keeps `findall` fast.
+
+A word matching both `x` and `x*` counts for `x*`. Compiled rules are
+immutable and safe to share between threads.
+
+The result also explains itself: the matched terms and their weights go into
+the item's `signals`, next to the base and source parts of the score.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple
+
+import yaml
+
+_WORD = re.compile(r"\w+")
+# ASCII bytes -> lower case, non-word characters -> space.
+_ASCII_FOLD = bytes(
+    c + 32 if 65 <= c <= 90 else c if c >= 128 or chr(c).isalnum() or c == 95 else 32 for c in range(256)
+)
+# Prefix tree keys that are not letters of a term.
+_SEP, _EXACT, _PREFIX = "\x00sep", "\x00exact", "\x00prefix"
+
+
+def _tree_regex(node: Dict[str, Any]) -> str:
+    alts = [re.escape(k) + _tree_regex(v) for k, v in sorted(node.items()) if not k.startswith("\x00")]
+    if _SEP in node:
+        alts.insert(0, r"\W+" + _tree_regex(node[_SEP]))
+    # Longer terms are tried first; the empty prefix end last (it always matches).
+    if _EXACT in node:
+        alts.append(r"\b")
+    if _PREFIX in node:
+        alts.append("")
+    return alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+
+
+class _TermIndex(dict):
+    """Matched text (" data center", str or bytes) -> (term, weight). Phrases
+    written with other separators ("data-center") are normalized on a miss."""
+
+    def __missing__(self, text: Any) -> Tuple[str, float]:
+        if isinstance(text, bytes):
+            return self[text.decode()]
+        key = " " + " ".join(_WORD.findall(text))
+        if key == text:
+            raise KeyError(text)
+        return self[key]
+
+
+@dataclass
+class TopicRules:
+    base: float = 30.0
+    source_weight_scale: float = 50.0
+    terms: Dict[str, float] = field(default_factory=dict)
+    pattern: Optional[Pattern[str]] = None
+    ascii_pattern: Optional[Pattern[bytes]] = None
+    index: _TermIndex = field(default_factory=_TermIndex)
+
+    def compile(self) -> "TopicRules":
+        root: Dict[str, Any] = {}
+        ascii_root: Dict[str, Any] = {}
+        for term in sorted(self.terms, key=lambda t: t.endswith("*")):
+            words = _WORD.findall(term.rstrip("*"))
+            if not words:
+                continue
+            key = " " + " ".join(words)
+            ascii_key = key.isascii()
+            for tree in (root, ascii_root) if ascii_key else (root,):
+                node = tree
+                for i, w in enumerate(words):
+                    if i:
+                        node = node.setdefault(_SEP, {})
+                    for ch in w:
+                        node = node.setdefault(ch, {})
+                node[_PREFIX if term.endswith("*") else _EXACT] = {}
+            # Prefix terms sort last and win a key they share with a whole-word term.
+            self.index[key] = (term, self.terms[term])
+            if ascii_key:
+                self.index[key.encode()] = self.index[key]
+        if root:
+            self.pattern = re.compile(r"\W" + _tree_regex(root))
+        if ascii_root:
+            self.ascii_pattern = re.compile((" " + _tree_regex(ascii_root)).encode())
+        return self
+
+    def match_text(self, text: str) -> Dict[str, float]:
+        """Terms found in `text` (any case) -> their weights."""
+        if text.isascii():
+            if self.ascii_pattern is None:
+                return {}
+            found: List[Any] = self.ascii_pattern.findall((" " + text).encode().translate(_ASCII_FOLD))
+        elif self.pattern is not None:
+            found = self.pattern.findall(" " + text.lower())
+        else:
+            return {}
+        return dict(map(self.index.__getitem__, found))
+
+
+@dataclass
+class Score:
+    severity: int
+    matched: Dict[str, float]
+    base: float
+    source: float
+
+    def signals(self) -> Dict[str, Any]:
+        return {
+            "matched_terms": sorted(self.matched),
+            "score_explain": {"base": self.base, "source": self.source, "terms": dict(self.matched)},
+        }
+
+
+def _rules(raw: Dict[str, Any]) -> TopicRules:
+    return TopicRules(
+        base=float(raw.get("base", 30)),
+        source_weight_scale=float(raw.get("source_weight_scale", 50)),
+        terms={str(k).strip().lower(): float(v) for k, v in (raw.get("terms") or {}).items()},
+    ).compile()
+
+
+class Scorer:
+    def __init__(self, config: Dict[str, Any]):
+        self.default = _rules(config.get("default") or {})
+        self.topics = {str(t): _rules(r or {}) for t, r in (config.get("topics") or {}).items()}
+
+    @classmethod
+    def from_yaml(cls, path: str) -> "Scorer":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(yaml.safe_load(f) or {})
+
+    def rules(self, topic: str) -> TopicRules:
+        return self.topics.get(topic, self.default)
+
+    def score(self, topic: str, text: str, weight: float = 1.0) -> Score:
+        return self.score_batch(topic, [(text, weight)])[0]
+
+    def score_batch(self, topic: str, items: Sequence[Tuple[str, float]]) -> List[Score]:
+        """Score (text, source weight) pairs that share a topic (rules and the
+        base + source part per distinct weight resolved once)."""
+        rules = self.rules(topic)
+        match, base = rules.match_text, rules.base
+        parts: Dict[float, Tuple[float, int]] = {}
+        out: List[Score] = []
+        for text, weight in items:
+            part = parts.get(weight)
+            if part is None:
+                source = rules.source_weight_scale * float(weight)
+                part = parts[weight] = (source, int(base + source))
+            matched = match(text)
+            total = part[1] + int(sum(matched.values()))
+            out.append(Score(max(0, min(100, total)), matched, base, part[0]))
+        return out
+
+
+_cached: Tuple[Optional[str], float, Optional[Scorer]] = (None, 0.0, None)
+_lock = threading.Lock()
+
+
+def load_scorer(path: str) -> Scorer:
+    """Scorer for `path`, rebuilt when the file's mtime changes (edit keywords without a restart)."""
+    global _cached
+    mtime = os.path.getmtime(path)
+    with _lock:
+        cached_path, cached_mtime, scorer = _cached
+        if scorer is None or cached_path != path or cached_mtime != mtime:
+            scorer = Scorer.from_yaml(path)
+            _cached = (path, mtime, scorer)
+        return scorer
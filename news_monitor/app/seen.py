@@ -0,0 +1,85 @@
+"""Seen-URL bloom filter: skip re-posting items the API already acknowledged.
+
+Feeds return the same entries poll after poll; the API would dedupe them on
+news_items.url anyway, but only after they were serialized, sent and
+inserted-with-conflict. URLs are added once the API acknowledged them, so a
+failed post is retried on the next poll.
+
+False positives (an unseen URL reported as seen) occur at about `error_rate`
+and make news_monitor skip that one item; there are no false negatives. When
+more than `capacity` URLs were added the filter starts over, which only costs
+one round of server-side dedupe. The bit array is persisted next to the feed
+state so restarts do not re-post everything.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import struct
+from typing import Iterable, List, Optional
+
+_MAGIC = b"SEEN1"
+_HEADER = struct.Struct(">5sIIQ")  # magic, hashes, capacity, count
+
+
+class SeenFilter:
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001, path: Optional[str] = None):
+        self.capacity = max(1, int(capacity))
+        self.error_rate = float(error_rate)
+        # Optimal size / number of hash functions for capacity and error rate.
+        self.nbits = max(8, int(-self.capacity * math.log(self.error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.nbits / self.capacity * math.log(2)))
+        self.path = path
+        self.count = 0
+        self._bits = bytearray((self.nbits + 7) // 8)
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def _positions(self, url: str) -> List[int]:
+        # Double hashing (Kirsch-Mitzenmacher): h1 + i*h2 from one 128-bit digest.
+        d = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack(">QQ", d)
+        return [(h1 + i * h2) % self.nbits for i in range(self.hashes)]
+
+    def __contains__(self, url: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(url))
+
+    def add(self, url: str) -> None:
+        if self.count >= self.capacity:
+            self.clear()
+        for p in self._positions(url):
+            self._bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    def add_many(self, urls: Iterable[str]) -> None:
+        for u in urls:
+            if u not in self:
+                self.add(u)
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.hashes, self.capacity, self.count))
+            f.write(self._bits)
+        os.replace(tmp, self.path)
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, "rb") as f:
+                magic, hashes, capacity, count = _HEADER.unpack(f.read(_HEADER.size))
+                bits = f.read()
+        except Exception:
+            return
+        # A file written with other sizing is dropped (server-side dedupe still applies).
+        if magic == _MAGIC and hashes == self.hashes and capacity == self.capacity and len(bits) == len(self._bits):
+            self._bits = bytearray(bits)
+            self.count = int(count)
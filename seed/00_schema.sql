@@ -73,6 +73,12 @@ CREATE INDEX IF NOT EXISTS idx_agent_cases_resource ON agent_cases(resource_id);
 
 
 -- Kanban (Operational cards as first-class objects)
+-- Monotonic board change counter: every insert/update of a card takes the next
+-- value into kanban_cards.change_seq (GET /board versions + delta sync).
+CREATE SEQUENCE IF NOT EXISTS kanban_change_seq;
+-- Event ids for the change feed (NOTIFY change_feed, app/change_feed.py).
+CREATE SEQUENCE IF NOT EXISTS change_feed_seq;
+
 CREATE TABLE IF NOT EXISTS kanban_cards (
   card_id UUID PRIMARY KEY DEFAULT (md5(random()::text || clock_timestamp()::text)::uuid),
   created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
@@ -99,6 +105,9 @@ CREATE TABLE IF NOT EXISTS kanban_cards (
   blocked_reason TEXT,
   last_activity_at TIMESTAMPTZ NOT NULL DEFAULT now(),
   resolved_at TIMESTAMPTZ,
+  change_seq BIGINT NOT NULL DEFAULT nextval('kanban_change_seq'),
+  -- When change_seq was taken (GET /board only trusts seqs older than a settle window).
+  changed_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp(),
 
   -- SLA policy guardrails (enforced at DB level)
   CHECK (status <> 'blocked' OR blocked_reason IS NOT NULL),
@@ -108,6 +117,70 @@ CREATE TABLE IF NOT EXISTS kanban_cards (
 CREATE INDEX IF NOT EXISTS idx_kanban_cards_status ON kanban_cards(status);
 CREATE INDEX IF NOT EXISTS idx_kanban_cards_resource ON kanban_cards(resource_id);
 CREATE INDEX IF NOT EXISTS idx_kanban_cards_updated ON kanban_cards(updated_at);
+ALTER TABLE kanban_cards ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT nextval('kanban_change_seq');
+ALTER TABLE kanban_cards ADD COLUMN IF NOT EXISTS changed_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp();
+CREATE INDEX IF NOT EXISTS idx_kanban_cards_change_seq ON kanban_cards(change_seq);
+CREATE INDEX IF NOT EXISTS idx_kanban_cards_changed_at ON kanban_cards(changed_at);
+-- Open-card SLA scans: breached / due-before filters and the SLA sweeper.
+CREATE INDEX IF NOT EXISTS idx_kanban_cards_status_sla_due ON kanban_cards(status, sla_due_at);
+
+CREATE OR REPLACE FUNCTION kanban_cards_bump_change_seq()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.change_seq := nextval('kanban_change_seq');
+  NEW.changed_at := clock_timestamp();
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_kanban_cards_change_seq ON kanban_cards;
+CREATE TRIGGER trg_kanban_cards_change_seq
+  BEFORE UPDATE ON kanban_cards
+  FOR EACH ROW EXECUTE FUNCTION kanban_cards_bump_change_seq();
+
+-- sla_due_at is persisted on write (created_at + sla_hours unless set explicitly).
+-- breached is only set by the SLA sweeper (app/jobs/sla_sweeper.py), so every
+-- breach is reported once; writes that resolve the card or move the due date
+-- into the future clear it.
+CREATE OR REPLACE FUNCTION kanban_cards_sla()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    NEW.sla_due_at := COALESCE(NEW.sla_due_at, NEW.created_at + make_interval(hours => NEW.sla_hours));
+  ELSIF NEW.sla_due_at IS NULL
+     OR (NEW.sla_hours IS DISTINCT FROM OLD.sla_hours AND NEW.sla_due_at IS NOT DISTINCT FROM OLD.sla_due_at) THEN
+    NEW.sla_due_at := NEW.created_at + make_interval(hours => NEW.sla_hours);
+  END IF;
+  IF NEW.status = 'resolved' OR NEW.sla_due_at >= now() THEN
+    NEW.breached := FALSE;
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_kanban_cards_sla ON kanban_cards;
+CREATE TRIGGER trg_kanban_cards_sla
+  BEFORE INSERT OR UPDATE ON kanban_cards
+  FOR EACH ROW EXECUTE FUNCTION kanban_cards_sla();
+
+-- Backfill cards written before the trigger existed.
+UPDATE kanban_cards SET sla_due_at = created_at + make_interval(hours => sla_hours) WHERE sla_due_at IS NULL;
+
+-- v_kanban_cards shows case risk/confidence/status, so changing those moves the card too.
+CREATE OR REPLACE FUNCTION agent_cases_touch_cards()
+RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE kanban_cards SET change_seq = nextval('kanban_change_seq') WHERE case_id = NEW.case_id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_agent_cases_touch_cards ON agent_cases;
+CREATE TRIGGER trg_agent_cases_touch_cards
+  AFTER UPDATE OF risk_score, confidence, status ON agent_cases
+  FOR EACH ROW
+  WHEN ((OLD.risk_score, OLD.confidence, OLD.status) IS DISTINCT FROM (NEW.risk_score, NEW.confidence, NEW.status))
+  EXECUTE FUNCTION agent_cases_touch_cards();
 
 
 -- Scenario outputs per case
@@ -140,6 +213,7 @@ CREATE TABLE IF NOT EXISTS materializations (
   expires_at TIMESTAMPTZ
 );
 CREATE UNIQUE INDEX IF NOT EXISTS idx_materializations_idem ON materializations(endpoint, subject, idempotency_key);
+CREATE INDEX IF NOT EXISTS idx_materializations_created ON materializations(created_at);
 
 CREATE TABLE IF NOT EXISTS pending_actions (
   pending_id UUID PRIMARY KEY DEFAULT (md5(random()::text || clock_timestamp()::text)::uuid),
@@ -175,37 +249,97 @@ CREATE TABLE IF NOT EXISTS pending_actions (
 CREATE INDEX IF NOT EXISTS idx_pending_actions_case_updated ON pending_actions(case_id, updated_at DESC);
 CREATE INDEX IF NOT EXISTS idx_pending_actions_card_updated ON pending_actions(card_id, updated_at DESC);
 CREATE INDEX IF NOT EXISTS idx_pending_actions_materialization ON pending_actions(materialization_id);
+-- Batched retention of superseded rows (app/jobs/cleanup.py).
+CREATE INDEX IF NOT EXISTS idx_pending_actions_superseded ON pending_actions(superseded_at) WHERE status = 'canceled';
+CREATE INDEX IF NOT EXISTS idx_pending_actions_superseded_by ON pending_actions(superseded_by) WHERE superseded_by IS NOT NULL;
 
+-- Time-partitioned (monthly) audit trail; see ensure_time_partitions() below.
 CREATE TABLE IF NOT EXISTS agent_actions (
-  action_id UUID PRIMARY KEY DEFAULT (md5(random()::text || clock_timestamp()::text)::uuid),
+  action_id UUID NOT NULL DEFAULT (md5(random()::text || clock_timestamp()::text)::uuid),
   case_id UUID NOT NULL REFERENCES agent_cases(case_id) ON DELETE CASCADE,
   channel TEXT NOT NULL,
   action_type TEXT NOT NULL,
   payload JSONB NOT NULL DEFAULT '{}'::jsonb,
   result TEXT NOT NULL DEFAULT '',
-  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
-);
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+
+  -- Projections of the payload->'_audit' envelope (see app/audit.py) so /audit
+  -- lookups use btree indexes instead of scanning JSONB.
+  audit_request_id TEXT GENERATED ALWAYS AS (NULLIF(NULLIF(payload->'_audit'->>'request_id', ''), '-')) STORED,
+  actor_sub TEXT GENERATED ALWAYS AS (NULLIF(payload->'_audit'->'actor'->>'sub', '')) STORED,
+  actor_role TEXT GENERATED ALWAYS AS (NULLIF(payload->'_audit'->'actor'->>'role', '')) STORED,
+  policy_revision INT GENERATED ALWAYS AS (
+    CASE WHEN payload->'_audit'->>'policy_revision' ~ '^-?[0-9]{1,9}$'
+         THEN (payload->'_audit'->>'policy_revision')::int END
+  ) STORED,
+  materialization_id TEXT GENERATED ALWAYS AS (NULLIF(payload->'_audit'->>'materialization_id', '')) STORED,
+
+  PRIMARY KEY (action_id, created_at)
+) PARTITION BY RANGE (created_at);
+CREATE TABLE IF NOT EXISTS agent_actions_default PARTITION OF agent_actions DEFAULT;
 CREATE INDEX IF NOT EXISTS idx_agent_actions_case_created ON agent_actions(case_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_agent_actions_created ON agent_actions(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_agent_actions_request_id ON agent_actions(audit_request_id) WHERE audit_request_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_agent_actions_actor_sub_created ON agent_actions(actor_sub, created_at DESC) WHERE actor_sub IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_agent_actions_actor_role_created ON agent_actions(actor_role, created_at DESC) WHERE actor_role IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_agent_actions_policy_rev_created ON agent_actions(policy_revision, created_at DESC) WHERE policy_revision IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_agent_actions_materialization_created ON agent_actions(materialization_id, created_at DESC) WHERE materialization_id IS NOT NULL;
+
+-- Durable queue for external connector calls (ACTION_EXECUTION_MODE=async).
+-- Workers (app/jobs/executor.py) claim rows with FOR UPDATE SKIP LOCKED and
+-- write results back to agent_actions / pending_actions. agent_actions is
+-- partitioned, so the row is addressed by (action_id, action_created_at).
+CREATE TABLE IF NOT EXISTS action_jobs (
+  job_id UUID PRIMARY KEY DEFAULT (md5(random()::text || clock_timestamp()::text)::uuid),
+  action_id UUID NOT NULL,
+  action_created_at TIMESTAMPTZ NOT NULL,
+  case_id UUID NOT NULL,
+  pending_id UUID REFERENCES pending_actions(pending_id) ON DELETE SET NULL,
+  channel TEXT NOT NULL,
+  action_type TEXT NOT NULL,
+  payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+  status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued','running','succeeded','failed')),
+  attempts INT NOT NULL DEFAULT 0,
+  max_attempts INT NOT NULL DEFAULT 3,
+  available_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  locked_by TEXT,
+  locked_at TIMESTAMPTZ,
+  result JSONB,
+  error TEXT,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_action_jobs_ready ON action_jobs(available_at) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_action_jobs_running ON action_jobs(locked_at) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_action_jobs_action ON action_jobs(action_id);
+CREATE INDEX IF NOT EXISTS idx_action_jobs_finished ON action_jobs(updated_at) WHERE status IN ('succeeded','failed');
 
--- API idempotency (demo)
+-- API idempotency: rows are reserved 'in_flight' (atomic INSERT .. ON CONFLICT)
+-- and flipped to 'completed' with the response; expires_at drives TTL cleanup.
 CREATE TABLE IF NOT EXISTS idempotency_keys (
   key TEXT PRIMARY KEY,
   request_hash TEXT NOT NULL,
-  response JSONB NOT NULL,
-  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+  status TEXT NOT NULL DEFAULT 'completed' CHECK (status IN ('in_flight','completed')),
+  response JSONB,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  expires_at TIMESTAMPTZ NOT NULL DEFAULT (now() + INTERVAL '24 hours')
 );
+CREATE INDEX IF NOT EXISTS idx_idempotency_expires ON idempotency_keys(expires_at);
 
 
 -- Audit log: lightweight event trail for demos / governance.
+-- Time-partitioned (monthly).
 CREATE TABLE IF NOT EXISTS audit_log (
-  id UUID PRIMARY KEY DEFAULT (md5(random()::text || clock_timestamp()::text)::uuid),
+  id UUID NOT NULL DEFAULT (md5(random()::text || clock_timestamp()::text)::uuid),
   ts TIMESTAMPTZ NOT NULL DEFAULT now(),
   actor TEXT,
   action TEXT NOT NULL,
   entity_type TEXT,
   entity_id TEXT,
-  payload JSONB NOT NULL DEFAULT '{}'::jsonb
-);
+  payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+  PRIMARY KEY (id, ts)
+) PARTITION BY RANGE (ts);
+CREATE TABLE IF NOT EXISTS audit_log_default PARTITION OF audit_log DEFAULT;
 
 CREATE INDEX IF NOT EXISTS audit_log_ts_idx ON audit_log (ts DESC);
 CREATE INDEX IF NOT EXISTS idx_idempotency_created ON idempotency_keys(created_at DESC);
@@ -213,29 +347,110 @@ CREATE INDEX IF NOT EXISTS idx_idempotency_created ON idempotency_keys(created_a
 
 CREATE INDEX IF NOT EXISTS idx_agent_actions_type_created ON agent_actions(action_type, created_at DESC);
 
+-- Time-partitioned (daily).
 CREATE TABLE IF NOT EXISTS dq_results (
-  dq_id UUID PRIMARY KEY DEFAULT (md5(random()::text || clock_timestamp()::text)::uuid),
+  dq_id UUID NOT NULL DEFAULT (md5(random()::text || clock_timestamp()::text)::uuid),
   ts TIMESTAMPTZ NOT NULL DEFAULT now(),
   gate_name TEXT NOT NULL,
   severity TEXT NOT NULL,
   passed BOOLEAN NOT NULL,
   scope JSONB NOT NULL DEFAULT '{}'::jsonb,
   message TEXT NOT NULL,
-  details JSONB NOT NULL DEFAULT '{}'::jsonb
-);
+  details JSONB NOT NULL DEFAULT '{}'::jsonb,
+  PRIMARY KEY (dq_id, ts)
+) PARTITION BY RANGE (ts);
+CREATE TABLE IF NOT EXISTS dq_results_default PARTITION OF dq_results DEFAULT;
 CREATE INDEX IF NOT EXISTS idx_dq_results_ts ON dq_results(ts DESC);
 
 
+-- Time-partitioned (daily).
 CREATE TABLE IF NOT EXISTS agent_predictions (
-  pred_id UUID PRIMARY KEY DEFAULT (md5(random()::text || clock_timestamp()::text)::uuid),
+  pred_id UUID NOT NULL DEFAULT (md5(random()::text || clock_timestamp()::text)::uuid),
   ts TIMESTAMPTZ NOT NULL DEFAULT now(),
   resource_id TEXT NOT NULL,
   risk_score NUMERIC NOT NULL,
   confidence NUMERIC,
   predicted_window_days INT,
-  features JSONB NOT NULL DEFAULT '{}'::jsonb
-);
+  features JSONB NOT NULL DEFAULT '{}'::jsonb,
+  PRIMARY KEY (pred_id, ts)
+) PARTITION BY RANGE (ts);
+CREATE TABLE IF NOT EXISTS agent_predictions_default PARTITION OF agent_predictions DEFAULT;
 CREATE INDEX IF NOT EXISTS idx_agent_predictions_resource_ts ON agent_predictions(resource_id, ts DESC);
+CREATE INDEX IF NOT EXISTS idx_agent_predictions_ts ON agent_predictions(ts DESC);
+
+-- Time partitioning helper.
+-- Creates the current + `premake` future range partitions for a table that is
+-- PARTITION BY RANGE on a timestamptz column. Partitions are named
+-- <parent>_pYYYYMMDD (UTC lower bound); app/partitions.py relies on that naming
+-- to drop expired partitions (retention) instead of row-by-row DELETEs.
+-- If the premaker missed its window, rows for a range may already sit in
+-- <parent>_default and CREATE ... PARTITION OF fails with check_violation. The
+-- partition is then created with DEFAULT detached, the rows are moved into it
+-- and DEFAULT is re-attached (one subtransaction). If even that fails, the
+-- range is skipped with a WARNING so the other ranges are still created.
+CREATE OR REPLACE FUNCTION ensure_time_partitions(parent TEXT, granularity TEXT, premake INT)
+RETURNS INT AS $$
+DECLARE
+  step INTERVAL;
+  base TIMESTAMP;
+  lo TIMESTAMP;
+  part TEXT;
+  def TEXT := parent || '_default';
+  col TEXT;
+  moved BIGINT;
+  created INT := 0;
+BEGIN
+  IF granularity NOT IN ('day', 'month') THEN
+    RAISE EXCEPTION 'unsupported partition granularity: %', granularity;
+  END IF;
+  step := CASE granularity WHEN 'day' THEN INTERVAL '1 day' ELSE INTERVAL '1 month' END;
+  base := date_trunc(granularity, now() AT TIME ZONE 'UTC');
+  FOR i IN 0..GREATEST(premake, 0) LOOP
+    lo := base + step * i;
+    part := format('%s_p%s', parent, to_char(lo, 'YYYYMMDD'));
+    IF to_regclass(part) IS NULL THEN
+      BEGIN
+        EXECUTE format(
+          'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+          part, parent, lo AT TIME ZONE 'UTC', (lo + step) AT TIME ZONE 'UTC'
+        );
+        created := created + 1;
+      EXCEPTION
+        WHEN duplicate_table THEN
+          NULL;  -- created concurrently by another worker
+        WHEN check_violation THEN
+          BEGIN
+            SELECT a.attname INTO col
+            FROM pg_partitioned_table pt
+            JOIN pg_attribute a ON a.attrelid = pt.partrelid AND a.attnum = pt.partattrs[0]
+            WHERE pt.partrelid = parent::regclass;
+            EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', parent, def);
+            EXECUTE format(
+              'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+              part, parent, lo AT TIME ZONE 'UTC', (lo + step) AT TIME ZONE 'UTC'
+            );
+            EXECUTE format(
+              'WITH m AS (DELETE FROM %I WHERE %I >= %L AND %I < %L RETURNING *) INSERT INTO %I SELECT * FROM m',
+              def, col, lo AT TIME ZONE 'UTC', col, (lo + step) AT TIME ZONE 'UTC', part
+            );
+            GET DIAGNOSTICS moved = ROW_COUNT;
+            EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I DEFAULT', parent, def);
+            created := created + 1;
+            RAISE WARNING 'ensure_time_partitions: moved % rows from % into %', moved, def, part;
+          EXCEPTION WHEN OTHERS THEN
+            RAISE WARNING 'ensure_time_partitions: could not create % (rows in %): %', part, def, SQLERRM;
+          END;
+      END;
+    END IF;
+  END LOOP;
+  RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_time_partitions('agent_actions', 'month', 3);
+SELECT ensure_time_partitions('audit_log', 'month', 3);
+SELECT ensure_time_partitions('dq_results', 'day', 14);
+SELECT ensure_time_partitions('agent_predictions', 'day', 14);
 
 CREATE TABLE IF NOT EXISTS agent_recommendations (
   rec_id UUID PRIMARY KEY DEFAULT (md5(random()::text || clock_timestamp()::text)::uuid),
@@ -282,6 +497,47 @@ CREATE TABLE IF NOT EXISTS news_items (
 CREATE INDEX IF NOT EXISTS idx_news_items_topic_time ON news_items(topic, fetched_at DESC);
 CREATE INDEX IF NOT EXISTS idx_news_items_severity ON news_items(severity DESC);
 
+-- Near-duplicate clusters (app/news_dedupe.py): first item of a story names the cluster.
+ALTER TABLE news_items ADD COLUMN IF NOT EXISTS cluster_id UUID;
+CREATE INDEX IF NOT EXISTS idx_news_items_cluster ON news_items(cluster_id);
+
+-- 64-bit SimHash per item, split into four 16-bit LSH bands for candidate lookup.
+CREATE TABLE IF NOT EXISTS news_signatures (
+  item_id UUID PRIMARY KEY REFERENCES news_items(item_id) ON DELETE CASCADE,
+  simhash BIGINT NOT NULL,
+  band0 INT NOT NULL,
+  band1 INT NOT NULL,
+  band2 INT NOT NULL,
+  band3 INT NOT NULL,
+  cluster_id UUID NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_news_signatures_band0 ON news_signatures(band0);
+CREATE INDEX IF NOT EXISTS idx_news_signatures_band1 ON news_signatures(band1);
+CREATE INDEX IF NOT EXISTS idx_news_signatures_band2 ON news_signatures(band2);
+CREATE INDEX IF NOT EXISTS idx_news_signatures_band3 ON news_signatures(band3);
+CREATE INDEX IF NOT EXISTS idx_news_signatures_created ON news_signatures(created_at);
+
+-- Full-text search (GET /news/search): weighted title (A) + summary (B), kept current by Postgres.
+ALTER TABLE news_items ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS (
+  setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+  setweight(to_tsvector('english', coalesce(summary, '')), 'B')
+) STORED;
+CREATE INDEX IF NOT EXISTS idx_news_items_search ON news_items USING GIN (search_tsv);
+-- Also the keyset order of the news linker's watermark (app/news_linker.py).
+DROP INDEX IF EXISTS idx_news_items_fetched;
+CREATE INDEX IF NOT EXISTS idx_news_items_fetched_item ON news_items(fetched_at, item_id);
+
+-- Fuzzy title matching (typos, partial names) needs pg_trgm; search works without it.
+DO $$
+BEGIN
+  CREATE EXTENSION IF NOT EXISTS pg_trgm;
+  CREATE INDEX IF NOT EXISTS idx_news_items_title_trgm ON news_items USING GIN (title gin_trgm_ops);
+EXCEPTION WHEN OTHERS THEN
+  RAISE NOTICE 'pg_trgm unavailable, fuzzy news search disabled: %', SQLERRM;
+END;
+$$;
+
 CREATE TABLE IF NOT EXISTS news_alerts (
   alert_id UUID PRIMARY KEY DEFAULT (md5(random()::text || clock_timestamp()::text)::uuid),
   ts TIMESTAMPTZ NOT NULL DEFAULT now(),
@@ -294,3 +550,40 @@ CREATE TABLE IF NOT EXISTS news_alerts (
 );
 
 CREATE INDEX IF NOT EXISTS idx_news_alerts_topic_time ON news_alerts(topic, ts DESC);
+CREATE INDEX IF NOT EXISTS idx_news_alerts_item ON news_alerts(item_id);
+CREATE INDEX IF NOT EXISTS idx_news_items_case ON news_items(case_id);
+
+-- News -> resource links (app/news_linker.py): one row per matched resource, with
+-- the open case of that resource when there is one.
+CREATE TABLE IF NOT EXISTS news_links (
+  item_id UUID NOT NULL REFERENCES news_items(item_id) ON DELETE CASCADE,
+  resource_id TEXT NOT NULL,
+  case_id UUID,
+  matched_by TEXT NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (item_id, resource_id)
+);
+CREATE INDEX IF NOT EXISTS idx_news_links_resource_time ON news_links(resource_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_news_links_case ON news_links(case_id);
+
+-- Progress of incremental jobs: keyset position (last_ts, last_id) of the last row processed.
+CREATE TABLE IF NOT EXISTS job_watermarks (
+  job TEXT PRIMARY KEY,
+  last_ts TIMESTAMPTZ NOT NULL DEFAULT '1970-01-01 00:00:00+00',
+  last_id UUID NOT NULL DEFAULT '00000000-0000-0000-0000-000000000000',
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+INSERT INTO job_watermarks(job) VALUES ('news_linker') ON CONFLICT (job) DO NOTHING;
+
+-- Per-resource news features (app/news_features.py): exponentially decayed sums
+-- (time constants 24h / 7d) as of updated_at, maintained by the news linker.
+CREATE TABLE IF NOT EXISTS news_resource_features (
+  resource_id TEXT PRIMARY KEY,
+  items_24h DOUBLE PRECISION NOT NULL DEFAULT 0,
+  items_7d DOUBLE PRECISION NOT NULL DEFAULT 0,
+  sev_24h DOUBLE PRECISION NOT NULL DEFAULT 0,
+  sev_7d DOUBLE PRECISION NOT NULL DEFAULT 0,
+  themes_7d JSONB NOT NULL DEFAULT '{}'::jsonb,
+  last_item_at TIMESTAMPTZ,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
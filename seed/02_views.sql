@@ -32,14 +32,15 @@ SELECT
   k.assignee,
   k.tags,
   k.sla_hours,
-  COALESCE(k.sla_due_at, (k.created_at + (k.sla_hours || ' hours')::interval)) AS sla_due_at,
-  (k.status <> 'resolved' AND now() > COALESCE(k.sla_due_at, (k.created_at + (k.sla_hours || ' hours')::interval))) AS breached,
+  k.sla_due_at,
+  (k.status <> 'resolved' AND k.sla_due_at < now()) AS breached,
   k.blocked_reason,
   k.last_activity_at,
   k.resolved_at,
   c.risk_score AS case_risk_score,
   c.confidence AS case_confidence,
-  c.status AS case_status
+  c.status AS case_status,
+  k.change_seq
 FROM kanban_cards k
 LEFT JOIN agent_cases c ON c.case_id = k.case_id;
 
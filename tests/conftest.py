@@ -5,3 +5,20 @@ repo_root = Path(__file__).resolve().parents[1]
 agent_runtime = repo_root / "agent_runtime"
 if str(agent_runtime) not in sys.path:
     sys.path.insert(0, str(agent_runtime))
+
+
+def load_service_app(service: str):
+    """Import <service>/app (news_monitor, live_orchestrator) as package `<service>_app`.
+
+    Each service ships its own top-level `app` package, which would clash with
+    agent_runtime's `app` on sys.path.
+    """
+    import importlib
+    import types
+
+    name = f"{service}_app"
+    if name not in sys.modules:
+        pkg = types.ModuleType(name)
+        pkg.__path__ = [str(repo_root / service / "app")]  # type: ignore[attr-defined]
+        sys.modules[name] = pkg
+    return importlib.import_module(name)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api_main import create_app
+import app.api.routers.actions as actions_mod
+import app.execution as exec_mod
+import app.idempotency as idem_mod
+
+CASE = "11111111-1111-1111-1111-111111111111"
+MISSING_CASE = "22222222-2222-2222-2222-222222222222"
+CARD = "33333333-3333-3333-3333-333333333333"
+
+POLICY = {
+    "idempotency": {"enabled": True},
+    "card_status_policy": {
+        "allowed_transitions": {"todo": ["in_progress"], "in_progress": ["blocked"], "blocked": [], "resolved": []},
+        "sla_guardrails": {"blocked_requires_reason": True},
+    },
+}
+
+
+class _Result:
+    def __init__(self, rows: List[Any] | None = None):
+        self._rows = rows or []
+
+    def fetchall(self):
+        return self._rows
+
+
+@pytest.fixture()
+def fake_db(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+    db: Dict[str, Any] = {"selects": [], "writes": [], "idem": {}, "card_status": "todo"}
+
+    def fake_all(sql: str, **params):
+        db["selects"].append(sql)
+        if "FROM agent_cases" in sql:
+            return [{"case_id": c, "risk_score": 90} for c in params["ids"] if c == CASE]
+        if "FROM kanban_cards" in sql:
+            return [{"card_id": c, "case_id": CASE, "status": "todo"} for c in params["ids"] if c == CARD]
+        return []
+
+    def fake_q(sql: str, **params):
+        db["writes"].append((sql, params))
+        if "UPDATE kanban_cards" in sql:
+            # Compare-and-set: only rows still in their expected status are updated.
+            return _Result([(r["card_id"],) for r in json.loads(params["cards"]) if r["expected"] == db["card_status"]])
+        return _Result()
+
+    def fake_idem_q(sql: str, **params):
+        if "INSERT INTO idempotency_keys" in sql:
+            out = []
+            for e in json.loads(params["rows"]):
+                if e["k"] not in db["idem"]:
+                    db["idem"][e["k"]] = {"key": e["k"], "request_hash": e["h"], "status": "in_flight", "response": None}
+                    out.append((e["k"],))
+            return _Result(out)
+        if "UPDATE idempotency_keys" in sql:
+            for e in json.loads(params["rows"]):
+                db["idem"][e["k"]].update(status="completed", response=e["r"])
+        return None
+
+    def fake_idem_all(sql: str, **params):
+        return [db["idem"][k] for k in params["ks"] if k in db["idem"]]
+
+    monkeypatch.setattr(exec_mod, "all", fake_all)
+    monkeypatch.setattr(exec_mod, "q", fake_q)
+    monkeypatch.setattr(idem_mod, "_q", fake_idem_q)
+    monkeypatch.setattr(idem_mod, "_all", fake_idem_all)
+    idem_mod.clear_cache()
+
+    monkeypatch.setattr(actions_mod, "load_policy", lambda: POLICY)
+    monkeypatch.setattr(exec_mod, "load_policy", lambda: POLICY)
+    monkeypatch.setattr(actions_mod, "get_actor", lambda request, channel="api": {"sub": "u1", "role": "system"})
+    monkeypatch.setattr(
+        actions_mod,
+        "can_execute",
+        lambda policy, *, action_type, **k: (action_type != "TriggerPurchase", "forbidden by rbac"),
+    )
+    return db
+
+
+def _audit_inserts(db: Dict[str, Any]) -> List[List[Dict[str, Any]]]:
+    return [json.loads(p["rows"]) for sql, p in db["writes"] if "INSERT INTO agent_actions" in sql]
+
+
+def test_execute_batch_partial_failure(fake_db: Dict[str, Any]) -> None:
+    client = TestClient(create_app())
+    items = [
+        {"case_id": CASE, "action_type": "UpdateCardStatus", "payload": {"card_id": CARD, "new_status": "in_progress"}, "idempotency_key": "k1"},
+        {"case_id": MISSING_CASE, "action_type": "ExpediteShipment", "payload": {}},
+        {"case_id": CASE, "action_type": "ExpediteShipment", "payload": {"qty": 5}},
+        # Sees the in_progress status set by item 0; blocked without a reason.
+        {"case_id": CASE, "action_type": "UpdateCardStatus", "payload": {"card_id": CARD, "new_status": "blocked"}},
+        {"case_id": CASE, "action_type": "TriggerPurchase", "payload": {}},
+    ]
+    r = client.post("/actions/execute_batch", json={"channel": "api", "items": items})
+    assert r.status_code == 200
+    body = r.json()
+    codes = [it["status_code"] for it in body["items"]]
+    assert codes == [200, 404, 200, 200, 403]
+    assert body["items"][0]["ok"] is True and body["items"][0]["connector"] == "local_db"
+    assert body["items"][2]["ok"] is True and body["items"][2]["connector"] == "mock"
+    assert body["items"][3]["blocked"] is True and "blocked_reason" in body["items"][3]["message"]
+    assert (body["succeeded"], body["failed"]) == (2, 3)
+
+    # One lookup per table, then the card UPDATE and the audit INSERT for all
+    # executed items in a single statement.
+    assert len(fake_db["selects"]) == 2
+    (write,) = [sql for sql, _ in fake_db["writes"] if "kanban_cards" in sql or "agent_actions" in sql]
+    assert "UPDATE kanban_cards" in write and "INSERT INTO agent_actions" in write
+    inserts = _audit_inserts(fake_db)
+    assert len(inserts) == 1
+    assert [row["action_type"] for row in inserts[0]] == ["UpdateCardStatus", "UpdateCardStatus", "ExpediteShipment"]
+    assert {row["action_id"] for row in inserts[0]} == {body["items"][i]["action_id"] for i in (0, 2, 3)}
+
+
+def test_execute_batch_per_item_idempotency(fake_db: Dict[str, Any]) -> None:
+    client = TestClient(create_app())
+    item = {"case_id": CASE, "action_type": "ExpediteShipment", "payload": {"qty": 1}, "idempotency_key": "k1"}
+    r1 = client.post("/actions/execute_batch", json={"items": [item]})
+    assert r1.json()["items"][0]["status_code"] == 200
+    assert fake_db["idem"]["k1"]["status"] == "completed"
+
+    idem_mod.clear_cache()  # force the DB path
+    changed = {**item, "payload": {"qty": 2}}
+    r2 = client.post("/actions/execute_batch", json={"items": [item, changed]})
+    out = r2.json()["items"]
+    assert out[0]["replayed"] is True
+    assert out[0]["action_id"] == r1.json()["items"][0]["action_id"]
+    assert out[1]["status_code"] == 409
+    assert len(_audit_inserts(fake_db)) == 1  # nothing re-executed
+
+
+def test_execute_batch_dry_run_writes_nothing(fake_db: Dict[str, Any]) -> None:
+    client = TestClient(create_app())
+    items = [{"case_id": CASE, "action_type": "UpdateCardStatus", "payload": {"card_id": CARD, "new_status": "in_progress"}, "idempotency_key": "k9"}]
+    r = client.post("/actions/execute_batch?dry_run=true", json={"items": items})
+    assert r.json()["items"][0]["dry_run"] is True
+    assert fake_db["writes"] == []
+    assert fake_db["idem"] == {}
+
+
+def test_execute_batch_reports_conflict_when_card_moved(fake_db: Dict[str, Any]) -> None:
+    fake_db["card_status"] = "blocked"  # another writer moved the card after it was read
+    client = TestClient(create_app())
+    items = [
+        {"case_id": CASE, "action_type": "UpdateCardStatus", "payload": {"card_id": CARD, "new_status": "in_progress"}},
+        {"case_id": CASE, "action_type": "ExpediteShipment", "payload": {}},
+    ]
+    body = client.post("/actions/execute_batch", json={"items": items}).json()
+    first, second = body["items"]
+    assert first["conflict"] is True and first["ok"] is False
+    assert first["status_code"] == 409
+    assert "no longer 'todo'" in first["message"]
+    assert second["ok"] is True
+    (rows,) = _audit_inserts(fake_db)
+    # The statement records the conflict result for cards its UPDATE missed.
+    assert rows[0]["action_id"] == first["action_id"]
+    assert rows[0]["card_id"] == CARD and rows[0]["conflict"] == first["message"]
+    assert "card_id" not in rows[1]
@@ -20,18 +20,35 @@ def test_actions_execute_idempotency_replay_and_conflict(monkeypatch: pytest.Mon
             return store.get(params.get("k"))
         return None
 
+    class _Result:
+        def __init__(self, row):
+            self._row = row
+
+        def fetchone(self):
+            return self._row
+
     def fake_idem_q(sql: str, **params):
-        if "insert into idempotency_keys" in sql.lower():
+        s = sql.lower()
+        if "insert into idempotency_keys" in s:
+            if params["k"] in store:
+                return _Result(None)
             store[params["k"]] = {
                 "key": params["k"],
                 "request_hash": params["h"],
-                "response": json.loads(params["r"]),
+                "status": "in_flight",
+                "response": None,
             }
+            return _Result((params["k"],))
+        if "update idempotency_keys" in s:
+            row = store.get(params["k"])
+            if row and row["request_hash"] == params["h"]:
+                row.update(status="completed", response=json.loads(params["r"]))
         return None
 
     # Patch idempotency module callables
     monkeypatch.setattr(idem_mod, "_one", fake_idem_one)
     monkeypatch.setattr(idem_mod, "_q", fake_idem_q)
+    idem_mod.clear_cache()
 
     # Fake DB lookup for case
     def fake_one(sql: str, **params):
@@ -72,6 +89,13 @@ def test_actions_execute_idempotency_replay_and_conflict(monkeypatch: pytest.Mon
     assert calls["n"] == 1  # replayed
     assert r2.json() == r1.json()
 
+    # Replay from the DB row as well (fresh process / other replica)
+    idem_mod.clear_cache()
+    r2b = client.post("/actions/execute", json=body, headers={"Idempotency-Key": "k1"})
+    assert r2b.status_code == 200
+    assert calls["n"] == 1
+    assert r2b.json() == r1.json()
+
     # Conflict: same key, different payload
     body2 = {"case_id": "c1", "channel": "api", "action_type": "UpdateCardStatus", "payload": {"x": 999}}
     r3 = client.post("/actions/execute", json=body2, headers={"Idempotency-Key": "k1"})
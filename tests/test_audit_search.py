@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api_main import create_app
+from app.api.routers import audit_view
+
+
+def test_audit_search_uses_projection_columns(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen = {}
+
+    def fake_all(sql: str, **params):
+        seen["sql"] = sql
+        seen["params"] = params
+        return [
+            {"action_id": "00000000-0000-0000-0000-000000000002", "created_at": datetime(2026, 1, 2, tzinfo=timezone.utc)},
+        ]
+
+    monkeypatch.setattr(audit_view, "all", fake_all)
+    client = TestClient(create_app())
+
+    r = client.get("/audit/search", params={"actor_sub": "u1", "policy_revision": 7, "request_id": "rid-1", "limit": 1})
+    assert r.status_code == 200
+    sql = seen["sql"]
+    assert "actor_sub = :sub" in sql and "policy_revision = :rev" in sql and "audit_request_id = :rid" in sql
+    assert "payload->'_audit'" not in sql  # blob only on include_audit=true
+    assert seen["params"]["rev"] == 7
+
+    cursor = r.json()["next_cursor"]
+    ts, aid = audit_view.decode_cursor(cursor)
+    assert aid == "00000000-0000-0000-0000-000000000002"
+    assert ts == datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+    r2 = client.get("/audit/search", params={"cursor": cursor, "include_audit": True})
+    assert r2.status_code == 200
+    assert "(created_at, action_id) <" in seen["sql"]
+    assert "payload->'_audit' AS audit" in seen["sql"]
+
+
+def test_audit_by_case_compares_uuid(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen = {}
+    monkeypatch.setattr(audit_view, "all", lambda sql, **p: seen.update(sql=sql) or [])
+    client = TestClient(create_app())
+
+    assert client.get("/audit/by_case/not-a-uuid").status_code == 400
+
+    r = client.get("/audit/by_case/00000000-0000-0000-0000-000000000001")
+    assert r.status_code == 200
+    assert "case_id::text" not in seen["sql"]
+    assert "CAST(:cid AS UUID)" in seen["sql"]
+
+
+def _fake_rows(n: int):
+    for i in range(n):
+        yield {
+            "action_id": f"00000000-0000-0000-0000-{i:012d}",
+            "case_id": "c1",
+            "channel": "api",
+            "action_type": "UpdateCardStatus",
+            "result": "ok",
+            "created_at": datetime(2026, 1, 1, 0, 0, i, tzinfo=timezone.utc),
+            "audit": {"request_id": f"r{i}"},
+        }
+
+
+def test_audit_export_streams_ndjson_with_resume_cursor(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen = {}
+
+    def fake_stream(sql: str, chunk_size: int = 1000, **params):
+        seen["sql"] = sql
+        seen["params"] = params
+        return _fake_rows(5)
+
+    monkeypatch.setattr(audit_view, "stream", fake_stream)
+    client = TestClient(create_app())
+
+    r = client.get("/audit/export", params={"since": "2026-01-01T00:00:00Z", "chunk_size": 100})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(x) for x in r.text.splitlines()]
+    assert len(lines) == 5
+    assert "ORDER BY created_at ASC, action_id ASC" in seen["sql"]
+
+    last = lines[-1]["cursor"]
+    client.get("/audit/export", params={"cursor": last})
+    assert "(created_at, action_id) >" in seen["sql"]
+    assert seen["params"]["caid"] == "00000000-0000-0000-0000-000000000004"
+
+
+def test_audit_export_csv(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(audit_view, "stream", lambda sql, chunk_size=1000, **p: _fake_rows(3))
+    client = TestClient(create_app())
+
+    r = client.get("/audit/export", params={"format": "csv"})
+    assert r.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert len(rows) == 3
+    assert json.loads(rows[0]["audit"]) == {"request_id": "r0"}
+    assert rows[2]["cursor"]
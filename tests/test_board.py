@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api_main import create_app
+import app.api.routers.board as board_mod
+
+
+def _card(n: int, status: str, seq: int) -> Dict[str, Any]:
+    return {"card_id": f"c{n}", "status": status, "change_seq": seq, "updated_at": f"2026-01-01T00:00:{n:02d}"}
+
+
+@pytest.fixture
+def board(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+    state: Dict[str, Any] = {
+        "cards": [_card(1, "todo", 3), _card(2, "blocked", 5), _card(3, "todo", 9)],
+        "card_reads": [],
+        "settled_below": 100,  # change_seq values taken more than the settle window ago
+    }
+
+    def fake_one(sql: str, **params: Any) -> Dict[str, Any]:
+        assert "MAX(change_seq)" in sql and "changed_at < now() - make_interval(secs => :settle)" in sql
+        seqs = [c["change_seq"] for c in state["cards"]]
+        settled = [s for s in seqs if s < state["settled_below"]]
+        return {"head": max(seqs), "version": max(settled, default=0), "recent": sum(s for s in seqs if s not in settled)}
+
+    def fake_all(sql: str, **params: Any) -> List[Dict[str, Any]]:
+        state["card_reads"].append(sql)
+        cards = state["cards"]
+        if "change_seq >" in sql:
+            cards = sorted((c for c in cards if c["change_seq"] > params["since"]), key=lambda c: c["change_seq"])
+        return cards[: params["lim"]]
+
+    monkeypatch.setattr(board_mod, "one", fake_one)
+    monkeypatch.setattr(board_mod, "all", fake_all)
+    return state
+
+
+def test_board_groups_by_status_with_etag(board: Dict[str, Any]) -> None:
+    client = TestClient(create_app())
+    r = client.get("/board")
+    assert r.status_code == 200
+    assert r.headers["ETag"] == '"board-9"'
+    body = r.json()
+    assert body["version"] == 9
+    assert body["counts"] == {"todo": 2, "in_progress": 0, "blocked": 1, "resolved": 0}
+    assert [c["card_id"] for c in body["columns"]["todo"]] == ["c1", "c3"]
+
+
+def test_board_if_none_match_skips_card_reads(board: Dict[str, Any]) -> None:
+    client = TestClient(create_app())
+    r = client.get("/board", headers={"If-None-Match": '"board-9"'})
+    assert r.status_code == 304
+    assert r.headers["ETag"] == '"board-9"'
+    assert board["card_reads"] == []
+
+    board["cards"][0] = _card(1, "in_progress", 10)
+    r = client.get("/board", headers={"If-None-Match": '"board-9"'})
+    assert r.status_code == 200 and r.json()["version"] == 10
+
+
+def test_board_delta_returns_only_changed_cards(board: Dict[str, Any]) -> None:
+    client = TestClient(create_app())
+    body = client.get("/board", params={"since": 4}).json()
+    assert body["delta"] is True
+    assert [c["card_id"] for c in body["cards"]] == ["c2", "c3"]
+    assert body["version"] == 9 and body["more"] is False
+
+    # Up to date: no card query at all.
+    reads = len(board["card_reads"])
+    body = client.get("/board", params={"since": 9}).json()
+    assert body["cards"] == [] and len(board["card_reads"]) == reads
+
+
+def test_board_delta_paging(board: Dict[str, Any]) -> None:
+    client = TestClient(create_app())
+    body = client.get("/board", params={"since": 0, "limit": 2}).json()
+    assert [c["card_id"] for c in body["cards"]] == ["c1", "c2"]
+    assert body["more"] is True and body["version"] == 5
+    body = client.get("/board", params={"since": body["version"], "limit": 2}).json()
+    assert [c["card_id"] for c in body["cards"]] == ["c3"]
+    assert body["more"] is False
+
+
+def test_board_version_stays_behind_unsettled_changes(board: Dict[str, Any]) -> None:
+    client = TestClient(create_app())
+    board["settled_below"] = 10
+    board["cards"].append(_card(4, "todo", 12))  # committed; seq 11 is still in flight
+    body = client.get("/board", params={"since": 9}).json()
+    assert [c["card_id"] for c in body["cards"]] == ["c4"] and body["version"] == 9
+    etag = client.get("/board").headers["ETag"]
+    assert etag == '"board-9-12"'
+
+    board["cards"].append(_card(5, "blocked", 11))  # the lower seq commits late
+    assert client.get("/board", headers={"If-None-Match": etag}).status_code == 200
+    body = client.get("/board", params={"since": body["version"]}).json()
+    assert [c["card_id"] for c in body["cards"]] == ["c5", "c4"]  # not skipped
+
+    board["settled_below"] = 100
+    body = client.get("/board", params={"since": 9}).json()
+    assert body["version"] == 12
+    assert client.get("/board", params={"since": 12}).json()["cards"] == []
+
+
+def test_schema_adds_board_columns_to_existing_tables() -> None:
+    # Databases created before change_seq/changed_at existed must get the
+    # columns before their indexes are built.
+    sql = (Path(__file__).resolve().parents[1] / "seed" / "00_schema.sql").read_text()
+    for col in ("change_seq", "changed_at"):
+        add = sql.index(f"ALTER TABLE kanban_cards ADD COLUMN IF NOT EXISTS {col} ")
+        assert add < sql.index(f"ON kanban_cards({col})")
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List
+
+import pytest
+
+import app.execution as exec_mod
+
+CASE = "11111111-1111-1111-1111-111111111111"
+CARD = "22222222-2222-2222-2222-222222222222"
+
+POLICY = {
+    "card_status_policy": {
+        "allowed_transitions": {"todo": ["in_progress"], "in_progress": ["blocked"], "blocked": ["in_progress"]},
+        "sla_guardrails": {"blocked_requires_reason": True},
+    },
+}
+
+
+class _Row:
+    def __init__(self, row: tuple) -> None:
+        self.row = row
+
+    def fetchone(self) -> tuple:
+        return self.row
+
+
+@pytest.fixture
+def hot_card(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+    """One card in a fake DB whose CTE applies the compare-and-set atomically."""
+    db: Dict[str, Any] = {"status": "todo", "reads": 0, "statements": 0, "applied": [], "audit": []}
+    lock = threading.Lock()
+
+    def fake_all(sql: str, **params: Any) -> List[Dict[str, Any]]:
+        with lock:
+            db["reads"] += 1
+            return [{"card_id": CARD, "case_id": CASE, "status": db["status"]}]
+
+    def fake_q(sql: str, **params: Any) -> _Row:
+        assert "WITH u AS" in sql and "INSERT INTO agent_actions" in sql
+        with lock:
+            db["statements"] += 1
+            aid = f"a{db['statements']}"
+            cur = db["status"]
+            if cur == params["expected"] and (params["st"] == cur or params["st"] in params["allowed"]):
+                db["status"] = params["st"]
+                db["applied"].append((cur, params["st"]))
+                db["audit"].append(params["ok_res"])
+                return _Row((aid, CARD, params["st"], params["br"], None))
+            db["audit"].append(params["conflict_res"])
+            return _Row((aid, None, None, None, None))
+
+    monkeypatch.setattr(exec_mod, "all", fake_all)
+    monkeypatch.setattr(exec_mod, "q", fake_q)
+    monkeypatch.setattr(exec_mod, "load_policy", lambda: POLICY)
+    return db
+
+
+def _flip() -> dict:
+    cur = exec_mod.get_card(CARD)["status"]
+    new = "blocked" if cur == "in_progress" else "in_progress"
+    return exec_mod.execute_action(
+        case_id=CASE,
+        channel="ui",
+        action_type="UpdateCardStatus",
+        payload={"card_id": CARD, "new_status": new, "blocked_reason": "waiting on supplier"},
+    )
+
+
+def test_update_is_one_statement(hot_card: Dict[str, Any]) -> None:
+    res = _flip()
+    assert res["ok"] is True and res["data"]["status"] == "in_progress"
+    # Card update and audit row go out as a single statement.
+    assert hot_card["statements"] == 1
+    assert hot_card["audit"] == ["ok: card status updated -> in_progress"]
+
+
+def test_conflict_when_card_moved_after_validation(hot_card: Dict[str, Any]) -> None:
+    card = {"card_id": CARD, "case_id": CASE, "status": "todo"}
+    hot_card["status"] = "blocked"  # moved by someone else after `card` was read
+    res = exec_mod.execute_action(
+        case_id=CASE,
+        channel="ui",
+        action_type="UpdateCardStatus",
+        payload={"card_id": CARD, "new_status": "in_progress"},
+        card=card,
+    )
+    assert res["ok"] is False and res["conflict"] is True
+    assert hot_card["status"] == "blocked"
+    assert hot_card["audit"][-1].startswith("conflict:")
+
+
+def test_hot_card_contention_loses_no_updates(hot_card: Dict[str, Any]) -> None:
+    results: List[dict] = []
+    res_lock = threading.Lock()
+    start = threading.Barrier(8)
+
+    def worker() -> None:
+        start.wait()
+        for _ in range(25):
+            r = _flip()
+            with res_lock:
+                results.append(r)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    ok = [r for r in results if r["ok"]]
+    conflicts = [r for r in results if r.get("conflict")]
+    assert len(ok) + len(conflicts) + sum(1 for r in results if r.get("blocked")) == len(results)
+    # Every reported success is exactly one applied transition, and the applied
+    # transitions form an unbroken chain: no write was based on a stale status.
+    assert len(ok) == len(hot_card["applied"])
+    prev = "todo"
+    for frm, to in hot_card["applied"]:
+        assert frm == prev
+        prev = to
+    assert prev == hot_card["status"]
+    # One statement per attempt that passed the guardrails.
+    assert hot_card["statements"] == len(ok) + len(conflicts)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.change_feed as cf
+import app.execution as exec_mod
+from app.api.routers import events as events_mod
+from app.api_main import create_app
+
+CASE = "11111111-1111-1111-1111-111111111111"
+CARD = "22222222-2222-2222-2222-222222222222"
+
+
+@pytest.fixture
+def broker(monkeypatch: pytest.MonkeyPatch) -> cf.Broker:
+    b = cf.Broker(capacity=5)
+    monkeypatch.setattr(cf, "broker", b)
+    monkeypatch.setattr(cf, "_local_ids", itertools.count(100))  # after the ids tests append by hand
+    monkeypatch.setattr(cf.config, "CHANGE_FEED_BACKEND", "inprocess")
+    return b
+
+
+def _ev(i: int, kind: str = "card") -> Dict[str, Any]:
+    return {"id": i, "kind": kind, "op": "updated", "object_id": str(i), "data": {}, "ts": 0}
+
+
+def _frames(chunk: str) -> List[Dict[str, Any]]:
+    out = []
+    for block in chunk.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if "data" in fields:
+            out.append({"id": int(fields["id"]), "event": fields["event"], "data": json.loads(fields["data"])})
+    return out
+
+
+def test_ring_buffer_reads_after_cursor_and_reports_gap(broker: cf.Broker) -> None:
+    for i in range(1, 9):
+        broker.append(_ev(i))
+    broker.append(_ev(8))  # duplicate delivery is dropped
+    assert len(broker) == 5 and broker.last_id == 8
+
+    events, gap = broker.read_after(6)
+    assert [e["id"] for e in events] == [7, 8] and gap is False
+
+    events, gap = broker.read_after(3)
+    assert [e["id"] for e in events] == [4, 5, 6, 7, 8] and gap is False
+
+    events, gap = broker.read_after(1)
+    assert gap is True
+
+
+def test_late_event_is_filed_in_order_and_passed_readers_reset(broker: cf.Broker) -> None:
+    async def scenario() -> List[str]:
+        broker.append(_ev(9))
+        gen = events_mod._stream(9, None, heartbeat=5)
+        out = [await gen.__anext__()]
+        broker.append(_ev(11))
+        out.append(await gen.__anext__())  # the stream is now at 11
+        broker.append(_ev(10))  # committed before 11, notified after it
+        out.append(await asyncio.wait_for(gen.__anext__(), 1))
+        await gen.aclose()
+        return out
+
+    _, first, second = asyncio.run(scenario())
+    assert [f["id"] for f in _frames(first)] == [11]
+    (ev,) = _frames(second)
+    assert ev["event"] == "reset" and ev["id"] == 11
+    events, gap = broker.read_after(9)
+    assert [e["id"] for e in events] == [10, 11] and gap is False  # readers behind it get it in order
+    broker.append(_ev(10))
+    assert len(broker) == 3  # a second delivery is still a duplicate
+
+    mark = broker.late_mark
+    for i in (14, 13, 12, 8):  # full buffer: 12 evicts 9; 8 is older than all of it
+        broker.append(_ev(i))
+    assert [e["id"] for e in broker.read_after(0)[0]] == [10, 11, 12, 13, 14]
+    assert broker.late_since(mark) == (8, mark + 3)
+
+
+def test_publish_inprocess_assigns_increasing_ids(broker: cf.Broker) -> None:
+    cf.publish("case", CASE, "created", risk_score=88)
+    cf.publish_many([("card", CARD, "updated", {"status": "blocked"}), ("news", 7, "created", {})])
+    events, _ = broker.read_after(0)
+    assert [e["kind"] for e in events] == ["case", "card", "news"]
+    assert [e["id"] for e in events] == sorted({e["id"] for e in events})
+    assert events[0]["data"] == {"risk_score": 88} and events[2]["object_id"] == "7"
+
+
+def test_publish_failure_never_raises(monkeypatch: pytest.MonkeyPatch, broker: cf.Broker) -> None:
+    def boom(sql: str, **params: Any) -> None:
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(cf.config, "CHANGE_FEED_BACKEND", "postgres")
+    monkeypatch.setattr(cf, "q", boom)
+    cf.publish("card", CARD)
+    assert len(broker) == 0
+
+
+def test_stream_resumes_after_cursor_filters_kinds_and_wakes_on_publish(broker: cf.Broker) -> None:
+    async def scenario() -> List[str]:
+        for i in range(1, 5):
+            broker.append(_ev(i, "news" if i == 3 else "card"))
+        gen = events_mod._stream(2, frozenset({"card"}), heartbeat=5)
+        out = [await gen.__anext__(), await gen.__anext__()]
+        assert broker.clients == 1
+        nxt = asyncio.ensure_future(gen.__anext__())
+        await asyncio.sleep(0.01)
+        assert not nxt.done()  # idle client waits instead of polling
+        cf.publish("card", CARD, status="blocked")
+        out.append(await asyncio.wait_for(nxt, 1))
+        await gen.aclose()
+        assert broker.clients == 0
+        return out
+
+    retry, first, second = asyncio.run(scenario())
+    assert retry.startswith("retry:")
+    assert [(f["id"], f["event"]) for f in _frames(first)] == [(4, "card")]  # 3 was news
+    (ev,) = _frames(second)
+    assert ev["event"] == "card" and ev["data"]["object_id"] == CARD and ev["data"]["data"] == {"status": "blocked"}
+
+
+def test_stream_sends_reset_when_cursor_was_evicted(broker: cf.Broker) -> None:
+    async def scenario() -> List[str]:
+        for i in range(10, 20):
+            broker.append(_ev(i))
+        gen = events_mod._stream(3, None, heartbeat=5)
+        out = [await gen.__anext__() for _ in range(2)]
+        await gen.aclose()
+        return out
+
+    _, reset = asyncio.run(scenario())
+    (ev,) = _frames(reset)
+    assert ev["event"] == "reset" and ev["id"] == 19
+
+
+def test_stream_resets_a_cursor_from_before_a_restart(broker: cf.Broker) -> None:
+    assert broker.read_after(500) == ([], True)  # empty buffer after a restart
+    for i in range(10, 13):
+        broker.append(_ev(i))
+    assert broker.read_after(500) == ([], True)
+    assert broker.read_after(12) == ([], False)
+
+    async def scenario() -> str:
+        gen = events_mod._stream(500, None, heartbeat=5)
+        await gen.__anext__()
+        out = await asyncio.wait_for(gen.__anext__(), 1)
+        await gen.aclose()
+        return out
+
+    (ev,) = _frames(asyncio.run(scenario()))
+    assert ev["event"] == "reset" and ev["id"] == 12
+
+
+def test_inprocess_ids_start_past_the_previous_run() -> None:
+    assert next(cf._local_ids) > 1_600_000_000_000  # epoch-ms at import, not 1
+
+
+def test_stream_heartbeat_when_idle(broker: cf.Broker) -> None:
+    async def scenario() -> str:
+        gen = events_mod._stream(0, None, heartbeat=0.01)
+        await gen.__anext__()
+        ping = await gen.__anext__()
+        await gen.aclose()
+        return ping
+
+    assert asyncio.run(scenario()) == ": ping\n\n"
+
+
+def test_execute_action_publishes_card_and_action_events(monkeypatch: pytest.MonkeyPatch, broker: cf.Broker) -> None:
+    class _Row:
+        def fetchone(self) -> tuple:
+            return ("44444444-4444-4444-4444-444444444444", CARD, "in_progress", None, None)
+
+    monkeypatch.setattr(exec_mod, "q", lambda sql, **p: _Row())
+    monkeypatch.setattr(
+        exec_mod,
+        "all",
+        lambda sql, **p: [{"card_id": CARD, "case_id": CASE, "status": "todo"}] if "kanban_cards" in sql else [],
+    )
+    res = exec_mod.execute_action(
+        case_id=CASE,
+        channel="ui",
+        action_type="UpdateCardStatus",
+        payload={"card_id": CARD, "new_status": "in_progress"},
+    )
+    assert res["ok"] is True
+    events, _ = broker.read_after(0)
+    assert [(e["kind"], e["object_id"]) for e in events] == [
+        ("action", "44444444-4444-4444-4444-444444444444"),
+        ("card", CARD),
+    ]
+    assert events[1]["data"]["status"] == "in_progress"
+
+
+def test_stream_endpoint_rejects_unknown_kinds_and_reports_status(broker: cf.Broker) -> None:
+    client = TestClient(create_app())
+    r = client.get("/events/stream", params={"kinds": "card,bogus"})
+    assert r.status_code == 400
+
+    broker.append(_ev(3))
+    s = client.get("/events/status").json()
+    assert s["backend"] == "inprocess" and s["last_event_id"] == 3 and s["buffered"] == 1
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import pytest
+
+import app.jobs.cleanup as cleanup
+
+
+class _Result:
+    def __init__(self, rowcount: int):
+        self.rowcount = rowcount
+
+
+def test_delete_batched_stops_on_short_batch(monkeypatch: pytest.MonkeyPatch) -> None:
+    counts = [3, 3, 1]
+    calls: List[Dict[str, Any]] = []
+
+    def fake_q(sql: str, **params):
+        calls.append({"sql": sql, "params": params})
+        return _Result(counts.pop(0))
+
+    monkeypatch.setattr(cleanup, "q", fake_q)
+    sleeps: List[float] = []
+    monkeypatch.setattr(cleanup.time, "sleep", lambda s: sleeps.append(s))
+
+    m = cleanup.delete_batched("dq_results", "dq_id, ts", "ts < :cutoff", batch_size=3, pause_ms=20, cutoff="x")
+    assert m["deleted"] == 7
+    assert m["batches"] == 3
+    assert m["complete"] is True
+    assert sleeps == [0.02, 0.02]  # paused between full batches only
+    assert "(dq_id, ts) IN (SELECT dq_id, ts FROM dq_results WHERE ts < :cutoff LIMIT :lim)" in calls[0]["sql"]
+    assert calls[0]["params"] == {"lim": 3, "cutoff": "x"}
+
+
+def test_delete_batched_respects_max_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(cleanup, "q", lambda sql, **p: _Result(10))
+    m = cleanup.delete_batched("idempotency_keys", "key", "expires_at < now()", batch_size=10, max_batches=2)
+    assert m == {"deleted": 20, "batches": 2, "elapsed_ms": m["elapsed_ms"], "complete": False}
+
+
+def test_cleanup_tables_sweeps_all_targets(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: List[str] = []
+
+    def fake_q(sql: str, **params):
+        seen.append(sql.split("DELETE FROM", 1)[1].split()[0])
+        return _Result(0)
+
+    monkeypatch.setattr(cleanup, "q", fake_q)
+    policy = {
+        "cleanup_policy": {"batch_size": 500, "pause_ms": 0, "tables": {"pending_actions": {"retain_days": 7}}},
+        "partition_policy": {"tables": {"agent_predictions": {"retain_days": 0}}},
+    }
+    res = cleanup.cleanup_tables(policy)
+    # agent_predictions retention disabled by policy
+    assert seen == ["idempotency_keys", "materializations", "pending_actions", "action_jobs", "dq_results"]
+    assert set(res["tables"]) == set(seen)
+    assert res["batch_size"] == 500
+    assert res["deleted_count"] == 0
+    assert "deleted" in res["tables"]["pending_actions"] and "elapsed_ms" in res["tables"]["pending_actions"]
+
+
+def test_cleanup_config_defaults() -> None:
+    cfg = cleanup.cleanup_config({})
+    assert cfg["batch_size"] == cleanup.DEFAULT_BATCH_SIZE
+    assert cfg["superseded_retain_days"] == cleanup.DEFAULT_SUPERSEDED_RETAIN_DAYS
+    assert cfg["ttl_hours"] == 24
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator
+
+import pytest
+import requests
+
+from app.connectors.bench_coalesce import CountingMockConnector
+from app.connectors.erp import ERPConnector, ExecutionResult
+from app.connectors.http_erp import HttpERPConnector
+from app.connectors.registry import (
+    DEFAULT_SETTINGS,
+    ManagedConnector,
+    connector_settings,
+    register_connector,
+    reset_connectors,
+)
+from app.connectors.resilience import CircuitBreaker, ConnectorUnavailable, TokenBucket
+from app.connectors.stub_erp import start_stub_server
+import app.execution as exec_mod
+
+CASE = "11111111-1111-1111-1111-111111111111"
+
+
+@pytest.fixture(autouse=True)
+def _reset() -> Iterator[None]:
+    reset_connectors()
+    yield
+    reset_connectors()
+
+
+@pytest.fixture
+def stub():
+    srv = start_stub_server()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _settings(**overrides: Any) -> Dict[str, float]:
+    return {**DEFAULT_SETTINGS, "cb_min_calls": 2, "cb_window": 4, "acquire_timeout": 0.1, **overrides}
+
+
+class _Flaky(ERPConnector):
+    name = "flaky"
+
+    def __init__(self) -> None:
+        self.fail = True
+        self.calls = 0
+
+    def execute(self, action_type: str, payload: Dict[str, Any]) -> ExecutionResult:
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("backend down")
+        return ExecutionResult(ok=True, message=f"ok {action_type}")
+
+
+def test_token_bucket_limits_burst() -> None:
+    tb = TokenBucket(rate_per_sec=1, burst=2)
+    assert tb.try_acquire() == 0.0
+    assert tb.try_acquire() == 0.0
+    assert tb.try_acquire() > 0.0
+    assert tb.acquire(timeout=0.01) is False
+
+
+def test_breaker_opens_on_failure_rate_and_recovers_after_probe() -> None:
+    cb = CircuitBreaker(window=4, min_calls=2, failure_rate=0.5, open_seconds=0.05)
+    assert cb.allow()
+    cb.record(False, 1)
+    assert cb.state == "closed"  # below min_calls
+    cb.record(False, 1)
+    assert cb.state == "open"
+    assert cb.allow() is False
+
+    time.sleep(0.06)
+    assert cb.allow() is True  # the single half-open probe
+    assert cb.allow() is False
+    cb.record(True, 1)
+    assert cb.state == "closed"
+
+
+def test_breaker_opens_on_slow_calls() -> None:
+    cb = CircuitBreaker(window=4, min_calls=2, slow_call_ms=100, slow_call_rate=0.5)
+    cb.record(True, 150)
+    cb.record(True, 150)
+    assert cb.state == "open"
+
+
+def test_settings_per_connector_override_global(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CONNECTOR_RATE_PER_SEC", "7")
+    monkeypatch.setenv("CONNECTOR_HTTP_RATE_PER_SEC", "3")
+    assert connector_settings("http")["rate_per_sec"] == 3.0
+    assert connector_settings("mock")["rate_per_sec"] == 7.0
+    assert connector_settings("mock")["max_concurrency"] == DEFAULT_SETTINGS["max_concurrency"]
+
+
+def test_managed_connector_fails_fast_when_open() -> None:
+    inner = _Flaky()
+    mc = ManagedConnector(inner, _settings())
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            mc.execute("ExpediteShipment", {})
+    with pytest.raises(ConnectorUnavailable):
+        mc.execute("ExpediteShipment", {})
+    assert inner.calls == 2
+    assert mc.status()["breaker"]["state"] == "open"
+
+
+def test_managed_connector_rate_limit() -> None:
+    inner = _Flaky()
+    inner.fail = False
+    mc = ManagedConnector(inner, _settings(rate_per_sec=0.001, burst=1))
+    assert mc.execute("A", {}).ok
+    with pytest.raises(ConnectorUnavailable, match="rate limit"):
+        mc.execute("A", {})
+
+
+def test_http_connector_single_and_bulk(stub) -> None:
+    stub.reject_action_types = {"CancelPO"}
+    conn = HttpERPConnector(stub.base_url, timeout=2)
+
+    res = conn.execute("ExpediteShipment", {"qty": 1})
+    assert res.ok and res.data["action_type"] == "ExpediteShipment"
+
+    out = conn.execute_batch([("ExpediteShipment", {}), ("CancelPO", {}), ("ExpediteShipment", {})])
+    assert [r.ok for r in out] == [True, False, True]
+    assert stub.calls == 2 and stub.items == 4
+
+
+def test_http_5xx_raises_and_trips_breaker(stub) -> None:
+    stub.fail_status = 503
+    mc = register_connector(HttpERPConnector(stub.base_url, timeout=2), _settings())
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            mc.execute("ExpediteShipment", {})
+    with pytest.raises(ConnectorUnavailable):
+        mc.execute("ExpediteShipment", {})
+    assert stub.calls == 2
+
+    # Per-item fallback is not used for bulk connectors: the whole batch is refused at once.
+    with pytest.raises(ConnectorUnavailable):
+        mc.execute_batch([("ExpediteShipment", {}), ("ExpediteShipment", {})])
+
+
+def test_http_4xx_is_a_rejection_not_an_error(stub) -> None:
+    stub.fail_status = 422
+    mc = register_connector(HttpERPConnector(stub.base_url, timeout=2), _settings())
+    for _ in range(3):
+        res = mc.execute("ExpediteShipment", {})
+        assert res.ok is False and "422" in res.message
+    assert mc.status()["breaker"]["state"] == "closed"
+
+
+def test_execute_action_blocks_when_circuit_open(monkeypatch: pytest.MonkeyPatch) -> None:
+    class _Row:
+        def fetchone(self):
+            return ("cccccccc-0000-0000-0000-000000000001",)
+
+    monkeypatch.setattr(exec_mod, "q", lambda sql, **p: _Row())
+    inner = _Flaky()
+    mc = register_connector(inner, _settings())
+    monkeypatch.setattr(exec_mod, "get_erp_connector", lambda: mc)
+
+    for _ in range(3):
+        res = exec_mod.execute_action(case_id=CASE, channel="api", action_type="ExpediteShipment", payload={})
+        assert res["ok"] is False
+        assert res["message"].startswith("connector error:")
+    assert "circuit open" in res["message"]
+    assert res["connector_state"]["breaker"]["state"] == "open"
+    assert inner.calls == 2
+
+
+def test_coalescer_groups_same_target_into_one_bulk_call() -> None:
+    backend = CountingMockConnector(latency_ms=0)
+    mc = ManagedConnector(backend, _settings(coalesce_window_ms=100, coalesce_max_batch=4))
+
+    def call(i: int) -> ExecutionResult:
+        return mc.execute("TriggerPurchase", {"supplier_id": "SUP-1", "sku": "SKU-1", "qty": i})
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        out = list(pool.map(call, range(4)))
+    assert backend.calls == 1
+    # Each caller gets its own item's result back.
+    assert [r.data["payload"]["qty"] for r in out] == [0, 1, 2, 3]
+    assert all(r.data["coalesced"] == 4 for r in out)
+    assert mc.status()["coalescing"]["calls_saved"] == 3
+
+
+def test_coalescer_keeps_targets_and_uncovered_actions_apart() -> None:
+    backend = CountingMockConnector(latency_ms=0)
+    mc = ManagedConnector(backend, _settings(coalesce_window_ms=1))
+    assert mc.coalescer.target_key("TriggerPurchase", {"qty": 1}) is None  # no target fields
+    assert mc.coalescer.target_key("OpenSupplierTicket", {"supplier_id": "S"}) is None
+    assert mc.coalescer.target_key("TriggerPurchase", {"sku": "A"}) != mc.coalescer.target_key(
+        "TriggerPurchase", {"sku": "B"}
+    )
+
+    res = mc.execute("OpenSupplierTicket", {"supplier_id": "S"})
+    assert res.ok and "coalesced" not in res.data
+    assert backend.calls == 1
+
+
+def test_coalescing_is_off_without_a_bulk_backend() -> None:
+    mc = ManagedConnector(_Flaky(), _settings(coalesce_window_ms=50))
+    assert mc.coalescer.enabled is False
+    assert mc.status()["coalescing"] is None
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import config
+from app.api_main import create_app
+from app.connectors.erp import ExecutionResult
+import app.api.routers.actions as actions_mod
+import app.execution as exec_mod
+import app.jobs.executor as executor
+
+CASE = "11111111-1111-1111-1111-111111111111"
+PENDING = "aaaaaaaa-0000-0000-0000-000000000001"
+ACTION = "bbbbbbbb-0000-0000-0000-000000000001"
+
+
+def test_async_mode_queues_connector_actions(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config, "ACTION_EXECUTION_MODE", "async")
+    calls: List[Dict[str, Any]] = []
+    monkeypatch.setattr(exec_mod, "q", lambda sql, **p: calls.append({"sql": sql, **p}))
+
+    res = exec_mod.execute_action(
+        case_id=CASE,
+        channel="api",
+        action_type="ExpediteShipment",
+        payload={"qty": 3},
+        pending_id=PENDING,
+    )
+    assert res["queued"] is True and res["status"] == "queued"
+    assert len(calls) == 1
+    assert "INSERT INTO action_jobs" in calls[0]["sql"]
+    (audit,) = json.loads(calls[0]["rows"])
+    (job,) = json.loads(calls[0]["jobs"])
+    assert audit["action_id"] == job["action_id"] == res["action_id"]
+    assert audit["result"].startswith("queued:")
+    assert job["pending_id"] == PENDING
+
+
+def test_execute_endpoint_answers_202_when_queued(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(actions_mod, "one", lambda sql, **p: {"case_id": CASE, "risk_score": 10})
+    monkeypatch.setattr(actions_mod, "can_execute", lambda *a, **k: (True, ""))
+    monkeypatch.setattr(actions_mod, "load_policy", lambda: {})
+    monkeypatch.setattr(
+        actions_mod,
+        "execute_action",
+        lambda **k: {"ok": True, "queued": True, "status": "queued", "action_id": ACTION},
+    )
+    client = TestClient(create_app())
+    r = client.post("/actions/execute", json={"case_id": CASE, "action_type": "ExpediteShipment", "payload": {}})
+    assert r.status_code == 202
+    assert r.json()["action_id"] == ACTION
+
+
+def test_get_action_reports_job_status(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        actions_mod,
+        "one",
+        lambda sql, **p: {"action_id": ACTION, "result": "queued: mock", "job_status": "running", "attempts": 1},
+    )
+    client = TestClient(create_app())
+    body = client.get(f"/actions/{ACTION}").json()
+    assert body["status"] == "running" and body["done"] is False
+    assert client.get("/actions/not-a-uuid").status_code == 400
+
+
+class _Connector:
+    name = "stub"
+
+    def __init__(self, exc: Exception | None = None):
+        self.exc = exc
+
+    def execute(self, action_type: str, payload: Dict[str, Any]) -> ExecutionResult:
+        if self.exc:
+            raise self.exc
+        return ExecutionResult(ok=True, message=f"done {action_type}", data={"n": payload.get("qty")})
+
+
+def _job(attempts: int = 1) -> Dict[str, Any]:
+    return {"job_id": "j1", "action_type": "ExpediteShipment", "payload": {"qty": 2}, "attempts": attempts, "max_attempts": 3}
+
+
+def test_run_job_writes_back_result(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[Dict[str, Any]] = []
+    monkeypatch.setattr(executor, "q", lambda sql, **p: calls.append({"sql": sql, **p}))
+    monkeypatch.setattr(executor, "get_erp_connector", lambda: _Connector())
+
+    executor.run_job(_job())
+    (call,) = calls
+    assert "UPDATE agent_actions" in call["sql"] and "UPDATE pending_actions" in call["sql"]
+    assert (call["st"], call["pst"], call["msg"]) == ("succeeded", "executed", "done ExpediteShipment")
+    assert json.loads(call["res"])["data"] == {"n": 2}
+
+
+@pytest.mark.parametrize("attempts, expect_retry", [(1, True), (3, False)])
+def test_run_job_retries_connector_errors(monkeypatch: pytest.MonkeyPatch, attempts: int, expect_retry: bool) -> None:
+    calls: List[Dict[str, Any]] = []
+    monkeypatch.setattr(executor, "q", lambda sql, **p: calls.append({"sql": sql, **p}))
+    monkeypatch.setattr(executor, "get_erp_connector", lambda: _Connector(exc=TimeoutError("erp slow")))
+
+    executor.run_job(_job(attempts))
+    (call,) = calls
+    if expect_retry:
+        assert "SET status='queued'" in call["sql"]
+        assert call["delay"] == executor.RETRY_BACKOFF_SECONDS
+    else:
+        assert (call["st"], call["pst"]) == ("failed", "blocked")
+        assert "erp slow" in call["err"]
+
+
+def test_requeue_stale_fails_jobs_out_of_attempts(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[Dict[str, Any]] = []
+    rows = [
+        {"job_id": "j1", "action_id": ACTION, "case_id": CASE, "pending_id": PENDING, "action_type": "ExpediteShipment", "status": "failed"},
+        {"job_id": "j2", "action_id": "a2", "case_id": CASE, "pending_id": None, "action_type": "TriggerPurchase", "status": "queued"},
+    ]
+    monkeypatch.setattr(executor, "all", lambda sql, **p: calls.append({"sql": sql, **p}) or rows)
+    published: List[Any] = []
+    monkeypatch.setattr(executor, "publish_many", lambda evs: published.extend(evs))
+
+    assert executor.requeue_stale(60) == (1, 1)
+    (call,) = calls  # one statement decides requeue vs. fail
+    sql = " ".join(call["sql"].split())
+    assert "SET status=CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END" in sql
+    assert "UPDATE pending_actions" in sql and "lease expired" in call["msg"] and call["lease"] == 60
+    assert [(kind, obj, data["status"]) for kind, obj, _, data in published] == [("action", ACTION, "failed"), ("pending_action", PENDING, "blocked")]
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import json
-
 import pytest
 
 import app.idempotency as idem
@@ -14,42 +12,130 @@ def test_request_hash_is_stable_for_same_object() -> None:
     assert h1 == h2
 
 
-def test_check_or_replay_replays_on_match(monkeypatch: pytest.MonkeyPatch) -> None:
-    def fake_one(sql: str, **params):
-        assert "idempotency_keys" in sql
-        return {"key": params["k"], "request_hash": "abc", "response": {"ok": True, "x": 1}}
+class _Result:
+    def __init__(self, row):
+        self._row = row
 
-    monkeypatch.setattr(idem, "_one", fake_one)
-    replayed, resp, conflict = idem.check_or_replay(key="k1", req_hash="abc")
-    assert replayed is True
-    assert resp == {"ok": True, "x": 1}
-    assert conflict is None
+    def fetchone(self):
+        return self._row
 
 
-def test_check_or_replay_conflicts_on_mismatch(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_reserve_claims_new_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    idem.clear_cache()
+    calls = {}
+
+    def fake_q(sql: str, **params):
+        calls["sql"] = sql
+        calls["params"] = params
+        return _Result(("k1",))
+
+    monkeypatch.setattr(idem, "_q", fake_q)
+    outcome, resp = idem.reserve(key="k1", req_hash="h1", ttl_seconds=60)
+    assert outcome == "reserved"
+    assert resp is None
+    assert "ON CONFLICT (key) DO UPDATE" in calls["sql"]
+    assert "'in_flight'" in calls["sql"]
+
+
+@pytest.mark.parametrize(
+    "row, expected",
+    [
+        ({"key": "k1", "request_hash": "h1", "status": "in_flight", "response": None}, "in_flight"),
+        ({"key": "k1", "request_hash": "OTHER", "status": "completed", "response": {"ok": True}}, "conflict"),
+        ({"key": "k1", "request_hash": "h1", "status": "completed", "response": {"ok": True}}, "replay"),
+    ],
+)
+def test_reserve_existing_key_outcomes(monkeypatch: pytest.MonkeyPatch, row, expected) -> None:
+    idem.clear_cache()
+    monkeypatch.setattr(idem, "_q", lambda sql, **params: _Result(None))
+    monkeypatch.setattr(idem, "_one", lambda sql, **params: row)
+    outcome, _resp = idem.reserve(key="k1", req_hash="h1", ttl_seconds=60)
+    assert outcome == expected
+
+
+def test_reserve_replays_a_completed_response_and_caches_it(monkeypatch: pytest.MonkeyPatch) -> None:
+    idem.clear_cache()
+    row = {"key": "k1", "request_hash": "abc", "status": "completed", "response": {"ok": True, "x": 1}}
+
     def fake_one(sql: str, **params):
-        return {"key": params["k"], "request_hash": "abc", "response": {"ok": True}}
+        assert "idempotency_keys" in sql and params["k"] == "k1"
+        return row
 
+    monkeypatch.setattr(idem, "_q", lambda sql, **params: _Result(None))
     monkeypatch.setattr(idem, "_one", fake_one)
-    replayed, resp, conflict = idem.check_or_replay(key="k1", req_hash="DIFF")
-    assert replayed is False
-    assert resp is None
-    assert "different request" in (conflict or "").lower()
+    assert idem.reserve(key="k1", req_hash="abc", ttl_seconds=60) == ("replay", {"ok": True, "x": 1})
+    assert idem._lru_get("k1") == ("abc", {"ok": True, "x": 1})
 
 
-def test_store_inserts_jsonb(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_reserve_conflicts_on_a_different_request(monkeypatch: pytest.MonkeyPatch) -> None:
+    idem.clear_cache()
+    row = {"key": "k1", "request_hash": "abc", "status": "completed", "response": {"ok": True}}
+    monkeypatch.setattr(idem, "_q", lambda sql, **params: _Result(None))
+    monkeypatch.setattr(idem, "_one", lambda sql, **params: row)
+    assert idem.reserve(key="k1", req_hash="DIFF", ttl_seconds=60) == ("conflict", None)
+    assert idem._lru_get("k1") is None
+
+
+class _Updated:
+    def __init__(self, keys: list) -> None:
+        self.rowcount = len(keys)
+        self._rows = [(k,) for k in keys]
+
+    def fetchall(self) -> list:
+        return self._rows
+
+
+def test_complete_writes_canonical_jsonb_for_an_in_flight_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    idem.clear_cache()
     calls = {}
 
     def fake_q(sql: str, **params):
-        calls["sql"] = sql
+        calls["sql"] = " ".join(sql.split())
         calls["params"] = params
-        return None
+        return _Updated([params.get("k", "k2")])
 
     monkeypatch.setattr(idem, "_q", fake_q)
-    idem.store("k1", "h1", {"ok": True, "n": 3})
-    assert "INSERT INTO idempotency_keys" in calls["sql"]
-    assert calls["params"]["k"] == "k1"
-    assert calls["params"]["h"] == "h1"
+    assert idem.complete("k1", "h1", {"ok": True, "n": 3}, ttl_seconds=60) is True
+    assert "UPDATE idempotency_keys" in calls["sql"]
+    assert "WHERE key=:k AND request_hash=:h AND status='in_flight'" in calls["sql"]
+    assert calls["params"]["k"] == "k1" and calls["params"]["h"] == "h1"
     # response stored as canonical JSON string
-    stored = json.loads(calls["params"]["r"])
-    assert stored == {"n": 3, "ok": True}
+    assert calls["params"]["r"] == '{"n":3,"ok":true}'
+
+    idem.complete_many([("k2", "h2", {"n": 2})], ttl_seconds=60)
+    assert "k.status='in_flight'" in calls["sql"]
+
+
+def test_complete_populates_lru_and_skips_db(monkeypatch: pytest.MonkeyPatch) -> None:
+    idem.clear_cache()
+    monkeypatch.setattr(idem, "_q", lambda sql, **params: _Updated([params["k"]]))
+    assert idem.complete("k1", "h1", {"ok": True, "n": 1}, ttl_seconds=60) is True
+
+    def boom(sql: str, **params):
+        raise AssertionError("DB should not be hit for a cached key")
+
+    monkeypatch.setattr(idem, "_q", boom)
+    monkeypatch.setattr(idem, "_one", boom)
+    assert idem.reserve(key="k1", req_hash="h1", ttl_seconds=60) == ("replay", {"n": 1, "ok": True})
+    assert idem.reserve(key="k1", req_hash="h2", ttl_seconds=60) == ("conflict", None)
+
+
+def test_complete_does_not_cache_a_vanished_reservation(monkeypatch: pytest.MonkeyPatch) -> None:
+    idem.clear_cache()
+    monkeypatch.setattr(idem, "_q", lambda sql, **params: _Updated([]))  # expired and cleaned up
+    assert idem.complete("k1", "h1", {"ok": True}, ttl_seconds=60) is False
+    assert idem._lru_get("k1") is None
+
+    monkeypatch.setattr(idem, "_q", lambda sql, **params: _Updated(["k2"]))
+    entries = [("k2", "h", {"n": 2}), ("k3", "h", {"n": 3})]
+    assert idem.complete_many(entries, ttl_seconds=60) == 1
+    assert idem._lru_get("k2") == ("h", {"n": 2}) and idem._lru_get("k3") is None
+
+
+def test_lru_evicts_oldest(monkeypatch: pytest.MonkeyPatch) -> None:
+    idem.clear_cache()
+    monkeypatch.setattr(idem, "LRU_MAX_ENTRIES", 2)
+    for k in ("a", "b", "c"):
+        idem._lru_put(k, "h", {"k": k}, 60)
+    assert idem._lru_get("a") is None
+    assert idem._lru_get("c") == ("h", {"k": "c"})
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.news_dedupe as dd
+from app.api.routers import news as news_mod
+from app.api_main import create_app
+
+STORY = (
+    "DRAM spot prices soften as leakage inventory hits secondary channels. Multiple channel checks cite "
+    "excess server DRAM inventory leaking into spot markets, pressuring prices."
+)
+OTHER = "NAND flash price cuts rumored as AI DC demand shifts to HBM priority. Suppliers may discount contracts."
+
+
+def test_simhash_separates_rewordings_from_other_stories() -> None:
+    base = dd.simhash(STORY)
+    assert dd.distance(base, dd.simhash("Update: " + STORY)) <= 6
+    assert dd.distance(base, dd.simhash(STORY + " (Reuters)")) <= 6
+    assert dd.distance(base, dd.simhash(OTHER)) > 12
+    assert dd.to_signed(1 << 63) == -(1 << 63) and dd.to_signed(5) == 5
+
+
+def test_index_lookup_is_fast_at_scale() -> None:
+    idx = dd.SimHashIndex(max_distance=6)
+    rnd = random.Random(7)
+    for i in range(100_000):
+        idx.add(rnd.getrandbits(64), f"c{i}")
+    sig = dd.simhash(STORY)
+    idx.add(sig, "story")
+    assert idx.lookup(sig ^ 0b101) == "story"  # 2 bits away
+
+    probes = [rnd.getrandbits(64) for _ in range(2000)]
+    start = time.perf_counter()
+    for p in probes:
+        idx.lookup(p)
+    per_lookup = (time.perf_counter() - start) / len(probes)
+    assert per_lookup < 0.001
+
+
+@pytest.fixture
+def fake_db(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+    db: Dict[str, Any] = {"signatures": [], "items": {}, "urls": set()}
+
+    def fake_all(sql: str, **params: Any) -> List[Dict[str, Any]]:
+        if "INSERT INTO news_items" in sql:
+            out = []
+            for r in json.loads(params["rows"]):
+                if r["url"] in db["urls"]:
+                    continue
+                db["urls"].add(r["url"])
+                iid = f"00000000-0000-0000-0000-{len(db['urls']):012d}"
+                out.append({"item_id": iid, "topic": r["topic"], "title": r["title"], "url": r["url"], "severity": r["severity"]})
+            return out
+        assert "FROM news_signatures" in sql and "bit_count" in sql
+        out = []
+        for p in json.loads(params["probes"]):
+            cands = [s for s in db["signatures"] if any(s[f"band{b}"] == p[f"band{b}"] for b in range(dd.BANDS))]
+            best = min(cands, key=lambda s: dd.distance(s["simhash"], p["simhash"]), default=None)
+            if best and dd.distance(best["simhash"], p["simhash"]) <= params["maxd"]:
+                out.append({"item_id": p["item_id"], "cluster_id": best["cluster_id"]})
+        return out
+
+    def fake_q(sql: str, **params: Any) -> None:
+        for r in json.loads(params["rows"]):
+            db["signatures"].append(r)
+            db["items"][r["item_id"]] = r["cluster_id"]
+
+    monkeypatch.setattr(news_mod, "all", fake_all)
+    monkeypatch.setattr(dd, "all", fake_all)
+    monkeypatch.setattr(dd, "q", fake_q)
+    monkeypatch.setattr(dd, "stream", lambda sql, **p: iter(db["signatures"]))
+    monkeypatch.setattr(dd, "_index", None)
+    return db
+
+
+def _item(url: str, title: str, summary: str = "") -> Dict[str, Any]:
+    return {"topic": "memory", "title": title, "summary": summary, "url": url, "severity": 50}
+
+
+def test_ingest_assigns_clusters_across_urls_and_batches(fake_db: Dict[str, Any]) -> None:
+    client = TestClient(create_app())
+    first, second = STORY.split(". ", 1)
+    r = client.post(
+        "/news/ingest",
+        json={"items": [_item("https://a/1", first, second), _item("https://b/1", "Update: " + first, second), _item("https://c/1", OTHER)]},
+    ).json()
+    assert r["inserted"] == 3 and r["near_duplicates"] == 1
+
+    ids = sorted(fake_db["items"])
+    assert fake_db["items"][ids[1]] == ids[0]  # joined the first item's cluster
+    assert fake_db["items"][ids[2]] == ids[2]  # new story, own cluster
+
+    # A different process (cold index) still finds the cluster through the band query.
+    dd._index = dd.SimHashIndex(max_distance=6)
+    dd._index.warmed = True
+    r = client.post("/news/ingest", json={"items": [_item("https://d/1", first, second + " (Reuters)")]}).json()
+    assert r["near_duplicates"] == 1
+    assert fake_db["items"][sorted(fake_db["items"])[-1]] == ids[0]
+
+
+def test_clustering_failure_does_not_fail_ingest(fake_db: Dict[str, Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    def boom(sql: str, **params: Any) -> None:
+        raise RuntimeError("signatures table missing")
+
+    monkeypatch.setattr(dd, "q", boom)
+    r = TestClient(create_app()).post("/news/ingest", json={"items": [_item("https://x/1", "HBM supply tight")]})
+    assert r.status_code == 200 and r.json()["inserted"] == 1 and r.json()["near_duplicates"] == 0
+
+
+def test_collapse_query_picks_one_row_per_cluster(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: List[str] = []
+
+    def fake_all(sql: str, **params: Any) -> List[Dict[str, Any]]:
+        seen.append(sql)
+        return []
+
+    monkeypatch.setattr(news_mod, "all", fake_all)
+    r = TestClient(create_app()).get("/news/items", params={"topic": "memory", "collapse": "true"}).json()
+    assert r["collapsed"] is True
+    assert "PARTITION BY r.cluster_key" in seen[-1] and "rn = 1" in seen[-1]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+import app.news_features as nf
+import app.news_linker as linker
+from app.risk_model import compute_risk
+
+NOW = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+
+
+def _it(hours_ago: float, severity: int) -> Dict[str, Any]:
+    return {"fetched_at": NOW - timedelta(hours=hours_ago), "severity": severity}
+
+
+def test_themes_come_from_signals_and_matched_terms() -> None:
+    assert nf.item_themes({"theme": "leakage", "matched_terms": ["leak*", "shortage", "price*"]}) == ["leakage", "shortage", "price"]
+    assert nf.item_themes({"theme": ["Price cuts"], "matched_terms": ["dump*"]}) == ["price_cut", "dumping"]
+    assert nf.item_themes({}) == []
+
+
+def test_contributions_weight_items_by_age() -> None:
+    rows = nf.contributions(
+        [
+            (_it(0, 80), {"theme": "shortage"}, ["dram_ddr5"]),
+            (_it(24, 50), {}, ["dram_ddr5", "nand_tlc"]),
+            (_it(24 * 30, 100), {"theme": "leakage"}, ["nand_tlc"]),  # backlog item, barely counts
+        ],
+        now=NOW,
+    )
+    by = {r["resource_id"]: r for r in rows}
+    assert by["dram_ddr5"]["items_24h"] == pytest.approx(1 + math.exp(-1))
+    assert by["dram_ddr5"]["sev_7d"] == pytest.approx(0.8 + 0.5 * math.exp(-1 / 7))
+    assert by["dram_ddr5"]["themes"] == {"shortage": 1.0}
+    assert by["nand_tlc"]["themes"]["leakage"] < 0.02
+    assert by["nand_tlc"]["last_item_at"] == (NOW - timedelta(hours=24)).isoformat()
+
+
+def test_features_decay_to_now_with_momentum_and_flags() -> None:
+    # Steady one-item-per-day stream at severity 100: decayed sums ~ rate * time constant.
+    row = {"items_24h": 1.0, "items_7d": 7.0, "sev_24h": 1.0, "sev_7d": 7.0, "themes_7d": {"shortage": 3.0, "price": 0.2}, "last_item_at": NOW, "updated_at": NOW}
+    f = nf.features_at(row, now=NOW)
+    assert f["news_momentum"] == pytest.approx(1.0)
+    assert f["news_themes"] == ["shortage"]
+
+    later = nf.features_at(row, now=NOW + timedelta(days=1))
+    assert later["news_severity_24h"] == pytest.approx(math.exp(-1), abs=1e-3)
+    assert later["news_momentum"] < 1.0  # quiet day -> decelerating
+
+    burst = nf.features_at({**row, "sev_24h": 5.0, "sev_7d": 8.0}, now=NOW)
+    assert burst["news_momentum"] > 4
+
+
+def test_risk_is_unchanged_without_news_and_bumped_with_it() -> None:
+    sigs, otif = {"price_index": 1.21}, {"SUP_A": 0.93}
+    base = compute_risk(sigs, otif)
+    assert base == compute_risk(sigs, otif, None)
+    assert base[0] == int(round(0.55 * 70 + 0.45 * 60)) and "news_risk_bump" not in base[3]
+
+    news = {"news_severity_7d": 6.0, "news_momentum": 2.0, "news_themes": ["leakage"], "news_items_7d": 7.0}
+    risk, _, _, features = compute_risk(sigs, otif, news)
+    assert risk == base[0] + 15  # capped
+    assert features["news_risk_bump"] == 15 and features["news_themes"] == ["leakage"]
+    assert compute_risk(sigs, otif, {"news_severity_7d": 1.0})[3]["news_risk_bump"] == 3
+
+
+def test_linker_updates_features_in_the_link_statement(monkeypatch: pytest.MonkeyPatch) -> None:
+    fetched = datetime.now(timezone.utc)
+    item = {"item_id": "00000000-0000-0000-0000-000000000001", "fetched_at": fetched, "topic": "memory", "title": "t", "severity": 70, "signals": {"category": "dram", "theme": "shortage"}}
+    sent: Dict[str, Any] = {}
+
+    def fake_one(sql: str, **p: Any) -> Optional[Dict[str, Any]]:
+        if sql.strip().startswith("SELECT last_ts"):
+            return {"last_ts": fetched - timedelta(days=1), "last_id": "00000000-0000-0000-0000-000000000000"}
+        sent.update(sql=sql, **p)
+        return {"advanced": 1, "links": 1, "cases": 0, "alerts": []}
+
+    def fake_all(sql: str, **p: Any) -> List[Dict[str, Any]]:
+        return [] if "agent_cases" in sql else [item]
+
+    monkeypatch.setattr(linker, "one", fake_one)
+    monkeypatch.setattr(linker, "all", fake_all)
+    policy = {"news_link_policy": {"entities": {"dram_ddr5": {"category": ["dram"]}}}}
+    assert linker.link_new_items(policy)["links"] == 1
+
+    assert "INSERT INTO news_resource_features" in sent["sql"] and "ON CONFLICT (resource_id) DO UPDATE" in sent["sql"]
+    (feat,) = json.loads(sent["feats"])
+    assert feat["resource_id"] == "dram_ddr5" and feat["themes"] == {"shortage": pytest.approx(1.0, rel=1e-3)}
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import importlib
+import json
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from conftest import load_service_app
+
+load_service_app("news_monitor")
+rss = importlib.import_module("news_monitor_app.fetchers.rss")
+stub_feeds = importlib.import_module("news_monitor_app.fetchers.stub_feeds")
+sched_mod = importlib.import_module("news_monitor_app.scheduler")
+outbox_mod = importlib.import_module("news_monitor_app.outbox")
+nm_main = importlib.import_module("news_monitor_app.main")
+
+
+@pytest.fixture
+def feeds() -> Iterator["stub_feeds.StubFeedServer"]:
+    srv = stub_feeds.start_stub_feeds()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _sources(srv, n: int, **kw):
+    for i in range(n):
+        srv.publish(f"f{i}", f"HBM shortage update {i}", f"https://example.com/{i}/1")
+    return [nm_main.RssSource(name=f"f{i}", url=srv.url(f"f{i}"), **kw) for i in range(n)]
+
+
+def test_unchanged_feeds_cost_a_304_and_validators_persist(feeds, tmp_path: Path) -> None:
+    state = tmp_path / "state.json"
+    sources = _sources(feeds, 3)
+    f = rss.FeedFetcher(concurrency=4, timeout=2, state_path=str(state))
+    first = f.fetch_all(sources)
+    assert [len(r.entries) for r in first] == [1, 1, 1] and feeds.full == 3
+    assert json.loads(state.read_text())[sources[0].url]["etag"] == '"f0-1"'
+
+    feeds.publish("f1", "NAND price cut", "https://example.com/1/2")
+    # A new fetcher (process restart) picks the validators up from disk.
+    again = rss.FeedFetcher(concurrency=4, timeout=2, state_path=str(state)).fetch_all(sources)
+    assert [r.not_modified for r in again] == [True, False, True]
+    assert [len(r.entries) for r in again] == [0, 2, 0]
+    assert feeds.full == 4 and feeds.not_modified == 2
+    f.close()
+
+
+def test_fetches_run_concurrently_with_per_source_timeouts(feeds) -> None:
+    sources = _sources(feeds, 8)
+    for i in range(8):
+        feeds.delay_ms[f"f{i}"] = 200
+    feeds.delay_ms["f7"] = 3000
+    sources[7].timeout = 0.3
+
+    f = rss.FeedFetcher(concurrency=8, timeout=5)
+    start = time.monotonic()
+    results = f.fetch_all(sources)
+    elapsed = time.monotonic() - start
+    f.close()
+
+    assert elapsed < 1.0  # 8 x 200ms sequentially would be 1.6s+
+    assert all(len(r.entries) == 1 for r in results[:7])
+    assert results[7].error and "Timeout" in results[7].error
+
+
+def test_connections_are_reused_across_sources(feeds) -> None:
+    sources = _sources(feeds, 20)
+    f = rss.FeedFetcher(concurrency=2, timeout=2)
+    f.fetch_all(sources)
+    f.fetch_all(sources)
+    f.close()
+    assert feeds.requests == 40
+    assert feeds.connections <= 2
+
+
+def test_errors_do_not_fail_the_poll(feeds, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    sources = _sources(feeds, 2) + [nm_main.RssSource(name="gone", url=feeds.url("missing"))]
+    now = [1000.0]
+    posted: List[str] = []
+    monkeypatch.setattr(nm_main, "load_rss_sources", lambda: sources)
+    monkeypatch.setattr(nm_main, "_fetcher", rss.FeedFetcher(concurrency=4, timeout=2, state_path=str(tmp_path / "s.json")))
+    monkeypatch.setattr(nm_main, "_scheduler", sched_mod.SourceScheduler([], default_interval=10, jitter=0, clock=lambda: now[0]))
+    monkeypatch.setattr(nm_main, "_seen", nm_main.SeenFilter(capacity=1000))
+    monkeypatch.setattr(nm_main, "_outbox", outbox_mod.Outbox(str(tmp_path / "outbox.sqlite3")))
+    monkeypatch.setattr(nm_main, "SOURCE_METRICS_PATH", "")
+    monkeypatch.setattr(
+        nm_main,
+        "_api_post",
+        lambda path, payload, **_: posted.extend(i["url"] for i in payload["items"]) or {"inserted": len(payload["items"])},
+    )
+
+    out = nm_main.run_due_sources()
+    assert sorted(posted) == ["https://example.com/0/1", "https://example.com/1/1"]
+    assert out["sources"] == 3 and out["errors"] == {"gone": "http 404"}
+
+    now[0] += 10
+    out = nm_main.run_due_sources()
+    assert out["fetched"] == 0 and out["not_modified"] == 2 and len(posted) == 2
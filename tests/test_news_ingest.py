@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import importlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routers import news as news_mod
+from app.api_main import create_app
+from conftest import load_service_app
+
+load_service_app("news_monitor")
+seen_mod = importlib.import_module("news_monitor_app.seen")
+outbox_mod = importlib.import_module("news_monitor_app.outbox")
+nm_main = importlib.import_module("news_monitor_app.main")
+
+
+@pytest.fixture
+def stored(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+    db: Dict[str, Any] = {"urls": set(), "statements": 0}
+
+    def fake_all(sql: str, **params: Any) -> List[Dict[str, Any]]:
+        assert "INSERT INTO news_items" in sql and "ON CONFLICT(url) DO NOTHING" in sql
+        db["statements"] += 1
+        out = []
+        for r in json.loads(params["rows"]):
+            if r["url"] in db["urls"]:
+                continue
+            db["urls"].add(r["url"])
+            out.append({"item_id": f"id-{len(db['urls'])}", "topic": r["topic"], "title": r["title"], "url": r["url"], "severity": r["severity"]})
+        return out
+
+    monkeypatch.setattr(news_mod, "all", fake_all)
+    return db
+
+
+def _items(*urls: str) -> List[Dict[str, Any]]:
+    return [{"topic": "memory", "title": f"t {u}", "url": u, "severity": 40} for u in urls]
+
+
+def test_ingest_is_one_statement_with_real_counts(stored: Dict[str, Any]) -> None:
+    client = TestClient(create_app())
+    r = client.post("/news/ingest", json={"items": _items("u1", "u2", "u2", "u3")}).json()
+    assert (r["inserted"], r["deduped"]) == (3, 1)
+    assert stored["statements"] == 1
+
+    r = client.post("/news/ingest", json={"items": _items("u3", "u4")}).json()
+    assert (r["inserted"], r["deduped"]) == (1, 1)
+
+
+def test_seen_filter_has_no_false_negatives_and_bounded_false_positives(tmp_path: Path) -> None:
+    f = seen_mod.SeenFilter(capacity=10_000, error_rate=0.01, path=str(tmp_path / "seen.bloom"))
+    f.add_many(f"https://a.example/{i}" for i in range(10_000))
+    assert all(f"https://a.example/{i}" in f for i in range(10_000))
+    fp = sum(f"https://b.example/{i}" in f for i in range(20_000))
+    assert fp / 20_000 < 0.02
+
+    f.save()
+    again = seen_mod.SeenFilter(capacity=10_000, error_rate=0.01, path=str(tmp_path / "seen.bloom"))
+    assert "https://a.example/42" in again and again.count == f.count
+
+    # Past capacity the filter starts over instead of saturating.
+    small = seen_mod.SeenFilter(capacity=3)
+    for u in ("x1", "x2", "x3", "x4"):
+        small.add(u)
+    assert small.count == 1 and "x4" in small and "x1" not in small
+
+
+def test_monitor_skips_acknowledged_urls(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    posted: List[List[str]] = []
+
+    def fake_post(path: str, payload: Dict[str, Any], **_: Any) -> Dict[str, Any]:
+        posted.append([i["url"] for i in payload["items"]])
+        return {"ok": True, "inserted": len(payload["items"]), "deduped": 0}
+
+    monkeypatch.setattr(nm_main, "_api_post", fake_post)
+    monkeypatch.setattr(nm_main, "_seen", seen_mod.SeenFilter(capacity=1000, path=str(tmp_path / "s.bloom")))
+    monkeypatch.setattr(nm_main, "_outbox", outbox_mod.Outbox(str(tmp_path / "outbox.sqlite3")))
+
+    assert nm_main.queue_items(_items("u1", "u2", "u1")) == ["u1", "u2"]
+    assert nm_main.deliver_outbox()["inserted"] == 2
+    assert nm_main.queue_items(_items("u1", "u2", "u3")) == ["u3"]
+    assert nm_main.deliver_outbox()["inserted"] == 1
+    assert posted == [["u1", "u2"], ["u3"]]
+
+    def down(path: str, payload: Dict[str, Any], **_: Any) -> Dict[str, Any]:
+        raise ConnectionError("api down")
+
+    monkeypatch.setattr(nm_main, "_api_post", down)
+    assert nm_main.queue_items(_items("u4")) == ["u4"]
+    r = nm_main.deliver_outbox()  # the poll survives; u4 waits in the outbox
+    assert r["delivered"] == 0 and "api down" in r["delivery_error"] and r["outbox"]["pending"] == 1
+    assert "u4" not in nm_main.get_seen()
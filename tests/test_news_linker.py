@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.change_feed as cf
+import app.news_linker as linker
+from app.api.routers import news as news_mod
+from app.api.routers.governance import _validate_policy_strict
+from app.api_main import create_app
+from app.policy_store import load_policy
+
+CASE = "33333333-3333-3333-3333-333333333333"
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+POLICY: Dict[str, Any] = {
+    "news_link_policy": {
+        "batch_size": 3,
+        "alert_min_severity": 90,
+        "topic_alert_min_severity": {"memory": 75},
+        "entities": {
+            "dram_ddr5": {"category": ["dram", "server_memory"], "vendor": ["samsung", "sk hynix"]},
+            "nand_tlc": {"category": ["nand"], "vendor": ["samsung"]},
+        },
+    }
+}
+
+
+def test_entity_dictionary_matching() -> None:
+    d = linker.EntityDictionary(POLICY["news_link_policy"]["entities"], ["ocean_freight_asia_us"])
+    assert d.match("x", {"category": "DRAM"}) == {"dram_ddr5": "category:dram"}
+    assert d.match("x", {"category": "Server-Memory"}) == {"dram_ddr5": "category:server memory"}
+    assert d.match("Delays on ocean_freight_asia_us lanes", {}) == {"ocean_freight_asia_us": "title:ocean_freight_asia_us"}
+    assert d.match("x", {"resource_ids": ["nand_tlc", "unknown"]}) == {"nand_tlc": "resource_id:nand_tlc"}
+    # A vendor alone is ambiguous; it only counts when no category/product is named.
+    assert set(d.match("x", {"vendor": "Samsung"})) == {"dram_ddr5", "nand_tlc"}
+    assert d.match("x", {"vendor": "Samsung", "category": "nand"}) == {"nand_tlc": "category:nand"}
+    assert d.match("x", {"vendor": "SK Hynix", "category": "hdd"}) == {}
+
+
+class FakeDB:
+    def __init__(self, items: List[Dict[str, Any]]):
+        self.items = items
+        self.wm: Dict[str, Any] = {"last_ts": datetime(1970, 1, 1, tzinfo=timezone.utc), "last_id": "00000000-0000-0000-0000-000000000000"}
+        self.links: List[Dict[str, Any]] = []
+        self.item_cases: Dict[str, str] = {}
+        self.alerts: List[Dict[str, Any]] = []
+        self.steal_next = False
+
+    def one(self, sql: str, **p: Any) -> Optional[Dict[str, Any]]:
+        if sql.strip().startswith("SELECT last_ts"):
+            return dict(self.wm)
+        assert "UPDATE job_watermarks" in sql and "last_ts = :ts AND last_id" in sql
+        if self.steal_next or (p["ts"], p["id"]) != (self.wm["last_ts"], str(self.wm["last_id"])):
+            return {"advanced": 0, "links": 0, "cases": 0, "alerts": []}
+        self.wm = {"last_ts": p["new_ts"], "last_id": p["new_id"]}
+        self.links += json.loads(p["links"])
+        for r in json.loads(p["cases"]):
+            self.item_cases[r["item_id"]] = r["case_id"]
+        raised = []
+        for a in json.loads(p["alerts"]):
+            if all(x["item_id"] != a["item_id"] for x in self.alerts):
+                a["alert_id"] = f"alert-{len(self.alerts)}"
+                self.alerts.append(a)
+                raised.append(a)
+        return {"advanced": 1, "links": len(json.loads(p["links"])), "cases": len(json.loads(p["cases"])), "alerts": json.dumps(raised)}
+
+    def all(self, sql: str, **p: Any) -> List[Dict[str, Any]]:
+        if "FROM agent_cases" in sql and "DISTINCT ON" in sql:
+            return [{"resource_id": "dram_ddr5", "case_id": CASE, "risk_score": 82}] if "dram_ddr5" in p["rids"] else []
+        if "FROM agent_cases" in sql:
+            return [{"resource_id": "dram_ddr5"}]
+        assert "(fetched_at, item_id) > (:ts" in sql and "make_interval(secs => :lag)" in sql and "ORDER BY fetched_at, item_id" in sql
+        after = [i for i in self.items if (i["fetched_at"], i["item_id"]) > (p["ts"], p["id"])]
+        return after[: p["lim"]]
+
+
+def _item(n: int, severity: int, signals: Dict[str, Any], topic: str = "memory") -> Dict[str, Any]:
+    return {
+        "item_id": f"00000000-0000-0000-0000-{n:012d}",
+        "fetched_at": T0 + timedelta(seconds=n),
+        "topic": topic,
+        "title": f"item {n}",
+        "severity": severity,
+        "signals": signals,
+    }
+
+
+@pytest.fixture
+def db(monkeypatch: pytest.MonkeyPatch) -> FakeDB:
+    fake = FakeDB(
+        [
+            _item(1, 78, {"category": "dram"}),
+            _item(2, 60, {"category": "nand"}),
+            _item(3, 95, {}, topic="energy"),
+            _item(4, 80, {"category": "server_memory", "vendor": "Samsung"}),
+            _item(5, 70, {"vendor": "Samsung"}),
+        ]
+    )
+    monkeypatch.setattr(linker, "one", fake.one)
+    monkeypatch.setattr(linker, "all", fake.all)
+    broker = cf.Broker(capacity=100)
+    monkeypatch.setattr(cf, "broker", broker)
+    monkeypatch.setattr(cf.config, "CHANGE_FEED_BACKEND", "inprocess")
+    return fake
+
+
+def test_links_batches_past_watermark_and_raises_alerts(db: FakeDB) -> None:
+    r = linker.link_new_items(POLICY)
+    assert r == {"items": 5, "links": 5, "cases": 3, "alerts": 3, "batches": 2}
+    assert db.wm["last_id"].endswith("000000000005")
+
+    by_item = {(lk["item_id"][-1], lk["resource_id"]): lk for lk in db.links}
+    assert by_item[("1", "dram_ddr5")]["case_id"] == CASE
+    assert by_item[("2", "nand_tlc")]["case_id"] is None
+    assert {("5", "dram_ddr5"), ("5", "nand_tlc")} <= set(by_item)
+    assert set(db.item_cases.values()) == {CASE}
+
+    # memory threshold 75, other topics 90; items 1 (78), 3 (95, energy) and 4 (80).
+    assert sorted(a["item_id"][-1] for a in db.alerts) == ["1", "3", "4"]
+    assert "category:dram" in db.alerts[0]["note"]
+    kinds = [(e["kind"], e["op"]) for e in cf.broker.read_after(0, limit=100)[0]]
+    assert kinds.count(("news", "alert")) == 3 and kinds.count(("news", "linked")) == 3
+
+    # Caught up: the next pass reads past the watermark only and writes nothing.
+    assert linker.link_new_items(POLICY)["items"] == 0
+    assert len(db.alerts) == 3
+
+
+def test_lost_watermark_race_writes_nothing(db: FakeDB) -> None:
+    db.steal_next = True
+    r = linker.link_new_items(POLICY)
+    assert r["links"] == 0 and r["alerts"] == 0 and r["batches"] == 1
+    assert db.links == [] and cf.broker.last_id == 0
+
+
+def test_matching_keeps_up_with_ingest_rate() -> None:
+    d = linker.EntityDictionary(load_policy()["news_link_policy"]["entities"], [f"res_{i}" for i in range(500)])
+    items = [{"title": f"Memory update {i} for res_{i % 700}", "signals": {"category": "dram" if i % 2 else "nand", "vendor": "Micron"}} for i in range(10_000)]
+    start = time.perf_counter()
+    matched = sum(1 for it in items if d.match(it["title"], it["signals"]))
+    assert time.perf_counter() - start < 1.0  # 10k items; the target is 1k/min
+    assert matched > 5000
+
+
+def test_policy_validation_and_case_filter(monkeypatch: pytest.MonkeyPatch) -> None:
+    errors, warnings = _validate_policy_strict({**load_policy(), "news_link_policy": {"batch_size": "x", "entities": {"r": {"colour": ["red"]}}}})
+    assert "news_link_policy.batch_size must be an integer" in errors
+    assert any("unknown kind: colour" in w for w in warnings)
+    assert not [e for e in _validate_policy_strict(load_policy())[0] if "news_link_policy" in e]
+
+    seen: List[str] = []
+    monkeypatch.setattr(news_mod, "all", lambda sql, **p: seen.append(sql) or [])
+    client = TestClient(create_app())
+    assert client.get("/news/items", params={"case_id": CASE}).status_code == 200
+    assert "case_id=CAST(:case_id AS UUID)" in seen[-1]
+    assert client.get("/news/items", params={"case_id": "nope"}).status_code == 400
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import gzip
+import importlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+import requests
+from fastapi.testclient import TestClient
+
+from app.api.routers import news as news_mod
+from app.api_main import create_app
+from conftest import load_service_app
+
+load_service_app("news_monitor")
+outbox_mod = importlib.import_module("news_monitor_app.outbox")
+seen_mod = importlib.import_module("news_monitor_app.seen")
+nm_main = importlib.import_module("news_monitor_app.main")
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.t = 1000.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def _items(*urls: str, summary: str = "") -> List[Dict[str, Any]]:
+    return [{"topic": "memory", "title": f"t {u}", "url": u, "severity": 40, "summary": summary} for u in urls]
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    resp = requests.Response()
+    resp.status_code = status
+    return requests.HTTPError(f"{status} error", response=resp)
+
+
+def test_queue_dedupes_by_url_and_batches_are_bounded(tmp_path: Path) -> None:
+    ob = outbox_mod.Outbox(str(tmp_path / "o.sqlite3"), batch_items=3, batch_bytes=500)
+    assert ob.enqueue(_items("a", "b", "a")) == ["a", "b"]
+    assert ob.enqueue(_items("b", "c", "d")) == ["c", "d"]
+    assert [u for _, u, _ in ob.next_batch()] == ["a", "b", "c"]
+
+    ob.enqueue(_items("big1", "big2", summary="x" * 300))
+    ob.mark_delivered([s for s, _, _ in ob.next_batch()])
+    assert [u for _, u, _ in ob.next_batch()] == ["d", "big1"]  # byte bound
+    ob.mark_delivered([s for s, _, _ in ob.next_batch()])
+    assert [u for _, u, _ in ob.next_batch()] == ["big2"]  # an oversized row still goes alone
+    assert ob.enqueue(_items("a")) == []  # delivered rows keep suppressing re-queues
+
+
+def test_outage_keeps_items_on_disk_and_backs_off(tmp_path: Path) -> None:
+    clock = Clock()
+    path = str(tmp_path / "o.sqlite3")
+    ob = outbox_mod.Outbox(path, batch_items=2, retry_base_s=2, retry_max_s=10, clock=clock)
+    ob.enqueue(_items("a", "b", "c"))
+
+    def down(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        raise requests.ConnectionError("api down")
+
+    d = ob.deliver(down)
+    assert d.delivered == 0 and "api down" in (d.error or "") and 1 <= d.retry_in_s <= 2
+    assert ob.deliver(down).error is None  # still backing off: no request at all
+    clock.t += 2
+    assert 2 <= ob.deliver(down).retry_in_s <= 4
+    ob.close()
+
+    # Restart: the queue survives; delivery resumes in order and nothing is sent twice.
+    ob = outbox_mod.Outbox(path, batch_items=2, clock=clock)
+    sent: List[List[str]] = []
+    d = ob.deliver(lambda items: sent.append([i["url"] for i in items]) or {"inserted": len(items)})
+    assert sent == [["a", "b"], ["c"]] and d.inserted == 3 and d.delivered_urls == ["a", "b", "c"]
+    assert ob.deliver(lambda items: pytest.fail("nothing pending")).delivered == 0
+    assert ob.stats()["pending"] == 0
+
+    clock.t += 86400 + 1
+    assert ob.prune() == 3
+
+
+def test_rejected_row_is_isolated_and_parked(tmp_path: Path) -> None:
+    ob = outbox_mod.Outbox(str(tmp_path / "o.sqlite3"), batch_items=8)
+    ob.enqueue(_items(*[f"u{i}" for i in range(8)]))
+    delivered: List[str] = []
+
+    def post(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if any(i["url"] == "u5" for i in items):
+            raise _http_error(422)
+        delivered.extend(i["url"] for i in items)
+        return {"inserted": len(items)}
+
+    d = ob.deliver(post)
+    assert sorted(delivered) == [f"u{i}" for i in range(8) if i != 5]
+    assert d.failed == 1 and ob.stats() == {"pending": 0, "failed": 1, "oldest_pending_s": None}
+    assert ob.retry_at == 0.0  # a rejected row is not an outage
+
+
+@pytest.mark.parametrize("status", [403, 404, 405, 503])
+def test_other_errors_back_off_without_parking(tmp_path: Path, status: int) -> None:
+    ob = outbox_mod.Outbox(str(tmp_path / "o.sqlite3"), batch_items=4, retry_base_s=2, clock=Clock())
+    ob.enqueue(_items("a", "b", "c", "d"))
+    calls: List[int] = []
+
+    def post(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        calls.append(len(items))
+        raise _http_error(status)
+
+    d = ob.deliver(post)
+    assert calls == [4] and d.failed == 0 and 1 <= d.retry_in_s <= 2  # no bisecting
+    assert ob.stats()["pending"] == 4 and ob.fail_streak == 1
+
+
+@pytest.fixture
+def api(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+    db: Dict[str, Any] = {"urls": set()}
+
+    def fake_all(sql: str, **params: Any) -> List[Dict[str, Any]]:
+        out = []
+        for r in json.loads(params["rows"]):
+            if r["url"] not in db["urls"]:
+                db["urls"].add(r["url"])
+                out.append({"item_id": f"id-{len(db['urls'])}", "topic": r["topic"], "title": r["title"], "url": r["url"], "severity": r["severity"]})
+        return out
+
+    monkeypatch.setattr(news_mod, "all", fake_all)
+    monkeypatch.setattr(news_mod, "_cluster_inserted", lambda inserted, rows: {})
+    db["client"] = TestClient(create_app())
+    return db
+
+
+def test_monitor_posts_gzip_batches_the_api_accepts(api: Dict[str, Any], monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    client: TestClient = api["client"]
+    bodies: List[bytes] = []
+
+    def via_client(url: str, data: bytes, headers: Dict[str, str], timeout: float) -> Any:
+        bodies.append(data)
+        return client.post(url.replace(nm_main.API_BASE, ""), content=data, headers=headers)
+
+    monkeypatch.setattr(nm_main.requests, "post", via_client)
+    monkeypatch.setattr(nm_main, "_seen", seen_mod.SeenFilter(capacity=1000))
+    monkeypatch.setattr(nm_main, "_outbox", outbox_mod.Outbox(str(tmp_path / "o.sqlite3"), batch_items=50))
+
+    queued = nm_main.queue_items(_items(*[f"https://n/{i}" for i in range(120)], summary="HBM supply tightens " * 20))
+    r = nm_main.deliver_outbox()
+    assert (len(queued), r["batches"], r["inserted"]) == (120, 3, 120)
+    raw = len(json.dumps({"items": _items("x", summary="HBM supply tightens " * 20)}))
+    assert all(len(b) < 50 * raw / 5 for b in bodies)  # compressed well below the raw size
+    assert json.loads(gzip.decompress(bodies[0]))["items"][0]["url"] == "https://n/0"
+    assert "https://n/7" in nm_main.get_seen()
+
+
+def test_api_rejects_bad_or_oversized_gzip(api: Dict[str, Any]) -> None:
+    client: TestClient = api["client"]
+    hdrs = {"Content-Type": "application/json", "Content-Encoding": "gzip", "X-Request-Id": "rid-1"}
+    r = client.post("/news/ingest", content=b"not gzip", headers=hdrs)
+    assert r.status_code == 400 and r.json()["request_id"] == "rid-1" and r.headers["X-Request-Id"] == "rid-1"
+
+    body = gzip.compress(json.dumps({"items": _items("a")}).encode() + b" " * 100_000)
+    small = create_app()
+    for m in small.user_middleware:
+        if m.cls.__name__ == "GzipRequestMiddleware":
+            m.kwargs["max_size"] = 10_000
+    assert TestClient(small).post("/news/ingest", content=body, headers=hdrs).status_code == 413
+    assert client.post("/news/ingest", content=body, headers=hdrs).json()["inserted"] == 1
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import importlib
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from conftest import load_service_app
+
+load_service_app("news_monitor")
+rss = importlib.import_module("news_monitor_app.fetchers.rss")
+sched_mod = importlib.import_module("news_monitor_app.scheduler")
+outbox_mod = importlib.import_module("news_monitor_app.outbox")
+nm_main = importlib.import_module("news_monitor_app.main")
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.t = 1000.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def _src(name: str, interval: Any = None, kind: str = "rss") -> Any:
+    return nm_main.RssSource(name=name, url=f"https://example.com/{name}", interval=interval, kind=kind)
+
+
+def _poll(s: Any, clock: Clock, changed: Dict[str, bool]) -> List[str]:
+    names = [src.name for src in s.take_due()]
+    for src in list(s._states[n].source for n in names):
+        s.record(src, changed=changed.get(src.name, False), elapsed_ms=5)
+    return names
+
+
+def test_sources_poll_at_their_own_interval() -> None:
+    clock = Clock()
+    s = sched_mod.SourceScheduler([_src("wire", 10), _src("weekly", 60)], default_interval=30, jitter=0, clock=clock)
+    polls: Dict[str, int] = {"wire": 0, "weekly": 0}
+    for _ in range(121):
+        for n in _poll(s, clock, {"wire": True, "weekly": True}):
+            polls[n] += 1
+        clock.t += 1
+    assert polls == {"wire": 13, "weekly": 3}
+    assert s.next_wake() is not None and s.next_wake() <= 10
+
+
+def test_unchanged_feeds_back_off_and_reset_on_change() -> None:
+    clock = Clock()
+    s = sched_mod.SourceScheduler([_src("slow", 10)], backoff_after=2, max_backoff=4, jitter=0, clock=clock)
+    intervals = []
+    for _ in range(5):
+        assert _poll(s, clock, {}) == ["slow"]
+        intervals.append(s.metrics()["slow"]["current_interval_s"])
+        clock.t += s.next_wake()
+    assert intervals == [10, 20, 40, 40, 40]  # capped at 4x
+
+    _poll(s, clock, {"slow": True})
+    m = s.metrics()["slow"]
+    assert m["current_interval_s"] == 10 and m["unchanged_polls"] == 0 and m["polls"] == 6
+
+
+def test_jitter_spreads_due_times_and_lag_is_measured() -> None:
+    clock = Clock()
+    srcs = [_src(f"s{i}", 60) for i in range(50)]
+    s = sched_mod.SourceScheduler(srcs, jitter=0.1, clock=clock, rng=random.Random(7))
+    _poll(s, clock, {})
+    dues = sorted(st.due - clock.t for st in s._states.values())
+    assert 54 <= dues[0] < dues[-1] <= 66 and len(set(dues)) == 50
+
+    clock.t += 70  # loop woke late: every fetch starts behind its due time
+    s.take_due()
+    lags = [m["lag_ms"] for m in s.metrics().values()]
+    assert min(lags) >= 4000 and max(lags) <= 16000
+
+
+def test_reload_keeps_schedule_and_drops_removed_sources() -> None:
+    clock = Clock()
+    s = sched_mod.SourceScheduler([_src("a", 10), _src("b", 10)], jitter=0, clock=clock)
+    _poll(s, clock, {"a": True, "b": True})
+    s.update_sources([_src("a", 20), _src("c")])
+    assert s.take_due() == [s._states["c"].source]  # new source due now, a keeps its due time
+    assert set(s.metrics()) == {"a", "c"}
+    clock.t += 10
+    assert [src.name for src in s.take_due()] == ["a"]  # b's stale heap entry is skipped
+
+
+def test_load_sources_from_yaml(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(nm_main, "RSS_ALLOWLIST_PATH", str(Path(nm_main.__file__).parent / "rss_sources.yaml"))
+    shipped = nm_main.load_rss_sources()
+    assert len(shipped) == 4 and all(s.url.startswith("https://") and s.interval and s.kind == "rss" for s in shipped)
+
+    p = tmp_path / "sources.yaml"
+    p.write_text('sources:\n  - name: "a"\n    url: "https://x/a"\n    timeout: 2\n  - name: "no url"\n  - name: b\n    url: https://x/b\n    kind: wire\n    weight: bad\n')
+    monkeypatch.setattr(nm_main, "RSS_ALLOWLIST_PATH", str(p))
+    a, b = nm_main.load_rss_sources()
+    assert (a.name, a.timeout, a.interval, a.weight) == ("a", 2.0, None, 1.0)
+    assert (b.name, b.kind) == ("b", "wire")
+
+
+class WireAdapter:
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def fetch_all(self, sources: List[Any]) -> List[Any]:
+        self.calls.append([s.name for s in sources])
+        entry = type("E", (), {"title": "HBM shortage", "link": "https://wire/1", "summary": ""})
+        return [rss.FetchResult(source=s, status=200, entries=[entry], elapsed_ms=3) for s in sources]
+
+
+def test_scheduled_pass_fetches_due_sources_through_adapters(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    clock = Clock()
+    sources = [_src("w", 10, kind="wire"), _src("x", 10, kind="unknown")]
+    wire = WireAdapter()
+    posted: List[Dict[str, Any]] = []
+    monkeypatch.setattr(nm_main, "load_rss_sources", lambda: sources)
+    monkeypatch.setattr(nm_main, "_adapters", {"wire": wire})
+    monkeypatch.setattr(nm_main, "_scheduler", sched_mod.SourceScheduler([], jitter=0, clock=clock))
+    monkeypatch.setattr(nm_main, "_seen", nm_main.SeenFilter(capacity=1000))
+    monkeypatch.setattr(nm_main, "_api_post", lambda path, payload, **_: posted.append(payload) or {"inserted": len(payload["items"])})
+    monkeypatch.setattr(nm_main, "_outbox", outbox_mod.Outbox(str(tmp_path / "outbox.sqlite3")))
+    monkeypatch.setattr(nm_main, "SOURCE_METRICS_PATH", str(tmp_path / "metrics.json"))
+
+    out = nm_main.run_due_sources()
+    assert out["inserted"] == 1 and out["errors"] == {"x": "no adapter for kind 'unknown'"}
+    assert set(out["due"]) == {"w", "x"} and out["due"]["w"]["fetch_ms"] == 3 and out["next_in_s"] == 10
+    assert json.loads((tmp_path / "metrics.json").read_text())["w"]["polls"] == 1
+
+    assert nm_main.run_due_sources()["due"] == {}  # nothing due yet
+    clock.t += 10
+    nm_main.run_due_sources()
+    assert wire.calls == [["w"], ["w"]] and len(posted) == 1
+    assert nm_main.get_scheduler().metrics()["w"]["unchanged_polls"] == 1  # same item again
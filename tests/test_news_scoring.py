@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import importlib
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from conftest import load_service_app
+
+load_service_app("news_monitor")
+scoring = importlib.import_module("news_monitor_app.scoring")
+nm_main = importlib.import_module("news_monitor_app.main")
+
+CONFIG: Dict[str, Any] = {
+    "default": {"base": 10, "source_weight_scale": 0, "terms": {"shortage": 5}},
+    "topics": {
+        "memory": {
+            "base": 30,
+            "source_weight_scale": 50,
+            "terms": {"leak*": 30, "ai": 6, "spot": 10, "data center*": 10, "hbm": 12},
+        }
+    },
+}
+
+
+def test_terms_match_whole_words_and_prefixes() -> None:
+    s = scoring.Scorer(CONFIG)
+    r = s.score("memory", "Leakage of HBM parts said to hit Data  Centers", 0.0)
+    assert sorted(r.matched) == ["data center*", "hbm", "leak*"]  # "ai" inside "said" does not count
+    assert r.severity == 30 + 30 + 12 + 10
+    assert s.score("memory", "Hotspots and maintenance", 1.0).matched == {}
+    assert s.score("memory", "AI: spot prices", 1.0).severity == 30 + 50 + 6 + 10
+
+
+def test_non_ascii_text_matches_like_ascii() -> None:
+    s = scoring.Scorer({"topics": {"memory": {"terms": {"hbm": 12, "data center*": 10, "leak*": 30, "café": 5}}}})
+    assert sorted(s.score("memory", "(HBM) data-centers leak").matched) == ["data center*", "hbm", "leak*"]
+    assert sorted(s.score("memory", "“HBM” data—centers leaké, Café").matched) == ["café", "data center*", "hbm", "leak*"]
+    assert s.score("memory", "hbmé xleak").matched == {}
+    rules = s.rules("memory")
+    assert rules.pattern is not None and rules.ascii_pattern is not None and b"caf" not in rules.ascii_pattern.pattern
+
+
+def test_unknown_topic_uses_default_and_severity_is_clamped() -> None:
+    s = scoring.Scorer(CONFIG)
+    assert s.score("gpu", "GPU shortage", 1.0).severity == 15
+    assert s.score("memory", "leaks leak leaked hbm ai spot data centers", 1.0).severity == 100
+    signals = s.score("memory", "HBM spot", 1.0).signals()
+    assert signals["matched_terms"] == ["hbm", "spot"]
+    assert signals["score_explain"] == {"base": 30.0, "source": 50.0, "terms": {"hbm": 12.0, "spot": 10.0}}
+
+
+def test_batch_matches_single_item_scoring() -> None:
+    s = scoring.Scorer(CONFIG)
+    texts = [("HBM data", 1.0), ("data centre spot", 0.5), ("", 1.0), ("spot leak data center build", 0.8)]
+    batch = s.score_batch("memory", texts)
+    assert [b.severity for b in batch] == [s.score("memory", t, w).severity for t, w in texts]
+    assert [sorted(b.matched) for b in batch][3] == ["data center*", "leak*", "spot"]
+
+
+def test_scorer_reloads_when_keywords_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "keywords.yaml"
+    path.write_text("topics:\n  memory:\n    terms:\n      dram: 10\n")
+    assert scoring.load_scorer(str(path)).score("memory", "DRAM", 0.0).severity == 40
+    assert scoring.load_scorer(str(path)) is scoring.load_scorer(str(path))
+
+    path.write_text("topics:\n  memory:\n    terms:\n      dram: 20\n")
+    st = path.stat()
+    os.utime(path, (st.st_atime, st.st_mtime + 5))
+    assert scoring.load_scorer(str(path)).score("memory", "DRAM", 0.0).severity == 50
+
+
+def test_monitor_sends_severity_with_explanation() -> None:
+    items: List[Dict[str, Any]] = [
+        {"topic": "memory", "title": "DRAM inventory leak", "summary": "spot prices", "url": "u1", "_weight": 1.0},
+        {"topic": "memory", "title": "Quarterly results", "summary": "", "url": "u2", "_weight": 0.5},
+    ]
+    out = nm_main.score_items(items)
+    assert all("severity" in it and "score" not in it and "_weight" not in it for it in out)
+    assert out[0]["severity"] == 100 and "leak*" in out[0]["signals"]["matched_terms"]
+    assert out[1]["severity"] == 55 and out[1]["signals"]["matched_terms"] == []
+
+
+@pytest.mark.parametrize("term", ["leak*", "dram", "data center*"])
+def test_shipped_keywords_file_loads(term: str) -> None:
+    rules = scoring.load_scorer(nm_main.KEYWORDS_PATH).rules("memory")
+    assert term in rules.terms
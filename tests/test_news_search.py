@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import importlib
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routers import news as news_mod
+from app.api_main import create_app
+from conftest import load_service_app
+
+load_service_app("live_orchestrator")
+tools = importlib.import_module("live_orchestrator_app.tools_backend")
+
+
+@pytest.fixture
+def db(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+    state: Dict[str, Any] = {"calls": [], "fts": [], "fuzzy": []}
+
+    def fake_all(sql: str, **params: Any) -> List[Dict[str, Any]]:
+        state["calls"].append((sql, params))
+        return state["fuzzy" if "word_similarity" in sql else "fts"]
+
+    monkeypatch.setattr(news_mod, "all", fake_all)
+    return state
+
+
+def test_search_ranks_indexed_matches_with_filters(db: Dict[str, Any]) -> None:
+    db["fts"] = [{"item_id": f"i{n}", "title": "HBM lead time", "rank": 0.5} for n in range(2)]
+    r = TestClient(create_app()).get(
+        "/news/search",
+        params={"q": "hbm lead time", "topic": "memory", "since": "2026-01-01T00:00:00+00:00", "min_severity": 40, "limit": 2},
+    ).json()
+    assert r["fuzzy"] is False and len(r["items"]) == 2 and r["next_offset"] == 2
+
+    sql, params = db["calls"][0]
+    assert "search_tsv @@ websearch_to_tsquery('english', :q)" in sql
+    assert "ts_rank_cd(search_tsv" in sql and "ORDER BY rank DESC" in sql
+    assert "topic = :topic" in sql and "fetched_at >= :since" in sql and "severity >= :min_sev" in sql
+    assert params["q"] == "hbm lead time" and params["min_sev"] == 40 and params["off"] == 0
+
+
+def test_any_mode_and_validation(db: Dict[str, Any]) -> None:
+    client = TestClient(create_app())
+    r = client.get("/news/search", params={"q": "hbm korea", "match": "any", "fuzzy": "false"}).json()
+    assert r["items"] == [] and r["fuzzy"] is False and r["next_offset"] is None
+    assert "plainto_tsquery" in db["calls"][0][0] and "' | '" in db["calls"][0][0]
+    assert len(db["calls"]) == 1  # no fuzzy query
+
+    assert client.get("/news/search", params={"q": "x", "match": "some"}).status_code == 422
+    assert client.get("/news/search", params={"q": ""}).status_code == 422
+
+
+def test_fuzzy_fallback_and_missing_pg_trgm(db: Dict[str, Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    db["fuzzy"] = [{"item_id": "i1", "title": "Samsung HBM3E qualification", "rank": 0.7}]
+    client = TestClient(create_app())
+    r = client.get("/news/search", params={"q": "samsng"}).json()
+    assert r["fuzzy"] is True and r["items"][0]["item_id"] == "i1"
+    assert ":q <% title" in db["calls"][-1][0] and "off" not in db["calls"][-1][1]
+
+    def no_trgm(sql: str, **params: Any) -> List[Dict[str, Any]]:
+        if "word_similarity" in sql:
+            raise RuntimeError("function word_similarity(unknown, text) does not exist")
+        return []
+
+    monkeypatch.setattr(news_mod, "all", no_trgm)
+    r = client.get("/news/search", params={"q": "samsng"})
+    assert r.status_code == 200 and r.json()["items"] == []
+
+
+def test_orchestrator_searches_instead_of_grepping(monkeypatch: pytest.MonkeyPatch) -> None:
+    plan = tools.classify_tools_for_prompt("HBM lead time Korea last 7 days")
+    assert ("news_search", {"q": "hbm lead time korea", "topic": "memory", "days": 7, "limit": 10}) in plan
+    assert all(name != "news_search" for name, _ in tools.classify_tools_for_prompt("what's new?"))
+
+    paths: List[str] = []
+    monkeypatch.setattr(tools, "api_get_json", lambda path: paths.append(path) or {"items": []})
+    tools.search_news("hbm lead time korea", days=7)
+    assert paths[0].startswith("/news/search?q=hbm+lead+time+korea&topic=memory") and "since=" in paths[0]
+
+    item = {"title": "HBM lead times stretch", "url": "https://x/1", "severity": 70}
+    cites = tools.build_structured_citations(
+        {"tools": [{"name": "news_search", "ok": True, "data": {"items": [item]}}, {"name": "news_items", "ok": True, "data": {"items": [item]}}]}
+    )
+    assert [n["label"] for n in cites["news"]] == ["N1"]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import pytest
+
+import app.execution as exec_mod
+from app.object_cache import request_cache
+
+CASE = "11111111-1111-1111-1111-111111111111"
+CARD = "22222222-2222-2222-2222-222222222222"
+
+
+@pytest.fixture
+def queries(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    seen: List[str] = []
+
+    def fake_all(sql: str, **params: Any) -> List[Dict[str, Any]]:
+        seen.append(sql)
+        if "FROM kanban_cards" in sql:
+            return [{"card_id": c, "case_id": CASE, "status": "todo"} for c in params["ids"] if c == CARD]
+        if "FROM agent_cases" in sql:
+            return [{"case_id": c, "risk_score": 90} for c in params["ids"]]
+        return []
+
+    monkeypatch.setattr(exec_mod, "all", fake_all)
+    return seen
+
+
+def _validate(n: int) -> List[dict]:
+    return [
+        exec_mod.execute_action(
+            case_id=CASE,
+            channel="ui",
+            action_type="UpdateCardStatus",
+            payload={"card_id": CARD, "new_status": "in_progress"},
+            dry_run=True,
+        )
+        for _ in range(n)
+    ]
+
+
+def test_ten_validations_cost_one_query_inside_a_request(queries: List[str]) -> None:
+    with request_cache():
+        out = _validate(10)
+    assert all(r["ok"] for r in out)
+    assert len(queries) == 1
+
+
+def test_without_request_cache_every_validation_queries(queries: List[str]) -> None:
+    _validate(3)
+    assert len(queries) == 3
+
+
+def test_preloaded_rows_cost_zero_queries(queries: List[str]) -> None:
+    with request_cache():
+        exec_mod.remember_cards([{"card_id": CARD, "case_id": CASE, "status": "todo"}])
+        exec_mod.remember_cases([{"case_id": CASE, "risk_score": 90}])
+        _validate(5)
+    assert queries == []
+
+    res = exec_mod.execute_action(
+        case_id=CASE,
+        channel="ui",
+        action_type="UpdateCardStatus",
+        payload={"card_id": CARD, "new_status": "in_progress"},
+        dry_run=True,
+        card={"card_id": CARD, "case_id": CASE, "status": "todo"},
+    )
+    assert res["ok"] is True
+    assert queries == []
+
+
+def test_missing_rows_are_cached_as_not_found(queries: List[str]) -> None:
+    other = "33333333-3333-3333-3333-333333333333"
+    with request_cache():
+        assert exec_mod.load_cards([other, CARD]) == {CARD: {"card_id": CARD, "case_id": CASE, "status": "todo"}}
+        assert exec_mod.get_card(other) is None
+        assert exec_mod.get_card(CARD)["status"] == "todo"
+    assert len(queries) == 1
+
+
+def test_card_update_refreshes_cached_status(monkeypatch: pytest.MonkeyPatch, queries: List[str]) -> None:
+    class _Row:
+        def __init__(self, row: tuple) -> None:
+            self.row = row
+
+        def fetchone(self) -> tuple:
+            return self.row
+
+    def fake_q(sql: str, **params: Any) -> _Row:
+        return _Row(("44444444-4444-4444-4444-444444444444", params["id"], params["st"], None, None))
+
+    monkeypatch.setattr(exec_mod, "q", fake_q)
+    with request_cache():
+        res = exec_mod.execute_action(
+            case_id=CASE,
+            channel="ui",
+            action_type="UpdateCardStatus",
+            payload={"card_id": CARD, "new_status": "in_progress"},
+        )
+        assert res["ok"] is True
+        assert exec_mod.get_card(CARD)["status"] == "in_progress"
+        # A stale cached "todo" would make this a no-op; the refreshed status makes it illegal.
+        again = exec_mod.execute_action(
+            case_id=CASE,
+            channel="ui",
+            action_type="UpdateCardStatus",
+            payload={"card_id": CARD, "new_status": "todo"},
+            dry_run=True,
+        )
+    assert again["ok"] is False
+    assert "in_progress -> todo" in again["message"]
+    assert len(queries) == 1
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import time
+from typing import Any, Dict, Iterator, List
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from conftest import load_service_app
+
+load_service_app("live_orchestrator")
+tools = importlib.import_module("live_orchestrator_app.tools_backend")
+orch_main = importlib.import_module("live_orchestrator_app.main")
+
+PLAN = [("news_alerts", {"topic": "memory", "limit": 10}), ("news_items", {"topic": "memory", "limit": 25}), ("cases", {"limit": 10})]
+
+
+class FakeAPI:
+    def __init__(self) -> None:
+        self.paths: List[str] = []
+        self.delay: Dict[str, float] = {}
+        self.fail: Dict[str, int] = {}
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.paths.append(path)
+        await asyncio.sleep(self.delay.get(path, 0.0))
+        if self.fail.get(path):
+            self.fail[path] -= 1
+            return httpx.Response(503, json={"error": "busy"})
+        return httpx.Response(200, json={"items": [{"title": f"from {path}", "url": f"https://x{path}"}]})
+
+
+@pytest.fixture
+def api(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeAPI]:
+    fake = FakeAPI()
+    client = httpx.AsyncClient(base_url="http://api", transport=httpx.MockTransport(fake))
+    monkeypatch.setattr(tools, "_client", client)
+    monkeypatch.setattr(tools, "tool_cache", tools.ToolCache(ttl=10))
+    yield fake
+
+
+def test_tools_run_concurrently_in_plan_order(api: FakeAPI) -> None:
+    for p in ("/news/alerts", "/news/items", "/cases"):
+        api.delay[p] = 0.2
+    start = time.monotonic()
+    out = asyncio.run(tools.run_tools_async(PLAN))
+    assert time.monotonic() - start < 0.45  # three 200ms calls back to back would be 0.6s+
+    assert [t["name"] for t in out["tools"]] == ["news_alerts", "news_items", "cases"]
+    assert all(t["ok"] for t in out["tools"])
+    assert out["tools"][1]["data"]["items"][0]["title"] == "from /news/items"
+
+
+def test_cache_is_shared_single_flight_and_expires(api: FakeAPI, monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    cache = tools.ToolCache(ttl=10, clock=lambda: now[0])
+    monkeypatch.setattr(tools, "tool_cache", cache)
+    api.delay["/news/items"] = 0.1
+
+    async def sessions(n: int) -> List[Dict[str, Any]]:
+        return await asyncio.gather(*(tools.run_tools_async(PLAN) for _ in range(n)))
+
+    results = asyncio.run(sessions(5))  # five sessions asking at once
+    assert sorted(api.paths) == ["/cases", "/news/alerts", "/news/items"]
+    assert all(r == results[0] for r in results)
+
+    asyncio.run(tools.run_tools_async(PLAN))
+    assert len(api.paths) == 3 and cache.hits == 3
+    now[0] += 11
+    asyncio.run(tools.run_tools_async(PLAN[:1]))
+    assert api.paths[-1] == "/news/alerts" and len(api.paths) == 4
+
+    # Different args are a different entry.
+    asyncio.run(tools.run_tools_async([("cases", {"limit": 5})]))
+    assert len(api.paths) == 5
+
+
+def test_failures_are_per_tool_and_not_cached(api: FakeAPI) -> None:
+    api.fail["/cases"] = 1
+    out = asyncio.run(tools.run_tools_async(PLAN + [("nope", {})]))
+    by = {t["name"]: t for t in out["tools"]}
+    assert not by["cases"]["ok"] and "503" in by["cases"]["error"]
+    assert by["news_items"]["ok"] and by["nope"]["data"] == {"error": "unknown tool nope"}
+
+    again = asyncio.run(tools.run_tools_async([("cases", {"limit": 10})]))
+    assert again["tools"][0]["ok"] and api.paths.count("/cases") == 2
+
+
+def test_slow_call_does_not_stall_other_sessions(api: FakeAPI) -> None:
+    api.delay["/news/search"] = 1.0
+
+    async def scenario() -> float:
+        slow = asyncio.ensure_future(tools.run_tools_async([("news_search", {"q": "hbm", "topic": "memory", "days": 7, "limit": 10})]))
+        await asyncio.sleep(0.01)
+        start = time.monotonic()
+        await tools.run_tools_async([("cases", {"limit": 10})])
+        took = time.monotonic() - start
+        assert (await slow)["tools"][0]["ok"]
+        return took
+
+    assert asyncio.run(scenario()) < 0.2
+    assert any(p == "/news/search" for p in api.paths)
+
+
+def test_websocket_commands_use_the_async_client(api: FakeAPI) -> None:
+    with TestClient(orch_main.app) as client:
+        with client.websocket_connect("/ws") as ws:
+            assert ws.receive_json()["type"] == "hello"
+            ws.send_json({"type": "command", "command": "list_alerts", "topic": "memory"})
+            msg = ws.receive_json()
+    assert msg["type"] == "news_alerts" and msg["result"]["items"][0]["title"] == "from /news/alerts"
+    assert tools._client is None  # closed on shutdown
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+import app.partitions as parts
+
+
+def test_partition_upper_bound_day_and_month() -> None:
+    assert parts.partition_upper_bound("dq_results_p20260131", "day") == datetime(2026, 2, 1, tzinfo=timezone.utc)
+    assert parts.partition_upper_bound("agent_actions_p20261201", "month") == datetime(2027, 1, 1, tzinfo=timezone.utc)
+    assert parts.partition_upper_bound("agent_actions_default", "month") is None
+
+
+def test_drop_expired_partitions_drops_only_fully_expired(monkeypatch: pytest.MonkeyPatch) -> None:
+    names = [
+        "dq_results_default",
+        "dq_results_p20260101",
+        "dq_results_p20260109",
+        "dq_results_p20260110",
+        "dq_results_p20260111",
+    ]
+    monkeypatch.setattr(parts, "all", lambda sql, **p: [{"name": n} for n in names])
+    executed: list[str] = []
+    monkeypatch.setattr(parts, "q", lambda sql, **p: executed.append(sql))
+
+    now = datetime(2026, 1, 20, 12, 0, tzinfo=timezone.utc)
+    dropped = parts.drop_expired_partitions("dq_results", retain_days=10, now=now)
+
+    # cutoff = 2026-01-10T12:00Z: the 01-10 partition still holds retained rows
+    assert dropped == ["dq_results_p20260101", "dq_results_p20260109"]
+    assert all(sql.startswith("DROP TABLE IF EXISTS") for sql in executed)
+    assert not any("default" in sql for sql in executed)
+
+
+def test_retention_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(parts, "all", lambda sql, **p: pytest.fail("should not list partitions"))
+    assert parts.drop_expired_partitions("agent_actions", retain_days=0) == []
+
+
+def test_table_config_reads_policy() -> None:
+    policy = {"partition_policy": {"premake": 2, "tables": {"dq_results": {"retain_days": 7}}}}
+    cfg = parts.table_config("dq_results", policy)
+    assert cfg == {"granularity": "day", "premake": 2, "retain_days": 7}
+    assert parts.table_config("audit_log", {})["retain_days"] == parts.DEFAULT_RETAIN_DAYS["audit_log"]
+
+
+def test_ensure_partitions_keeps_going_when_a_table_fails(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture) -> None:
+    calls: list[str] = []
+
+    def fake_one(sql: str, **p: object) -> dict:
+        calls.append(str(p["parent"]))
+        if p["parent"] == "agent_actions":
+            raise RuntimeError('updated partition constraint for default partition "agent_actions_default" would be violated')
+        return {"created": 1}
+
+    monkeypatch.setattr(parts, "one", fake_one)
+    out = parts.ensure_partitions({})
+    assert calls == list(parts.PARTITIONED_TABLES)
+    assert out == {"agent_actions": 0, "audit_log": 1, "dq_results": 1, "agent_predictions": 1}
+    assert "agent_actions" in caplog.text
+
+
+def test_premake_moves_rows_already_in_default_partition() -> None:
+    # Rows for a range that landed in <parent>_default (premaker was down) make
+    # CREATE ... PARTITION OF fail with check_violation; the function must move
+    # them out instead of aborting, and must not give up on the other ranges.
+    sql = (Path(__file__).resolve().parents[1] / "seed" / "00_schema.sql").read_text()
+    fn = sql[sql.index("CREATE OR REPLACE FUNCTION ensure_time_partitions") :]
+    fn = fn[: fn.index("$$ LANGUAGE plpgsql;")]
+    handler = fn[fn.index("WHEN check_violation THEN") :]
+    steps = ["DETACH PARTITION", "CREATE TABLE %I PARTITION OF", "DELETE FROM %I WHERE %I >= %L AND %I < %L RETURNING *", "ATTACH PARTITION %I DEFAULT"]
+    positions = [handler.index(s) for s in steps]
+    assert positions == sorted(positions)
+    assert "EXCEPTION WHEN OTHERS THEN" in handler and "RAISE WARNING" in handler
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api_main import create_app
+from app.api.routers import pending_actions as pa_mod
+
+CASE = "11111111-1111-1111-1111-111111111111"
+P1 = "aaaaaaaa-0000-0000-0000-000000000001"
+P2 = "aaaaaaaa-0000-0000-0000-000000000002"
+P3 = "aaaaaaaa-0000-0000-0000-000000000003"
+MISSING = "aaaaaaaa-0000-0000-0000-00000000ffff"
+
+POLICY = {
+    "pending_action_policy": {
+        "allowed_transitions": {
+            "pending": ["approved", "rejected", "executed", "blocked"],
+            "approved": ["executed", "blocked"],
+            "rejected": [],
+        }
+    }
+}
+
+
+def _row(pid: str, status: str, *, approval_required: bool = True, action_type: str = "ExpediteShipment") -> Dict[str, Any]:
+    return {
+        "pending_id": pid,
+        "case_id": CASE,
+        "card_id": None,
+        "materialization_id": None,
+        "status": status,
+        "approval_required": approval_required,
+        "action_type": action_type,
+        "action_payload": {"qty": 1},
+        "case_risk_score": 90,
+    }
+
+
+@pytest.fixture()
+def fake_db(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+    db: Dict[str, Any] = {
+        "rows": {P1: _row(P1, "pending"), P2: _row(P2, "rejected"), P3: _row(P3, "approved")},
+        "selects": 0,
+        "writes": [],
+    }
+
+    def fake_all(sql: str, **params):
+        db["selects"] += 1
+        assert "ANY(CAST(:ids AS UUID[]))" in sql
+        return [dict(db["rows"][i]) for i in params["ids"] if i in db["rows"]]
+
+    def fake_q(sql: str, **params):
+        db["writes"].append((sql, params))
+        return None
+
+    monkeypatch.setattr(pa_mod, "all", fake_all)
+    monkeypatch.setattr(pa_mod, "q", fake_q)
+    monkeypatch.setattr(pa_mod, "one", lambda *a, **k: pytest.fail("batch endpoints must not do per-item lookups"))
+    monkeypatch.setattr(pa_mod, "load_policy", lambda: POLICY)
+    monkeypatch.setattr(pa_mod, "get_actor", lambda request, channel="ui": {"sub": "sup1", "role": "supervisor"})
+    monkeypatch.setattr(pa_mod, "can_approve", lambda *a, **k: (True, ""))
+    monkeypatch.setattr(pa_mod, "can_execute", lambda *a, action_type, **k: (action_type != "TriggerPurchase", "no"))
+    return db
+
+
+def _writes(db: Dict[str, Any], needle: str) -> List[Dict[str, Any]]:
+    return [p for sql, p in db["writes"] if needle in sql]
+
+
+def test_decide_batch_single_update_and_audit(fake_db: Dict[str, Any]) -> None:
+    client = TestClient(create_app())
+    items = [
+        {"pending_id": P1, "decision": "approve", "note": "ok"},
+        {"pending_id": P2, "decision": "approve"},  # rejected -> approved is illegal
+        {"pending_id": MISSING, "decision": "approve"},
+        {"pending_id": P3, "decision": "maybe"},
+    ]
+    r = client.post("/pending_actions/decide_batch?channel=supervisor", json={"items": items})
+    assert r.status_code == 200
+    body = r.json()
+    assert [it["status_code"] for it in body["items"]] == [200, 409, 404, 400]
+    assert body["items"][0]["status"] == "approved"
+    assert (body["succeeded"], body["failed"]) == (1, 3)
+
+    assert fake_db["selects"] == 1
+    updates = _writes(fake_db, "UPDATE pending_actions p")
+    assert len(updates) == 1
+    assert updates[0]["pending_id_0"] == P1 and updates[0]["st_0"] == "approved"
+    assert "pending_id_1" not in updates[0]
+
+    audits = _writes(fake_db, "INSERT INTO agent_actions")
+    assert len(audits) == 1
+    assert {audits[0]["action_type_0"], audits[0]["action_type_1"]} == {"PendingActionTransitionViolation", "DecidePendingAction"}
+
+
+def test_execute_batch_runs_through_batch_executor(fake_db: Dict[str, Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[Any] = []
+
+    def fake_execute_actions_batch(items, *, channel, cases=None, dry_run=False):
+        calls.append((items, cases, dry_run))
+        return [{"ok": True, "action_id": "bbbbbbbb-0000-0000-0000-000000000001"} for _ in items]
+
+    monkeypatch.setattr(pa_mod, "execute_actions_batch", fake_execute_actions_batch)
+    fake_db["rows"][P1]["approval_required"] = False
+
+    client = TestClient(create_app())
+    items = [{"pending_id": P1}, {"pending_id": P2}, {"pending_id": P3}, {"pending_id": P3}]
+    r = client.post("/pending_actions/execute_batch?dry_run=false&channel=ui", json={"items": items})
+    assert r.status_code == 200
+    body = r.json()
+    # P2 is rejected and requires approval; duplicate P3 is refused.
+    assert [it["status_code"] for it in body["items"]] == [200, 409, 200, 409]
+    assert body["items"][0]["transition"] == "pending->executed"
+    assert body["items"][2]["transition"] == "approved->executed"
+
+    assert len(calls) == 1
+    batch, cases, dry_run = calls[0]
+    assert len(batch) == 2 and dry_run is False
+    assert cases == {CASE: {"case_id": CASE, "risk_score": 90}}
+
+    updates = _writes(fake_db, "UPDATE pending_actions p")
+    assert len(updates) == 1
+    assert {updates[0]["pending_id_0"], updates[0]["pending_id_1"]} == {P1, P3}
+    assert len(_writes(fake_db, "INSERT INTO agent_actions")) == 1  # approval violation for P2
+
+
+def test_execute_batch_dry_run_writes_nothing(fake_db: Dict[str, Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        pa_mod,
+        "execute_actions_batch",
+        lambda items, **k: [{"ok": True, "dry_run": True} for _ in items],
+    )
+    client = TestClient(create_app())
+    r = client.post("/pending_actions/execute_batch", json={"items": [{"pending_id": P3}, {"pending_id": P2}]})
+    body = r.json()
+    assert body["items"][0]["would_transition"] == "approved->executed"
+    assert body["items"][1]["status_code"] == 409
+    assert fake_db["writes"] == []
@@ -38,3 +38,11 @@ def test_policy_validation_errors_on_invalid_transition_target() -> None:
     p["card_status_policy"]["allowed_transitions"]["todo"].append("nonsense")
     errors, _warnings = _validate_policy_strict(p)
     assert any("contains invalid status" in e for e in errors)
+
+
+def test_policy_validation_cleanup_policy_types() -> None:
+    p = _base_policy()
+    p["cleanup_policy"] = {"batch_size": "big", "tables": {"pending_actions": {"retain_days": "30"}}}
+    errors, _warnings = _validate_policy_strict(p)
+    assert any("cleanup_policy.batch_size" in e for e in errors)
+    assert any("cleanup_policy.tables.pending_actions.retain_days" in e for e in errors)
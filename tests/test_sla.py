@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.change_feed as cf
+import app.jobs.sla_sweeper as sweeper_mod
+from app.api.routers import objects as objects_mod
+from app.api_main import create_app
+
+CARD = "22222222-2222-2222-2222-222222222222"
+
+
+@pytest.fixture
+def queries(monkeypatch: pytest.MonkeyPatch) -> List[Dict[str, Any]]:
+    seen: List[Dict[str, Any]] = []
+
+    def fake_all(sql: str, **params: Any) -> List[Dict[str, Any]]:
+        seen.append({"sql": " ".join(sql.split()), **params})
+        return []
+
+    monkeypatch.setattr(objects_mod, "all", fake_all)
+    return seen
+
+
+def test_list_cards_default_unchanged(queries: List[Dict[str, Any]]) -> None:
+    client = TestClient(create_app())
+    assert client.get("/objects/list/cards", params={"status": "todo"}).status_code == 200
+    assert queries[-1]["sql"] == "SELECT * FROM v_kanban_cards WHERE status = :st ORDER BY updated_at DESC LIMIT :lim"
+
+
+def test_breached_filter_is_a_range_on_open_statuses(queries: List[Dict[str, Any]]) -> None:
+    client = TestClient(create_app())
+    client.get("/objects/list/cards", params={"breached": "true", "due_before": "2026-01-01T00:00:00Z"})
+    sql = queries[-1]["sql"]
+    assert "status IN ('todo', 'in_progress', 'blocked')" in sql
+    assert "sla_due_at < now()" in sql and "sla_due_at < :due" in sql
+    assert sql.endswith("ORDER BY sla_due_at ASC LIMIT :lim")
+    # Filters run on the persisted column, not an expression over created_at.
+    assert "created_at" not in sql and "interval" not in sql
+
+    client.get("/objects/list/cards", params={"breached": "false", "status": "blocked"})
+    sql = queries[-1]["sql"]
+    assert "status = :st" in sql and "sla_due_at >= now()" in sql and "status IN" not in sql
+
+
+def test_breached_filters_reject_a_closed_status(queries: List[Dict[str, Any]]) -> None:
+    client = TestClient(create_app())
+    for params in ({"breached": "true"}, {"due_before": "2026-01-01T00:00:00Z"}):
+        r = client.get("/objects/list/cards", params={**params, "status": "resolved"})
+        assert r.status_code == 400
+    assert queries == []
+
+    client.get("/objects/list/cards", params={"breached": "true", "status": "blocked"})
+    sql = queries[-1]["sql"]
+    assert "status = :st" in sql and "sla_due_at < now()" in sql and queries[-1]["st"] == "blocked"
+
+
+def test_not_breached_includes_cards_without_a_due_date(queries: List[Dict[str, Any]]) -> None:
+    client = TestClient(create_app())
+    client.get("/objects/list/cards", params={"breached": "false"})
+    sql = queries[-1]["sql"]
+    assert "(status = 'resolved' OR sla_due_at IS NULL OR sla_due_at >= now())" in sql
+    assert sql.endswith("ORDER BY updated_at DESC LIMIT :lim")
+
+
+def test_sweeper_flips_in_batches_and_publishes_events(monkeypatch: pytest.MonkeyPatch) -> None:
+    broker = cf.Broker(capacity=100)
+    monkeypatch.setattr(cf, "broker", broker)
+    monkeypatch.setattr(cf.config, "CHANGE_FEED_BACKEND", "inprocess")
+    pending = [
+        {"card_id": f"{CARD[:-2]}{i:02d}", "case_id": None, "status": "todo", "sla_due_at": "2026-01-01T00:00:00+00:00"}
+        for i in range(5)
+    ]
+    calls: List[int] = []
+
+    def fake_all(sql: str, **params: Any) -> List[Dict[str, Any]]:
+        assert "NOT breached" in sql and "SKIP LOCKED" in sql
+        calls.append(params["lim"])
+        out = pending[: params["lim"]]
+        del pending[: params["lim"]]
+        return out
+
+    monkeypatch.setattr(sweeper_mod, "all", fake_all)
+    assert sweeper_mod.sweep(limit=2) == 5
+    assert calls == [2, 2, 2]
+
+    events, _ = broker.read_after(0)
+    assert len(events) == 5
+    assert {e["op"] for e in events} == {"sla_breached"} and events[0]["data"]["status"] == "todo"